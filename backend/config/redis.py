@@ -98,8 +98,10 @@ async def init_redis() -> Redis:
             **config.connection_kwargs
         )
 
-        # Create client with pool
-        _client = Redis(connection_pool=_pool)
+        # Create client with pool (commands made while serving a request are
+        # recorded as spans of its trace, see middleware/tracing.py)
+        from middleware.tracing import TracedRedis
+        _client = TracedRedis(connection_pool=_pool)
 
         # Test connection
         await _client.ping()
@@ -0,0 +1,592 @@
+"""
+Scheduled (periodic) jobs
+
+Every periodic job is a plain ``async def job(db)`` registered in
+SCHEDULED_JOBS with its trigger. The scheduler (scheduler.py) only
+decides *when* a job is due; the job itself runs through
+run_scheduled_job(), either on the ARQ worker (jobs/worker.py, when the
+dedicated scheduler process dispatches it) or inline in the API process
+(embedded mode, for development).
+
+run_scheduled_job():
+- takes the job's distributed lock, so a job never runs twice at once
+  across workers/instances
+- records each run in ``scheduler_runs``: duration, items processed,
+  failures and the error of a failed run
+
+Jobs return what they processed: an int, a JobResult, or a dict with
+``processed`` / ``failed`` keys (returned by some service functions).
+
+Jobs registered with ``takes_fire_time`` are called as ``job(db, fire_time)``
+with the start of the time slot they were due in, so a run that waited in
+the ARQ queue still acts on the hour it was scheduled for.
+"""
+
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from apscheduler.triggers.base import BaseTrigger
+from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from services.article_cache import VIEW_FLUSH_INTERVAL
+from services.explore.content_counters import RECONCILE_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+RUNS_COLLECTION = "scheduler_runs"
+RUNS_RETENTION_DAYS = 14  # TTL index on started_at (utils/performance.py)
+
+
+@dataclass
+class JobResult:
+    """Outcome of a job run: items processed and items that failed."""
+
+    processed: int = 0
+    failed: int = 0
+
+
+@dataclass(frozen=True)
+class ScheduledJob:
+    """A periodic job and when it runs."""
+
+    id: str
+    name: str
+    func: Callable[[AsyncIOMotorDatabase], Awaitable[Any]]
+    trigger: BaseTrigger
+    lock_ttl: int = 300  # Should exceed the job's longest run
+    takes_fire_time: bool = False  # Called as func(db, fire_time)
+
+    @property
+    def period(self) -> int:
+        """Smallest gap between two runs, in seconds (cron triggers fire at most every minute)."""
+        if isinstance(self.trigger, IntervalTrigger):
+            return max(1, int(self.trigger.interval.total_seconds()))
+        return 60
+
+    def slot(self, now: float) -> int:
+        """Time slot (multiple of period) an epoch timestamp falls in."""
+        return int(now // self.period)
+
+    def slot_start(self, slot: int) -> datetime:
+        """When a time slot starts (the fire time of a run due in it)."""
+        return datetime.fromtimestamp(slot * self.period, timezone.utc)
+
+
+# ==================== Jobs ====================
+
+async def publish_scheduled_articles(db: AsyncIOMotorDatabase):
+    """Publish articles whose scheduled publish date has passed."""
+    from services.article_scheduler import publish_scheduled_articles as publish
+    return await publish(db)
+
+
+async def flush_article_views(db: AsyncIOMotorDatabase):
+    """Write buffered article view counts to MongoDB."""
+    from services.article_cache import article_view_buffer
+    return await article_view_buffer.flush(db)
+
+
+async def reconcile_explore_counters(db: AsyncIOMotorDatabase):
+    """Rebuild Explore content counters (repairs drift from untracked writers)."""
+    from services.explore.content_counters import explore_counters
+    await explore_counters.reconcile(db)
+
+
+async def process_webhook_queue(db: AsyncIOMotorDatabase):
+    """Deliver queued webhooks that are due for (re)try."""
+    from services.webhook_service import webhook_service
+    return await webhook_service.process_webhook_queue(db)
+
+
+async def run_status_automation(db: AsyncIOMotorDatabase, fire_time: Optional[datetime] = None) -> JobResult:
+    """
+    Run status automation for churches scheduled for the hour the job fired in (respecting timezones)
+
+    ``fire_time`` is when the run was due, not when it started, so a run that
+    waited behind long ARQ jobs still serves its hour.
+    """
+    import pytz
+    from services.status_automation_service_v2 import StatusAutomationService
+
+    result = JobResult()
+    current_utc = fire_time or datetime.now(timezone.utc)
+    logger.info(f"Checking status automation at {current_utc.strftime('%Y-%m-%d %H:%M UTC')}")
+
+    # Get all churches with automation enabled
+    settings = await db.church_settings.find({
+        "status_automation_enabled": True
+    }).to_list(1000)
+
+    churches_to_process = []
+
+    for setting in settings:
+        try:
+            # Get current time in church's timezone (default to UTC if not set)
+            church_tz_name = setting.get('timezone', 'UTC')
+            church_tz = pytz.timezone(church_tz_name)
+            current_local = current_utc.astimezone(church_tz)
+
+            # Parse schedule (HH:MM format in church's local time)
+            schedule = setting.get('status_automation_schedule', '00:00')
+            schedule_hour, schedule_minute = map(int, schedule.split(':'))
+
+            # Run in the first 5 minutes of the scheduled hour
+            if current_local.hour == schedule_hour and current_local.minute < 5:
+                churches_to_process.append({
+                    'church_id': setting.get('church_id'),
+                    'timezone': church_tz_name,
+                    'local_time': current_local.strftime('%H:%M %Z')
+                })
+
+        except Exception as e:
+            result.failed += 1
+            logger.error(f"Error parsing schedule for church {setting.get('church_id')}: {e}")
+
+    if churches_to_process:
+        logger.info(f"Running status automation for {len(churches_to_process)} church(es)")
+
+    for church_info in churches_to_process:
+        church_id = church_info['church_id']
+        try:
+            logger.info(f"Running automation for church {church_id} at {church_info['local_time']} ({church_info['timezone']})")
+            stats = await StatusAutomationService.run_automation_for_church(church_id, db)
+            logger.info(f"Automation complete for church {church_id}: {stats}")
+            result.processed += 1
+        except Exception as e:
+            result.failed += 1
+            logger.error(f"Error running automation for church {church_id}: {e}")
+
+    return result
+
+
+async def empty_trash_bin(db: AsyncIOMotorDatabase) -> int:
+    """Permanently delete members in trash for more than 14 days, scoped by church_id for audit trail."""
+    cutoff_date = datetime.now(timezone.utc) - timedelta(days=14)
+
+    logger.info("Checking trash bin for members older than 14 days")
+
+    # Process deletions per church (audit trail and tenant isolation)
+    churches = await db.churches.find({"is_active": True}, {"_id": 0, "id": 1}).to_list(1000)
+
+    total_deleted = 0
+    for church in churches:
+        church_id = church.get("id")
+        if not church_id:
+            continue
+
+        result = await db.members.delete_many({
+            "church_id": church_id,
+            "is_deleted": True,
+            "deleted_at": {"$lt": cutoff_date.isoformat()}
+        })
+
+        if result.deleted_count > 0:
+            logger.info(
+                f"Church {church_id}: Permanently deleted {result.deleted_count} member(s) "
+                f"from trash bin (older than 14 days)"
+            )
+            total_deleted += result.deleted_count
+
+    if total_deleted > 0:
+        logger.info(f"Total permanently deleted: {total_deleted} member(s) from trash bin")
+    return total_deleted
+
+
+async def cleanup_stale_calls(db: AsyncIOMotorDatabase) -> JobResult:
+    """Mark ringing calls that have timed out as missed and send notifications"""
+    from services.fcm_service import fcm_service
+
+    result = JobResult()
+
+    # 45 second timeout for ringing calls
+    timeout = datetime.now(timezone.utc) - timedelta(seconds=45)
+
+    # Find stale calls before marking them (to get details for notification)
+    stale_calls = await db.calls.find({
+        "status": "ringing",
+        "initiated_at": {"$lt": timeout}
+    }).to_list(100)
+
+    if not stale_calls:
+        return result
+
+    # Mark exactly these calls as missed (a call answered meanwhile is left alone)
+    await db.calls.update_many(
+        {
+            "_id": {"$in": [call["_id"] for call in stale_calls]},
+            "status": "ringing",
+        },
+        {
+            "$set": {
+                "status": "missed",
+                "end_reason": "missed",
+                "ended_at": datetime.now(timezone.utc),
+                "updated_at": datetime.now(timezone.utc)
+            }
+        }
+    )
+
+    logger.info(f"Marked {len(stale_calls)} stale calls as missed")
+
+    # Send missed call notifications to each callee
+    for call in stale_calls:
+        try:
+            church_id = call.get("church_id")
+            caller_id = call.get("caller_id")
+            call_type = call.get("call_type", "voice")
+
+            caller_info = await db.members.find_one({"id": caller_id}, {"_id": 0, "full_name": 1})
+            caller_name = caller_info.get("full_name", "Unknown") if caller_info else "Unknown"
+
+            for participant in call.get("participants", []):
+                if participant.get("role") == "callee":
+                    callee_id = participant.get("member_id")
+                    if callee_id and church_id:
+                        await fcm_service.send_to_member(
+                            db=db,
+                            member_id=callee_id,
+                            church_id=church_id,
+                            title="Missed Call",
+                            body=f"You missed a {'video' if call_type == 'video' else 'voice'} call from {caller_name}",
+                            notification_type="call",
+                            data={
+                                "type": "missed_call",
+                                "call_id": call.get("call_id"),
+                                "caller_id": caller_id,
+                                "caller_name": caller_name,
+                                "call_type": call_type
+                            }
+                        )
+            result.processed += 1
+        except Exception as e:
+            result.failed += 1
+            logger.error(f"Error sending missed call notification: {e}")
+
+    return result
+
+
+async def generate_counseling_slots(db: AsyncIOMotorDatabase) -> JobResult:
+    """
+    Reconcile counseling slots for all churches based on their settings.
+
+    Open slots are computed on request; this only persists booked slots
+    (bulk upserts) and drops stale stored open/blocked slots, with one
+    query per collection per church.
+    """
+    from services.counseling_availability_service import CounselingAvailabilityService
+
+    result = JobResult()
+    logger.info("Generating counseling slots for all churches")
+
+    settings = await db.church_settings.find({
+        "counseling_enabled": True
+    }).to_list(1000)
+
+    if not settings:
+        logger.info("No churches with counseling enabled")
+        return result
+
+    availability_service = CounselingAvailabilityService(db)
+
+    for setting in settings:
+        church_id = setting.get('church_id')
+        # Get days_ahead setting (default 60, or 365 for "forever")
+        days_ahead = setting.get('counseling_slot_generation_days', 60)
+
+        try:
+            logger.info(f"Generating slots for church {church_id} ({days_ahead} days ahead)")
+            stats = await availability_service.generate_slots_for_all_counselors(church_id, days_ahead)
+            logger.info(f"Slot generation complete for church {church_id}: {stats}")
+            result.processed += 1
+        except Exception as e:
+            result.failed += 1
+            logger.error(f"Error generating slots for church {church_id}: {e}")
+
+    return result
+
+
+async def generate_explore_content(db: AsyncIOMotorDatabase) -> JobResult:
+    """
+    Autonomously generate Explore content for the next day.
+
+    Generates the Daily Devotion, Verse of the Day, Bible Figure of the
+    Day and Daily Quiz for global content and every opted-in church. All
+    content goes to the review queue; images are stored in SeaweedFS.
+    """
+    from services.explore.autonomous_generator import AutonomousContentGenerator
+    from services.explore.generation_pipeline import GenerationPipeline, DAILY_CONTENT_TYPES
+    from services.seaweedfs_service import SeaweedFSService
+
+    logger.info("Starting autonomous Explore content generation")
+
+    generator = AutonomousContentGenerator(db, SeaweedFSService())
+
+    # Global (platform-wide) content plus churches that opted in
+    churches = await db.church_settings.find(
+        {"explore_auto_generation": True},
+        {"_id": 0, "church_id": 1},
+    ).to_list(100)
+    church_ids = ["global"] + [c["church_id"] for c in churches if c.get("church_id")]
+
+    # Fan out all churches x content types under a shared concurrency budget;
+    # documents are saved to their collections as each task completes
+    pipeline = GenerationPipeline(db, generator)
+    report = await pipeline.run(church_ids, DAILY_CONTENT_TYPES, job="generate_explore_content")
+
+    for task in report.tasks:
+        if task.status == "failed":
+            logger.error(f"✗ Failed {task.content_type} for {task.church_id}: {task.error}")
+        else:
+            logger.info(f"✓ Generated {task.content_type} for {task.church_id} -> {task.collection}")
+
+    logger.info(
+        f"Autonomous Explore content generation complete: {report.succeeded} succeeded, "
+        f"{report.failed} failed in {report.duration_ms / 1000:.1f}s (stages: {report.stage_summary()})"
+    )
+    return JobResult(processed=report.succeeded, failed=report.failed)
+
+
+async def materialize_daily_feeds(db: AsyncIOMotorDatabase) -> int:
+    """
+    Keep each church's daily Explore feed ready before the morning peak.
+
+    - Auto-publish schedule entries whose release time has passed
+      (invalidating the affected feeds)
+    - Materialize today's feed for every church whose release time has
+      passed in its timezone
+    """
+    from services.explore import ScheduleService
+    from services.explore.daily_feed import get_daily_feed_service
+
+    published = await ScheduleService(db).auto_publish_due_content()
+    materialized = await get_daily_feed_service(db).materialize_due()
+
+    if published or materialized:
+        logger.info(
+            f"Daily feeds: published {published} schedule entries, "
+            f"materialized {materialized} church feed(s)"
+        )
+    return published + materialized
+
+
+async def generate_bible_studies(db: AsyncIOMotorDatabase) -> JobResult:
+    """Generate a new complete, multi-lesson Bible Study series (global)."""
+    from services.explore.autonomous_generator import AutonomousContentGenerator
+    from services.explore.generation_pipeline import GenerationPipeline
+    from services.seaweedfs_service import SeaweedFSService
+
+    logger.info("Starting weekly Bible Study generation")
+
+    generator = AutonomousContentGenerator(db, SeaweedFSService())
+    pipeline = GenerationPipeline(db, generator)
+    report = await pipeline.run(["global"], ["bible_study"], job="generate_bible_studies")
+
+    for task in report.tasks:
+        if task.status == "failed":
+            logger.error(f"✗ Failed to generate Bible Study: {task.error}")
+        else:
+            title = task.document.get("title", {}).get("en", "Unknown")
+            lessons = len(task.document.get("lessons", []))
+            logger.info(f"✓ Generated Bible Study: '{title}' with {lessons} lessons")
+
+    return JobResult(processed=report.succeeded, failed=report.failed)
+
+
+async def sweep_prayer_followups(db: AsyncIOMotorDatabase) -> int:
+    """
+    Queue unsent prayer follow-ups missing from the dispatcher's due set.
+
+    Follow-ups are sent by the prayer follow-up dispatcher as they fall due
+    (services/explore/prayer_followup_dispatcher.py); this catches the ones
+    it never heard about. Without Redis it sends due follow-ups directly.
+    """
+    from services.explore.prayer_followup_dispatcher import prayer_followup_dispatcher
+
+    return await prayer_followup_dispatcher.sweep(db)
+
+
+async def process_news_context(db: AsyncIOMotorDatabase) -> int:
+    """
+    Monitor news feeds and store the day's context for contextual content.
+
+    Fetches news (Kompas, Detik, CNN Indonesia) and BMKG earthquake
+    alerts, scores significance and stores today's context for admins.
+    """
+    from services.explore.news_context_service import NewsContextService
+
+    logger.info("Processing news context for contextual content")
+
+    context = await NewsContextService(db).create_daily_context()
+
+    if not context.significant_events:
+        logger.info("No significant news events found")
+        return 0
+
+    logger.info(f"Found {len(context.significant_events)} significant events")
+
+    for event in context.significant_events:
+        if event.get("significance_score", 0) >= 0.7:
+            logger.info(f"High-significance event: {event.get('title', 'Unknown')}")
+            # TODO: Generate contextual devotion and add to review queue
+
+    # Store today's context for admin review
+    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    await db.news_contexts.update_one(
+        {"date": today},
+        {"$set": {
+            "date": today,
+            "events": context.significant_events,
+            "disaster_alerts": context.disaster_alerts,
+            "created_at": datetime.now(timezone.utc),
+        }},
+        upsert=True
+    )
+
+    if context.disaster_alerts:
+        logger.warning(f"DISASTER ALERTS: {len(context.disaster_alerts)} active alerts")
+        # TODO: Send admin notification for urgent contextual content
+
+    return len(context.significant_events)
+
+
+async def process_scheduled_broadcasts(db: AsyncIOMotorDatabase) -> int:
+    """Send scheduled broadcast campaigns that are due."""
+    from services.broadcast_service import get_broadcast_service
+
+    processed = await get_broadcast_service().process_scheduled_campaigns(db)
+    if processed > 0:
+        logger.info(f"Processed {processed} scheduled broadcast campaign(s)")
+    return processed
+
+
+async def rebuild_overall_leaderboards(db: AsyncIOMotorDatabase) -> int:
+    """Seed the new period's overall leaderboards and repair all-time drift."""
+    from services.redis.leaderboard import rebuild_overall_leaderboards as rebuild
+    return await rebuild()
+
+
+# ==================== Registry ====================
+
+SCHEDULED_JOBS = [
+    ScheduledJob("publish_scheduled_articles", "Publish Scheduled Articles",
+                 publish_scheduled_articles, IntervalTrigger(seconds=30), lock_ttl=120),
+    ScheduledJob("flush_article_views", "Flush Article View Counts",
+                 flush_article_views, IntervalTrigger(seconds=VIEW_FLUSH_INTERVAL), lock_ttl=120),
+    ScheduledJob("reconcile_explore_counters", "Reconcile Explore Content Counters",
+                 reconcile_explore_counters, IntervalTrigger(seconds=RECONCILE_INTERVAL), lock_ttl=600),
+    ScheduledJob("process_webhook_queue", "Process Webhook Queue",
+                 process_webhook_queue, IntervalTrigger(seconds=10), lock_ttl=120),
+    # Hourly at XX:00; each church's local schedule is checked against UTC
+    ScheduledJob("status_automation", "Member Status Automation",
+                 run_status_automation, CronTrigger(minute=0), lock_ttl=600, takes_fire_time=True),
+    ScheduledJob("empty_trash_bin", "Empty Trash Bin (14 days)",
+                 empty_trash_bin, CronTrigger(hour=2, minute=0)),
+    ScheduledJob("cleanup_stale_calls", "Cleanup Stale Calls",
+                 cleanup_stale_calls, IntervalTrigger(seconds=30), lock_ttl=120),
+    ScheduledJob("generate_counseling_slots", "Generate Counseling Slots",
+                 generate_counseling_slots, CronTrigger(hour=2, minute=30), lock_ttl=1800),
+    ScheduledJob("generate_explore_content", "Autonomous Explore Content Generation",
+                 generate_explore_content, CronTrigger(hour=3, minute=0), lock_ttl=3600),
+    ScheduledJob("materialize_daily_feeds", "Materialize Daily Explore Feeds",
+                 materialize_daily_feeds, IntervalTrigger(minutes=5), lock_ttl=240),
+    ScheduledJob("generate_bible_studies", "Weekly Bible Study Generation",
+                 generate_bible_studies, CronTrigger(day_of_week='sun', hour=4, minute=0), lock_ttl=3600),
+    # Follow-ups are sent by the prayer follow-up dispatcher; this only re-queues strays
+    ScheduledJob("sweep_prayer_followups", "Prayer Follow-up Sweep (14-day check-ins)",
+                 sweep_prayer_followups, CronTrigger(minute=20), lock_ttl=600),
+    ScheduledJob("process_news_context_morning", "News Context Processing (Morning)",
+                 process_news_context, CronTrigger(hour=6, minute=30), lock_ttl=600),
+    ScheduledJob("process_news_context_afternoon", "News Context Processing (Afternoon)",
+                 process_news_context, CronTrigger(hour=14, minute=0), lock_ttl=600),
+    # Shortly after the UTC day (and week/month) rolls over
+    ScheduledJob("rebuild_overall_leaderboards", "Rebuild Overall Leaderboards",
+                 rebuild_overall_leaderboards, CronTrigger(hour=0, minute=5), lock_ttl=600),
+    ScheduledJob("process_scheduled_broadcasts", "Process Scheduled Broadcast Campaigns",
+                 process_scheduled_broadcasts, IntervalTrigger(seconds=60), lock_ttl=120),
+]
+
+JOBS_BY_ID: Dict[str, ScheduledJob] = {job.id: job for job in SCHEDULED_JOBS}
+
+# ARQ timeout for run_scheduled: the longest job may hold its lock this long
+SCHEDULED_JOB_TIMEOUT = max(job.lock_ttl for job in SCHEDULED_JOBS)
+
+
+# ==================== Runner ====================
+
+def _result_counts(result: Any) -> Tuple[int, int]:
+    """(processed, failed) from whatever a job returned."""
+    if isinstance(result, JobResult):
+        return result.processed, result.failed
+    if isinstance(result, bool) or result is None:
+        return 0, 0
+    if isinstance(result, int):
+        return result, 0
+    if isinstance(result, dict):
+        return int(result.get("processed", 0)), int(result.get("failed", 0))
+    return 0, 0
+
+
+async def run_scheduled_job(
+    db: AsyncIOMotorDatabase,
+    job_id: str,
+    runner: str = "embedded",
+    fire_time: Optional[datetime] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Run a registered job under its distributed lock and record the run.
+
+    ``fire_time`` is when the run was due (defaults to the start of the
+    current time slot, for runs started by the embedded scheduler).
+
+    Returns the ``scheduler_runs`` record, or None if another instance
+    holds the job's lock (that run is skipped, not recorded).
+    """
+    from scheduler import DistributedLock, INSTANCE_ID, get_lock_redis
+
+    job = JOBS_BY_ID.get(job_id)
+    if job is None:
+        raise ValueError(f"Unknown scheduled job: {job_id}")
+
+    lock = DistributedLock(await get_lock_redis(), job.id, ttl_seconds=job.lock_ttl)
+    if not await lock.acquire():
+        logger.debug(f"[Scheduler] Skipping {job.id} - already running on another instance")
+        return None
+
+    if fire_time is None:
+        fire_time = job.slot_start(job.slot(time.time()))
+
+    run: Dict[str, Any] = {
+        "id": str(uuid.uuid4()),
+        "job_id": job.id,
+        "job_name": job.name,
+        "runner": runner,
+        "instance": INSTANCE_ID,
+        "scheduled_for": fire_time,
+        "started_at": datetime.now(timezone.utc),
+        "error": None,
+    }
+    started = time.perf_counter()
+    try:
+        outcome = await (job.func(db, fire_time) if job.takes_fire_time else job.func(db))
+        processed, failed = _result_counts(outcome)
+        run.update(status="partial" if failed else "success", items_processed=processed, failures=failed)
+    except Exception as e:
+        logger.exception(f"[Scheduler] Job {job.id} failed: {e}")
+        run.update(status="failed", items_processed=0, failures=1, error=str(e)[:1000])
+    finally:
+        await lock.release()
+
+    run["finished_at"] = datetime.now(timezone.utc)
+    run["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+    try:
+        await db[RUNS_COLLECTION].insert_one(dict(run))
+    except Exception as e:
+        logger.warning(f"[Scheduler] Could not record run of {job.id}: {e}")
+    return run
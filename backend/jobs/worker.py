@@ -18,16 +18,23 @@ Jobs:
 - sync_external_data - External API syncs
 - cleanup_old_data - Data retention cleanup
 - ai_content_generation - AI-powered content
+- run_scheduled - periodic jobs dispatched by the scheduler process
+  (see scheduler.py / jobs/scheduled.py)
 """
 
 import os
 import asyncio
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, Optional
-from arq import create_pool, ArqRedis
+from arq import create_pool, ArqRedis, cron, func
 from arq.connections import RedisSettings
 
-# Redis configuration
+from jobs.scheduled import SCHEDULED_JOB_TIMEOUT
+
+QUEUE_NAME = "faithflow:jobs"
+
+# Redis configuration (REDIS_URL, as used by the API, takes precedence)
+REDIS_URL = os.getenv("REDIS_URL")
 REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
 REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
 REDIS_DB = int(os.getenv("REDIS_DB", "0"))
@@ -36,6 +43,8 @@ REDIS_PASSWORD = os.getenv("REDIS_PASSWORD", None)
 
 def get_redis_settings() -> RedisSettings:
     """Get Redis connection settings for ARQ."""
+    if REDIS_URL:
+        return RedisSettings.from_dsn(REDIS_URL)
     return RedisSettings(
         host=REDIS_HOST,
         port=REDIS_PORT,
@@ -211,10 +220,7 @@ async def cleanup_old_data(ctx: Dict[str, Any]):
     Scheduled job to clean up old data based on retention policies.
     Runs daily via cron.
     """
-    from database import get_db
-    from datetime import datetime, timedelta
-
-    db = await get_db()
+    db = ctx["db"]
 
     # Clean up deleted items older than 14 days (trash bin)
     cutoff_date = datetime.utcnow() - timedelta(days=14)
@@ -293,25 +299,68 @@ async def send_scheduled_notifications(ctx: Dict[str, Any]):
         return {"success": False, "error": str(e)}
 
 
+async def run_scheduled(ctx: Dict[str, Any], job_id: str, fire_time: Optional[float] = None):
+    """
+    Run a periodic job dispatched by the scheduler process.
+
+    Args:
+        ctx: ARQ context
+        job_id: Id of the job in jobs.scheduled.SCHEDULED_JOBS
+        fire_time: Epoch seconds the run was due at (set by the scheduler)
+    """
+    from jobs.scheduled import run_scheduled_job
+
+    due = datetime.fromtimestamp(fire_time, timezone.utc) if fire_time is not None else None
+    run = await run_scheduled_job(ctx["db"], job_id, runner="worker", fire_time=due)
+    if run is None:
+        return {"job_id": job_id, "status": "skipped"}
+    return {k: run[k] for k in ("job_id", "status", "duration_ms", "items_processed", "failures")}
+
+
 # ============================================================================
 # Worker Startup/Shutdown
 # ============================================================================
 
 async def startup(ctx: Dict[str, Any]):
     """Worker startup - initialize connections."""
-    from database import connect_to_mongodb
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from utils.query_profiler import PROFILER_ENABLED, query_profiler
+
+    # Connect to MongoDB (job queries are profiled too, attributed to "(background)")
+    ctx["mongo_client"] = AsyncIOMotorClient(
+        os.environ["MONGO_URL"],
+        maxPoolSize=20,
+        event_listeners=[query_profiler] if PROFILER_ENABLED else [],
+    )
+    ctx["db"] = ctx["mongo_client"][os.environ["DB_NAME"]]
+
+    # Jobs use the shared Redis client for caches, counters and locks
+    if os.environ.get("REDIS_ENABLED", "true").lower() == "true":
+        from config.redis import init_redis
+        try:
+            await init_redis()
+        except Exception as e:
+            print(f"ARQ Worker: Redis unavailable for job caches ({e})")
+
+    query_profiler.start(ctx["mongo_client"])
 
-    # Connect to MongoDB
-    await connect_to_mongodb()
+    # Send prayer follow-ups as they fall due (API processes do this in embedded mode)
+    from services.explore.prayer_followup_dispatcher import prayer_followup_dispatcher
+    await prayer_followup_dispatcher.start(ctx["db"])
 
     print("ARQ Worker started successfully")
 
 
 async def shutdown(ctx: Dict[str, Any]):
     """Worker shutdown - cleanup."""
-    from database import close_mongodb_connection
-
-    await close_mongodb_connection()
+    from config.redis import close_redis
+    from services.explore.prayer_followup_dispatcher import prayer_followup_dispatcher
+    from utils.query_profiler import query_profiler
+
+    await prayer_followup_dispatcher.stop()
+    await query_profiler.stop()
+    await close_redis()
+    ctx["mongo_client"].close()
     print("ARQ Worker shutdown complete")
 
 
@@ -334,21 +383,16 @@ class WorkerSettings:
         cleanup_old_data,
         sync_external_giving,
         send_scheduled_notifications,
+        # Periodic jobs run longer than job_timeout (Explore generation: 1h)
+        func(run_scheduled, timeout=SCHEDULED_JOB_TIMEOUT),
     ]
 
     # Cron jobs (scheduled tasks)
     cron_jobs = [
         # Clean up old data daily at 2 AM
-        {
-            "coroutine": cleanup_old_data,
-            "hour": 2,
-            "minute": 0,
-        },
+        cron(cleanup_old_data, hour=2, minute=0),
         # Process scheduled notifications every 5 minutes
-        {
-            "coroutine": send_scheduled_notifications,
-            "minute": {0, 5, 10, 15, 20, 25, 30, 35, 40, 45, 50, 55},
-        },
+        cron(send_scheduled_notifications, minute={0, 5, 10, 15, 20, 25, 30, 35, 40, 45, 50, 55}),
     ]
 
     # Lifecycle hooks
@@ -359,7 +403,7 @@ class WorkerSettings:
     max_jobs = 10  # Max concurrent jobs
     job_timeout = 600  # 10 minute timeout
     keep_result = 3600  # Keep results for 1 hour
-    queue_name = "faithflow:jobs"
+    queue_name = QUEUE_NAME
 
 
 # ============================================================================
@@ -373,17 +417,25 @@ async def get_job_pool() -> ArqRedis:
     """Get or create ARQ Redis pool for enqueueing jobs."""
     global _redis_pool
     if _redis_pool is None:
-        _redis_pool = await create_pool(get_redis_settings())
+        _redis_pool = await create_pool(get_redis_settings(), default_queue_name=QUEUE_NAME)
     return _redis_pool
 
 
+async def close_job_pool() -> None:
+    """Close the enqueueing pool (process shutdown)."""
+    global _redis_pool
+    if _redis_pool is not None:
+        await _redis_pool.close()
+        _redis_pool = None
+
+
 async def enqueue_job(
     func_name: str,
     *args,
     _defer_by: Optional[timedelta] = None,
     _defer_until: Optional[datetime] = None,
     **kwargs
-) -> str:
+) -> Optional[str]:
     """
     Enqueue a background job.
 
@@ -395,7 +447,7 @@ async def enqueue_job(
         **kwargs: Keyword arguments for the job
 
     Returns:
-        Job ID
+        Job ID (None if a job with the same ``_job_id`` is already queued)
     """
     pool = await get_job_pool()
     job = await pool.enqueue_job(
@@ -405,7 +457,7 @@ async def enqueue_job(
         _defer_until=_defer_until,
         **kwargs
     )
-    return job.job_id
+    return job.job_id if job else None
 
 
 async def get_job_status(job_id: str) -> Dict[str, Any]:
@@ -0,0 +1,66 @@
+"""
+Selective GZip Middleware
+
+Starlette's GZipMiddleware compresses every response over minimum_size.
+For Server-Sent Events that means events sit in the gzip buffer instead
+of reaching the client, and for images/video/archives it burns CPU on
+bytes that don't shrink. This variant passes those responses through
+untouched and gzips everything else exactly as before.
+"""
+
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
+from starlette.types import Message, Receive, Scope, Send
+
+# Content types sent as-is (streaming, or already compressed)
+UNCOMPRESSIBLE_PREFIXES = (
+    "text/event-stream",
+    "image/",
+    "video/",
+    "audio/",
+    "font/woff",
+    "application/zip",
+    "application/gzip",
+    "application/x-gzip",
+    "application/pdf",
+    "application/octet-stream",
+    "application/vnd.openxmlformats",
+)
+
+
+def is_compressible(content_type: str) -> bool:
+    """Whether a response of this content type is worth gzipping."""
+    content_type = content_type.lower()
+    if content_type.startswith("image/svg"):
+        return True
+    return not content_type.startswith(UNCOMPRESSIBLE_PREFIXES)
+
+
+class SelectiveGZipResponder(GZipResponder):
+    """GZipResponder that passes SSE and already-compressed media through."""
+
+    passthrough = False
+
+    async def send_with_gzip(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            self.passthrough = not is_compressible(headers.get("content-type", ""))
+        if self.passthrough:
+            await self.send(message)
+            return
+        await super().send_with_gzip(message)
+
+
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that skips SSE and already-compressed media."""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            headers = Headers(scope=scope)
+            if "gzip" in headers.get("Accept-Encoding", ""):
+                responder = SelectiveGZipResponder(
+                    self.app, self.minimum_size, compresslevel=self.compresslevel
+                )
+                await responder(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
@@ -17,10 +17,11 @@ Security features:
 """
 
 import time
-from typing import Optional, Dict, Callable, Tuple
+from typing import Optional, Dict, Tuple
 from fastapi import Request, HTTPException, status
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
 from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import asyncio
 import logging
 from collections import defaultdict
@@ -195,14 +196,14 @@ def get_rate_limit_config(path: str) -> Tuple[int, int]:
     return RATE_LIMITS["_default"]
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Rate limiting middleware for FastAPI."""
+class RateLimitMiddleware:
+    """Rate limiting middleware (pure ASGI - no per-request task or body re-streaming)."""
 
     # Class-level limiter instance for late binding
     _shared_limiter: Optional['InMemoryRateLimiter'] = None
 
-    def __init__(self, app, redis_client=None):
-        super().__init__(app)
+    def __init__(self, app: ASGIApp, redis_client=None):
+        self.app = app
         # Use shared limiter if already initialized, otherwise create new one
         if RateLimitMiddleware._shared_limiter is None:
             if redis_client:
@@ -211,7 +212,11 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             else:
                 RateLimitMiddleware._shared_limiter = InMemoryRateLimiter()
                 logger.info("Rate limiter initialized with in-memory backend")
-        self.limiter = RateLimitMiddleware._shared_limiter
+
+    @property
+    def limiter(self):
+        # Read through the class so upgrade_to_redis() takes effect immediately
+        return RateLimitMiddleware._shared_limiter
 
     @classmethod
     def upgrade_to_redis(cls, redis_client):
@@ -220,14 +225,20 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             cls._shared_limiter = RedisRateLimiter(redis_client)
             logger.info("Rate limiter upgraded to Redis backend")
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        path = request.url.path
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
 
         # Skip rate limiting for certain paths
         if any(path.startswith(skip) for skip in SKIP_PATHS):
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
 
         # Get rate limit config
+        request = Request(scope)
         limit, window = get_rate_limit_config(path)
         key = get_rate_limit_key(request)
 
@@ -244,7 +255,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             except ImportError:
                 pass
 
-            return Response(
+            response = Response(
                 content='{"detail": "Rate limit exceeded. Please try again later."}',
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                 headers={
@@ -255,16 +266,18 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                     "X-RateLimit-Reset": str(int(time.time()) + retry_after),
                 }
             )
-
-        # Process request
-        response = await call_next(request)
-
-        # Add rate limit headers
-        response.headers["X-RateLimit-Limit"] = str(limit)
-        response.headers["X-RateLimit-Remaining"] = str(remaining)
-        response.headers["X-RateLimit-Reset"] = str(int(time.time()) + window)
-
-        return response
+            await response(scope, receive, send)
+            return
+
+        async def send_with_rate_limit_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["X-RateLimit-Limit"] = str(limit)
+                headers["X-RateLimit-Remaining"] = str(remaining)
+                headers["X-RateLimit-Reset"] = str(int(time.time()) + window)
+            await send(message)
+
+        await self.app(scope, receive, send_with_rate_limit_headers)
 
 
 def setup_rate_limiting(app, redis_client=None):
@@ -0,0 +1,231 @@
+"""
+Request Context Middleware for FaithFlow
+
+Pure ASGI middleware that sets up per-request context once, instead of
+a stack of ``@app.middleware("http")`` / BaseHTTPMiddleware layers (each
+of which wraps the request in its own task and re-streams the body,
+and which broke SSE responses).
+
+Per request it:
+- assigns a request id (incoming ``X-Request-ID`` if sane, else a new one)
+  and echoes it in the response
+- opens a RequestContext in a contextvar; get_current_user fills in the
+  tenant (church_id) and user id once authentication has run
+- adds X-Process-Time and logs slow requests
+- traces where the time went (middleware/tracing.py): optional
+  Server-Timing header, per-route histograms and latency budgets
+- adds the OWASP security headers and Cache-Control policy that used to
+  live in server.py
+"""
+
+import logging
+import re
+import time
+import uuid
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+if TYPE_CHECKING:
+    from middleware.tracing import Trace
+
+logger = logging.getLogger(__name__)
+
+SLOW_REQUEST_SECONDS = 2.0
+
+_REQUEST_ID_RE = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+@dataclass
+class RequestContext:
+    """Context of the request being handled."""
+
+    request_id: str
+    method: str
+    path: str
+    started: float
+    church_id: Optional[str] = None
+    user_id: Optional[str] = None
+    scope: Optional[Scope] = field(default=None, repr=False)
+    trace: Optional["Trace"] = field(default=None, repr=False)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def handler(self) -> str:
+        """Route handler serving the request ("module.function"), or the path before routing."""
+        endpoint = (self.scope or {}).get("endpoint")
+        if endpoint is None:
+            return self.path
+        return f"{endpoint.__module__}.{endpoint.__qualname__}"
+
+
+_request_context: ContextVar[Optional[RequestContext]] = ContextVar("request_context", default=None)
+
+
+def get_request_context() -> Optional[RequestContext]:
+    """Context of the current request (None outside a request)."""
+    return _request_context.get()
+
+
+def set_request_tenant(church_id: Optional[str], user_id: Optional[str] = None) -> None:
+    """Record the authenticated tenant/user on the current request context."""
+    ctx = _request_context.get()
+    if ctx is not None:
+        ctx.church_id = church_id
+        ctx.user_id = user_id
+
+
+def open_request_context(scope: Scope) -> RequestContext:
+    """Create the context for an HTTP scope (request id from header or new)."""
+    incoming = Headers(scope=scope).get("x-request-id", "")
+    request_id = incoming if _REQUEST_ID_RE.match(incoming) else uuid.uuid4().hex
+    ctx = RequestContext(
+        request_id=request_id,
+        method=scope.get("method", ""),
+        path=scope.get("path", ""),
+        started=time.perf_counter(),
+        scope=scope,
+    )
+    scope.setdefault("state", {})["request_id"] = request_id
+    return ctx
+
+
+# ==================== Response header policy ====================
+
+STATIC_PATHS = (
+    "/settings/church",
+    "/settings/member-statuses",
+    "/settings/demographics",
+    "/categories",
+    "/bible",
+    "/explore/categories",
+)
+
+USER_PATHS = (
+    "/members",
+    "/events",
+    "/groups",
+    "/communities",
+    "/donations",
+    "/giving",
+)
+
+REALTIME_PATHS = (
+    "/notifications",
+    "/messages",
+    "/call",
+)
+
+
+def apply_security_headers(scope: Scope, request_headers: Headers, headers: MutableHeaders) -> None:
+    """Add security headers to a response (OWASP best practices)."""
+    path = scope.get("path", "")
+
+    headers["X-Content-Type-Options"] = "nosniff"
+    headers["X-Frame-Options"] = "SAMEORIGIN"
+    headers["X-XSS-Protection"] = "1; mode=block"
+    headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+    headers["Permissions-Policy"] = "camera=self, microphone=self, geolocation=()"
+
+    # HSTS only for HTTPS requests or when behind a TLS-terminating proxy
+    if scope.get("scheme") == "https" or request_headers.get("x-forwarded-proto") == "https":
+        headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains; preload"
+
+    # Prevent caching of sensitive responses
+    if "/auth/" in path or "/login" in path:
+        headers["Cache-Control"] = "no-store, no-cache, must-revalidate, private"
+        headers["Pragma"] = "no-cache"
+
+    # Relaxed CSP for HTML only (frontend handles strict CSP; JSON APIs unaffected)
+    if "text/html" in headers.get("content-type", ""):
+        headers["Content-Security-Policy"] = "default-src 'self'; script-src 'self' 'unsafe-inline'; style-src 'self' 'unsafe-inline'"
+
+
+def apply_cache_control(method: str, path: str, headers: MutableHeaders) -> None:
+    """
+    Add Cache-Control to API responses.
+
+    - Mutations: no-store
+    - Static/semi-static GETs (settings, categories, bible): public, 1 hour
+    - User data GETs (members, events, ...): private, 5 minutes
+    - Real-time GETs (notifications, messages, calls): private, 30 seconds
+    - Health: no-cache
+    - Anything else keeps a route-set value, or private, 60 seconds
+    """
+    if not path.startswith("/api") and not path.startswith("/public"):
+        return
+
+    if method in ("POST", "PATCH", "PUT", "DELETE"):
+        headers["Cache-Control"] = "no-store, no-cache, must-revalidate"
+        return
+    if method != "GET":
+        return
+
+    if any(p in path for p in STATIC_PATHS):
+        headers["Cache-Control"] = "public, max-age=3600, stale-while-revalidate=86400"
+    elif any(p in path for p in USER_PATHS):
+        headers["Cache-Control"] = "private, max-age=300, stale-while-revalidate=600"
+    elif any(p in path for p in REALTIME_PATHS):
+        headers["Cache-Control"] = "private, max-age=30"
+    elif "/health" in path:
+        headers["Cache-Control"] = "no-cache"
+    else:
+        # Unless the route set its own (e.g. ETag-validated responses)
+        headers.setdefault("Cache-Control", "private, max-age=60")
+
+
+class RequestContextMiddleware:
+    """Pure ASGI middleware: request id, tenant context, timing and response headers."""
+
+    def __init__(self, app: ASGIApp, slow_request_seconds: float = SLOW_REQUEST_SECONDS):
+        # middleware.tracing imports this module, so bind it here
+        from middleware import tracing
+
+        self.app = app
+        self.slow_request_seconds = slow_request_seconds
+        self.tracing = tracing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        ctx = open_request_context(scope)
+        self.tracing.start_trace(ctx)
+        request_headers = Headers(scope=scope)
+        response: dict = {}
+
+        async def send_with_context(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["X-Request-ID"] = ctx.request_id
+                headers["X-Process-Time"] = f"{ctx.elapsed:.4f}"
+                if ctx.trace is not None and self.tracing.SERVER_TIMING_ENABLED:
+                    headers["Server-Timing"] = ctx.trace.server_timing(time.perf_counter())
+                apply_security_headers(scope, request_headers, headers)
+                apply_cache_control(ctx.method, ctx.path, headers)
+                response["status"] = message["status"]
+                response["streaming"] = headers.get("content-type", "").startswith("text/event-stream")
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                # SSE streams stay open by design; keep them out of the route histograms
+                if ctx.trace is not None and not response.get("streaming"):
+                    self.tracing.route_latency.finish(ctx, response.get("status", 200))
+                elapsed = ctx.elapsed
+                if elapsed > self.slow_request_seconds:
+                    logger.warning(
+                        f"Slow request: {ctx.method} {ctx.path} took {elapsed:.2f}s "
+                        f"(request_id={ctx.request_id}, church_id={ctx.church_id})"
+                    )
+            await send(message)
+
+        token = _request_context.set(ctx)
+        try:
+            await self.app(scope, receive, send_with_context)
+        finally:
+            _request_context.reset(token)
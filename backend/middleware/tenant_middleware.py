@@ -1,38 +1,35 @@
 from fastapi import Request, HTTPException, status
-from starlette.middleware.base import BaseHTTPMiddleware
-from typing import Callable
+from starlette.types import ASGIApp, Receive, Scope, Send
 import logging
 
+from .request_context import _request_context, get_request_context, open_request_context
+
 logger = logging.getLogger(__name__)
 
 
-class TenantMiddleware(BaseHTTPMiddleware):
+class TenantMiddleware:
     """
-    Middleware to automatically inject church_id into request state
-    from JWT token for multi-tenant isolation.
+    Pure ASGI middleware that opens a per-request tenant context.
+
+    church_id is filled in from the JWT by the get_current_user dependency
+    (set_request_tenant) and read back with get_church_id_from_request.
+    RequestContextMiddleware does the same plus request id, timing and
+    response headers; use this one only when that isn't installed.
     """
-    
-    async def dispatch(self, request: Request, call_next: Callable):
-        # Skip middleware for public endpoints
-        public_paths = [
-            "/api/auth/login",
-            "/api/auth/register",
-            "/api/health",
-            "/api/",
-            "/docs",
-            "/openapi.json",
-            "/redoc"
-        ]
-        
-        if request.url.path in public_paths or request.url.path.startswith("/docs") or request.url.path.startswith("/openapi"):
-            return await call_next(request)
-        
-        # For authenticated endpoints, church_id will be extracted from JWT
-        # and added to request.state by the get_current_user dependency
-        # This middleware just ensures the pattern is followed
-        
-        response = await call_next(request)
-        return response
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or get_request_context() is not None:
+            await self.app(scope, receive, send)
+            return
+
+        token = _request_context.set(open_request_context(scope))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_context.reset(token)
 
 
 def get_church_id_from_request(request: Request) -> str:
@@ -40,6 +37,9 @@ def get_church_id_from_request(request: Request) -> str:
     Extract church_id from request state (set by authentication)
     """
     church_id = getattr(request.state, 'church_id', None)
+    if not church_id:
+        ctx = get_request_context()
+        church_id = ctx.church_id if ctx else None
     if not church_id:
         # Fallback: Try to get from user if available
         user = getattr(request.state, 'user', None)
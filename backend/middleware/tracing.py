@@ -0,0 +1,425 @@
+"""
+Request Tracing for FaithFlow
+
+Per-request spans showing where a request's time goes, cheap enough to
+leave on in production. They are created automatically for:
+
+- MongoDB commands (MongoSpanListener, a pymongo CommandListener)
+- Redis commands and pipelines (config/redis.py builds a TracedRedis)
+- outbound HTTP through httpx (install_http_tracing)
+- executor hops: ``asyncio.to_thread`` / ``run_in_executor(None, ...)``
+  (TracingExecutor as the loop's default executor)
+
+and by hand with ``with span("cpu", "match faces"):``. Whatever isn't in
+a span (CPU, un-instrumented awaits) is reported as ``app``.
+
+The trace lives on the RequestContext (middleware/request_context.py).
+When the response finishes it is folded into per-route histograms
+(served by routes/route_latency.py) and dropped; only requests over
+their route's latency budget keep their span tree, which is logged.
+Spans recorded per request are capped at MAX_SPANS, so a handler looping
+over thousands of queries still costs a bounded amount.
+
+Budgets: ``@latency_budget(300)`` on a route function, overridden by
+``ROUTE_LATENCY_BUDGETS="routes.kiosk.face_checkin=800,..."``, else
+ROUTE_LATENCY_BUDGET_MS (default 1000).
+
+Settings: TRACING_ENABLED (default true); SERVER_TIMING_ENABLED (default
+false) adds a ``Server-Timing`` header to every response.
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from pymongo import monitoring
+from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
+
+from middleware.request_context import RequestContext, get_request_context
+from utils.query_profiler import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "true").lower() == "true"
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "false").lower() == "true"
+DEFAULT_BUDGET_MS = float(os.getenv("ROUTE_LATENCY_BUDGET_MS", "1000"))
+
+MAX_SPANS = 128
+MAX_ROUTES = 1000
+UNROUTED = "(unrouted)"
+OVER_BUDGET_SAMPLES = 50
+OVER_BUDGET_LOG_INTERVAL = 60.0  # seconds between span-tree logs per route
+
+# (kind, name, start offset s, duration s, depth)
+Span = Tuple[str, str, float, float, int]
+
+
+def _parse_budgets(raw: str) -> Dict[str, float]:
+    budgets = {}
+    for item in raw.split(","):
+        handler, _, ms = item.strip().partition("=")
+        if handler and ms:
+            try:
+                budgets[handler.strip()] = float(ms)
+            except ValueError:
+                logger.warning(f"Ignoring invalid latency budget: {item!r}")
+    return budgets
+
+
+ROUTE_BUDGETS = _parse_budgets(os.getenv("ROUTE_LATENCY_BUDGETS", ""))
+
+
+def latency_budget(ms: float) -> Callable:
+    """Set a route's latency budget (ROUTE_LATENCY_BUDGETS overrides it)."""
+    def decorator(func: Callable) -> Callable:
+        func.__latency_budget_ms__ = ms
+        return func
+    return decorator
+
+
+# ==================== Traces ====================
+
+class Trace:
+    """Spans of one request. Appended from the loop and Motor's executor threads."""
+
+    __slots__ = ("started", "spans", "totals", "dropped", "depth")
+
+    def __init__(self, started: float):
+        self.started = started
+        self.spans: List[Span] = []
+        self.totals: Dict[str, List[float]] = {}  # kind -> [seconds, count]
+        self.dropped = 0
+        self.depth = 0
+
+    def add(self, kind: str, name: str, start: float, duration: float, depth: Optional[int] = None) -> None:
+        total = self.totals.get(kind)
+        if total is None:
+            self.totals[kind] = [duration, 1]
+        else:
+            total[0] += duration
+            total[1] += 1
+        if len(self.spans) < MAX_SPANS:
+            self.spans.append((kind, name, start - self.started, duration, self.depth if depth is None else depth))
+        else:
+            self.dropped += 1
+
+    def busy(self, end: float) -> float:
+        """Wall time covered by top-level spans (overlapping spans counted once)."""
+        intervals = sorted((s[2], s[2] + s[3]) for s in self.spans if s[4] == 0)
+        covered, cursor = 0.0, 0.0
+        for lo, hi in intervals:
+            lo = max(lo, cursor)
+            if hi > lo:
+                covered += hi - lo
+                cursor = hi
+        return min(covered, end - self.started)
+
+    def breakdown(self, end: float) -> Dict[str, float]:
+        """Seconds per span kind, plus ``app`` (time outside any span)."""
+        result = {kind: total[0] for kind, total in self.totals.items()}
+        result["app"] = max(0.0, (end - self.started) - self.busy(end))
+        return result
+
+    def server_timing(self, end: float) -> str:
+        parts = [
+            f'{kind};dur={total[0] * 1000:.1f};desc="{int(total[1])}"'
+            for kind, total in self.totals.items()
+        ]
+        parts.append(f"app;dur={self.breakdown(end)['app'] * 1000:.1f}")
+        parts.append(f"total;dur={(end - self.started) * 1000:.1f}")
+        return ", ".join(parts)
+
+    def tree(self) -> List[str]:
+        lines = [
+            f"{'  ' * (depth + 1)}+{offset * 1000:7.1f}ms {duration * 1000:7.1f}ms {kind} {name}"
+            for kind, name, offset, duration, depth in sorted(self.spans, key=lambda s: s[2])
+        ]
+        if self.dropped:
+            lines.append(f"  ... {self.dropped} more spans")
+        return lines
+
+
+def current_trace() -> Optional[Trace]:
+    ctx = get_request_context()
+    return ctx.trace if ctx is not None else None
+
+
+class span:
+    """Time a block (sync or async) as a span of the current request; nested spans indent."""
+
+    __slots__ = ("kind", "name", "trace", "start")
+
+    def __init__(self, kind: str, name: str = ""):
+        self.kind = kind
+        self.name = name
+
+    def __enter__(self) -> "span":
+        self.trace = current_trace()
+        if self.trace is not None:
+            self.start = time.perf_counter()
+            self.trace.depth += 1
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        if self.trace is not None:
+            self.trace.depth -= 1
+            self.trace.add(self.kind, self.name, self.start, time.perf_counter() - self.start)
+
+    async def __aenter__(self) -> "span":
+        return self.__enter__()
+
+    async def __aexit__(self, *exc: Any) -> None:
+        self.__exit__(*exc)
+
+
+# ==================== Instrumentation ====================
+
+class MongoSpanListener(monitoring.CommandListener):
+    """Records each MongoDB command of a traced request as a ``mongo`` span."""
+
+    def __init__(self):
+        self._names: Dict[Tuple[Any, int], str] = {}
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        if current_trace() is not None:
+            target = event.command.get(event.command_name)
+            name = f"{event.command_name} {target}" if isinstance(target, str) else event.command_name
+            self._names[(event.connection_id, event.request_id)] = name
+
+    def _finish(self, event: Any) -> None:
+        name = self._names.pop((event.connection_id, event.request_id), None)
+        trace = current_trace()
+        if name is not None and trace is not None:
+            duration = event.duration_micros / 1_000_000
+            trace.add("mongo", name, time.perf_counter() - duration, duration)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._finish(event)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self._finish(event)
+
+
+mongo_span_listener = MongoSpanListener()
+
+
+class TracedPipeline(Pipeline):
+    """Pipeline recording each ``execute()`` as one ``redis`` span."""
+
+    async def execute(self, raise_on_error: bool = True) -> List[Any]:
+        trace = current_trace()
+        if trace is None:
+            return await super().execute(raise_on_error)
+        name = f"pipeline({len(self.command_stack)})"
+        start = time.perf_counter()
+        try:
+            return await super().execute(raise_on_error)
+        finally:
+            trace.add("redis", name, start, time.perf_counter() - start)
+
+
+class TracedRedis(Redis):
+    """Redis client recording each command of a traced request as a ``redis`` span."""
+
+    async def execute_command(self, *args: Any, **options: Any) -> Any:
+        trace = current_trace()
+        if trace is None:
+            return await super().execute_command(*args, **options)
+        start = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            trace.add("redis", str(args[0]), start, time.perf_counter() - start)
+
+    def pipeline(self, transaction: bool = True, shard_hint: Optional[str] = None) -> Pipeline:
+        return TracedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+
+def _callable_name(fn: Any) -> str:
+    while isinstance(fn, functools.partial):
+        # asyncio.to_thread submits partial(context.run, func, ...)
+        fn = fn.args[0] if fn.func.__name__ == "run" and fn.args else fn.func
+    return getattr(fn, "__qualname__", None) or repr(fn)
+
+
+class TracingExecutor(ThreadPoolExecutor):
+    """Default executor recording each submission (queue wait + run) as an ``executor`` span."""
+
+    def submit(self, fn, /, *args, **kwargs):
+        trace = current_trace()
+        future = super().submit(fn, *args, **kwargs)
+        if trace is not None:
+            start = time.perf_counter()
+            name = _callable_name(fn)
+            depth = trace.depth
+            future.add_done_callback(
+                lambda _: trace.add("executor", name, start, time.perf_counter() - start, depth)
+            )
+        return future
+
+
+def install_executor_tracing(loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+    """Make the running loop's default executor a TracingExecutor."""
+    if not TRACING_ENABLED:
+        return
+    loop = loop or asyncio.get_running_loop()
+    loop.set_default_executor(TracingExecutor(thread_name_prefix="traced"))
+
+
+def install_http_tracing() -> None:
+    """Record httpx requests (until response headers) as ``http`` spans, for every AsyncClient."""
+    if not TRACING_ENABLED:
+        return
+    try:
+        import httpx
+    except ImportError:
+        return
+
+    transport = httpx.AsyncHTTPTransport
+    if getattr(transport.handle_async_request, "__traced__", False):
+        return
+    original = transport.handle_async_request
+
+    @functools.wraps(original)
+    async def handle_async_request(self, request):
+        trace = current_trace()
+        if trace is None:
+            return await original(self, request)
+        start = time.perf_counter()
+        try:
+            return await original(self, request)
+        finally:
+            trace.add("http", f"{request.method} {request.url.host}", start, time.perf_counter() - start)
+
+    handle_async_request.__traced__ = True
+    transport.handle_async_request = handle_async_request
+
+
+# ==================== Per-route aggregation ====================
+
+class _RouteStats:
+    __slots__ = ("histogram", "kind_seconds", "errors", "over_budget")
+
+    def __init__(self):
+        self.histogram = LatencyHistogram()
+        self.kind_seconds: Dict[str, float] = {}
+        self.errors = 0
+        self.over_budget = 0
+
+
+class RouteLatency:
+    """Per-route latency histograms, time breakdown and budget violations (this process)."""
+
+    def __init__(self):
+        self._routes: Dict[str, _RouteStats] = {}
+        self._budgets: Dict[str, float] = {}
+        self._last_logged: Dict[str, float] = {}
+        self.over_budget_samples: Deque[Dict[str, Any]] = deque(maxlen=OVER_BUDGET_SAMPLES)
+
+    def budget_ms(self, handler: str, endpoint: Any = None) -> float:
+        budget = self._budgets.get(handler)
+        if budget is None:
+            budget = ROUTE_BUDGETS.get(handler) or getattr(endpoint, "__latency_budget_ms__", None) or DEFAULT_BUDGET_MS
+            self._budgets[handler] = budget
+        return budget
+
+    def finish(self, ctx: RequestContext, status: int) -> None:
+        """Fold a finished request's trace into its route's stats."""
+        trace = ctx.trace
+        if trace is None:
+            return
+        end = time.perf_counter()
+        endpoint = (ctx.scope or {}).get("endpoint")
+        handler = ctx.handler if endpoint is not None else UNROUTED
+        route = f"{ctx.method} {handler}"
+
+        stats = self._routes.get(route)
+        if stats is None:
+            if len(self._routes) >= MAX_ROUTES:
+                return
+            stats = self._routes[route] = _RouteStats()
+
+        elapsed = end - trace.started
+        stats.histogram.record(int(elapsed * 1_000_000))
+        breakdown = trace.breakdown(end)
+        for kind, seconds in breakdown.items():
+            stats.kind_seconds[kind] = stats.kind_seconds.get(kind, 0.0) + seconds
+        if status >= 500:
+            stats.errors += 1
+
+        budget = self.budget_ms(handler, endpoint)
+        if elapsed * 1000 <= budget:
+            return
+        stats.over_budget += 1
+        self.over_budget_samples.appendleft({
+            "route": route,
+            "request_id": ctx.request_id,
+            "church_id": ctx.church_id,
+            "status": status,
+            "duration_ms": round(elapsed * 1000, 1),
+            "budget_ms": budget,
+            "breakdown_ms": {k: round(v * 1000, 1) for k, v in breakdown.items()},
+            "spans": [
+                {"kind": k, "name": n, "offset_ms": round(o * 1000, 1), "duration_ms": round(d * 1000, 1), "depth": dp}
+                for k, n, o, d, dp in trace.spans
+            ],
+            "at": time.time(),
+        })
+        if end - self._last_logged.get(route, 0.0) >= OVER_BUDGET_LOG_INTERVAL:
+            self._last_logged[route] = end
+            summary = ", ".join(f"{k} {v * 1000:.0f}ms" for k, v in breakdown.items())
+            logger.warning("\n".join([
+                f"Over budget: {route} took {elapsed * 1000:.0f}ms (budget {budget:.0f}ms; {summary}; "
+                f"request_id={ctx.request_id})",
+                *trace.tree(),
+            ]))
+
+    def report(self, sort: str = "p95", limit: int = 20) -> Dict[str, Any]:
+        """Routes ranked by ``sort`` (p50/p95/p99/max/total/count/over_budget)."""
+        rows = []
+        for route, stats in list(self._routes.items()):
+            hist = stats.histogram
+            if not hist.count:
+                continue
+            handler = route.partition(" ")[2]
+            row = {
+                "route": route,
+                **hist.summary(),
+                "budget_ms": self.budget_ms(handler) if handler != UNROUTED else None,
+                "over_budget": stats.over_budget,
+                "errors": stats.errors,
+                "mean_breakdown_ms": {
+                    kind: round(seconds / hist.count * 1000, 2) for kind, seconds in stats.kind_seconds.items()
+                },
+            }
+            rows.append(row)
+        key = {"total": "total_ms", "count": "count", "over_budget": "over_budget"}.get(sort, f"{sort}_ms")
+        rows.sort(key=lambda r: r.get(key) or 0, reverse=True)
+        return {
+            "routes": rows[:limit],
+            "total_routes": len(rows),
+            "over_budget_samples": list(self.over_budget_samples),
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": TRACING_ENABLED,
+            "server_timing": SERVER_TIMING_ENABLED,
+            "routes": len(self._routes),
+            "requests": sum(s.histogram.count for s in self._routes.values()),
+            "over_budget": sum(s.over_budget for s in self._routes.values()),
+        }
+
+
+route_latency = RouteLatency()
+
+
+def start_trace(ctx: RequestContext) -> None:
+    if TRACING_ENABLED:
+        ctx.trace = Trace(ctx.started)
@@ -146,12 +146,15 @@ class CommunityMessage(BaseModel):
         description="Reactions: emoji -> [member_ids]"
     )
 
-    # Read receipts (only stored for small communities, otherwise use presence service)
+    # Channel sequence number (read watermarks and unread counts are based on it)
+    seq: Optional[int] = Field(None, description="Per-channel sequence number")
+
+    # Read receipts (legacy; read state is now tracked with per-channel watermarks)
     read_by: List[ReadReceipt] = Field(
         default_factory=list,
         description="Read receipts (limited to first 50)"
     )
-    read_count: int = Field(0, description="Total read count")
+    read_count: int = Field(0, description="Members whose read watermark is at or past this message")
 
     # Edit/Delete status
     is_edited: bool = Field(False, description="Has message been edited?")
@@ -257,6 +257,7 @@ class ChurchExploreSettings(BaseModel):
     # AI Content Generation Settings
     auto_publish_ai_content: bool = True  # If True, AI content publishes immediately; if False, goes to review queue
     theological_traditions: List[str] = ["evangelical"]  # Multiple traditions = content on common ground only without explicit mention
+    ai_generation_cache_enabled: bool = True  # If False, never reuse or contribute to the shared cross-church generation cache
 
     # Feature toggles
     features: Dict[str, FeatureConfiguration] = {
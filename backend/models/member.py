@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field, ConfigDict, EmailStr, field_validator
 from typing import Optional, Literal, List, Dict, Any
 from datetime import datetime, date, timezone
+import msgspec
 import uuid
 
 
@@ -134,3 +135,65 @@ class Member(MemberBase):
     church_id: str
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class MemberListItem(msgspec.Struct):
+    """
+    msgspec twin of ``Member`` for the streamed member list.
+
+    Same fields, order and defaults as ``Member`` so the JSON matches what
+    response_model=List[Member] produced, without per-row Pydantic
+    validation. Stored ISO strings decode to datetime/date like before.
+    """
+    full_name: str
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    email: Optional[str] = None
+    phone_whatsapp: Optional[str] = None
+    date_of_birth: Optional[date] = None
+    gender: Optional[str] = None
+    address: Optional[str] = None
+    city: Optional[str] = None
+    state: Optional[str] = None
+    country: Optional[str] = None
+    marital_status: Optional[str] = None
+    occupation: Optional[str] = None
+    baptism_date: Optional[date] = None
+    membership_date: Optional[date] = None
+    is_active: bool = True
+    is_deleted: bool = False
+    deleted_at: Optional[datetime] = None
+    deleted_by: Optional[str] = None
+    household_id: Optional[str] = None
+    notes: Optional[str] = None
+    demographic_category: Optional[str] = None
+    member_status: Optional[str] = None
+    current_status_id: Optional[str] = None
+    participate_in_automation: bool = True
+    blood_type: Optional[str] = None
+    photo_filename: Optional[str] = None
+    photo_base64: Optional[str] = None
+    photo_url: Optional[str] = None
+    photo_thumbnail_url: Optional[str] = None
+    photo_fid: Optional[str] = None
+    photo_path: Optional[str] = None
+    personal_document: Optional[str] = None
+    personal_document_base64: Optional[str] = None
+    documents: List[Dict[str, Any]] = []
+    custom_fields: Dict[str, Any] = {}
+    personal_qr_code: Optional[str] = None
+    personal_qr_data: Optional[str] = None
+    personal_id_code: Optional[str] = None
+    preferred_language: Optional[str] = None
+    face_descriptors: List[Dict[str, Any]] = []
+    face_checkin_enabled: bool = True
+    last_face_photo_at: Optional[datetime] = None
+    has_face_descriptors: Optional[bool] = None
+    id: str = ""
+    church_id: str = ""
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    def __post_init__(self):
+        if self.email == "":
+            self.email = None
@@ -8,6 +8,8 @@ from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any, Literal
 from datetime import datetime
 
+QUIET_HOURS_PATTERN = r"^([01]\d|2[0-3]):[0-5]\d$"
+
 
 class DeviceToken(BaseModel):
     """FCM device token registration."""
@@ -50,6 +52,11 @@ class NotificationPreferences(BaseModel):
     push_enabled: bool = True
     whatsapp_enabled: bool = True
 
+    # Quiet hours for scheduled pushes (HH:MM, member-local; None = defaults)
+    quiet_hours_start: Optional[str] = None
+    quiet_hours_end: Optional[str] = None
+    timezone: Optional[str] = None  # IANA name; falls back to the church timezone
+
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
 
@@ -63,6 +70,9 @@ class NotificationPreferencesUpdate(BaseModel):
     giving_receipts_enabled: Optional[bool] = None
     push_enabled: Optional[bool] = None
     whatsapp_enabled: Optional[bool] = None
+    quiet_hours_start: Optional[str] = Field(None, pattern=QUIET_HOURS_PATTERN)
+    quiet_hours_end: Optional[str] = Field(None, pattern=QUIET_HOURS_PATTERN)
+    timezone: Optional[str] = Field(None, max_length=50)
 
 
 class PushNotification(BaseModel):
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from typing import Optional
 from datetime import date, datetime
@@ -7,12 +7,14 @@ from decimal import Decimal
 from utils.dependencies import get_db, get_current_user
 from utils.dependencies import get_session_church_id
 from services import accounting_service
+from utils.serialization import stream_json
 
 router = APIRouter(prefix="/accounting/reports", tags=["Reports"])
 
 
 @router.get("/general-ledger")
 async def general_ledger_report(
+    request: Request,
     account_id: Optional[str] = None,
     start_date: date = Query(...),
     end_date: date = Query(...),
@@ -35,10 +37,12 @@ async def general_ledger_report(
     if account_id:
         query["lines.account_id"] = account_id
     
+    # A year of journals can run to hundreds of MB - stream it from the cursor
     cursor = db.journals.find(query, {"_id": 0}).sort("date", 1)
-    journals = await cursor.to_list(length=None)
-    
-    return {"journals": journals, "start_date": start_date, "end_date": end_date}
+    return await stream_json(
+        request, cursor, key="journals",
+        envelope={"start_date": start_date, "end_date": end_date},
+    )
 
 
 @router.get("/trial-balance")
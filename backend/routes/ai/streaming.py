@@ -12,6 +12,7 @@ Endpoints:
 - POST /api/ai/stream/explore/{content_type} - Stream Explore content
 - POST /api/ai/stream/explore - Generic streaming with content_type in body
 - POST /api/ai/stream/image - Generate coherent image from content
+- GET /api/ai/stream/cache/stats - Generation cache hit-rate metrics
 """
 
 import asyncio
@@ -26,8 +27,9 @@ from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
-from utils.dependencies import get_current_user, get_session_church_id
+from utils.dependencies import get_current_user, get_session_church_id, require_super_admin
 from services.image_prompt_builder import ImagePromptBuilder, ImageStyle, ImageMood, ColorPalette
+from services.redis.generation_cache import generation_cache
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +54,7 @@ class ExploreStreamRequest(BaseModel):
     quiz_difficulty: Optional[str] = Field(None, description="Quiz difficulty: easy/medium/hard")
     num_questions: Optional[int] = Field(default=5, description="Number of quiz questions")
     study_duration: Optional[int] = Field(None, description="Bible study duration in days")
+    use_cache: bool = Field(default=True, description="Replay cached generation for identical prompts (False forces a fresh generation)")
 
     # Image generation options
     generate_image: bool = Field(default=False, description="Generate coherent image after text")
@@ -356,7 +359,8 @@ async def stream_explore_content(
     content_type: str,
     params: dict,
     church_id: str,
-    model: str = "claude-sonnet-4-5-20250929"
+    model: str = "claude-sonnet-4-5-20250929",
+    use_cache: bool = True,
 ) -> AsyncGenerator[str, None]:
     """
     Stream Explore content generation using Claude API.
@@ -366,6 +370,11 @@ async def stream_explore_content(
     2. Assistant prefill starts the JSON to ensure valid output
     3. Content is generated field-by-field maintaining context
 
+    Identical prompts (or, if enabled, prompts for the same figure/passage/
+    topic with near-identical instructions) are replayed from the shared
+    generation cache unless the church has opted out. With
+    use_cache=False the cache is bypassed and the fresh result replaces it.
+
     Yields JSON content chunks in real-time.
     """
     import anthropic
@@ -419,6 +428,18 @@ OUTPUT FORMAT:
 - No markdown, no explanations before or after
 - Start directly with { and end with }"""
 
+    # Serve repeat prompts from the shared generation cache
+    cache_prompt = f"{system_prompt}\n\n{user_prompt}"
+    cache_enabled = await generation_cache.is_enabled_for_church(church_id)
+    if cache_enabled and use_cache:
+        cached = await generation_cache.get(content_type, model, cache_prompt, params)
+        if cached is not None:
+            logger.info(f"Generation cache hit for {content_type} (church={church_id})")
+            for chunk in cached.replay_chunks():
+                yield chunk
+            return
+
+    chunks: List[str] = []
     try:
         client = anthropic.AsyncAnthropic(api_key=api_key)
 
@@ -436,10 +457,21 @@ OUTPUT FORMAT:
             ]
         ) as stream:
             # Yield the prefilled "{" first
+            chunks.append("{")
             yield "{"
             async for text in stream.text_stream:
+                chunks.append(text)
                 yield text
 
+        # Only cache complete, parseable generations
+        if cache_enabled:
+            try:
+                json.loads("".join(chunks))
+            except json.JSONDecodeError:
+                logger.warning(f"Not caching unparseable {content_type} generation")
+            else:
+                await generation_cache.set(content_type, model, cache_prompt, chunks, params)
+
     except anthropic.APIError as e:
         logger.error(f"Claude API error: {e}")
         yield f'"error": "AI generation failed: {str(e)}"}}'
@@ -746,7 +778,8 @@ async def stream_explore_by_type(
         content_type=content_type,
         params=params,
         church_id=church_id,
-        model=request.model
+        model=request.model,
+        use_cache=request.use_cache,
     )
 
     return StreamingResponse(
@@ -842,3 +875,22 @@ async def generate_image_from_content(
     except Exception as e:
         logger.error(f"Image generation failed: {e}")
         raise HTTPException(status_code=500, detail=f"Image generation failed: {str(e)}")
+
+
+@router.get("/cache/stats")
+async def get_generation_cache_stats(
+    current_user: dict = Depends(require_super_admin)
+):
+    """
+    Get generation cache hit-rate metrics (super admin only).
+
+    Returns per-content-type hits, similarity hits, misses and hit rate,
+    plus overall totals across all Explore content types.
+    """
+    stats = await generation_cache.get_stats(list(EXPLORE_PROMPTS.keys()) + ["devotion", "verse", "figure", "quiz"])
+    return {
+        "success": True,
+        "similarity_enabled": generation_cache.similarity_enabled,
+        "ttl_seconds": generation_cache.ttl,
+        **stats,
+    }
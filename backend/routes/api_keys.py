@@ -5,6 +5,7 @@ from datetime import datetime
 
 from models.api_key import APIKey, APIKeyCreate, APIKeyUpdate
 from utils.dependencies import get_db, require_admin, get_current_user
+from services.redis.pubsub import invalidate_user_sessions
 
 router = APIRouter(prefix="/api-keys", tags=["API Keys"])
 
@@ -113,6 +114,7 @@ async def update_api_key(
             {"id": api_key_id},
             {"$set": update_data}
         )
+        await invalidate_user_sessions(api_key_id)
 
     # Get updated API key (without sensitive data)
     updated_key = await db.api_keys.find_one(
@@ -147,6 +149,7 @@ async def delete_api_key(
         )
 
     await db.api_keys.delete_one({"id": api_key_id, "church_id": api_key.get('church_id')})
+    await invalidate_user_sessions(api_key_id)
 
     return None
 
@@ -186,6 +189,7 @@ async def regenerate_api_key(
             "updated_at": datetime.now().isoformat()
         }}
     )
+    await invalidate_user_sessions(api_key_id)
 
     # Return with new plain API key (only shown once)
     return {
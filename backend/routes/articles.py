@@ -11,6 +11,7 @@ from utils.dependencies import get_session_church_id
 from utils.error_response import error_response
 from utils.validation import sanitize_regex_pattern
 from services import article_service, audit_service
+from services.article_cache import article_render_cache, article_view_buffer
 from services.seaweedfs_service import (
     get_seaweedfs_service,
     SeaweedFSService,
@@ -168,6 +169,9 @@ async def create_article(
     
     await db.articles.insert_one(article_dict)
     
+    if article_dict.get("status") == "published":
+        await article_render_cache.warm(article_dict)
+    
     await audit_service.log_action(
         db=db, church_id=church_id, user_id=user_id,
         action_type="create", module="article",
@@ -224,6 +228,10 @@ async def update_article(
     
     updated = await db.articles.find_one({"id": article_id}, {"_id": 0})
     
+    # Re-render for public readers (the new updated_at is the cache version)
+    if updated and updated.get("status") == "published":
+        await article_render_cache.warm(updated)
+    
     await audit_service.log_action(
         db=db, church_id=church_id, user_id=user_id,
         action_type="update", module="article",
@@ -551,13 +559,14 @@ async def increment_view(
     article_id: str,
     db: AsyncIOMotorDatabase = Depends(get_db)
 ):
-    """Increment article view count (public endpoint, no auth)."""
-    success = await article_service.increment_article_views(db, article_id)
+    """Increment article view count (public endpoint, no auth). Buffered, flushed in bulk."""
+    exists = await db.articles.count_documents({"id": article_id}, limit=1)
     
-    if not success:
+    if not exists:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail={"error_code": "NOT_FOUND", "message": "Article not found"}
         )
     
+    await article_view_buffer.record_view(db, article_id)
     return {"success": True}
@@ -1,10 +1,10 @@
-from fastapi import APIRouter, HTTPException, status, Query, Depends
+from fastapi import APIRouter, HTTPException, status, Query, Depends, Request, Response
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from typing import Optional
 from datetime import datetime
 
 from utils.dependencies import get_db
-from services import article_service
+from services.article_cache import article_render_cache, article_view_buffer, etag_matches
 
 router = APIRouter(prefix="/public/articles", tags=["Public Articles API"])
 
@@ -45,7 +45,6 @@ async def list_public_articles(
         "id": 1,
         "title": 1,
         "slug": 1,
-        "content": 1,
         "excerpt": 1,
         "featured_image": 1,
         "category_ids": 1,
@@ -53,15 +52,20 @@ async def list_public_articles(
         "publish_date": 1,
         "reading_time": 1,
         "views_count": 1,
-        "allow_comments": 1
+        "allow_comments": 1,
+        "updated_at": 1,
+        "created_at": 1
     }
     
     cursor = db.articles.find(query, projection).sort("publish_date", -1).skip(offset).limit(limit)
     articles = await cursor.to_list(length=limit)
     
-    # Sanitize content for public
-    for article in articles:
-        article["content"] = article_service.sanitize_content_for_public(article.get("content", ""))
+    # Sanitized content from the render cache (content only loaded for misses)
+    rendered = await article_render_cache.get_many(db, articles)
+    for article, render in zip(articles, rendered):
+        article["content"] = render["content"]
+        article.pop("updated_at", None)
+        article.pop("created_at", None)
     
     return {
         "data": articles,
@@ -107,10 +111,12 @@ async def get_featured_articles(
 @router.get("/{slug}")
 async def get_public_article_by_slug(
     slug: str,
+    request: Request,
+    response: Response,
     church_id: str = Query(..., description="Church ID"),
     db: AsyncIOMotorDatabase = Depends(get_db)
 ):
-    """Get published article by slug (for mobile app)."""
+    """Get published article by slug (for mobile app). Supports If-None-Match."""
     article = await db.articles.find_one(
         {
             "church_id": church_id,
@@ -118,7 +124,7 @@ async def get_public_article_by_slug(
             "status": "published",
             "publish_date": {"$lte": datetime.utcnow()}
         },
-        {"_id": 0, "preview_token": 0, "scheduled_by": 0}
+        {"_id": 0, "preview_token": 0, "scheduled_by": 0, "content": 0}
     )
     
     if not article:
@@ -127,12 +133,18 @@ async def get_public_article_by_slug(
             detail={"error_code": "NOT_FOUND", "message": "Article not found"}
         )
     
-    # Increment views
-    await article_service.increment_article_views(db, article["id"])
+    # Buffered view count (flushed to Mongo in bulk)
+    pending_views = await article_view_buffer.record_view(db, article["id"])
     
-    # Sanitize content
-    article["content"] = article_service.sanitize_content_for_public(article.get("content", ""))
+    # Sanitized content from the render cache
+    rendered = await article_render_cache.get(db, article)
+    headers = {"ETag": rendered["etag"], "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), rendered["etag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
     
+    response.headers.update(headers)
+    article["content"] = rendered["content"]
+    article["views_count"] = article.get("views_count", 0) + pending_views
     return article
 
 
@@ -6,6 +6,7 @@ from datetime import date
 from utils.dependencies import get_db, require_admin
 from utils.dependencies import get_session_church_id
 from services import pagination_service
+from services.audit_service import audit_writer
 
 router = APIRouter(prefix="/accounting/audit-logs", tags=["Audit Logs"])
 
@@ -48,12 +49,30 @@ async def list_audit_logs(
     if user_id:
         query["user_id"] = user_id
     
+    # Entries still in the audit write buffer are the newest - they lead the list
+    def matches(entry: dict) -> bool:
+        if entry["church_id"] != church_id:
+            return False
+        if "$gte" in query.get("timestamp", {}) and entry["timestamp"] < query["timestamp"]["$gte"]:
+            return False
+        if "$lte" in query.get("timestamp", {}) and entry["timestamp"] > query["timestamp"]["$lte"]:
+            return False
+        return all(entry.get(field) == query[field] for field in ("module", "action_type", "user_id") if field in query)
+
+    pending = audit_writer.pending_entries(matches)
+    if pending:
+        query["id"] = {"$nin": [entry["id"] for entry in pending]}
+    
     # Get total count
-    total = await db.audit_logs.count_documents(query)
+    total = await db.audit_logs.count_documents(query) + len(pending)
     
     # Get paginated data
-    cursor = db.audit_logs.find(query, {"_id": 0}).sort("timestamp", -1).skip(offset).limit(limit)
-    logs = await cursor.to_list(length=limit)
+    logs = pending[offset:offset + limit]
+    if len(logs) < limit:
+        db_offset = max(0, offset - len(pending))
+        db_limit = limit - len(logs)
+        cursor = db.audit_logs.find(query, {"_id": 0}).sort("timestamp", -1).skip(db_offset).limit(db_limit)
+        logs += await cursor.to_list(length=db_limit)
     
     return pagination_service.build_pagination_response(logs, total, limit, offset)
 
@@ -67,7 +86,8 @@ async def get_audit_log(
     """Get single audit log with full before/after data."""
     church_id = get_session_church_id(current_user)
     
-    log = await db.audit_logs.find_one(
+    pending = audit_writer.pending_entries(lambda e: e["id"] == log_id and e["church_id"] == church_id)
+    log = pending[0] if pending else await db.audit_logs.find_one(
         {"id": log_id, "church_id": church_id},
         {"_id": 0}
     )
@@ -3,6 +3,7 @@ from motor.motor_asyncio import AsyncIOMotorDatabase
 from typing import List
 
 from utils.dependencies import get_db, get_current_user
+from services.bible_store import bible_store
 
 router = APIRouter(prefix="/bible", tags=["Bible"])
 
@@ -22,10 +23,10 @@ async def list_bible_books(
     version: str = "TB",
     db: AsyncIOMotorDatabase = Depends(get_db)
 ):
-    """List all Bible books"""
+    """List Bible books with the version's own book names and chapter counts"""
     
-    books = await db.bible_books.find({}, {"_id": 0}).sort("book_number", 1).to_list(100)
-    return books
+    bible_store.bind(db)
+    return await bible_store.list_books(version)
 
 
 @router.get("/{version}/{book}/{chapter}")
@@ -35,33 +36,10 @@ async def get_chapter(
     chapter: int,
     db: AsyncIOMotorDatabase = Depends(get_db)
 ):
-    """Get all verses in a chapter"""
+    """Get all verses in a chapter (book may be a name or alias in any language, or a number)"""
 
-    # Try to find verses with the book name as provided
-    verses = await db.bible_verses.find(
-        {
-            "version_code": version.upper(),
-            "book": book,
-            "chapter": chapter
-        },
-        {"_id": 0}
-    ).sort("verse", 1).to_list(200)
-
-    # If not found, try finding by book_number (for non-English versions)
-    if not verses:
-        # Get the book info to find book_number
-        book_info = await db.bible_books.find_one({"name": book})
-        if book_info:
-            book_num = book_info.get('book_number')
-            # Try finding by book_number
-            verses = await db.bible_verses.find(
-                {
-                    "version_code": version.upper(),
-                    "book_number": book_num,
-                    "chapter": chapter
-                },
-                {"_id": 0}
-            ).sort("verse", 1).to_list(200)
+    bible_store.bind(db)
+    verses = await bible_store.get_chapter(version, book, chapter)
 
     if not verses:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chapter not found")
@@ -80,32 +58,8 @@ async def get_verse(
 ):
     """Get single verse or verse range"""
     
-    # Try to find verse with the book name as provided
-    query = {
-        "version_code": version.upper(),
-        "book": book,
-        "chapter": chapter,
-        "verse": {"$gte": start_verse, "$lte": end_verse if end_verse else start_verse}
-    }
-    
-    verses = await db.bible_verses.find(query, {"_id": 0}).sort("verse", 1).to_list(200)
-    
-    # If not found, try finding by book_number (convert English to number to local name)
-    if not verses:
-        # Get the book info to find book_number
-        book_info = await db.bible_books.find_one({"name": book})
-        if book_info:
-            book_num = book_info.get('book_number')
-            # Try finding by book_number
-            verses = await db.bible_verses.find(
-                {
-                    "version_code": version.upper(),
-                    "book_number": book_num,
-                    "chapter": chapter,
-                    "verse": {"$gte": start_verse, "$lte": end_verse if end_verse else start_verse}
-                },
-                {"_id": 0}
-            ).sort("verse", 1).to_list(200)
+    bible_store.bind(db)
+    verses = await bible_store.get_verses(version, book, chapter, start_verse, end_verse)
     
     if not verses:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Verse not found")
@@ -115,7 +69,7 @@ async def get_verse(
         combined_text = " ".join([v['text'] for v in verses])
         return {
             "version": version.upper(),
-            "book": verses[0]['book'] if verses else book,
+            "book": verses[0]['book'],
             "chapter": chapter,
             "start_verse": start_verse,
             "end_verse": end_verse,
@@ -124,4 +78,4 @@ async def get_verse(
         }
     else:
         # Single verse
-        return verses[0] if verses else None
+        return verses[0]
@@ -23,6 +23,8 @@ from services.seaweedfs_service import (
     StorageCategory
 )
 from utils.error_response import error_response
+from services.community_read_service import get_community_read_service, channel_field
+from services.chat_context_service import get_chat_context_resolver
 from utils.validation import sanitize_regex_pattern
 
 logger = logging.getLogger(__name__)
@@ -109,8 +111,6 @@ async def get_my_communities(
                             "as": "member_count_result"
                         }
                     },
-                    # Get unread messages count (future: when messages are implemented)
-                    # For now, return 0
                     {
                         "$addFields": {
                             "community.members_count": {
@@ -123,7 +123,6 @@ async def get_my_communities(
                             "community.joined_at": "$joined_at",
                             "community.notifications_enabled": {"$ifNull": ["$notifications_enabled", True]},
                             "community.muted_until": "$muted_until",
-                            "community.unread_count": 0  # TODO: Implement when messages collection exists
                         }
                     },
                     # Project final shape
@@ -140,6 +139,16 @@ async def get_my_communities(
     total = result[0]["metadata"][0]["total"] if result[0]["metadata"] else 0
     communities = result[0]["data"] if result else []
 
+    # Unread counts for the announcement and general channels (read watermarks)
+    unread = await get_community_read_service(db).get_unread_counts(
+        church_id, member_id, [c["id"] for c in communities]
+    )
+    for community in communities:
+        channels = unread.get(community["id"], {})
+        community["unread_count"] = (
+            channels.get(channel_field("announcement"), 0) + channels.get(channel_field("general"), 0)
+        )
+
     return {
         "data": communities,
         "pagination": {
@@ -409,6 +418,7 @@ async def update_community(
     update_dict["updated_at"] = datetime.utcnow()
 
     await db.communities.update_one({"id": community_id, "church_id": church_id}, {"$set": update_dict})
+    await get_chat_context_resolver(db).invalidate_community(church_id, community_id)
 
     updated = await db.communities.find_one({"id": community_id, "church_id": church_id}, {"_id": 0})
 
@@ -457,6 +467,7 @@ async def delete_community(
         )
 
     await db.communities.delete_one({"id": community_id, "church_id": church_id})
+    await get_chat_context_resolver(db).invalidate_community(church_id, community_id)
 
     await audit_service.log_action(
         db=db,
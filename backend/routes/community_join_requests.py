@@ -20,6 +20,8 @@ from utils.dependencies import get_db, get_current_user, get_current_member
 from services.whatsapp_service import send_whatsapp_message
 from utils.dependencies import get_session_church_id
 from services import audit_service
+from services.chat_context_service import get_chat_context_resolver
+from utils.cache import get_church_settings
 
 router = APIRouter(tags=["Community Join Requests"])
 
@@ -201,6 +203,9 @@ async def approve_join_request(
             "left_at": None,
         }
         await db.community_memberships.insert_one(membership)
+        await get_chat_context_resolver(db).invalidate_membership(
+            membership["church_id"], request_doc["community_id"], request_doc["member_id"]
+        )
 
         # Update member count
         await db.communities.update_one(
@@ -229,7 +234,7 @@ async def approve_join_request(
     )
 
     # Send WhatsApp notification to member if enabled in church settings
-    church_settings = await db.church_settings.find_one({"church_id": church_id})
+    church_settings = await get_church_settings(db, church_id)
     whatsapp_enabled = (
         church_settings
         and church_settings.get("enable_whatsapp_notifications")
@@ -311,7 +316,7 @@ async def reject_join_request(
     )
 
     # Send WhatsApp notification to member if enabled in church settings
-    church_settings = await db.church_settings.find_one({"church_id": church_id})
+    church_settings = await get_church_settings(db, church_id)
     whatsapp_enabled = (
         church_settings
         and church_settings.get("enable_whatsapp_notifications")
@@ -13,7 +13,9 @@ from datetime import datetime
 from utils.dependencies import get_db, get_current_user, get_current_member
 from utils.dependencies import get_session_church_id
 from services import audit_service
+from services.chat_context_service import get_chat_context_resolver
 from services.whatsapp_service import send_whatsapp_message
+from utils.cache import get_church_settings
 
 router = APIRouter(tags=["Community Leave Requests"])
 
@@ -62,6 +64,9 @@ async def create_leave_request_public(
             }
         },
     )
+    await get_chat_context_resolver(db).invalidate_membership(
+        membership["church_id"], membership["community_id"], membership["member_id"]
+    )
 
     return {
         "message": "Your leave request is submitted and waiting for staff confirmation.",
@@ -143,6 +148,9 @@ async def approve_leave_request(
         {"id": membership_id},
         {"$set": {"status": "removed", "left_at": datetime.utcnow()}},
     )
+    await get_chat_context_resolver(db).invalidate_membership(
+        membership["church_id"], membership["community_id"], membership["member_id"]
+    )
 
     # Update member count
     await db.communities.update_one(
@@ -160,7 +168,7 @@ async def approve_leave_request(
     )
 
     # Send WhatsApp notification to member if enabled in church settings
-    church_settings = await db.church_settings.find_one({"church_id": church_id})
+    church_settings = await get_church_settings(db, church_id)
     whatsapp_enabled = (
         church_settings
         and church_settings.get("enable_whatsapp_notifications")
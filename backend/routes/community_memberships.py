@@ -14,6 +14,7 @@ from models.community_membership import CommunityMembership, CommunityMembership
 from utils.dependencies import get_db, get_current_user
 from utils.dependencies import get_session_church_id
 from services import audit_service
+from services.chat_context_service import get_chat_context_resolver
 
 router = APIRouter(prefix="/communities", tags=["Community Memberships"])
 
@@ -112,6 +113,7 @@ async def add_community_member(
         "left_at": None,
     }
     await db.community_memberships.insert_one(membership)
+    await get_chat_context_resolver(db).invalidate_membership(church_id, community_id, member_id)
 
     # Update member count
     await db.communities.update_one(
@@ -157,6 +159,7 @@ async def remove_community_member(
         {"id": membership["id"]},
         {"$set": {"status": "removed", "left_at": datetime.utcnow()}},
     )
+    await get_chat_context_resolver(db).invalidate_membership(church_id, community_id, member_id)
 
     # Update member count
     await db.communities.update_one(
@@ -211,6 +214,7 @@ async def update_member_role(
         {"id": membership["id"]},
         {"$set": {"role": role}},
     )
+    await get_chat_context_resolver(db).invalidate_membership(church_id, community_id, member_id)
 
     # If promoting to leader, also add to leader_member_ids in community
     if role == "leader":
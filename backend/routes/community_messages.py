@@ -10,7 +10,7 @@ Routes:
 - DELETE /v1/messages/{id} - Delete message
 - POST /v1/messages/{id}/react - Add/remove reaction
 - POST /v1/messages/{id}/read - Mark as read
-- GET  /v1/communities/{id}/messages/search - Search messages
+- GET  /v1/communities/{id}/messages/search - Search messages (ranked, with highlights)
 
 Mobile Routes (member auth):
 - GET  /mobile/communities/{id}/messages
@@ -18,7 +18,10 @@ Mobile Routes (member auth):
 - PUT  /mobile/messages/{id}
 - DELETE /mobile/messages/{id}
 - POST /mobile/messages/{id}/react
-- POST /mobile/messages/{id}/read
+- POST /mobile/messages/{id}/read - Move read watermark to a message
+- POST /mobile/communities/{id}/read - Mark channel read up to a message
+- GET  /mobile/communities/{id}/unread - Unread counts per channel
+- GET  /mobile/messages/{id}/readers - Members who read a message
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, Form
@@ -43,11 +46,15 @@ from models.community_message import (
     create_system_message,
     SystemMessageData
 )
+from middleware.tracing import latency_budget
 from utils.dependencies import get_db, get_current_user, get_current_member
 from utils.tenant_utils import get_session_church_id_from_user
 from services.mqtt_service import get_mqtt, MQTTService
 from services.seaweedfs_service import get_seaweedfs, SeaweedFSService
 from services.fcm_service import send_push_notification
+from services.community_read_service import get_community_read_service, channel_field
+from services.chat_context_service import ChatContext, get_chat_context_resolver
+from services.community_search_service import CommunitySearchService, get_community_search_service
 
 logger = logging.getLogger(__name__)
 
@@ -64,11 +71,8 @@ async def get_community_or_404(
     community_id: str,
     church_id: str
 ) -> dict:
-    """Get community or raise 404."""
-    community = await db.communities.find_one({
-        "id": community_id,
-        "church_id": church_id
-    })
+    """Get community (cached chat context) or raise 404."""
+    community = await get_chat_context_resolver(db).get_community(church_id, community_id)
     if not community:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -83,13 +87,8 @@ async def check_membership(
     member_id: str,
     church_id: str
 ) -> dict:
-    """Check if member is part of community."""
-    membership = await db.community_memberships.find_one({
-        "community_id": community_id,
-        "member_id": member_id,
-        "church_id": church_id,
-        "status": "active"
-    })
+    """Check if member is part of community (cached chat context)."""
+    membership = await get_chat_context_resolver(db).get_membership(church_id, community_id, member_id)
     if not membership:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -98,6 +97,32 @@ async def check_membership(
     return membership
 
 
+async def resolve_chat_context(
+    db: AsyncIOMotorDatabase,
+    community_id: str,
+    member_id: str,
+    church_id: str
+) -> ChatContext:
+    """
+    Community, membership and sender info for a member's chat action.
+
+    Resolved concurrently through the chat context cache; raises the same
+    404/403 as get_community_or_404 and check_membership.
+    """
+    context = await get_chat_context_resolver(db).resolve(church_id, community_id, member_id)
+    if not context.community:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Community not found"
+        )
+    if not context.membership:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You are not a member of this community"
+        )
+    return context
+
+
 async def can_send_message(
     community: dict,
     membership: dict,
@@ -140,17 +165,34 @@ def extract_mentions(text: str) -> tuple[List[str], bool]:
 
 
 async def get_member_info(db: AsyncIOMotorDatabase, member_id: str, church_id: str) -> dict:
-    """Get member's display info."""
-    member = await db.members.find_one(
-        {"id": member_id, "church_id": church_id},
-        {"full_name": 1, "photo": 1}
+    """Get member's display info (cached chat context)."""
+    return await get_chat_context_resolver(db).get_sender(church_id, member_id)
+
+
+async def store_message(
+    db: AsyncIOMotorDatabase,
+    message: CommunityMessage,
+    sender_member_id: Optional[str] = None
+) -> None:
+    """
+    Assign the channel sequence number and store the message.
+
+    If the sender is a member, their read watermark moves to their own
+    message so it never counts as unread for them.
+    """
+    read_service = get_community_read_service(db)
+    message.seq = await read_service.next_sequence(
+        message.church_id, message.community_id, message.channel_type, message.subgroup_id
     )
-    if member:
-        return {
-            "name": member.get("full_name", "Unknown"),
-            "avatar_fid": member.get("photo")
-        }
-    return {"name": "Unknown", "avatar_fid": None}
+    doc = message.model_dump(mode='json')
+    doc["search_terms"] = CommunitySearchService.terms_for(doc.get("text"))
+    await db.community_messages.insert_one(doc)
+
+    if sender_member_id:
+        try:
+            await read_service.mark_read(message.church_id, sender_member_id, doc, publish=False)
+        except Exception as e:
+            logger.warning(f"Failed to advance sender read watermark: {e}")
 
 
 # ============================================================================
@@ -219,6 +261,10 @@ async def get_messages(
     if after:
         messages.reverse()
 
+    await get_community_read_service(db).apply_read_counts(
+        church_id, community_id, channel_type, subgroup_id, messages
+    )
+
     return MessageListResponse(
         messages=[CommunityMessage(**m) for m in messages],
         total=total,
@@ -285,7 +331,7 @@ async def send_message(
             )
 
     # Store in MongoDB
-    await db.community_messages.insert_one(message.model_dump(mode='json'))
+    await store_message(db, message)
 
     # Publish to MQTT
     mqtt_published = await mqtt.publish_message(
@@ -329,6 +375,7 @@ async def edit_message(
         {
             "$set": {
                 "text": update.text,
+                "search_terms": CommunitySearchService.terms_for(update.text),
                 "is_edited": True,
                 "edited_at": datetime.utcnow()
             }
@@ -385,7 +432,8 @@ async def delete_message(
                 "deleted_at": datetime.utcnow(),
                 "deleted_for_everyone": for_everyone,
                 "text": None if for_everyone else message.get("text"),
-                "media": None if for_everyone else message.get("media")
+                "media": None if for_everyone else message.get("media"),
+                "search_terms": []
             }
         }
     )
@@ -423,8 +471,7 @@ async def mobile_get_messages(
     church_id = current_member.get("church_id")
 
     # Verify community and membership
-    community = await get_community_or_404(db, community_id, church_id)
-    await check_membership(db, community_id, member_id, church_id)
+    await resolve_chat_context(db, community_id, member_id, church_id)
 
     # Build query
     query = {
@@ -464,6 +511,10 @@ async def mobile_get_messages(
     if after:
         messages.reverse()
 
+    await get_community_read_service(db).apply_read_counts(
+        church_id, community_id, channel_type, subgroup_id, messages
+    )
+
     return MessageListResponse(
         messages=[CommunityMessage(**m) for m in messages],
         total=total,
@@ -474,6 +525,7 @@ async def mobile_get_messages(
 
 
 @mobile_router.post("/communities/{community_id}/messages", response_model=MessageSendResponse)
+@latency_budget(300)
 async def mobile_send_message(
     community_id: str,
     message_data: CommunityMessageCreate,
@@ -487,20 +539,17 @@ async def mobile_send_message(
     member_id = current_member.get("id")
     church_id = current_member.get("church_id")
 
-    # Verify community and membership
-    community = await get_community_or_404(db, community_id, church_id)
-    membership = await check_membership(db, community_id, member_id, church_id)
+    # Verify community and membership, and get sender info (one cached lookup)
+    context = await resolve_chat_context(db, community_id, member_id, church_id)
+    sender_info = context.sender
 
     # Check permission
-    if not await can_send_message(community, membership, channel_type):
+    if not await can_send_message(context.community, context.membership, channel_type):
         raise HTTPException(
             status_code=403,
             detail="You don't have permission to send messages in this channel"
         )
 
-    # Get sender info
-    sender_info = await get_member_info(db, member_id, church_id)
-
     # Extract mentions
     mentioned_ids, mentions_everyone = extract_mentions(message_data.text)
 
@@ -537,7 +586,7 @@ async def mobile_send_message(
             )
 
     # Store in MongoDB
-    await db.community_messages.insert_one(message.model_dump(mode='json'))
+    await store_message(db, message, sender_member_id=member_id)
 
     # Publish to MQTT
     mqtt_published = await mqtt.publish_message(
@@ -575,11 +624,9 @@ async def mobile_react_to_message(
     if not message:
         raise HTTPException(status_code=404, detail="Message not found")
 
-    # Verify membership
-    await check_membership(db, message["community_id"], member_id, church_id)
-
-    # Get sender info
-    sender_info = await get_member_info(db, member_id, church_id)
+    # Verify membership and get sender info (one cached lookup)
+    context = await resolve_chat_context(db, message["community_id"], member_id, church_id)
+    sender_info = context.sender
 
     # Update reactions
     if action == "add":
@@ -607,62 +654,149 @@ async def mobile_react_to_message(
     return {"success": True, "action": action, "emoji": emoji}
 
 
+READ_WATERMARK_PROJECTION = {
+    "_id": 0, "id": 1, "community_id": 1, "channel_type": 1,
+    "subgroup_id": 1, "created_at": 1, "seq": 1
+}
+
+
 @mobile_router.post("/messages/{message_id}/read")
 async def mobile_mark_as_read(
     message_id: str,
     current_member: dict = Depends(get_current_member),
-    db: AsyncIOMotorDatabase = Depends(get_db),
-    mqtt: MQTTService = Depends(get_mqtt)
+    db: AsyncIOMotorDatabase = Depends(get_db)
 ):
-    """Mark a message as read."""
+    """
+    Mark a message (and everything before it in its channel) as read.
+
+    Moves the member's read watermark forward; reading older messages
+    again is a no-op. Read receipts are published coalesced over MQTT.
+    """
     member_id = current_member.get("id")
     church_id = current_member.get("church_id")
 
-    message = await db.community_messages.find_one({
-        "id": message_id,
-        "church_id": church_id
-    })
+    message = await db.community_messages.find_one(
+        {"id": message_id, "church_id": church_id},
+        READ_WATERMARK_PROJECTION
+    )
+
+    if not message:
+        raise HTTPException(status_code=404, detail="Message not found")
+
+    await check_membership(db, message["community_id"], member_id, church_id)
+
+    advanced = await get_community_read_service(db).mark_read(church_id, member_id, message)
+
+    return {"success": True, "advanced": advanced}
+
+
+@mobile_router.post("/communities/{community_id}/read")
+async def mobile_mark_read_up_to(
+    community_id: str,
+    up_to_message_id: str = Query(..., description="Newest message the member has seen"),
+    current_member: dict = Depends(get_current_member),
+    db: AsyncIOMotorDatabase = Depends(get_db)
+):
+    """
+    Mark a channel as read up to a message (batch read).
+
+    Clients call this once with the newest visible message instead of
+    once per message. Returns the channel's remaining unread count.
+    """
+    member_id = current_member.get("id")
+    church_id = current_member.get("church_id")
+
+    await check_membership(db, community_id, member_id, church_id)
+
+    message = await db.community_messages.find_one(
+        {"id": up_to_message_id, "church_id": church_id, "community_id": community_id},
+        READ_WATERMARK_PROJECTION
+    )
 
     if not message:
         raise HTTPException(status_code=404, detail="Message not found")
 
-    # Get member info
-    sender_info = await get_member_info(db, member_id, church_id)
+    read_service = get_community_read_service(db)
+    advanced = await read_service.mark_read(church_id, member_id, message)
+    unread = await read_service.get_channel_unread(
+        church_id, member_id, community_id, message["channel_type"], message.get("subgroup_id")
+    )
 
-    # Update read receipts (limit to 50 for performance)
-    read_receipt = {
-        "member_id": member_id,
-        "member_name": sender_info["name"],
-        "read_at": datetime.utcnow()
+    return {
+        "success": True,
+        "advanced": advanced,
+        "channel_type": message["channel_type"],
+        "subgroup_id": message.get("subgroup_id"),
+        "last_read_message_id": up_to_message_id if advanced else None,
+        "unread_count": unread
     }
 
-    # Only add if not already read by this member
-    await db.community_messages.update_one(
-        {
-            "id": message_id,
-            "read_by.member_id": {"$ne": member_id}
-        },
-        {
-            "$push": {
-                "read_by": {
-                    "$each": [read_receipt],
-                    "$slice": -50  # Keep last 50 receipts
-                }
-            },
-            "$inc": {"read_count": 1}
-        }
+
+@mobile_router.get("/communities/{community_id}/unread")
+async def mobile_get_unread_counts(
+    community_id: str,
+    current_member: dict = Depends(get_current_member),
+    db: AsyncIOMotorDatabase = Depends(get_db)
+):
+    """Unread message counts per channel of a community."""
+    member_id = current_member.get("id")
+    church_id = current_member.get("church_id")
+
+    await check_membership(db, community_id, member_id, church_id)
+
+    counts = await get_community_read_service(db).get_unread_counts(
+        church_id, member_id, [community_id]
     )
+    channels = counts[community_id]
 
-    # Publish to MQTT
-    await mqtt.publish_read_receipt(
-        church_id=church_id,
-        community_id=message["community_id"],
-        member_id=member_id,
-        message_id=message_id,
-        subgroup_id=message.get("subgroup_id")
+    return {
+        "community_id": community_id,
+        "announcement": channels.get(channel_field("announcement"), 0),
+        "general": channels.get(channel_field("general"), 0),
+        "subgroups": {
+            field.split(":", 1)[1]: count
+            for field, count in channels.items()
+            if field.startswith("subgroup:")
+        },
+        "total": sum(channels.values())
+    }
+
+
+@mobile_router.get("/messages/{message_id}/readers")
+async def mobile_get_message_readers(
+    message_id: str,
+    limit: int = Query(50, ge=1, le=200),
+    current_member: dict = Depends(get_current_member),
+    db: AsyncIOMotorDatabase = Depends(get_db)
+):
+    """Members who have read a message (their watermark is at or past it)."""
+    member_id = current_member.get("id")
+    church_id = current_member.get("church_id")
+
+    message = await db.community_messages.find_one(
+        {"id": message_id, "church_id": church_id},
+        READ_WATERMARK_PROJECTION
     )
 
-    return {"success": True}
+    if not message:
+        raise HTTPException(status_code=404, detail="Message not found")
+
+    await check_membership(db, message["community_id"], member_id, church_id)
+
+    readers = await get_community_read_service(db).get_readers(church_id, message, limit=limit)
+
+    # Resolve display names in one query
+    names = {
+        m["id"]: m.get("full_name", "Unknown")
+        async for m in db.members.find(
+            {"id": {"$in": [r["member_id"] for r in readers]}, "church_id": church_id},
+            {"_id": 0, "id": 1, "full_name": 1}
+        )
+    }
+    for reader in readers:
+        reader["member_name"] = names.get(reader["member_id"], "Unknown")
+
+    return {"message_id": message_id, "readers": readers}
 
 
 @mobile_router.put("/messages/{message_id}", response_model=CommunityMessage)
@@ -694,6 +828,7 @@ async def mobile_edit_message(
         {
             "$set": {
                 "text": update.text,
+                "search_terms": CommunitySearchService.terms_for(update.text),
                 "is_edited": True,
                 "edited_at": datetime.utcnow()
             }
@@ -745,7 +880,8 @@ async def mobile_delete_message(
                 "deleted_at": datetime.utcnow(),
                 "deleted_for_everyone": for_everyone,
                 "text": None if for_everyone else message.get("text"),
-                "media": None if for_everyone else message.get("media")
+                "media": None if for_everyone else message.get("media"),
+                "search_terms": []
             }
         }
     )
@@ -775,10 +911,9 @@ async def mobile_typing_indicator(
     member_id = current_member.get("id")
     church_id = current_member.get("church_id")
 
-    # Verify membership
-    await check_membership(db, community_id, member_id, church_id)
-
-    sender_info = await get_member_info(db, member_id, church_id)
+    # Verify membership and get sender info (one cached lookup)
+    context = await resolve_chat_context(db, community_id, member_id, church_id)
+    sender_info = context.sender
 
     await mqtt.publish_typing_indicator(
         church_id=church_id,
@@ -796,17 +931,40 @@ async def mobile_typing_indicator(
 # Message Search Routes
 # ============================================================================
 
+SEARCH_SORT_PATTERN = "^(relevance|recent)$"
+
+
+def format_search_results(result: dict, query: str) -> dict:
+    """Shape search service results for the API."""
+    return {
+        "messages": [CommunityMessage(**m) for m in result["messages"]],
+        "highlights": result["highlights"],
+        "total": len(result["messages"]),
+        "query": query,
+        "next_cursor": result["next_cursor"],
+        "has_more": result["has_more"],
+    }
+
+
 @mobile_router.get("/communities/{community_id}/messages/search")
 async def mobile_search_messages(
     community_id: str,
     query: str = Query(..., min_length=2, max_length=100, description="Search query"),
+    channel_type: Optional[ChannelType] = Query(None, description="Limit to a channel"),
+    subgroup_id: Optional[str] = Query(None, description="Limit to a subgroup"),
+    sender_member_id: Optional[str] = Query(None, description="Limit to a sender"),
+    date_from: Optional[datetime] = Query(None, description="Sent on or after"),
+    date_to: Optional[datetime] = Query(None, description="Sent on or before"),
+    sort: str = Query("relevance", regex=SEARCH_SORT_PATTERN, description="relevance or recent"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     limit: int = Query(20, ge=1, le=50),
     current_member: dict = Depends(get_current_member),
     db: AsyncIOMotorDatabase = Depends(get_db)
 ):
     """
     Search messages in a community.
-    Searches in message text content.
+    Word-based search (English and Indonesian word forms), ranked by
+    relevance or recency, with highlight ranges per message.
     """
     member_id = current_member.get("id")
     church_id = current_member.get("church_id")
@@ -814,33 +972,33 @@ async def mobile_search_messages(
     # Verify membership
     await check_membership(db, community_id, member_id, church_id)
 
-    # Build search query with text index or regex
-    search_query = {
-        "church_id": church_id,
-        "community_id": community_id,
-        "is_deleted": {"$ne": True},
-        "text": {"$regex": query, "$options": "i"}
-    }
-
-    # Fetch messages
-    cursor = db.community_messages.find(
-        search_query,
-        {"_id": 0}
-    ).sort("created_at", -1).limit(limit)
-
-    messages = await cursor.to_list(length=limit)
-
-    return {
-        "messages": [CommunityMessage(**m) for m in messages],
-        "total": len(messages),
-        "query": query
-    }
+    result = await get_community_search_service(db).search(
+        church_id=church_id,
+        community_id=community_id,
+        query=query,
+        channel_type=channel_type,
+        subgroup_id=subgroup_id,
+        sender_member_id=sender_member_id,
+        date_from=date_from,
+        date_to=date_to,
+        sort=sort,
+        cursor=cursor,
+        limit=limit,
+    )
+    return format_search_results(result, query)
 
 
 @router.get("/communities/{community_id}/messages/search")
 async def admin_search_messages(
     community_id: str,
     query: str = Query(..., min_length=2, max_length=100),
+    channel_type: Optional[ChannelType] = Query(None),
+    subgroup_id: Optional[str] = Query(None),
+    sender_member_id: Optional[str] = Query(None),
+    date_from: Optional[datetime] = Query(None),
+    date_to: Optional[datetime] = Query(None),
+    sort: str = Query("relevance", regex=SEARCH_SORT_PATTERN),
+    cursor: Optional[str] = Query(None),
     limit: int = Query(20, ge=1, le=50),
     current_user: dict = Depends(get_current_user),
     db: AsyncIOMotorDatabase = Depends(get_db)
@@ -848,25 +1006,20 @@ async def admin_search_messages(
     """Search messages (admin route)."""
     church_id = get_session_church_id_from_user(current_user)
 
-    search_query = {
-        "church_id": church_id,
-        "community_id": community_id,
-        "is_deleted": {"$ne": True},
-        "text": {"$regex": query, "$options": "i"}
-    }
-
-    cursor = db.community_messages.find(
-        search_query,
-        {"_id": 0}
-    ).sort("created_at", -1).limit(limit)
-
-    messages = await cursor.to_list(length=limit)
-
-    return {
-        "messages": [CommunityMessage(**m) for m in messages],
-        "total": len(messages),
-        "query": query
-    }
+    result = await get_community_search_service(db).search(
+        church_id=church_id,
+        community_id=community_id,
+        query=query,
+        channel_type=channel_type,
+        subgroup_id=subgroup_id,
+        sender_member_id=sender_member_id,
+        date_from=date_from,
+        date_to=date_to,
+        sort=sort,
+        cursor=cursor,
+        limit=limit,
+    )
+    return format_search_results(result, query)
 
 
 # ============================================================================
@@ -903,12 +1056,9 @@ async def mobile_create_poll(
     except json.JSONDecodeError:
         raise HTTPException(status_code=400, detail="Invalid options format")
 
-    # Verify community and membership
-    community = await get_community_or_404(db, community_id, church_id)
-    membership = await check_membership(db, community_id, member_id, church_id)
-
-    # Get sender info
-    sender_info = await get_member_info(db, member_id, church_id)
+    # Verify community and membership, and get sender info (one cached lookup)
+    context = await resolve_chat_context(db, community_id, member_id, church_id)
+    sender_info = context.sender
 
     # Build poll options
     poll_options = [
@@ -955,7 +1105,7 @@ async def mobile_create_poll(
     )
 
     # Store in MongoDB
-    await db.community_messages.insert_one(message.model_dump(mode='json'))
+    await store_message(db, message, sender_member_id=member_id)
 
     # Publish to MQTT
     mqtt_published = await mqtt.publish_message(
@@ -1120,6 +1270,7 @@ async def mobile_update_community_settings(
         {"id": community_id, "church_id": church_id},
         {"$set": {f"settings.{k}": v for k, v in filtered_settings.items()}}
     )
+    await get_chat_context_resolver(db).invalidate_community(church_id, community_id)
 
     # Get updated community
     updated = await db.communities.find_one(
@@ -1230,11 +1381,9 @@ async def mobile_forward_message(
     if not original:
         raise HTTPException(status_code=404, detail="Message not found")
 
-    # Verify membership in original community
-    await check_membership(db, original["community_id"], member_id, church_id)
-
-    # Get sender info
-    sender_info = await get_member_info(db, member_id, church_id)
+    # Verify membership in original community and get sender info (one cached lookup)
+    context = await resolve_chat_context(db, original["community_id"], member_id, church_id)
+    sender_info = context.sender
 
     # Get original community name
     original_community = await db.communities.find_one(
@@ -1272,7 +1421,7 @@ async def mobile_forward_message(
         )
 
         # Store in MongoDB
-        await db.community_messages.insert_one(forwarded.model_dump(mode='json'))
+        await store_message(db, forwarded, sender_member_id=member_id)
 
         # Publish to MQTT
         await mqtt.publish_message(
@@ -1338,6 +1487,7 @@ async def mobile_set_disappearing_messages(
             }
         }
     )
+    await get_chat_context_resolver(db).invalidate_community(church_id, community_id)
 
     # If enabled, schedule existing messages for deletion (background task)
     # This would typically be handled by a scheduled job
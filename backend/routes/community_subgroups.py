@@ -37,6 +37,7 @@ from models.community_subgroup import (
 )
 from utils.dependencies import get_db, get_current_user, get_current_member
 from utils.tenant_utils import get_session_church_id_from_user
+from services.community_read_service import get_community_read_service
 
 logger = logging.getLogger(__name__)
 
@@ -170,9 +171,10 @@ async def enrich_subgroup_with_status(
     subgroup["is_member"] = sg_membership is not None
     subgroup["my_role"] = sg_membership.get("role") if sg_membership else None
 
-    # Get unread count (messages after last read)
-    # For now, simplified to 0 - can be enhanced with read tracking
-    subgroup["unread_count"] = 0
+    # Unread count (channel sequence minus the member's read watermark)
+    subgroup["unread_count"] = await get_community_read_service(db).get_channel_unread(
+        church_id, member_id, subgroup["community_id"], "subgroup", subgroup["id"]
+    ) if sg_membership else 0
 
     # Get last message preview
     last_msg = await db.community_messages.find_one(
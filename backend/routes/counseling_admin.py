@@ -631,11 +631,7 @@ async def list_slots(
         
         # Enrich with counselor and appointment info
         for slot in slots:
-            counselor = await db.counselors.find_one(
-                {"id": slot["counselor_id"]},
-                {"_id": 0, "display_name": 1}
-            )
-            slot["counselor_name"] = counselor.get("display_name") if counselor else "Unknown"
+            slot["counselor_name"] = slot.get("counselor_name") or "Unknown"
             
             if slot.get("appointment_id"):
                 appointment = await db.counseling_appointments.find_one(
@@ -158,18 +158,12 @@ async def get_availability(
             if slot_date not in grouped_by_date:
                 grouped_by_date[slot_date] = []
             
-            # Get counselor info
-            counselor = await db.counselors.find_one(
-                {"id": slot["counselor_id"]},
-                {"_id": 0, "display_name": 1}
-            )
-            
             grouped_by_date[slot_date].append({
                 "slot_id": slot["id"],
                 "start_time": slot["start_time"],
                 "end_time": slot["end_time"],
                 "counselor_id": slot["counselor_id"],
-                "counselor_name": counselor.get("display_name", "Unknown") if counselor else "Unknown"
+                "counselor_name": slot.get("counselor_name") or "Unknown"
             })
         
         # Convert to list format
@@ -23,6 +23,7 @@ from services.redis.checkin_cache import (
     get_checkin_stats,
 )
 from utils.performance import Projections
+from utils.cache import get_church_settings
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/events", tags=["Events"])
@@ -305,7 +306,7 @@ async def register_rsvp(
     qr_data = generate_rsvp_qr_data(event_id, member_id, session_id or '', confirmation_code)
     
     # Check if WhatsApp is enabled
-    church_settings = await db.church_settings.find_one({"church_id": event.get('church_id')})
+    church_settings = await get_church_settings(db, event.get('church_id'))
     whatsapp_enabled = (
         church_settings and 
         church_settings.get('enable_whatsapp_notifications') and 
@@ -429,7 +430,7 @@ async def retry_whatsapp_notification(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Member phone number not found")
     
     # Check settings
-    church_settings = await db.church_settings.find_one({"church_id": event.get('church_id')})
+    church_settings = await get_church_settings(db, event.get('church_id'))
     if not church_settings or not church_settings.get('enable_whatsapp_notifications'):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="WhatsApp notifications not enabled")
     
@@ -19,6 +19,9 @@ from utils.dependencies import (
     require_admin,
 )
 from services.explore import ScheduleService, ProgressService
+from services.redis.generation_cache import generation_cache
+from services.explore.daily_feed import get_daily_feed_service
+from services.explore.content_counters import explore_counters
 from models.explore import ContentType
 
 router = APIRouter()
@@ -46,6 +49,7 @@ async def get_church_settings(
             # AI Content Generation Settings
             "auto_publish_ai_content": True,  # If True, AI content publishes immediately; if False, goes to review queue
             "theological_traditions": ["evangelical"],  # Multiple traditions = content on common ground only
+            "ai_generation_cache_enabled": True,  # Share/reuse cached AI generations across churches
             "features": {
                 "daily_devotion": {"enabled": True, "sort_order": 1, "visible": True},
                 "verse_of_the_day": {"enabled": True, "sort_order": 2, "visible": True},
@@ -107,6 +111,12 @@ async def update_church_settings(
         settings["deleted"] = False
         await db.church_explore_settings.insert_one(settings)
 
+    # Pick up generation cache opt-out changes immediately on this instance
+    generation_cache.forget_church(church_id)
+
+    # Feature toggles and release time change what today's feed contains
+    await get_daily_feed_service(db).invalidate(church_id)
+
     settings.pop("_id", None)
     return {"status": "success", "settings": settings}
 
@@ -423,6 +433,7 @@ async def create_church_content(
     # Get collection
     collection = _get_collection(db, content_type)
     await collection.insert_one(content)
+    await explore_counters.record_insert(collection.name, content)
 
     content.pop("_id", None)
     return {"status": "success", "content": content}
@@ -486,7 +497,10 @@ async def update_church_content(
     updates["updated_by"] = current_user["id"]
     updates["updated_at"] = datetime.now()
 
-    await collection.update_one({"id": content_id, "church_id": church_id}, {"$set": updates})
+    await explore_counters.update_one(collection, {"id": content_id, "church_id": church_id}, {"$set": updates})
+
+    # Today's saved feed may embed the old version
+    await get_daily_feed_service(db).invalidate(church_id)
 
     # Return updated
     content = await collection.find_one({"id": content_id, "church_id": church_id})
@@ -516,7 +530,8 @@ async def delete_church_content(
         )
 
     # Soft delete
-    await collection.update_one(
+    await explore_counters.update_one(
+        collection,
         {"id": content_id},
         {
             "$set": {
@@ -527,6 +542,9 @@ async def delete_church_content(
         },
     )
 
+    # Today's saved feed may embed the deleted item
+    await get_daily_feed_service(db).invalidate(church_id)
+
     return {"status": "success", "message": "Content deleted"}
 
 
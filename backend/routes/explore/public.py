@@ -3,6 +3,7 @@ Public Explore API Routes
 
 Endpoints for mobile app users:
 - GET /public/explore/home - Today's content
+- GET /public/explore/feed - Today's materialized daily feed (ETag / 304)
 - GET /public/explore/daily/{type} - Specific daily content
 - GET /public/explore/{content_type} - Browse self-paced content
 - GET /public/explore/{content_type}/{id} - Get specific content
@@ -14,13 +15,15 @@ Endpoints for mobile app users:
 - POST /public/explore/favorite - Favorite content
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from datetime import datetime
 from typing import Optional, List
 from pydantic import BaseModel
 
 from utils.dependencies import get_current_user, get_db, get_session_church_id
 from services.explore import ContentResolver, ProgressService
+from services.explore.daily_feed import get_daily_feed_service
+from services.article_cache import etag_matches
 from models.explore import ContentType, Language
 
 router = APIRouter()
@@ -78,39 +81,49 @@ async def get_explore_home(
         - User progress (streak, stats)
     """
     user_id = current_user["id"]
-    today = datetime.now()
 
-    content_resolver = ContentResolver(db)
     progress_service = ProgressService(db)
 
-    # Get all daily content
-    devotion = await content_resolver.get_daily_content(
-        church_id, today, "daily_devotion", language
-    )
-    verse = await content_resolver.get_daily_content(
-        church_id, today, "verse_of_the_day", language
-    )
-    figure = await content_resolver.get_daily_content(
-        church_id, today, "bible_figure_of_the_day", language
-    )
-    quiz = await content_resolver.get_daily_content(
-        church_id, today, "daily_quiz", language
-    )
+    # Get all daily content from the materialized church feed
+    feed = (await get_daily_feed_service(db).get(church_id, language)).data
 
     # Get user progress
     user_progress = await progress_service.get_user_progress(church_id, user_id)
     stats = await progress_service.get_statistics(church_id, user_id)
 
     return {
-        "daily_devotion": devotion,
-        "verse_of_the_day": verse,
-        "bible_figure_of_the_day": figure,
-        "daily_quiz": quiz,
+        "daily_devotion": feed.get("daily_devotion"),
+        "verse_of_the_day": feed.get("verse_of_the_day"),
+        "bible_figure_of_the_day": feed.get("bible_figure_of_the_day"),
+        "daily_quiz": feed.get("daily_quiz"),
         "user_progress": user_progress,
         "stats": stats,
     }
 
 
+@router.get("/feed")
+async def get_daily_feed(
+    request: Request,
+    current_user=Depends(get_current_user),
+    church_id: str = Depends(get_session_church_id),
+    db=Depends(get_db),
+    language: Language = Query("en", description="Content language preference"),
+):
+    """
+    Get today's daily content (devotion, verse, figure, quiz) in one call
+
+    Served from the church's pre-formatted feed. Send the returned ETag as
+    If-None-Match to get 304 Not Modified while the feed is unchanged.
+    """
+    feed = await get_daily_feed_service(db).get(church_id, language)
+    headers = {"ETag": feed.etag, "Cache-Control": "private, no-cache"}
+
+    if etag_matches(request.headers.get("if-none-match"), feed.etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=feed.body, media_type="application/json", headers=headers)
+
+
 @router.get("/daily/{content_type}")
 async def get_daily_content(
     content_type: ContentType,
@@ -139,10 +152,14 @@ async def get_daily_content(
     ]:
         raise HTTPException(status_code=400, detail="Not a daily content type")
 
-    content_resolver = ContentResolver(db)
-    content = await content_resolver.get_daily_content(
-        church_id, target_date, content_type, language
-    )
+    if date:
+        content_resolver = ContentResolver(db)
+        content = await content_resolver.get_daily_content(
+            church_id, target_date, content_type, language
+        )
+    else:
+        feed = await get_daily_feed_service(db).get(church_id, language)
+        content = feed.data.get(content_type)
 
     if not content:
         raise HTTPException(status_code=404, detail="Content not found for this date")
@@ -13,6 +13,7 @@ from utils.dependencies import get_db, get_current_user, get_current_member
 from services.whatsapp_service import send_whatsapp_message
 from utils.dependencies import get_session_church_id
 from services import audit_service
+from utils.cache import get_church_settings
 
 router = APIRouter(tags=["Group Join Requests"])
 
@@ -213,7 +214,7 @@ async def approve_join_request(
     )
 
     # Send WhatsApp notification to member if enabled in church settings
-    church_settings = await db.church_settings.find_one({"church_id": church_id})
+    church_settings = await get_church_settings(db, church_id)
     whatsapp_enabled = (
         church_settings
         and church_settings.get("enable_whatsapp_notifications")
@@ -295,7 +296,7 @@ async def reject_join_request(
     )
 
     # Send WhatsApp notification to member if enabled in church settings
-    church_settings = await db.church_settings.find_one({"church_id": church_id})
+    church_settings = await get_church_settings(db, church_id)
     whatsapp_enabled = (
         church_settings
         and church_settings.get("enable_whatsapp_notifications")
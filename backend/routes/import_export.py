@@ -15,6 +15,7 @@ from models.member import Member
 from utils.dependencies import get_db, require_admin, get_current_user
 from services.import_export_service import import_export_service
 from services.file_upload_service import file_upload_service
+from services.member_search_index import member_search_fields, notify_members_changed
 from utils.demographics import auto_assign_demographic
 from utils.helpers import normalize_phone_number
 
@@ -556,6 +557,8 @@ async def import_members(
                 for field in date_fields:
                     if member_doc.get(field) and hasattr(member_doc[field], 'isoformat'):
                         member_doc[field] = member_doc[field].isoformat()
+
+                member_doc.update(member_search_fields(member_doc))
                 
                 await db.members.insert_one(member_doc)
                 imported_count += 1
@@ -571,6 +574,9 @@ async def import_members(
             except Exception as e:
                 import_errors.append(f"Row {idx}: {str(e)}")
         
+        if imported_count:
+            await notify_members_changed(church_id)
+
         # Create import log
         import_log = ImportLogCreate(
             church_id=church_id,
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from typing import Optional
 from datetime import datetime, date
@@ -8,6 +8,7 @@ from utils.dependencies import get_db, get_current_user
 from utils.dependencies import get_session_church_id
 from utils import error_codes
 from utils.error_response import error_response
+from utils.serialization import stream_json
 from services import accounting_service, audit_service, pagination_service
 import uuid
 
@@ -16,6 +17,7 @@ router = APIRouter(prefix="/accounting/journals", tags=["Journals"])
 
 @router.get("/")
 async def list_journals(
+    request: Request,
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
     start_date: Optional[date] = None,
@@ -49,11 +51,11 @@ async def list_journals(
     # Get total count
     total = await db.journals.count_documents(query)
     
-    # Get paginated data
+    # Stream the page; same {"data": [...], "pagination": {...}} document
     cursor = db.journals.find(query, {"_id": 0}).sort("date", -1).skip(offset).limit(limit)
-    journals = await cursor.to_list(length=limit)
-    
-    return pagination_service.build_pagination_response(journals, total, limit, offset)
+    envelope = pagination_service.build_pagination_response([], total, limit, offset)
+    del envelope["data"]
+    return await stream_json(request, cursor, envelope=envelope)
 
 
 @router.get("/{journal_id}")
@@ -13,9 +13,21 @@ import json
 import logging
 import traceback
 
+from middleware.tracing import latency_budget
 from utils.dependencies import get_db
+from services.chat_context_service import get_chat_context_resolver
+from utils.cache import get_church_settings
 from services.whatsapp_service import send_whatsapp_message
 from services.explore.prayer_intelligence_service import get_prayer_intelligence_service
+from services.member_search_index import (
+    MemberSearchIndex,
+    SEARCHABLE_MEMBER_FIELDS,
+    kiosk_prefix_index,
+    member_search_fields,
+    notify_members_changed,
+    reindex_member,
+    to_e164,
+)
 from services.redis.checkin_cache import (
     is_checked_in,
     mark_checked_in,
@@ -903,7 +915,9 @@ async def register_group_kiosk(
                                 "source": "kiosk_companion",
                                 "registered_by_member_id": request.primary_member_id
                             }
+                            new_member.update(member_search_fields(new_member))
                             await db.members.insert_one(new_member)
+                            await notify_members_changed(request.church_id)
                             logger.info(f"Created new companion: {member_name}")
                     else:
                         # No phone - just create new member
@@ -924,7 +938,9 @@ async def register_group_kiosk(
                             "source": "kiosk_companion",
                             "registered_by_member_id": request.primary_member_id
                         }
+                        new_member.update(member_search_fields(new_member))
                         await db.members.insert_one(new_member)
+                        await notify_members_changed(request.church_id)
                         logger.info(f"Created new companion (no phone): {member_name}")
 
                 # Check for duplicate registration
@@ -1136,10 +1152,7 @@ async def get_public_kiosk_settings(
     Returns which kiosk services are enabled, timeout settings, and profile fields.
     """
     try:
-        settings = await db.church_settings.find_one(
-            {"church_id": church_id},
-            {"_id": 0, "kiosk_settings": 1}
-        )
+        settings = await get_church_settings(db, church_id)
 
         if settings and settings.get("kiosk_settings"):
             kiosk_settings = settings["kiosk_settings"]
@@ -1362,7 +1375,9 @@ async def create_member_kiosk(
             "source": "kiosk"
         }
 
+        member.update(member_search_fields(member))
         await db.members.insert_one(member)
+        await notify_members_changed(request.church_id)
 
         logger.info(f"Kiosk member created: {member_id} ({request.full_name})")
 
@@ -1671,6 +1686,11 @@ async def update_member_profile_kiosk(
         )
 
         if result.modified_count > 0:
+            if SEARCHABLE_MEMBER_FIELDS.intersection(update_data):
+                await reindex_member(db, member_id)
+            # Chat shows the cached name/photo of message senders
+            if "full_name" in update_data:
+                await get_chat_context_resolver(db).invalidate_member(member.get("church_id"), member_id)
             logger.info(f"Kiosk profile update: Member {member_id}, Fields: {list(update_data.keys())}")
             return {"success": True, "message": "Profile updated successfully"}
         else:
@@ -1694,7 +1714,7 @@ async def lookup_member_by_phone(
 
     Supports:
     - phone parameter: Tries multiple phone formats to find match
-    - search parameter: Searches by name (case-insensitive) OR phone
+    - search parameter: Searches by name (word prefixes, typo tolerant) OR phone
     """
     try:
         # Use search param if provided, otherwise use phone param
@@ -1737,7 +1757,10 @@ async def lookup_member_by_phone(
 
             member = await db.members.find_one({
                 "church_id": church_id,
-                "phone_whatsapp": {"$in": phone_variations},
+                "$or": [
+                    {"phone_e164": to_e164(clean_query)},
+                    {"phone_whatsapp": {"$in": phone_variations}},
+                ],
                 "is_deleted": {"$ne": True}
             }, {"_id": 0})
 
@@ -1750,15 +1773,16 @@ async def lookup_member_by_phone(
                     "members": [cleaned]
                 }
         else:
-            # Name search - case-insensitive regex
-            import re
-            name_pattern = re.compile(re.escape(query_term), re.IGNORECASE)
-
-            members = await db.members.find({
-                "church_id": church_id,
-                "full_name": {"$regex": name_pattern},
-                "is_deleted": {"$ne": True}
-            }, {"_id": 0}).limit(10).to_list(length=10)
+            # Name search - in-memory prefix index, typo-tolerant fallback
+            members = await kiosk_prefix_index.lookup(db, church_id, query_term, limit=10)
+            if not members:
+                members = await MemberSearchIndex(db).search(
+                    query_term,
+                    base={"church_id": church_id, "is_deleted": {"$ne": True}},
+                    projection={"_id": 0, "id": 1, "full_name": 1, "phone_whatsapp": 1, "photo_url": 1,
+                                "photo_thumbnail_url": 1, "gender": 1, "status": 1, "membership_date": 1},
+                    limit=10,
+                )
 
             if members:
                 logger.info(f"Found {len(members)} members by name search: {query_term}")
@@ -2130,6 +2154,7 @@ async def batch_face_checkin(
 
 
 @router.post("/face-checkin")
+@latency_budget(800)
 async def face_checkin(
     request: FaceCheckinRequest,
     church_id: Optional[str] = Query(None, description="Church ID (can also be sent in request body)"),
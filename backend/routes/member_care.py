@@ -20,6 +20,7 @@ from motor.motor_asyncio import AsyncIOMotorDatabase
 from utils.dependencies import get_current_user, get_db, get_session_church_id
 from services import audit_service
 from services.member_care_service import MemberCareService
+from utils.cache import invalidate_settings_cache
 
 from models.member_care_request import (
     MemberCareRequestUpdate,
@@ -512,6 +513,7 @@ async def update_guided_prayer_settings(
         },
         upsert=True,
     )
+    await invalidate_settings_cache(church_id)
 
     # Audit log
     await audit_service.log_action(
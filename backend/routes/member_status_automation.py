@@ -11,6 +11,7 @@ from models.member_status_history import MemberStatusHistory
 from utils.dependencies import get_db, require_admin, get_current_user
 from services.status_rule_engine_v2 import RuleEngineService
 from services.status_automation_service_v2 import StatusAutomationService
+from utils.cache import get_church_settings, get_cached_statuses, invalidate_settings_cache, invalidate_statuses_cache
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/v1/member-status", tags=["Member Status Automation"])
@@ -28,15 +29,20 @@ async def list_statuses(
     if current_user.get('role') != 'super_admin':
         query['church_id'] = current_user.get('session_church_id')
     
-    statuses = await db.member_statuses.find(query, {"_id": 0}).sort("display_order", 1).to_list(100)
-    
-    for s in statuses:
-        if isinstance(s.get('created_at'), str):
-            s['created_at'] = datetime.fromisoformat(s['created_at'])
-        if isinstance(s.get('updated_at'), str):
-            s['updated_at'] = datetime.fromisoformat(s['updated_at'])
+    async def fetch_statuses():
+        statuses = await db.member_statuses.find(query, {"_id": 0}).sort("display_order", 1).to_list(100)
+        
+        for s in statuses:
+            if isinstance(s.get('created_at'), str):
+                s['created_at'] = datetime.fromisoformat(s['created_at'])
+            if isinstance(s.get('updated_at'), str):
+                s['updated_at'] = datetime.fromisoformat(s['updated_at'])
+        
+        return statuses
     
-    return statuses
+    if 'church_id' in query:
+        return await get_cached_statuses(query['church_id'], fetch_statuses)
+    return await fetch_statuses()
 
 
 @router.post("/statuses", response_model=MemberStatus, status_code=status.HTTP_201_CREATED)
@@ -72,6 +78,7 @@ async def create_status(
         )
     
     await db.member_statuses.insert_one(status_doc)
+    await invalidate_statuses_cache(status_data.church_id)
     return member_status
 
 
@@ -111,6 +118,7 @@ async def update_status(
             {"id": status_id},
             {"$set": update_data}
         )
+        await invalidate_statuses_cache(status_obj.get('church_id'))
     
     updated = await db.member_statuses.find_one({"id": status_id}, {"_id": 0})
     if isinstance(updated.get('created_at'), str):
@@ -154,6 +162,7 @@ async def delete_status(
         )
     
     await db.member_statuses.delete_one({"id": status_id, "church_id": status_obj.get('church_id')})
+    await invalidate_statuses_cache(status_obj.get('church_id'))
     return None
 
 
@@ -501,7 +510,7 @@ async def get_automation_settings(
     """Get automation settings for current church"""
     church_id = current_user.get('session_church_id')
     
-    settings = await db.church_settings.find_one({"church_id": church_id}, {"_id": 0})
+    settings = await get_church_settings(db, church_id)
     
     return {
         "automation_enabled": settings.get('status_automation_enabled', False) if settings else False,
@@ -530,6 +539,7 @@ async def update_automation_settings(
             }
         }
     )
+    await invalidate_settings_cache(church_id)
     
     return {"message": "Settings updated", "automation_enabled": automation_enabled}
 
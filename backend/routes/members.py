@@ -1,17 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, UploadFile, File
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from typing import List, Optional
 from datetime import datetime
 import logging
 
-from models.member import Member, MemberCreate, MemberUpdate
+from models.member import Member, MemberCreate, MemberUpdate, MemberListItem
 from models.quick_member import QuickAddMember
 from utils.dependencies import get_db, get_current_user, require_admin
 from utils.demographics import auto_assign_demographic
 from utils.helpers import combine_full_name, normalize_phone_number
-from utils.validation import sanitize_regex_pattern
 from services.qr_service import generate_member_id_code, generate_member_qr_data
 from services.webhook_service import webhook_service
+from services.chat_context_service import get_chat_context_resolver
+from services.member_search_index import (
+    MemberSearchIndex,
+    SEARCHABLE_MEMBER_FIELDS,
+    member_search_fields,
+    notify_members_changed,
+    reindex_member,
+)
 from services.seaweedfs_service import (
     get_seaweedfs_service,
     SeaweedFSService,
@@ -19,6 +26,7 @@ from services.seaweedfs_service import (
     StorageCategory
 )
 from utils.performance import Projections
+from utils.serialization import stream_json
 
 logger = logging.getLogger(__name__)
 
@@ -88,8 +96,11 @@ async def quick_add_member(
         if demographic:
             member_doc['demographic_category'] = demographic
 
+    member_doc.update(member_search_fields(member_doc))
+
     # mode='json' already converts datetime/date to ISO strings
     await db.members.insert_one(member_doc)
+    await notify_members_changed(member_doc['church_id'])
     
     return member
 
@@ -168,8 +179,11 @@ async def create_member(
         if demographic:
             member_doc['demographic_category'] = demographic
 
+    member_doc.update(member_search_fields(member_doc))
+
     # mode='json' already converts datetime/date to ISO strings
     await db.members.insert_one(member_doc)
+    await notify_members_changed(member_doc['church_id'])
     
     # Trigger webhook: member.created (hybrid: try immediate, fallback to queue)
     await webhook_service.trigger_member_webhook(
@@ -184,6 +198,7 @@ async def create_member(
 
 @router.get("/", response_model=List[Member])
 async def list_members(
+    request: Request,
     db: AsyncIOMotorDatabase = Depends(get_db),
     current_user: dict = Depends(get_current_user),
     skip: int = Query(0, ge=0),
@@ -209,15 +224,9 @@ async def list_members(
     
     # Add search filter
     if search:
-        # Sanitize regex pattern to prevent ReDoS attacks
-        safe_pattern = sanitize_regex_pattern(search)
-        query['$or'] = [
-            {'first_name': {'$regex': safe_pattern, '$options': 'i'}},
-            {'last_name': {'$regex': safe_pattern, '$options': 'i'}},
-            {'full_name': {'$regex': safe_pattern, '$options': 'i'}},
-            {'email': {'$regex': safe_pattern, '$options': 'i'}},
-            {'phone_whatsapp': {'$regex': safe_pattern, '$options': 'i'}}
-        ]
+        # Indexed name-prefix / phone / typo-tolerant match (see member_search_index)
+        search_clause = await MemberSearchIndex(db).filter_for(search, dict(query))
+        query['$and'] = [search_clause]
     
     # Add active filter
     if is_active is not None:
@@ -303,25 +312,9 @@ async def list_members(
             }
         }
     ]
-    members = await db.members.aggregate(pipeline).to_list(limit)
-
-    # Convert ISO strings to datetime/date
-    for member in members:
-        if isinstance(member.get('created_at'), str):
-            member['created_at'] = datetime.fromisoformat(member['created_at'])
-        if isinstance(member.get('updated_at'), str):
-            member['updated_at'] = datetime.fromisoformat(member['updated_at'])
-        if member.get('date_of_birth') and isinstance(member['date_of_birth'], str):
-            from datetime import date
-            member['date_of_birth'] = date.fromisoformat(member['date_of_birth'])
-        if member.get('baptism_date') and isinstance(member['baptism_date'], str):
-            from datetime import date
-            member['baptism_date'] = date.fromisoformat(member['baptism_date'])
-        if member.get('membership_date') and isinstance(member['membership_date'], str):
-            from datetime import date
-            member['membership_date'] = date.fromisoformat(member['membership_date'])
-    
-    return members
+    # Streamed straight from the cursor; MemberListItem gives the List[Member]
+    # shape without re-validating every row through Pydantic
+    return await stream_json(request, db.members.aggregate(pipeline), schema=MemberListItem)
 
 
 # ============= TRASH BIN ENDPOINTS (Must be before /{member_id}) =============
@@ -458,6 +451,13 @@ async def update_member(
             {"id": member_id},
             {"$set": update_data}
         )
+
+        if SEARCHABLE_MEMBER_FIELDS & update_data.keys():
+            await reindex_member(db, member_id)
+
+        # Chat shows the cached name/photo of message senders
+        if {'full_name', 'photo'} & update_data.keys():
+            await get_chat_context_resolver(db).invalidate_member(member.get('church_id'), member_id)
     
     # Get updated member
     updated_member = await db.members.find_one({"id": member_id}, {"_id": 0})
@@ -527,6 +527,7 @@ async def delete_member(
     )
     
     logger.info(f"Member moved to trash: {member.get('full_name')} (ID: {member_id}) by {current_user.get('full_name')}")
+    await notify_members_changed(member.get('church_id'))
     
     # Trigger webhook: member.deleted
     await webhook_service.trigger_member_webhook(
@@ -578,6 +579,7 @@ async def restore_member(
     )
     
     logger.info(f"Member restored from trash: {member.get('full_name')} by {current_user.get('full_name')}")
+    await notify_members_changed(member.get('church_id'))
     
     return {"message": "Member restored successfully", "member_id": member_id}
 
@@ -779,6 +781,9 @@ async def upload_member_photo(
 
         logger.info(f"Member {member_id} photo uploaded to SeaweedFS: {result['url']}")
 
+        # Chat shows the cached name/photo of message senders
+        await get_chat_context_resolver(db).invalidate_member(church_id, member_id)
+
         return {
             "photo_url": result["url"],
             "photo_thumbnail": result.get("thumbnail_url"),
@@ -0,0 +1,103 @@
+"""
+Query Profile API Routes
+
+Super Admin endpoints over utils.query_profiler: which query shapes cost
+the most, which route handlers issue collection scans, and recent slow
+queries, across every instance (or just this one). ``/indexes`` runs the
+index advisor (utils.index_advisor) against the same query shapes.
+
+The Prometheus endpoint also accepts ``Authorization: Bearer $METRICS_TOKEN``
+so a scraper doesn't need a user session.
+"""
+
+import hmac
+import logging
+import os
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+from fastapi.security import HTTPAuthorizationCredentials
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from utils.dependencies import get_current_user, get_db, require_super_admin, security_optional
+from utils.index_advisor import IndexAdvisor
+from utils.query_profiler import build_report, prometheus_text, query_profiler
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/system/query-profile", tags=["System"])
+
+async def require_metrics_access(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security_optional),
+    db: AsyncIOMotorDatabase = Depends(get_db),
+) -> None:
+    """METRICS_TOKEN bearer (scrapers) or a super admin session."""
+    if credentials is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+    metrics_token = os.environ.get("METRICS_TOKEN")
+    if metrics_token and hmac.compare_digest(credentials.credentials, metrics_token):
+        return
+    await require_super_admin(await get_current_user(credentials, db))
+
+
+async def _entries(scope: str, hours: int):
+    """Profile entries for the cluster (Redis rollup) or this instance."""
+    if scope == "cluster":
+        try:
+            await query_profiler.rollup()  # include this instance's latest deltas
+            return "cluster", await query_profiler.cluster_entries(hours)
+        except Exception as e:
+            logger.warning(f"Query profile rollup unavailable, showing this instance only: {e}")
+    return "local", query_profiler.local_entries()
+
+
+@router.get("")
+async def get_query_profile(
+    hours: int = Query(1, ge=1, le=48),
+    sort: Literal["total", "p95", "p99", "count", "max"] = "total",
+    limit: int = Query(50, ge=1, le=500),
+    collscan_only: bool = False,
+    scope: Literal["cluster", "local"] = "cluster",
+    current_user: dict = Depends(require_super_admin),
+):
+    """
+    Query fingerprints ranked by cost, with latency percentiles, winning
+    plan (collection scans flagged), the handlers issuing them and recent
+    slow queries. ``hours`` applies to the cluster view; the local view
+    covers this process's lifetime.
+    """
+    used_scope, (entries, meta, slow) = await _entries(scope, hours)
+    report = build_report(entries, meta, slow, sort=sort, limit=limit, collscan_only=collscan_only)
+    return {"scope": used_scope, "hours": hours if used_scope == "cluster" else None, **report}
+
+
+@router.get("/indexes")
+async def get_index_advice(
+    hours: int = Query(24, ge=1, le=48),
+    scope: Literal["cluster", "local"] = "cluster",
+    db: AsyncIOMotorDatabase = Depends(get_db),
+    current_user: dict = Depends(require_super_admin),
+):
+    """
+    Index drift against IndexManager.INDEXES (missing, conflicting,
+    undeclared), unused and redundant indexes, and profiled query shapes
+    no index serves. Read-only: build with ``python scripts/index_advisor.py apply``.
+    """
+    used_scope, (entries, meta, _slow) = await _entries(scope, hours)
+    report = await IndexAdvisor(db).report(entries, meta)
+    return {"scope": used_scope, **report}
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_query_metrics(
+    hours: int = Query(1, ge=1, le=48),
+    scope: Literal["cluster", "local"] = "cluster",
+    _: None = Depends(require_metrics_access),
+):
+    """Per-fingerprint latency histograms in Prometheus text format."""
+    _, (entries, meta, _slow) = await _entries(scope, hours)
+    return PlainTextResponse(
+        prometheus_text(entries, meta),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -0,0 +1,29 @@
+"""
+Route Latency API Routes
+
+Super Admin endpoint over middleware.tracing: the slowest routes with
+latency percentiles, where their time goes (mongo / redis / http /
+executor / app) and recent requests that exceeded their latency budget,
+with span trees.
+
+Figures cover this process since it started; each instance keeps its own.
+"""
+
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
+
+from middleware.tracing import route_latency
+from utils.dependencies import require_super_admin
+
+router = APIRouter(prefix="/system/route-latency", tags=["System"])
+
+
+@router.get("")
+async def get_route_latency(
+    sort: Literal["p50", "p95", "p99", "max", "total", "count", "over_budget"] = "p95",
+    limit: int = Query(20, ge=1, le=500),
+    current_user: dict = Depends(require_super_admin),
+):
+    """Worst routes by ``sort``, with mean time breakdown and over-budget samples."""
+    return route_latency.report(sort=sort, limit=limit)
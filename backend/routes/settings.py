@@ -8,7 +8,7 @@ from models.demographic_preset import DemographicPreset, DemographicPresetCreate
 from models.church_settings import ChurchSettings, ChurchSettingsCreate, ChurchSettingsUpdate
 from models.event_category import EventCategory, EventCategoryCreate, EventCategoryUpdate
 from utils.dependencies import get_db, require_admin, get_current_user, get_session_church_id
-from utils.cache import get_cached_statuses, get_cached_demographics, invalidate_church_cache
+from utils.cache import get_cached_statuses, get_cached_demographics, invalidate_church_cache, invalidate_settings_cache
 
 router = APIRouter(prefix="/settings", tags=["Settings"])
 
@@ -620,6 +620,7 @@ async def _ensure_settings_for_church(
             "updated_at": datetime.utcnow(),
         }
         await db.church_settings.insert_one(doc)
+        await invalidate_settings_cache(church_id)
         return doc
     
     # Normalize existing doc (ensure all keys exist)
@@ -668,6 +669,7 @@ async def _ensure_settings_for_church(
             {"_id": existing["_id"]},
             {"$set": existing},
         )
+        await invalidate_settings_cache(church_id)
     
     return existing
 
@@ -768,6 +770,7 @@ async def create_church_settings(
     # mode='json' already converts datetime to ISO strings, no need for isoformat()
 
     await db.church_settings.insert_one(settings_doc)
+    await invalidate_settings_cache(settings_data.church_id)
     return church_settings
 
 
@@ -831,6 +834,7 @@ async def update_church_settings(
             {"church_id": session_church_id},
             {"$set": update_data}
         )
+        await invalidate_settings_cache(session_church_id)
 
         logger.warning(f"✅ MongoDB matched={result.matched_count}, modified={result.modified_count}")
 
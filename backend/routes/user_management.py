@@ -11,6 +11,7 @@ import logging
 
 from utils.dependencies import get_db, require_admin, get_current_user, get_session_church_id
 from models.user import UserResponse
+from services.redis.pubsub import invalidate_user_sessions
 
 logger = logging.getLogger(__name__)
 
@@ -178,6 +179,8 @@ async def update_user(
             {"id": user_id},
             {"$set": update_data}
         )
+        # Cached principals carry role/is_active - drop them on every instance
+        await invalidate_user_sessions(user_id)
     
     return {
         "success": True,
@@ -220,6 +223,7 @@ async def delete_user(
         delete_query["church_id"] = session_church_id
 
     await db.users.delete_one(delete_query)
+    await invalidate_user_sessions(user_id)
 
     logger.info(f"User deleted: {user.get('email')} (role: {user.get('role')}) by {current_user.get('email')}")
 
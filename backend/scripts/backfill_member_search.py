@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Backfill member search fields
+
+Members and member care requests created before indexed member search
+have no search_tokens / search_grams / phone_e164 fields and don't
+show up in search results. Safe to re-run: only documents without
+search fields are touched (pass --all to recompute everything).
+
+Usage:
+    python scripts/backfill_member_search.py [church_id] [--all]
+"""
+
+import asyncio
+import os
+import sys
+from motor.motor_asyncio import AsyncIOMotorClient
+from dotenv import load_dotenv
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+load_dotenv(ROOT_DIR / '.env')
+
+from services.member_search_index import MemberSearchIndex  # noqa: E402
+
+mongo_url = os.environ['MONGO_URL']
+client = AsyncIOMotorClient(mongo_url)
+db = client[os.environ['DB_NAME']]
+
+
+async def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    church_id = args[0] if args else None
+    only_missing = "--all" not in sys.argv
+    print(f"Backfilling member search fields{' for church ' + church_id if church_id else ''}...")
+
+    members = await MemberSearchIndex(db).backfill(church_id=church_id, only_missing=only_missing)
+    print(f"Indexed {members} members")
+
+    requests = await MemberSearchIndex(db, collection="member_care_requests", phone_field="phone").backfill(
+        church_id=church_id, only_missing=only_missing
+    )
+    print(f"Indexed {requests} member care requests")
+
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Backfill search terms for community messages
+
+Messages sent before message search was introduced have no
+search_terms field and don't show up in search results. The API runs
+the same backfill at startup; this script does it ahead of a deploy or
+for a single church.
+Safe to re-run: only messages without search terms are touched.
+
+Usage:
+    python scripts/backfill_message_search.py [church_id]
+"""
+
+import asyncio
+import os
+import sys
+from motor.motor_asyncio import AsyncIOMotorClient
+from dotenv import load_dotenv
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+load_dotenv(ROOT_DIR / '.env')
+
+from services.community_search_service import CommunitySearchService  # noqa: E402
+
+mongo_url = os.environ['MONGO_URL']
+client = AsyncIOMotorClient(mongo_url)
+db = client[os.environ['DB_NAME']]
+
+
+async def main():
+    church_id = sys.argv[1] if len(sys.argv) > 1 else None
+    print(f"Backfilling message search terms{' for church ' + church_id if church_id else ''}...")
+
+    indexed = await CommunitySearchService(db).backfill(church_id=church_id)
+    print(f"Indexed {indexed} messages")
+
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,180 @@
+"""
+Benchmark the middleware chain: BaseHTTPMiddleware stack vs pure ASGI.
+
+Serves a hello-world route under granian twice — once behind the old
+stack (three ``@app.middleware("http")`` layers + BaseHTTPMiddleware
+rate limiting + GZip) and once behind the current pure ASGI stack
+(RequestContextMiddleware + RateLimitMiddleware + SelectiveGZipMiddleware)
+— and reports requests/second for each. Both stacks do the same header
+work; the rate limiter is replaced by one that never limits so only the
+middleware plumbing is compared.
+
+Usage:
+    cd backend
+    python scripts/bench_middleware.py [--seconds 10] [--concurrency 64] [--workers 1]
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI, Request
+from starlette.datastructures import MutableHeaders
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.middleware.gzip import GZipMiddleware
+
+from middleware.compression import SelectiveGZipMiddleware
+from middleware.rate_limit import RateLimitMiddleware, get_rate_limit_config
+from middleware.request_context import (
+    RequestContextMiddleware,
+    apply_cache_control,
+    apply_security_headers,
+)
+
+
+class _Unlimited:
+    async def is_rate_limited(self, key, limit, window):
+        return False, limit, 0
+
+
+RateLimitMiddleware._shared_limiter = _Unlimited()
+
+
+def _hello_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/hello")
+    async def hello():
+        return {"message": "hello"}
+
+    return app
+
+
+class _LegacyRateLimit(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        limit, window = get_rate_limit_config(request.url.path)
+        _, remaining, _ = await RateLimitMiddleware._shared_limiter.is_rate_limited("k", limit, window)
+        response = await call_next(request)
+        response.headers["X-RateLimit-Limit"] = str(limit)
+        response.headers["X-RateLimit-Remaining"] = str(remaining)
+        response.headers["X-RateLimit-Reset"] = str(int(time.time()) + window)
+        return response
+
+
+def build_legacy_app() -> FastAPI:
+    """The pre-ASGI middleware stack."""
+    app = _hello_app()
+    app.add_middleware(GZipMiddleware, minimum_size=500)
+    app.add_middleware(_LegacyRateLimit)
+
+    @app.middleware("http")
+    async def security_headers(request: Request, call_next):
+        response = await call_next(request)
+        apply_security_headers(request.scope, request.headers, MutableHeaders(raw=response.raw_headers))
+        return response
+
+    @app.middleware("http")
+    async def process_time(request: Request, call_next):
+        start = time.time()
+        response = await call_next(request)
+        response.headers["X-Process-Time"] = f"{time.time() - start:.4f}"
+        return response
+
+    @app.middleware("http")
+    async def cache_control(request: Request, call_next):
+        response = await call_next(request)
+        apply_cache_control(request.method, request.url.path, MutableHeaders(raw=response.raw_headers))
+        return response
+
+    return app
+
+
+def build_asgi_app() -> FastAPI:
+    """The current pure ASGI middleware stack (as in server.py)."""
+    app = _hello_app()
+    app.add_middleware(SelectiveGZipMiddleware, minimum_size=500)
+    app.add_middleware(RateLimitMiddleware)
+    app.add_middleware(RequestContextMiddleware)
+    return app
+
+
+legacy_app = build_legacy_app()
+asgi_app = build_asgi_app()
+
+
+async def _load(url: str, seconds: float, concurrency: int) -> float:
+    import httpx
+
+    count = 0
+    deadline = time.perf_counter() + seconds
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(limits=limits, timeout=10) as client:
+        async def worker():
+            nonlocal count
+            while time.perf_counter() < deadline:
+                response = await client.get(url)
+                response.raise_for_status()
+                count += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return count / (time.perf_counter() - started)
+
+
+def _serve(target: str, port: int, workers: int) -> subprocess.Popen:
+    return subprocess.Popen(
+        [
+            "granian", "--interface", "asgi", "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning", f"scripts.bench_middleware:{target}",
+        ],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+
+
+async def _wait_ready(url: str, timeout: float = 15) -> None:
+    import httpx
+
+    deadline = time.perf_counter() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.perf_counter() < deadline:
+            try:
+                await client.get(url)
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not start")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    results = {}
+    for target in ("legacy_app", "asgi_app"):
+        server = _serve(target, args.port, args.workers)
+        url = f"http://127.0.0.1:{args.port}/api/hello"
+        try:
+            asyncio.run(_wait_ready(url))
+            asyncio.run(_load(url, 1, args.concurrency))  # warm-up
+            results[target] = asyncio.run(_load(url, args.seconds, args.concurrency))
+        finally:
+            server.terminate()
+            server.wait()
+        print(f"{target:12s} {results[target]:10.0f} req/s")
+
+    gain = (results["asgi_app"] / results["legacy_app"] - 1) * 100
+    print(f"pure ASGI vs BaseHTTPMiddleware: {gain:+.1f}%")
+
+
+if __name__ == "__main__":
+    main()
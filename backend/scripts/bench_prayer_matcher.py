@@ -0,0 +1,84 @@
+"""
+Benchmark prayer keyword matching: substring scan vs compiled matcher.
+
+The old analysis lowercased the text and ran ``kw in text`` for every
+keyword of every theme and emotion (~300 scans per request, with false
+hits such as "miss" in "mission"). The compiled KeywordMatcher tokenizes
+once and looks each token's forms up in a prebuilt index. Reports
+microseconds per analysis for both, on a mix of English and Indonesian
+requests of different lengths, and how many results differ.
+
+Usage:
+    cd backend
+    python scripts/bench_prayer_matcher.py [--iterations 2000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.explore.prayer_intelligence_service import (  # noqa: E402
+    EMOTIONAL_KEYWORDS,
+    KEYWORD_MATCHER,
+    PRAYER_THEME_KEYWORDS,
+)
+
+SAMPLES = [
+    "Please pray for my mother, she is in the hospital after surgery and we are worried.",
+    "Mohon doakan ayah saya yang sedang sakit dan dirawat di rumah sakit. Kami sangat cemas.",
+    "I lost my job last month and can't pay the rent. I'm trusting God to provide.",
+    "Saya bersyukur atas kesembuhan istri saya. Terima kasih Tuhan atas penyertaan-Mu.",
+    "Pray for our mission trip next week, that the team stays safe and united.",
+    "Kami sedang menghadapi masalah keluarga, suami dan saya sering bertengkar. Tolong doakan "
+    "agar kami bisa saling mengampuni dan pernikahan kami dipulihkan sesuai kehendak-Mu.",
+    ("I have been struggling with anxiety and fear for months, I can't sleep and feel hopeless. "
+     "I need guidance about whether to move to a new city for work. ") * 4,
+]
+
+
+def _legacy_scan(text: str):
+    text_lower = text.lower()
+    hits = {}
+    for theme, config in PRAYER_THEME_KEYWORDS.items():
+        matches = sum(1 for kw in config["keywords_en"] + config["keywords_id"] if kw in text_lower)
+        if matches:
+            hits[f"theme:{theme}"] = matches
+    for emotion, keywords in EMOTIONAL_KEYWORDS.items():
+        matches = sum(1 for kw in keywords["en"] + keywords["id"] if kw in text_lower)
+        if matches:
+            hits[f"emotion:{emotion}"] = matches
+    return hits
+
+
+def _time(func, iterations: int) -> float:
+    for text in SAMPLES:  # warm-up (fills the stemmer caches)
+        func(text)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        for text in SAMPLES:
+            func(text)
+    return (time.perf_counter() - started) / (iterations * len(SAMPLES)) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{KEYWORD_MATCHER.size} keywords, {len(SAMPLES)} sample requests")
+    legacy = _time(_legacy_scan, args.iterations)
+    compiled = _time(KEYWORD_MATCHER.match, args.iterations)
+    print(f"substring scan   {legacy:8.1f} us/request")
+    print(f"compiled matcher {compiled:8.1f} us/request  ({legacy / compiled:.1f}x)")
+
+    for text in SAMPLES:
+        old, new = _legacy_scan(text), KEYWORD_MATCHER.match(text)
+        if old != new:
+            print(f"\n{text[:70]!r}\n  substring: {old}\n  compiled:  {new}")
+
+
+if __name__ == "__main__":
+    main()
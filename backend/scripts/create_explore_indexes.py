@@ -1,6 +1,9 @@
 """
 Create MongoDB indexes for Explore collections
 Run this script to optimize query performance
+
+The indexes are declared in IndexManager.INDEXES (utils/performance.py);
+running it without arguments builds the ones missing.
 """
 
 import asyncio
@@ -15,354 +18,35 @@ MONGO_URL = os.getenv("MONGO_URL", "mongodb://localhost:27017")
 DB_NAME = os.getenv("DB_NAME", "church_management")
 
 
-async def create_indexes():
-    """Create all necessary indexes for Explore collections"""
-
-    client = AsyncIOMotorClient(MONGO_URL)
-    db = client[DB_NAME]
-
-    print("Creating indexes for Explore collections...")
-    print("=" * 60)
-
-    # ==================== CONTENT COLLECTIONS ====================
-
-    content_collections = [
-        "explore_devotions",
-        "explore_verses",
-        "explore_figures",
-        "explore_quizzes",
-        "explore_bible_studies",
-        "explore_devotion_plans",
-        "explore_topical_categories",
-        "explore_topical_verses"
-    ]
-
-    for collection_name in content_collections:
-        collection = db[collection_name]
-        print(f"\n📁 {collection_name}")
+# Declared in IndexManager.INDEXES (utils/performance.py)
+EXPLORE_COLLECTIONS = [
+    "explore_devotions",
+    "explore_verses",
+    "explore_figures",
+    "explore_quizzes",
+    "explore_bible_studies",
+    "explore_devotion_plans",
+    "explore_topical_categories",
+    "explore_topical_verses",
+    "explore_user_progress",
+    "explore_analytics",
+    "explore_adoptions",
+    "explore_church_settings",
+    "explore_prompt_config",
+    "ai_generation_queue",
+    "user_spiritual_profiles",
+    "prayer_analyses",
+    "prayer_followups",
+    "news_contexts",
+    "user_journey_enrollments",
+]
 
-        # Compound index for common queries (church + deleted + published)
-        await collection.create_index(
-            [("church_id", 1), ("deleted", 1), ("published", 1)],
-            name="church_deleted_published_idx"
-        )
-        print("  ✓ Created: church_id + deleted + published")
-
-        # Index for scheduling queries
-        await collection.create_index(
-            [("church_id", 1), ("scheduled_date", 1)],
-            name="church_scheduled_idx"
-        )
-        print("  ✓ Created: church_id + scheduled_date")
-
-        # Index for date range queries
-        await collection.create_index(
-            [("church_id", 1), ("created_at", -1)],
-            name="church_created_idx"
-        )
-        print("  ✓ Created: church_id + created_at")
-
-        # Index for status queries (published content)
-        await collection.create_index(
-            [("church_id", 1), ("published", 1), ("deleted", 1), ("created_at", -1)],
-            name="church_published_sorted_idx"
-        )
-        print("  ✓ Created: church_id + published + deleted + created_at")
-
-        # Index for search by author/creator
-        await collection.create_index(
-            [("church_id", 1), ("created_by", 1)],
-            name="church_creator_idx"
-        )
-        print("  ✓ Created: church_id + created_by")
-
-    # ==================== USER PROGRESS ====================
-
-    print(f"\n📁 explore_user_progress")
-    progress_collection = db.explore_user_progress
-
-    # Compound index for user progress queries
-    await progress_collection.create_index(
-        [("church_id", 1), ("user_id", 1), ("content_type", 1)],
-        name="church_user_content_idx"
-    )
-    print("  ✓ Created: church_id + user_id + content_type")
-
-    # Index for streak calculations
-    await progress_collection.create_index(
-        [("church_id", 1), ("user_id", 1), ("last_accessed", -1)],
-        name="church_user_accessed_idx"
-    )
-    print("  ✓ Created: church_id + user_id + last_accessed")
-
-    # Index for unique content access
-    await progress_collection.create_index(
-        [("church_id", 1), ("user_id", 1), ("content_type", 1), ("content_id", 1)],
-        name="church_user_content_item_idx",
-        unique=True
-    )
-    print("  ✓ Created: church_id + user_id + content_type + content_id (unique)")
-
-    # ==================== ANALYTICS ====================
-
-    print(f"\n📁 explore_analytics")
-    analytics_collection = db.explore_analytics
-
-    # Index for analytics queries
-    await analytics_collection.create_index(
-        [("church_id", 1), ("date", -1)],
-        name="church_date_idx"
-    )
-    print("  ✓ Created: church_id + date")
-
-    # Index for content-specific analytics
-    await analytics_collection.create_index(
-        [("church_id", 1), ("content_type", 1), ("content_id", 1), ("date", -1)],
-        name="church_content_analytics_idx"
-    )
-    print("  ✓ Created: church_id + content_type + content_id + date")
-
-    # Index for date range analytics
-    await analytics_collection.create_index(
-        [("church_id", 1), ("content_type", 1), ("date", -1)],
-        name="church_type_date_idx"
-    )
-    print("  ✓ Created: church_id + content_type + date")
-
-    # ==================== ADOPTION ====================
-
-    print(f"\n📁 explore_adoptions")
-    adoption_collection = db.explore_adoptions
-
-    # Index for adoption status queries
-    await adoption_collection.create_index(
-        [("church_id", 1), ("content_type", 1), ("adopted", 1)],
-        name="church_type_adopted_idx"
-    )
-    print("  ✓ Created: church_id + content_type + adopted")
-
-    # Unique index for content adoption
-    await adoption_collection.create_index(
-        [("church_id", 1), ("content_type", 1), ("content_id", 1)],
-        name="church_content_unique_idx",
-        unique=True
-    )
-    print("  ✓ Created: church_id + content_type + content_id (unique)")
-
-    # ==================== SETTINGS ====================
-
-    print(f"\n📁 explore_church_settings")
-    settings_collection = db.explore_church_settings
-
-    # Index for church settings (should be unique per church)
-    await settings_collection.create_index(
-        [("church_id", 1)],
-        name="church_idx",
-        unique=True
-    )
-    print("  ✓ Created: church_id (unique)")
-
-    # ==================== PROMPT CONFIG ====================
-
-    print(f"\n📁 explore_prompt_config")
-    prompt_config_collection = db.explore_prompt_config
-
-    # Index for church prompt config (should be unique per church)
-    await prompt_config_collection.create_index(
-        [("church_id", 1)],
-        name="church_idx",
-        unique=True
-    )
-    print("  ✓ Created: church_id (unique)")
-
-    # ==================== AI GENERATION QUEUE ====================
-
-    print(f"\n📁 ai_generation_queue")
-    ai_queue_collection = db.ai_generation_queue
-
-    # Index for user's generation jobs
-    await ai_queue_collection.create_index(
-        [("church_id", 1), ("user_id", 1), ("created_at", -1)],
-        name="church_user_created_idx"
-    )
-    print("  ✓ Created: church_id + user_id + created_at")
-
-    # Index for status queries
-    await ai_queue_collection.create_index(
-        [("church_id", 1), ("status", 1), ("created_at", -1)],
-        name="church_status_idx"
-    )
-    print("  ✓ Created: church_id + status + created_at")
-
-    # Index for pending jobs processing
-    await ai_queue_collection.create_index(
-        [("status", 1), ("created_at", 1)],
-        name="status_created_processing_idx"
-    )
-    print("  ✓ Created: status + created_at (for job processing)")
-
-    # TTL index to auto-delete old jobs after 30 days
-    await ai_queue_collection.create_index(
-        [("created_at", 1)],
-        name="ttl_idx",
-        expireAfterSeconds=2592000  # 30 days
-    )
-    print("  ✓ Created: created_at (TTL - 30 days)")
-
-    # ==================== USER SPIRITUAL PROFILES ====================
-
-    print(f"\n📁 user_spiritual_profiles")
-    profile_collection = db.user_spiritual_profiles
-
-    # Compound index for user profile queries
-    await profile_collection.create_index(
-        [("church_id", 1), ("user_id", 1), ("deleted", 1)],
-        name="church_user_deleted_idx"
-    )
-    print("  ✓ Created: church_id + user_id + deleted")
-
-    # Index for onboarding status queries
-    await profile_collection.create_index(
-        [("church_id", 1), ("onboarding_completed", 1)],
-        name="church_onboarded_idx"
-    )
-    print("  ✓ Created: church_id + onboarding_completed")
-
-    # Index for life situation filtering
-    await profile_collection.create_index(
-        [("church_id", 1), ("life_situation", 1), ("deleted", 1)],
-        name="church_situation_idx"
-    )
-    print("  ✓ Created: church_id + life_situation + deleted")
-
-    # Unique index for user profile (one profile per user per church)
-    await profile_collection.create_index(
-        [("church_id", 1), ("user_id", 1)],
-        name="church_user_unique_idx",
-        unique=True
-    )
-    print("  ✓ Created: church_id + user_id (unique)")
-
-    # ==================== PRAYER INTELLIGENCE ====================
-
-    print(f"\n📁 prayer_analyses")
-    prayer_analyses_collection = db.prayer_analyses
-
-    # Index for prayer analysis queries
-    await prayer_analyses_collection.create_index(
-        [("church_id", 1), ("prayer_request_id", 1)],
-        name="church_prayer_idx"
-    )
-    print("  ✓ Created: church_id + prayer_request_id")
-
-    # Index for theme-based queries
-    await prayer_analyses_collection.create_index(
-        [("prayer_request_id", 1)],
-        name="prayer_request_idx",
-        unique=True
-    )
-    print("  ✓ Created: prayer_request_id (unique)")
-
-    print(f"\n📁 prayer_followups")
-    prayer_followups_collection = db.prayer_followups
-
-    # Index for due follow-up queries (used by scheduler)
-    await prayer_followups_collection.create_index(
-        [("follow_up_due_at", 1), ("follow_up_sent", 1), ("deleted", 1)],
-        name="followup_due_sent_idx"
-    )
-    print("  ✓ Created: follow_up_due_at + follow_up_sent + deleted")
-
-    # Index for user's follow-ups
-    await prayer_followups_collection.create_index(
-        [("church_id", 1), ("user_id", 1), ("deleted", 1)],
-        name="church_user_followup_idx"
-    )
-    print("  ✓ Created: church_id + user_id + deleted")
-
-    # Index for prayer request follow-ups
-    await prayer_followups_collection.create_index(
-        [("prayer_request_id", 1)],
-        name="prayer_request_followup_idx"
-    )
-    print("  ✓ Created: prayer_request_id")
-
-    # ==================== NEWS CONTEXT ====================
-
-    print(f"\n📁 news_contexts")
-    news_context_collection = db.news_contexts
-
-    # Index for date-based queries
-    await news_context_collection.create_index(
-        [("date", -1)],
-        name="date_idx"
-    )
-    print("  ✓ Created: date")
-
-    # TTL index to auto-delete old contexts after 30 days
-    await news_context_collection.create_index(
-        [("created_at", 1)],
-        name="ttl_idx",
-        expireAfterSeconds=2592000  # 30 days
-    )
-    print("  ✓ Created: created_at (TTL - 30 days)")
-
-    # ==================== JOURNEYS ====================
-
-    print(f"\n📁 user_journey_enrollments")
-    journey_enrollments_collection = db.user_journey_enrollments
-
-    # Index for user's journey queries
-    await journey_enrollments_collection.create_index(
-        [("church_id", 1), ("user_id", 1), ("deleted", 1)],
-        name="church_user_deleted_idx"
-    )
-    print("  ✓ Created: church_id + user_id + deleted")
-
-    # Index for active journeys
-    await journey_enrollments_collection.create_index(
-        [("church_id", 1), ("user_id", 1), ("status", 1)],
-        name="church_user_status_idx"
-    )
-    print("  ✓ Created: church_id + user_id + status")
-
-    # Index for journey-specific queries
-    await journey_enrollments_collection.create_index(
-        [("church_id", 1), ("journey_slug", 1), ("status", 1)],
-        name="church_journey_status_idx"
-    )
-    print("  ✓ Created: church_id + journey_slug + status")
-
-    # ==================== SERMONS ====================
-
-    print(f"\n📁 explore_sermons")
-    sermons_collection = db.explore_sermons
-
-    # Index for church sermon queries
-    await sermons_collection.create_index(
-        [("church_id", 1), ("deleted", 1), ("sermon_date", -1)],
-        name="church_deleted_date_idx"
-    )
-    print("  ✓ Created: church_id + deleted + sermon_date")
-
-    # Index for date range queries
-    await sermons_collection.create_index(
-        [("church_id", 1), ("sermon_date", 1), ("integration_mode", 1)],
-        name="church_date_integration_idx"
-    )
-    print("  ✓ Created: church_id + sermon_date + integration_mode")
-
-    # ==================== SUMMARY ====================
 
-    print("\n" + "=" * 60)
-    print("✅ All indexes created successfully!")
-    print("\nTo verify indexes, run:")
-    print("  db.explore_devotions.getIndexes()")
-    print("\nTo check index usage:")
-    print("  db.explore_devotions.aggregate([{$indexStats: {}}])")
-    print("=" * 60)
+async def create_indexes():
+    """Build the declared Explore indexes that are missing"""
+    from index_advisor import main
 
-    client.close()
+    await main(["apply", "--collections", ",".join(EXPLORE_COLLECTIONS)])
 
 
 async def drop_indexes():
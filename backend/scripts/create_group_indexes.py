@@ -1,50 +1,18 @@
-import os
-from pathlib import Path
-from motor.motor_asyncio import AsyncIOMotorClient
-from dotenv import load_dotenv
+"""Create database indexes for groups
 
-ROOT_DIR = Path(__file__).resolve().parents[1]
-load_dotenv(ROOT_DIR / '.env')
+The indexes are declared in IndexManager.INDEXES (utils/performance.py);
+this builds the ones missing on the group collections.
+"""
+import asyncio
+import sys
 
+from index_advisor import main
 
-async def create_indexes():
-    """Create all group-related indexes"""
-    mongo_url = os.environ['MONGO_URL']
-    client = AsyncIOMotorClient(mongo_url)
-    db_name = os.environ.get('DB_NAME', 'church_management')
-    db = client[db_name]
+COLLECTIONS = [
+    "groups",
+    "group_memberships",
+    "group_join_requests",
+]
 
-    # Groups
-    await db.groups.create_index([('church_id', 1)])
-    await db.groups.create_index([('church_id', 1), ('category', 1)])
-    await db.groups.create_index([('church_id', 1), ('is_open_for_join', 1)])
-
-    # GroupMemberships
-    await db.group_memberships.create_index([('church_id', 1)])
-    await db.group_memberships.create_index([('church_id', 1), ('group_id', 1)])
-    await db.group_memberships.create_index([('church_id', 1), ('member_id', 1)])
-    await db.group_memberships.create_index([
-        ('church_id', 1),
-        ('group_id', 1),
-        ('member_id', 1),
-        ('status', 1),
-    ])
-
-    # GroupJoinRequests
-    await db.group_join_requests.create_index([('church_id', 1)])
-    await db.group_join_requests.create_index([('church_id', 1), ('group_id', 1)])
-    await db.group_join_requests.create_index([('church_id', 1), ('member_id', 1)])
-    await db.group_join_requests.create_index([
-        ('church_id', 1),
-        ('group_id', 1),
-        ('member_id', 1),
-        ('status', 1),
-    ])
-
-    print('✓ Group indexes created')
-
-
-if __name__ == '__main__':
-    import asyncio
-
-    asyncio.run(create_indexes())
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(["apply", "--collections", ",".join(COLLECTIONS)])))
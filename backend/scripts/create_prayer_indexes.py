@@ -1,21 +1,18 @@
+"""Create database indexes for prayer requests
+
+The indexes are declared in IndexManager.INDEXES (utils/performance.py);
+this builds the ones missing on the prayer collections.
+"""
 import asyncio
-from motor.motor_asyncio import AsyncIOMotorClient
-import os
-from dotenv import load_dotenv
+import sys
+
+from index_advisor import main
 
-async def create_indexes():
-    load_dotenv('/app/backend/.env')
-    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
-    db = client[os.environ['DB_NAME']]
-    
-    print("Creating prayer request indexes...")
-    
-    await db.prayer_requests.create_index([("church_id", 1), ("status", 1)])
-    await db.prayer_requests.create_index([("church_id", 1), ("category", 1)])
-    await db.prayer_requests.create_index([("church_id", 1), ("created_at", -1)])
-    await db.prayer_requests.create_index([("church_id", 1), ("assigned_to_user_id", 1)])
-    
-    print("✅ Prayer request indexes created successfully!")
-    client.close()
+COLLECTIONS = [
+    "prayer_requests",
+    "prayer_analyses",
+    "prayer_followups",
+]
 
-asyncio.run(create_indexes())
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(["apply", "--collections", ",".join(COLLECTIONS)])))
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+MongoDB index advisor
+
+Compares IndexManager.INDEXES (utils/performance.py) with the database
+and builds what is missing (see utils/index_advisor.py).
+
+Usage:
+    python scripts/index_advisor.py check                # drift; exits 1 if any
+    python scripts/index_advisor.py report --hours 24    # + unused/redundant/uncovered shapes
+    python scripts/index_advisor.py apply                # build missing indexes, one at a time
+    python scripts/index_advisor.py apply --collections journals,members --pause 5
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from dotenv import load_dotenv
+
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+load_dotenv(ROOT_DIR / '.env')
+
+from utils.index_advisor import INDEX_BUILD_PAUSE, IndexAdvisor  # noqa: E402
+
+
+async def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="FaithFlow index advisor")
+    parser.add_argument("command", choices=["check", "report", "apply"])
+    parser.add_argument("--collections", help="Comma-separated collections (default: all declared)")
+    parser.add_argument("--pause", type=float, default=INDEX_BUILD_PAUSE, help="Seconds between builds (apply)")
+    parser.add_argument("--max-docs", type=int, default=None, help="Skip collections larger than this (apply)")
+    parser.add_argument("--hours", type=int, default=24, help="Query profile window for uncovered shapes (report)")
+    args = parser.parse_args(argv)
+
+    collections = args.collections.split(",") if args.collections else None
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    advisor = IndexAdvisor(client[os.environ['DB_NAME']])
+
+    try:
+        if args.command == "check":
+            result: Any = await advisor.check(collections)
+        elif args.command == "apply":
+            result = await advisor.apply(collections, pause=args.pause, max_docs=args.max_docs)
+        else:
+            entries, meta = {}, {}
+            try:
+                from utils.query_profiler import query_profiler
+                entries, meta, _ = await query_profiler.cluster_entries(args.hours)
+            except Exception as e:
+                print(f"Query profile unavailable ({e}); reporting indexes only", file=sys.stderr)
+            result = await advisor.report(entries, meta, collections)
+        print(json.dumps(result, indent=2, default=str))
+    finally:
+        client.close()
+        from config.redis import close_redis
+        await close_redis()
+
+    return 1 if args.command == "check" and result else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    sys.exit(asyncio.run(main()))
@@ -27,84 +27,20 @@ load_dotenv(Path(__file__).parent.parent / '.env')
 
 async def create_indexes(db):
     """Create or update database indexes (safe to run multiple times)."""
+    from utils.index_advisor import IndexAdvisor
+
     print("\n📊 Creating/updating database indexes...")
 
-    # User indexes
-    await db.users.create_index("email", unique=True)
-    await db.users.create_index("church_id")
-    print("✓ User indexes")
-
-    # Church indexes
-    await db.churches.create_index("id", unique=True)
-    print("✓ Church indexes")
-
-    # Member indexes - optimized for filtering and queries
-    await db.members.create_index("church_id")
-    await db.members.create_index("email")
-    await db.members.create_index("phone_whatsapp")
-    await db.members.create_index([("church_id", 1), ("is_deleted", 1), ("is_active", 1)])
-    await db.members.create_index([("church_id", 1), ("member_status", 1)])
-    await db.members.create_index([("church_id", 1), ("demographic_category", 1)])
-    print("✓ Member indexes")
-
-    # Group indexes
-    await db.groups.create_index("church_id")
-    await db.group_memberships.create_index([("church_id", 1), ("group_id", 1), ("status", 1)])
-    print("✓ Group indexes")
-
-    # Event indexes
-    await db.events.create_index("church_id")
-    await db.events.create_index([("church_id", 1), ("event_type", 1)])
-    print("✓ Event indexes")
-
-    # Article indexes
-    await db.articles.create_index([("church_id", 1), ("status", 1)])
-    await db.articles.create_index([("church_id", 1), ("schedule_status", 1)])
-    await db.articles.create_index([("church_id", 1), ("created_at", -1)])
-    print("✓ Article indexes")
-
-    # Prayer request indexes
-    await db.prayer_requests.create_index("church_id")
-    await db.prayer_requests.create_index([("church_id", 1), ("status", 1), ("created_at", -1)])
-    print("✓ Prayer request indexes")
-
-    # Donation indexes
-    await db.donations.create_index("church_id")
-    await db.donations.create_index("member_id")
-    print("✓ Donation indexes")
-
-    # Content indexes
-    await db.content.create_index("church_id")
-    print("✓ Content indexes")
-
-    # Spiritual journey indexes
-    await db.spiritual_journeys.create_index("church_id")
-    await db.spiritual_journeys.create_index("member_id")
-    print("✓ Spiritual journey indexes")
-
-    # Settings indexes
-    await db.member_statuses.create_index([("church_id", 1), ("name", 1)], unique=True)
-    await db.member_statuses.create_index([("church_id", 1), ("order", 1)])
-    await db.demographic_presets.create_index([("church_id", 1), ("name", 1)], unique=True)
-    await db.demographic_presets.create_index([("church_id", 1), ("order", 1)])
-    print("✓ Settings indexes")
-
-    # Explore indexes
-    await db.church_explore_settings.create_index("church_id", unique=True)
-    await db.content_schedule.create_index([("church_id", 1), ("content_type", 1), ("date", 1)])
-    await db.content_schedule.create_index([("church_id", 1), ("is_takeover", 1)])
-    await db.user_explore_progress.create_index([("church_id", 1), ("user_id", 1)], unique=True)
-    await db.user_explore_progress.create_index([("church_id", 1), ("streak.current_streak", -1)])
-    await db.daily_devotions.create_index([("scope", 1), ("status", 1), ("published_at", 1)])
-    await db.daily_devotions.create_index([("scope", 1), ("church_id", 1)])
-    await db.verses_of_the_day.create_index([("scope", 1), ("status", 1), ("published_at", 1)])
-    await db.bible_figures_of_the_day.create_index([("scope", 1), ("status", 1), ("published_at", 1)])
-    await db.daily_quizzes.create_index([("scope", 1), ("status", 1), ("published_at", 1)])
-    await db.bible_studies.create_index([("scope", 1), ("status", 1)])
-    await db.topical_categories.create_index([("scope", 1), ("order", 1)])
-    print("✓ Explore indexes")
-
-    print("\n✅ All indexes created/updated successfully")
+    # Declared in IndexManager.INDEXES (utils/performance.py); only missing ones are built
+    results = await IndexAdvisor(db).apply()
+    created = sum(r.get("indexes_created", 0) for r in results.values())
+    for name, result in results.items():
+        if result["status"] != "success":
+            print(f"⚠ {name}: {result.get('errors') or result.get('error')}")
+        if result.get("conflicts"):
+            print(f"⚠ {name}: indexes differ from their declaration: {[c['index'] for c in result['conflicts']]}")
+
+    print(f"\n✅ {created} indexes created, all declared indexes checked")
 
 
 async def check_migration_status(db):
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Re-analyze stored prayer requests
+
+Rewrites prayer_analyses (themes, emotions, urgency, suggested content)
+for historical prayer requests with the current keyword matcher, and
+refreshes the analysis summary stored on each request. Profiles and
+follow-ups are not touched. Safe to re-run.
+
+Usage:
+    python scripts/reanalyze_prayer_requests.py [church_id] [--batch-size 500] [--dry-run]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from motor.motor_asyncio import AsyncIOMotorClient
+from dotenv import load_dotenv
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+load_dotenv(ROOT_DIR / '.env')
+
+from services.explore.prayer_intelligence_service import PrayerIntelligenceService  # noqa: E402
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Re-analyze stored prayer requests")
+    parser.add_argument("church_id", nargs="?", default=None)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--dry-run", action="store_true", help="Report changes without writing")
+    args = parser.parse_args()
+
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    db = client[os.environ['DB_NAME']]
+
+    print(f"Re-analyzing prayer requests{' for church ' + args.church_id if args.church_id else ''}...")
+    stats = await PrayerIntelligenceService(db).reanalyze_prayer_requests(
+        church_id=args.church_id,
+        batch_size=args.batch_size,
+        dry_run=args.dry_run,
+    )
+    print(
+        f"Scanned {stats['scanned']}, analysis changed for {stats['changed']}, "
+        f"wrote {stats['written']}{' (dry run)' if args.dry_run else ''}"
+    )
+
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
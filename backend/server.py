@@ -1,13 +1,11 @@
-from fastapi import FastAPI, APIRouter, Request, Response
-from starlette.middleware.gzip import GZipMiddleware
+from fastapi import FastAPI, APIRouter
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+import asyncio
 import os
 import logging
-import time
 from pathlib import Path
-from typing import Callable
 
 # Custom ORJSONResponse for ~10x faster JSON serialization
 from utils.responses import ORJSONResponse
@@ -15,6 +13,15 @@ from utils.responses import ORJSONResponse
 # Environment validation (runs on import if RUN_ENV_VALIDATION=true)
 from utils.env_validation import validate_environment
 
+# Command monitoring: per-query-shape latency, plans and handler attribution
+from utils.query_profiler import PROFILER_ENABLED, query_profiler
+
+# Request tracing: per-route latency histograms, budgets, Server-Timing
+from middleware.tracing import (
+    TRACING_ENABLED, install_executor_tracing, install_http_tracing,
+    mongo_span_listener, route_latency,
+)
+
 # Import routes
 from routes import (
     auth, churches, members, settings, import_export, photo_document_sim,
@@ -28,6 +35,8 @@ from routes import (
     whatsapp_templates,  # WhatsApp message templates
     broadcast_campaigns,  # Push notification broadcasts
     notification_templates,  # Reusable notification templates
+    query_profile,  # MongoDB query profiler (super admin)
+    route_latency as route_latency_routes,  # Per-route latency (super admin)
 )
 
 # Import Explore routes
@@ -98,6 +107,10 @@ client = AsyncIOMotorClient(
     serverSelectionTimeoutMS=5000,  # Timeout for server selection
     connectTimeoutMS=10000,    # Timeout for initial connection
     retryWrites=True,          # Auto-retry failed writes
+    event_listeners=(
+        ([query_profiler] if PROFILER_ENABLED else [])
+        + ([mongo_span_listener] if TRACING_ENABLED else [])
+    ),
 )
 db = client[os.environ['DB_NAME']]
 
@@ -150,10 +163,22 @@ async def health_check():
 async def performance_stats():
     """Get performance statistics."""
     from utils.performance import get_cache, PerformanceMonitor
+    from services.mqtt_service import get_mqtt_service
+    from services.redis.tiered import tiered_cache
+    from utils.principal_cache import principal_cache
+    from services.audit_service import audit_writer
+    from services.explore.prayer_followup_dispatcher import prayer_followup_dispatcher
     cache = get_cache()
     return {
         "cache": cache.stats(),
+        "tiered_cache": tiered_cache.get_stats(),
+        "auth_cache": principal_cache.get_stats(),
         "queries": PerformanceMonitor.get_stats(),
+        "mqtt": get_mqtt_service().get_stats(),
+        "audit_writer": audit_writer.get_stats(),
+        "prayer_followups": await prayer_followup_dispatcher.get_stats(),
+        "query_profiler": query_profiler.get_stats(),
+        "route_latency": route_latency.get_stats(),
     }
 
 # Include all routers
@@ -164,6 +189,8 @@ api_router.include_router(settings.router)
 api_router.include_router(webhooks.router)
 api_router.include_router(api_keys.router)
 api_router.include_router(system_settings.router, prefix="/system", tags=["System Settings"])
+api_router.include_router(query_profile.router)
+api_router.include_router(route_latency_routes.router)
 api_router.include_router(member_status_automation.router)
 api_router.include_router(import_export.router)
 api_router.include_router(photo_document_sim.router)
@@ -267,8 +294,13 @@ api_router.include_router(kiosk.router)
 # Include the API router in the main app
 app.include_router(api_router)
 
-# Add GZIP compression middleware (compress responses > 500 bytes)
-app.add_middleware(GZipMiddleware, minimum_size=500)
+# Middleware is pure ASGI (no BaseHTTPMiddleware): each layer is a plain
+# function call per request, and streaming responses (SSE) pass straight through.
+# Added innermost first.
+
+# GZIP compression (responses > 500 bytes; skips SSE and already-compressed media)
+from middleware.compression import SelectiveGZipMiddleware
+app.add_middleware(SelectiveGZipMiddleware, minimum_size=500)
 
 app.add_middleware(
     CORSMiddleware,
@@ -282,135 +314,10 @@ app.add_middleware(
 from middleware.rate_limit import RateLimitMiddleware
 app.add_middleware(RateLimitMiddleware)
 
-# Security headers middleware
-@app.middleware("http")
-async def add_security_headers(request: Request, call_next: Callable):
-    """Add security headers to all responses (OWASP best practices)."""
-    response = await call_next(request)
-
-    # Prevent MIME type sniffing
-    response.headers["X-Content-Type-Options"] = "nosniff"
-
-    # Prevent clickjacking (allow same origin for iframes if needed)
-    response.headers["X-Frame-Options"] = "SAMEORIGIN"
-
-    # XSS protection (legacy but still useful for older browsers)
-    response.headers["X-XSS-Protection"] = "1; mode=block"
-
-    # Control referrer information sent with requests
-    response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-
-    # Restrict browser features (camera, mic, geolocation, etc.)
-    response.headers["Permissions-Policy"] = "camera=self, microphone=self, geolocation=()"
-
-    # HTTP Strict Transport Security (HSTS)
-    # Only add for HTTPS requests or when behind a reverse proxy
-    if request.url.scheme == "https" or request.headers.get("x-forwarded-proto") == "https":
-        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains; preload"
-
-    # Prevent caching of sensitive responses
-    if "/auth/" in str(request.url.path) or "/login" in str(request.url.path):
-        response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, private"
-        response.headers["Pragma"] = "no-cache"
-
-    # Content Security Policy - relaxed for API (frontend handles strict CSP)
-    # Only set for HTML responses to avoid breaking JSON APIs
-    content_type = response.headers.get("content-type", "")
-    if "text/html" in content_type:
-        response.headers["Content-Security-Policy"] = "default-src 'self'; script-src 'self' 'unsafe-inline'; style-src 'self' 'unsafe-inline'"
-
-    return response
-
-# Request timing middleware
-@app.middleware("http")
-async def add_process_time_header(request: Request, call_next: Callable):
-    """Add X-Process-Time header to all responses for performance monitoring."""
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = f"{process_time:.4f}"
-
-    # Log slow requests (> 2 seconds)
-    if process_time > 2.0:
-        logger.warning(f"Slow request: {request.method} {request.url.path} took {process_time:.2f}s")
-
-    return response
-
-
-# Cache-Control headers middleware
-@app.middleware("http")
-async def add_cache_control_headers(request: Request, call_next: Callable):
-    """
-    Add appropriate Cache-Control headers to API responses.
-
-    Strategy:
-    - GET /api/settings/*, /api/categories/*: public, max-age=3600 (1 hour) - static data
-    - GET /api/members/*, /api/events/*: private, max-age=300 (5 min) - user data
-    - POST, PATCH, DELETE: no-store - mutations should never be cached
-    - Health endpoints: no-cache
-    """
-    response = await call_next(request)
-
-    path = request.url.path
-    method = request.method
-
-    # Skip non-API paths
-    if not path.startswith("/api") and not path.startswith("/public"):
-        return response
-
-    # Never cache mutations
-    if method in ("POST", "PATCH", "PUT", "DELETE"):
-        response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate"
-        return response
-
-    # Only cache GET requests
-    if method != "GET":
-        return response
-
-    # Static/semi-static data - longer cache
-    static_paths = (
-        "/settings/church",
-        "/settings/member-statuses",
-        "/settings/demographics",
-        "/categories",
-        "/bible",
-        "/explore/categories",
-    )
-    if any(static_path in path for static_path in static_paths):
-        response.headers["Cache-Control"] = "public, max-age=3600, stale-while-revalidate=86400"
-        return response
-
-    # User-specific data - shorter cache, private
-    user_paths = (
-        "/members",
-        "/events",
-        "/groups",
-        "/communities",
-        "/donations",
-        "/giving",
-    )
-    if any(user_path in path for user_path in user_paths):
-        response.headers["Cache-Control"] = "private, max-age=300, stale-while-revalidate=600"
-        return response
-
-    # Real-time data - minimal or no cache
-    realtime_paths = (
-        "/notifications",
-        "/messages",
-        "/call",
-    )
-    if any(rt_path in path for rt_path in realtime_paths):
-        response.headers["Cache-Control"] = "private, max-age=30"
-        return response
-
-    # Health endpoints - no cache
-    if "/health" in path:
-        response.headers["Cache-Control"] = "no-cache"
-        return response
-
-    # Default: moderate cache for other GET endpoints
-    response.headers["Cache-Control"] = "private, max-age=60"
-    return response
+# Request context: request id, tenant context, X-Process-Time, security and
+# Cache-Control headers (see middleware/request_context.py)
+from middleware.request_context import RequestContextMiddleware
+app.add_middleware(RequestContextMiddleware)
 
 # Configure logging
 logging.basicConfig(
@@ -419,8 +326,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Initialize APScheduler for article publishing
-from scheduler import setup_scheduler, start_scheduler, shutdown_scheduler
+# Initialize APScheduler for background jobs
+from scheduler import SCHEDULER_MODE, setup_scheduler, start_scheduler, shutdown_scheduler
 
 # Redis initialization
 redis_enabled = os.environ.get('REDIS_ENABLED', 'true').lower() == 'true'
@@ -432,6 +339,10 @@ async def startup_event():
     logger.info("FaithFlow Backend Starting...")
     logger.info("=" * 60)
 
+    # Trace executor hops and outbound HTTP of each request
+    install_executor_tracing()
+    install_http_tracing()
+
     # Initialize Redis connection (if enabled)
     redis_client = None
     if redis_enabled:
@@ -447,6 +358,11 @@ async def startup_event():
             register_default_handlers()
             await pubsub_service.start_subscriber()
             logger.info("✓ Redis pub/sub subscriber started")
+
+            # Fold Explore engagement events into profiles in the background
+            from services.explore.engagement_tracker import engagement_tracker
+            await engagement_tracker.start(db)
+            logger.info("✓ Explore engagement aggregator started")
         except Exception as e:
             # In production, Redis is required for coordinated rate limiting across instances
             is_production = os.environ.get("ENVIRONMENT", "").lower() in ("production", "prod")
@@ -468,6 +384,11 @@ async def startup_event():
     else:
         logger.info("✓ Rate limiting using in-memory backend")
 
+        # No Redis stream: apply Explore engagement events synchronously
+        from services.explore.engagement_tracker import engagement_tracker
+        engagement_tracker.enabled = False
+        engagement_tracker.bind(db)
+
     # Log API configuration
     if API_PREFIX:
         logger.info(f"✓ API running in PATH mode: {API_PREFIX}/* (e.g., domain.com{API_PREFIX}/auth/login)")
@@ -482,10 +403,52 @@ async def startup_event():
     except Exception as e:
         logger.warning(f"⚠ Performance initialization partial: {e}")
 
-    # Initialize scheduler
-    setup_scheduler(db)
-    start_scheduler()
-    logger.info("✓ Article scheduler initialized and started")
+    # Load Bible versions into memory in the background (routes load lazily until then)
+    if os.environ.get("BIBLE_STORE_PRELOAD", "true").lower() == "true":
+        from services.bible_store import bible_store
+        asyncio.create_task(bible_store.warm(db))
+        logger.info("✓ Bible store warm-up started")
+
+    # Index members created before search fields existed (no-op once done)
+    from services.member_search_index import backfill_search_fields
+    asyncio.create_task(backfill_search_fields(db))
+
+    # Index community messages sent before message search existed (no-op once done)
+    from services.community_search_service import backfill_search_terms
+    asyncio.create_task(backfill_search_terms(db))
+
+    # Fold pre-existing leaderboard scores into the overall boards (no-op once done)
+    if redis_client is not None:
+        from services.redis.leaderboard import backfill_overall_leaderboards
+        asyncio.create_task(backfill_overall_leaderboards())
+
+    # Build Explore content counters (dashboard counts directly until this finishes)
+    from services.explore.content_counters import reconcile_explore_counters
+    asyncio.create_task(reconcile_explore_counters(db))
+
+    # Start MQTT publisher (connects in the background, retries with backoff)
+    from services.mqtt_service import mqtt_startup
+    await mqtt_startup()
+
+    # Start the batched audit log writer (replays entries spilled to Redis)
+    from services.audit_service import audit_writer
+    audit_writer.start(db)
+
+    # Explain sampled query shapes; roll latency histograms up to Redis
+    query_profiler.start(client, rollup=redis_enabled)
+
+    # Initialize scheduler (in production a dedicated scheduler process
+    # dispatches jobs to the ARQ worker instead: SCHEDULER_MODE=external)
+    if SCHEDULER_MODE == "embedded":
+        setup_scheduler(db)
+        start_scheduler()
+        logger.info("✓ Background job scheduler initialized and started")
+
+        # Send prayer follow-ups as they fall due (the ARQ worker does this otherwise)
+        from services.explore.prayer_followup_dispatcher import prayer_followup_dispatcher
+        await prayer_followup_dispatcher.start(db)
+    else:
+        logger.info("✓ Background jobs scheduled by the dedicated scheduler process")
 
     # Initialize iPaymu service (optional - only if credentials configured)
     ipaymu_va = os.environ.get('IPAYMU_VA')
@@ -512,6 +475,17 @@ async def shutdown_db_client():
     """Cleanup on shutdown."""
     shutdown_scheduler()
 
+    # Flush queued MQTT messages before exiting
+    from services.mqtt_service import mqtt_shutdown
+    await mqtt_shutdown()
+
+    # Write buffered audit log entries (spilled to Redis if Mongo is unavailable)
+    from services.audit_service import audit_writer
+    await audit_writer.stop()
+
+    # Push the last query profile deltas before Redis closes
+    await query_profiler.stop()
+
     # Close Redis connection
     if redis_enabled:
         try:
@@ -519,6 +493,15 @@ async def shutdown_db_client():
             from services.redis import pubsub_service
             await pubsub_service.stop_subscriber()
 
+            from services.explore.engagement_tracker import engagement_tracker
+            await engagement_tracker.stop()
+
+            from services.explore.prayer_followup_dispatcher import prayer_followup_dispatcher
+            await prayer_followup_dispatcher.stop()
+
+            from services.article_cache import flush_article_views
+            await flush_article_views(db)
+
             from config.redis import close_redis
             await close_redis()
             logger.info("✓ Redis connection closed")
@@ -18,6 +18,7 @@ from motor.motor_asyncio import AsyncIOMotorDatabase
 from utils.system_config import get_ai_settings
 from services.image_prompt_builder import ImagePromptBuilder, build_image_prompt
 from services.seaweedfs_service import get_seaweedfs_service, SeaweedFSError, StorageCategory
+from services.redis.generation_cache import generation_cache
 
 logger = logging.getLogger(__name__)
 
@@ -109,6 +110,7 @@ class AIService:
         user_id: str,
         custom_prompt: Optional[str] = None,
         generate_both_languages: bool = True,
+        use_cache: bool = True,
     ) -> Dict[str, Any]:
         """
         Queue content generation job
@@ -128,6 +130,7 @@ class AIService:
             "user_id": user_id,
             "custom_prompt": custom_prompt,
             "generate_both_languages": generate_both_languages,
+            "use_cache": use_cache,
             "status": "pending",
             "created_at": datetime.utcnow(),
             "updated_at": datetime.utcnow(),
@@ -174,18 +177,20 @@ class AIService:
             # Generate content based on type
             content_type = job["content_type"]
             model = job["model"]
+            church_id = job.get("church_id")
+            use_cache = job.get("use_cache", True)
             custom_prompt = job.get("custom_prompt")
             generate_both_languages = job.get("generate_both_languages", True)
 
             # Generate text content
             if content_type == "devotion":
-                generated = await self._generate_devotion(model, custom_prompt, generate_both_languages)
+                generated = await self._generate_devotion(model, custom_prompt, generate_both_languages, church_id, use_cache)
             elif content_type == "verse":
-                generated = await self._generate_verse(model, custom_prompt, generate_both_languages)
+                generated = await self._generate_verse(model, custom_prompt, generate_both_languages, church_id, use_cache)
             elif content_type == "figure":
-                generated = await self._generate_figure(model, custom_prompt, generate_both_languages)
+                generated = await self._generate_figure(model, custom_prompt, generate_both_languages, church_id, use_cache)
             elif content_type == "quiz":
-                generated = await self._generate_quiz(model, custom_prompt, generate_both_languages)
+                generated = await self._generate_quiz(model, custom_prompt, generate_both_languages, church_id, use_cache)
             else:
                 raise ValueError(f"Unknown content type: {content_type}")
 
@@ -255,11 +260,50 @@ class AIService:
                 }
             )
 
+    async def _complete_cached(
+        self,
+        content_type: str,
+        model: str,
+        prompt: str,
+        max_tokens: int,
+        church_id: Optional[str] = None,
+        use_cache: bool = True,
+    ) -> str:
+        """
+        Run a single-turn Claude completion through the shared generation cache.
+
+        Identical prompts for the same model and content type (common across
+        churches for the same figure/topic) are answered from Redis. With
+        use_cache=False the cache is not read but the fresh result replaces
+        the cached one. Churches that opted out neither read nor populate it.
+        """
+        cache_allowed = await generation_cache.is_enabled_for_church(church_id)
+        if cache_allowed and use_cache:
+            cached = await generation_cache.get(content_type, model, prompt)
+            if cached is not None:
+                logger.info(f"Generation cache hit for {content_type}")
+                return cached.text
+
+        message = self.client.messages.create(
+            model=model,
+            max_tokens=max_tokens,
+            temperature=0.7,
+            messages=[{"role": "user", "content": prompt}]
+        )
+        response_text = message.content[0].text
+
+        if cache_allowed and response_text.find('{') != -1:
+            await generation_cache.set(content_type, model, prompt, [response_text])
+
+        return response_text
+
     async def _generate_devotion(
         self,
         model: str,
         custom_prompt: Optional[str],
-        generate_both_languages: bool
+        generate_both_languages: bool,
+        church_id: Optional[str] = None,
+        use_cache: bool = True,
     ) -> Dict[str, Any]:
         """Generate a daily devotion using Claude"""
 
@@ -304,21 +348,8 @@ Return JSON with English only, in this exact format:
   "tags": ["faith", "spiritual-growth"]
 }}"""
 
-        # Call Claude API
-        message = self.client.messages.create(
-            model=model,
-            max_tokens=4096,
-            temperature=0.7,
-            messages=[
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ]
-        )
-
-        # Parse response
-        response_text = message.content[0].text
+        # Call Claude API (or replay a cached generation)
+        response_text = await self._complete_cached("devotion", model, prompt, 4096, church_id, use_cache)
 
         # Extract JSON from response (in case Claude adds explanation)
         json_start = response_text.find('{')
@@ -335,7 +366,9 @@ Return JSON with English only, in this exact format:
         self,
         model: str,
         custom_prompt: Optional[str],
-        generate_both_languages: bool
+        generate_both_languages: bool,
+        church_id: Optional[str] = None,
+        use_cache: bool = True,
     ) -> Dict[str, Any]:
         """Generate a verse of the day with all 4 required fields:
         - verse: BibleReference object (book, chapter, verse_start, verse_end, translation)
@@ -383,14 +416,7 @@ IMPORTANT:
 
 Return JSON with English only, same structure but only "en" field for text."""
 
-        message = self.client.messages.create(
-            model=model,
-            max_tokens=3072,
-            temperature=0.7,
-            messages=[{"role": "user", "content": prompt}]
-        )
-
-        response_text = message.content[0].text
+        response_text = await self._complete_cached("verse", model, prompt, 3072, church_id, use_cache)
         json_start = response_text.find('{')
         json_end = response_text.rfind('}') + 1
         json_text = response_text[json_start:json_end]
@@ -401,7 +427,9 @@ Return JSON with English only, same structure but only "en" field for text."""
         self,
         model: str,
         custom_prompt: Optional[str],
-        generate_both_languages: bool
+        generate_both_languages: bool,
+        church_id: Optional[str] = None,
+        use_cache: bool = True,
     ) -> Dict[str, Any]:
         """Generate a Bible figure profile"""
 
@@ -433,14 +461,7 @@ Return JSON in this exact format:
 
 Return JSON with English only."""
 
-        message = self.client.messages.create(
-            model=model,
-            max_tokens=4096,
-            temperature=0.7,
-            messages=[{"role": "user", "content": prompt}]
-        )
-
-        response_text = message.content[0].text
+        response_text = await self._complete_cached("figure", model, prompt, 4096, church_id, use_cache)
         json_start = response_text.find('{')
         json_end = response_text.rfind('}') + 1
         json_text = response_text[json_start:json_end]
@@ -451,7 +472,9 @@ Return JSON with English only."""
         self,
         model: str,
         custom_prompt: Optional[str],
-        generate_both_languages: bool
+        generate_both_languages: bool,
+        church_id: Optional[str] = None,
+        use_cache: bool = True,
     ) -> Dict[str, Any]:
         """Generate a Bible quiz"""
 
@@ -487,14 +510,7 @@ Generate 5-10 questions."""
 
 Return JSON with English only. Generate 5-10 questions."""
 
-        message = self.client.messages.create(
-            model=model,
-            max_tokens=4096,
-            temperature=0.7,
-            messages=[{"role": "user", "content": prompt}]
-        )
-
-        response_text = message.content[0].text
+        response_text = await self._complete_cached("quiz", model, prompt, 4096, church_id, use_cache)
         json_start = response_text.find('{')
         json_end = response_text.rfind('}') + 1
         json_text = response_text[json_start:json_end]
@@ -708,7 +724,8 @@ Questions should be engaging, educational, and encourage deeper Bible study."""
             church_id=church_id,
             user_id=user_id,
             custom_prompt=original_job.get("custom_prompt"),
-            generate_both_languages=original_job.get("generate_both_languages", True)
+            generate_both_languages=original_job.get("generate_both_languages", True),
+            use_cache=False,  # Skip cached replay; the fresh result refreshes the cache
         )
 
     async def generate_image(
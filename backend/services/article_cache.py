@@ -0,0 +1,228 @@
+"""
+Article Render Cache and View Counter Buffer
+
+Public article reads used to run bleach over the full HTML on every
+request and then ``$inc`` views_count on the article document before
+responding. A popular article therefore cost one sanitize pass and one
+write to the same hot document per view.
+
+- ArticleRenderCache keeps the sanitized HTML and an ETag in Redis under
+  the article id and its ``updated_at`` version. An edit bumps
+  ``updated_at``, so stale renders are never served and simply expire.
+  Renders are warmed when an article is published (scheduler) or edited.
+- ArticleViewBuffer counts views with ``HINCRBY`` on one Redis hash and
+  flush() applies the totals to Mongo with a single bulk_write
+  (scheduler job every VIEW_FLUSH_INTERVAL seconds, and on shutdown).
+
+Both fall back to the direct path (sanitize / ``$inc``) when Redis is
+unavailable.
+"""
+
+import hashlib
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from config.redis import get_redis
+from services.article_service import increment_article_views, sanitize_content_for_public
+from services.redis.utils import redis_key, TTL
+from utils.serialization import json_dumps_str, json_loads
+
+logger = logging.getLogger(__name__)
+
+
+RENDER_TTL = TTL.DAYS_7
+
+VIEWS_PENDING_KEY = redis_key("articles", "views", "pending")
+VIEWS_PROCESSING_KEY = redis_key("articles", "views", "processing")
+VIEWS_FLUSH_LOCK_KEY = redis_key("articles", "views", "flush_lock")
+
+VIEW_FLUSH_INTERVAL = 30  # seconds
+VIEW_FLUSH_BATCH = 1000
+
+
+def article_version(article: Dict[str, Any]) -> str:
+    """Version of an article's content (its last update time)."""
+    updated = article.get("updated_at") or article.get("created_at")
+    if isinstance(updated, datetime):
+        return str(int(updated.timestamp() * 1000))
+    return str(updated or "0")
+
+
+def render_article(article_id: str, version: str, content: str) -> Dict[str, str]:
+    """Sanitize article HTML and compute its ETag."""
+    html = sanitize_content_for_public(content or "")
+    digest = hashlib.sha256(f"{article_id}:{version}:".encode() + html.encode()).hexdigest()[:32]
+    return {"content": html, "etag": f'W/"{digest}"'}
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches an ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    bare = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == bare for tag in if_none_match.split(","))
+
+
+class ArticleRenderCache:
+    """Sanitized article HTML + ETag, keyed by article id and version."""
+
+    @staticmethod
+    def _key(article_id: str, version: str) -> str:
+        return redis_key("articles", "rendered", article_id, version)
+
+    async def _store(self, key: str, rendered: Dict[str, str]) -> None:
+        try:
+            redis = await get_redis()
+            await redis.set(key, json_dumps_str(rendered), ex=RENDER_TTL)
+        except Exception as e:
+            logger.debug(f"Article render cache write failed: {e}")
+
+    async def warm(self, article: Dict[str, Any]) -> Dict[str, str]:
+        """Render an article (with content) and cache the result."""
+        version = article_version(article)
+        rendered = render_article(article["id"], version, article.get("content", ""))
+        await self._store(self._key(article["id"], version), rendered)
+        return rendered
+
+    async def get(self, db: AsyncIOMotorDatabase, article: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Rendered content for an article.
+
+        ``article`` needs id and updated_at; content is loaded from Mongo
+        only on a cache miss when the caller didn't fetch it.
+        """
+        return (await self.get_many(db, [article]))[0]
+
+    async def get_many(
+        self, db: AsyncIOMotorDatabase, articles: List[Dict[str, Any]]
+    ) -> List[Dict[str, str]]:
+        """Rendered content for several articles (one MGET, one query for misses)."""
+        if not articles:
+            return []
+
+        keys = [self._key(a["id"], article_version(a)) for a in articles]
+        cached: List[Optional[str]] = [None] * len(keys)
+        try:
+            redis = await get_redis()
+            cached = await redis.mget(keys)
+        except Exception as e:
+            logger.debug(f"Article render cache read failed: {e}")
+
+        results: List[Optional[Dict[str, str]]] = [json_loads(c) if c else None for c in cached]
+        missing = [i for i, r in enumerate(results) if r is None]
+        if not missing:
+            return results
+
+        need_content = [articles[i]["id"] for i in missing if "content" not in articles[i]]
+        contents: Dict[str, str] = {}
+        if need_content:
+            async for doc in db.articles.find(
+                {"id": {"$in": need_content}}, {"_id": 0, "id": 1, "content": 1}
+            ):
+                contents[doc["id"]] = doc.get("content", "")
+
+        for i in missing:
+            article = articles[i]
+            content = article["content"] if "content" in article else contents.get(article["id"], "")
+            results[i] = render_article(article["id"], article_version(article), content)
+            await self._store(keys[i], results[i])
+        return results
+
+
+class ArticleViewBuffer:
+    """Buffers article views in a Redis hash and flushes them in bulk."""
+
+    async def record_view(self, db: AsyncIOMotorDatabase, article_id: str) -> int:
+        """
+        Count one view.
+
+        Returns:
+            Views buffered for the article and not yet in Mongo (add this to
+            views_count for an up-to-date figure)
+        """
+        try:
+            redis = await get_redis()
+            return int(await redis.hincrby(VIEWS_PENDING_KEY, article_id, 1))
+        except Exception as e:
+            logger.debug(f"View buffer unavailable, writing directly: {e}")
+            await increment_article_views(db, article_id)
+            return 0
+
+    async def flush(self, db: AsyncIOMotorDatabase) -> int:
+        """
+        Apply buffered views to Mongo.
+
+        The pending hash is renamed to a processing key so views keep
+        accumulating while the batch is written; a processing hash left
+        behind by an interrupted flush is applied first. Articles are removed
+        from it as their updates are applied, so only the updates that did
+        not land are sent again.
+
+        Returns:
+            Number of articles updated
+        """
+        try:
+            redis = await get_redis()
+            if not await redis.set(VIEWS_FLUSH_LOCK_KEY, "1", nx=True, ex=VIEW_FLUSH_INTERVAL * 4):
+                return 0  # Another instance is flushing
+        except Exception as e:
+            logger.debug(f"View flush skipped, Redis unavailable: {e}")
+            return 0
+
+        try:
+            if not await redis.exists(VIEWS_PROCESSING_KEY):
+                if not await redis.exists(VIEWS_PENDING_KEY):
+                    return 0
+                # Only flush() removes the pending hash, and it holds the lock
+                await redis.rename(VIEWS_PENDING_KEY, VIEWS_PROCESSING_KEY)
+            counts = await redis.hgetall(VIEWS_PROCESSING_KEY)
+
+            article_ids = [article_id for article_id, count in counts.items() if int(count) > 0]
+            ops = [UpdateOne({"id": article_id}, {"$inc": {"views_count": int(counts[article_id])}})
+                   for article_id in article_ids]
+            applied = 0
+            failed = False
+            for start in range(0, len(ops), VIEW_FLUSH_BATCH):
+                batch = article_ids[start:start + VIEW_FLUSH_BATCH]
+                try:
+                    await db.articles.bulk_write(ops[start:start + VIEW_FLUSH_BATCH], ordered=False)
+                    errors = set()
+                except BulkWriteError as e:
+                    errors = {error["index"] for error in e.details.get("writeErrors", [])}
+                    failed = True
+                    logger.error(f"Article view flush: {len(errors)} update(s) failed, kept for the next flush")
+                # Drop what was applied so a later retry only re-sends the failures
+                done = [article_id for i, article_id in enumerate(batch) if i not in errors]
+                if done:
+                    await redis.hdel(VIEWS_PROCESSING_KEY, *done)
+                applied += len(done)
+
+            if not failed:
+                await redis.delete(VIEWS_PROCESSING_KEY)
+            if applied:
+                logger.debug(f"Flushed views for {applied} articles")
+            return applied
+        except Exception as e:
+            logger.error(f"Article view flush failed: {e}")
+            return 0
+        finally:
+            try:
+                await redis.delete(VIEWS_FLUSH_LOCK_KEY)
+            except Exception:
+                pass
+
+
+article_render_cache = ArticleRenderCache()
+article_view_buffer = ArticleViewBuffer()
+
+
+async def flush_article_views(db: AsyncIOMotorDatabase) -> None:
+    """Scheduler job: write buffered article views to Mongo."""
+    await article_view_buffer.flush(db)
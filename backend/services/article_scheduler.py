@@ -3,9 +3,12 @@ Article Scheduling Service
 Background worker to publish scheduled articles using APScheduler
 """
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
 from datetime import datetime
 import logging
 
+from services.article_cache import article_render_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -49,7 +52,7 @@ async def publish_scheduled_articles(db: AsyncIOMotorDatabase):
                     continue
                 
                 # Publish the article
-                await db.articles.update_one(
+                published = await db.articles.find_one_and_update(
                     {"id": article_id},
                     {
                         "$set": {
@@ -59,9 +62,14 @@ async def publish_scheduled_articles(db: AsyncIOMotorDatabase):
                             "scheduled_by": None,
                             "updated_at": datetime.utcnow()
                         }
-                    }
+                    },
+                    return_document=ReturnDocument.AFTER
                 )
                 
+                # Pre-render sanitized content so the first readers hit the cache
+                if published:
+                    await article_render_cache.warm(published)
+                
                 # Log to audit
                 await db.audit_logs.insert_one({
                     "id": str(__import__('uuid').uuid4()),
@@ -93,6 +101,9 @@ async def publish_scheduled_articles(db: AsyncIOMotorDatabase):
         
         if published_count > 0 or failed_count > 0:
             logger.info(f"Article scheduler completed: {published_count} published, {failed_count} failed")
-        
+
+        return {"processed": published_count, "failed": failed_count}
+
     except Exception as e:
         logger.error(f"Article scheduler error: {str(e)}")
+        raise
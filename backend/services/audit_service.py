@@ -1,12 +1,221 @@
+"""
+Audit trail.
+
+log_action() used to await an insert_one into audit_logs inside every
+mutation. Entries now go through AuditLogWriter: an in-process bounded
+buffer flushed with insert_many every FLUSH_INTERVAL seconds or
+FLUSH_BATCH entries by a background task (started with the app).
+
+- Compliance-critical modules (year-end closing, fiscal periods, beginning
+  balances) and callers passing ``sync=True`` are written synchronously.
+- When the buffer is full (Mongo not keeping up) or the app shuts down with
+  entries it could not write, entries are spilled to a Redis stream and
+  re-inserted later (drain_spill, at start and every DRAIN_INTERVAL).
+  Inserts are idempotent on the entry id, so a replayed entry is skipped.
+- Readers merge entries that are still buffered (pending_entries), so
+  routes/audit_logs.py shows an action as soon as it happened.
+- Without a running writer (scripts, tests) log_action writes directly.
+"""
+
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import BulkWriteError
+from collections import deque
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable
+import asyncio
+import time
 import uuid
 import logging
 
+from config.redis import get_redis
+from services.redis.utils import redis_key
+from utils.serialization import json_dumps_str, json_loads
+
 logger = logging.getLogger(__name__)
 
 
+FLUSH_INTERVAL = 0.25  # seconds
+FLUSH_BATCH = 200
+MAX_BUFFER = 5000
+DRAIN_INTERVAL = 60  # seconds
+
+SPILL_STREAM_KEY = redis_key("audit", "spill")
+
+# Modules whose audit entries must be durable before the request returns
+COMPLIANCE_CRITICAL_MODULES = {"year_end_closing", "fiscal_period", "beginning_balance"}
+
+
+class AuditLogWriter:
+    """Buffers audit entries and writes them to Mongo in batches."""
+
+    def __init__(
+        self,
+        batch_size: int = FLUSH_BATCH,
+        flush_interval: float = FLUSH_INTERVAL,
+        max_buffer: int = MAX_BUFFER,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self._buffer: deque = deque()
+        self._inflight: List[Dict[str, Any]] = []
+        self._db: Optional[AsyncIOMotorDatabase] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._stats = {"buffered": 0, "written": 0, "sync_writes": 0, "spilled": 0, "replayed": 0, "flush_errors": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, db: AsyncIOMotorDatabase) -> None:
+        """Start the background flusher (call once the event loop is running)."""
+        if self.running:
+            return
+        self._db = db
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        logger.info("Audit log writer started")
+
+    async def stop(self) -> None:
+        """Stop the flusher and write (or spill) everything still buffered."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._db is not None:
+            await self.flush()
+        if self._buffer:
+            remaining = list(self._buffer)
+            if await self._spill(remaining):
+                self._buffer.clear()
+            else:
+                logger.error(f"Lost {len(remaining)} audit log entries on shutdown")
+
+    async def write(self, db: AsyncIOMotorDatabase, entry: Dict[str, Any], sync: bool = False) -> None:
+        """Queue an entry (or write it now if sync or no flusher is running)."""
+        if sync or not self.running:
+            await db.audit_logs.insert_one(entry)
+            self._stats["sync_writes"] += 1
+            return
+
+        if len(self._buffer) >= self.max_buffer:
+            # Backpressure: Mongo isn't keeping up - spill instead of growing memory
+            if not await self._spill([entry]):
+                await db.audit_logs.insert_one(entry)
+                self._stats["sync_writes"] += 1
+            return
+
+        self._buffer.append(entry)
+        self._stats["buffered"] += 1
+        if len(self._buffer) >= self.batch_size:
+            self._wake.set()
+
+    def pending_entries(self, predicate: Callable[[Dict[str, Any]], bool]) -> List[Dict[str, Any]]:
+        """Entries not yet in Mongo that match ``predicate`` (newest first)."""
+        entries = [
+            {k: v for k, v in entry.items() if k != "_id"}
+            for entry in (*self._inflight, *self._buffer)
+            if predicate(entry)
+        ]
+        entries.sort(key=lambda e: e["timestamp"], reverse=True)
+        return entries
+
+    async def _run(self) -> None:
+        last_drain = 0.0
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+                if time.monotonic() - last_drain >= DRAIN_INTERVAL:
+                    last_drain = time.monotonic()
+                    await self.drain_spill(self._db)
+            except Exception as e:
+                logger.error(f"Audit log flusher error: {e}")
+
+    async def _insert(self, db: AsyncIOMotorDatabase, entries: List[Dict[str, Any]]) -> None:
+        """insert_many that treats already-written entries (same id) as success."""
+        try:
+            await db.audit_logs.insert_many(entries, ordered=False)
+        except BulkWriteError as e:
+            if any(err.get("code") != 11000 for err in e.details.get("writeErrors", [])):
+                raise
+
+    async def flush(self) -> int:
+        """Write buffered entries to Mongo. Returns entries written."""
+        written = 0
+        while self._buffer:
+            batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+            self._inflight = batch
+            try:
+                await self._insert(self._db, batch)
+                written += len(batch)
+            except Exception as e:
+                self._stats["flush_errors"] += 1
+                logger.error(f"Audit log flush failed ({len(batch)} entries): {e}")
+                if not await self._spill(batch):
+                    # Keep them for the next attempt
+                    self._buffer.extendleft(reversed(batch))
+                    break
+            finally:
+                self._inflight = []
+        self._stats["written"] += written
+        return written
+
+    async def _spill(self, entries: List[Dict[str, Any]]) -> bool:
+        """Append entries to the Redis spill stream. Returns False if Redis is unavailable."""
+        try:
+            redis = await get_redis()
+            async with redis.pipeline(transaction=False) as pipe:
+                for entry in entries:
+                    payload = {k: v for k, v in entry.items() if k != "_id"}
+                    pipe.xadd(SPILL_STREAM_KEY, {"e": json_dumps_str(payload)})
+                await pipe.execute()
+            self._stats["spilled"] += len(entries)
+            return True
+        except Exception as e:
+            logger.error(f"Audit log spill failed: {e}")
+            return False
+
+    async def drain_spill(self, db: AsyncIOMotorDatabase, batch: int = 500) -> int:
+        """Insert entries spilled to Redis (by any instance) into Mongo."""
+        replayed = 0
+        try:
+            redis = await get_redis()
+            while True:
+                items = await redis.xrange(SPILL_STREAM_KEY, count=batch)
+                if not items:
+                    break
+                entries = []
+                for _, fields in items:
+                    entry = json_loads(fields["e"])
+                    entry["timestamp"] = datetime.fromisoformat(entry["timestamp"])
+                    entries.append(entry)
+                await self._insert(db, entries)
+                await redis.xdel(SPILL_STREAM_KEY, *[stream_id for stream_id, _ in items])
+                replayed += len(entries)
+        except Exception as e:
+            logger.debug(f"Audit spill drain skipped: {e}")
+        if replayed:
+            self._stats["replayed"] += replayed
+            logger.info(f"Replayed {replayed} spilled audit log entries")
+        return replayed
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self._stats, "queued": len(self._buffer) + len(self._inflight), "running": self.running}
+
+
+audit_writer = AuditLogWriter()
+
+
 async def log_action(
     db: AsyncIOMotorDatabase,
     church_id: str,
@@ -15,7 +224,8 @@ async def log_action(
     module: str,
     description: str,
     before_data: Optional[Dict[str, Any]] = None,
-    after_data: Optional[Dict[str, Any]] = None
+    after_data: Optional[Dict[str, Any]] = None,
+    sync: Optional[bool] = None,
 ) -> str:
     """
     Log an action to the audit trail.
@@ -29,6 +239,7 @@ async def log_action(
         description: Action description
         before_data: Data before action (for update/delete)
         after_data: Data after action (for create/update)
+        sync: Write before returning (default: only for COMPLIANCE_CRITICAL_MODULES)
     
     Returns:
         Audit log ID
@@ -45,7 +256,9 @@ async def log_action(
         "timestamp": datetime.utcnow()
     }
     
-    await db.audit_logs.insert_one(audit_log)
+    if sync is None:
+        sync = module in COMPLIANCE_CRITICAL_MODULES
+    await audit_writer.write(db, audit_log, sync=sync)
     logger.info(f"Audit log created: {module}.{action_type} by {user_id}")
     
     return audit_log["id"]
@@ -78,5 +291,15 @@ async def get_entity_history(
             {"after_data.id": reference_id}
         ]
     }).sort("timestamp", -1)
-    
-    return await cursor.to_list(length=None)
+    logs = await cursor.to_list(length=None)
+
+    # Entries still waiting in the write buffer come first (newest)
+    pending = audit_writer.pending_entries(
+        lambda e: e["church_id"] == church_id and e["module"] == module and reference_id in (
+            (e.get("before_data") or {}).get("id"), (e.get("after_data") or {}).get("id")
+        )
+    )
+    if pending:
+        pending_ids = {e["id"] for e in pending}
+        logs = pending + [log for log in logs if log.get("id") not in pending_ids]
+    return logs
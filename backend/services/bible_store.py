@@ -0,0 +1,411 @@
+"""
+In-Memory Bible Store
+
+Bible text is immutable, so there is no reason to pay a Mongo round-trip
+(and sometimes a second ``bible_books`` lookup plus a second verse query)
+for every chapter or verse request.
+
+Each version is loaded once into a ``BibleVersionText``:
+
+- All verse texts packed into one contiguous UTF-8 buffer
+- ``(book_number, chapter, verse) -> position`` index plus an offsets array
+  into the buffer, and a per-chapter range index for chapter/range reads
+- The version's own book names (e.g. "Kejadian" in TB)
+
+``BookResolver`` maps English, Indonesian, Chinese and abbreviated book
+names ("Gen", "Kej", "1 Yoh", "I John", "创世记") to book numbers.
+
+Versions are read from ``data/bible/<file>.json`` when present (the files
+``scripts/import_bible_from_json.py`` imports), otherwise from the
+``bible_verses`` collection, and are loaded lazily on first use. Server
+startup warms every version in the background.
+
+Usage:
+    from services.bible_store import bible_store
+
+    verses = await bible_store.get_chapter("TB", "Yohanes", 3)
+    verse = await bible_store.get_verse("NIV", "jn", 3, 16)
+"""
+
+import asyncio
+import json
+import logging
+import re
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+BIBLE_DATA_DIR = Path(__file__).parent.parent / "data" / "bible"
+
+# Version code -> JSON file in data/bible (same files the import script reads)
+VERSION_FILES = {
+    "TB": "indo_tb.json",
+    "NIV": "niv.json",
+    "NKJV": "nkjv.json",
+    "NLT": "nlt.json",
+    "ESV": "esv.json",
+    "CHS": "chinese_union_simp.json",
+}
+
+ENGLISH_BOOK_NAMES = [
+    "Genesis", "Exodus", "Leviticus", "Numbers", "Deuteronomy", "Joshua", "Judges",
+    "Ruth", "1 Samuel", "2 Samuel", "1 Kings", "2 Kings", "1 Chronicles",
+    "2 Chronicles", "Ezra", "Nehemiah", "Esther", "Job", "Psalms", "Proverbs",
+    "Ecclesiastes", "Song of Solomon", "Isaiah", "Jeremiah", "Lamentations",
+    "Ezekiel", "Daniel", "Hosea", "Joel", "Amos", "Obadiah", "Jonah", "Micah",
+    "Nahum", "Habakkuk", "Zephaniah", "Haggai", "Zechariah", "Malachi",
+    "Matthew", "Mark", "Luke", "John", "Acts", "Romans", "1 Corinthians",
+    "2 Corinthians", "Galatians", "Ephesians", "Philippians", "Colossians",
+    "1 Thessalonians", "2 Thessalonians", "1 Timothy", "2 Timothy", "Titus",
+    "Philemon", "Hebrews", "James", "1 Peter", "2 Peter", "1 John", "2 John",
+    "3 John", "Jude", "Revelation",
+]
+
+INDONESIAN_BOOK_NAMES = [
+    "Kejadian", "Keluaran", "Imamat", "Bilangan", "Ulangan", "Yosua", "Hakim-hakim",
+    "Rut", "1 Samuel", "2 Samuel", "1 Raja-raja", "2 Raja-raja", "1 Tawarikh",
+    "2 Tawarikh", "Ezra", "Nehemia", "Ester", "Ayub", "Mazmur", "Amsal",
+    "Pengkhotbah", "Kidung Agung", "Yesaya", "Yeremia", "Ratapan", "Yehezkiel",
+    "Daniel", "Hosea", "Yoel", "Amos", "Obaja", "Yunus", "Mikha", "Nahum",
+    "Habakuk", "Zefanya", "Hagai", "Zakharia", "Maleakhi", "Matius", "Markus",
+    "Lukas", "Yohanes", "Kisah Para Rasul", "Roma", "1 Korintus", "2 Korintus",
+    "Galatia", "Efesus", "Filipi", "Kolose", "1 Tesalonika", "2 Tesalonika",
+    "1 Timotius", "2 Timotius", "Titus", "Filemon", "Ibrani", "Yakobus",
+    "1 Petrus", "2 Petrus", "1 Yohanes", "2 Yohanes", "3 Yohanes", "Yudas", "Wahyu",
+]
+
+# Common English (SBL-style) and Indonesian (LAI) abbreviations, by book number
+BOOK_ABBREVIATIONS: Dict[int, List[str]] = {
+    1: ["Gen", "Ge", "Gn", "Kej"], 2: ["Exod", "Ex", "Exo", "Kel"], 3: ["Lev", "Lv", "Im"],
+    4: ["Num", "Nm", "Bil"], 5: ["Deut", "Dt", "Ul"], 6: ["Josh", "Jos", "Yos"],
+    7: ["Judg", "Jdg", "Hak"], 8: ["Rth", "Ru"], 9: ["1 Sam", "1 Sm"], 10: ["2 Sam", "2 Sm"],
+    11: ["1 Kgs", "1 Ki", "1 Raj"], 12: ["2 Kgs", "2 Ki", "2 Raj"],
+    13: ["1 Chr", "1 Chron", "1 Taw"], 14: ["2 Chr", "2 Chron", "2 Taw"],
+    15: ["Ezr"], 16: ["Neh"], 17: ["Esth", "Est"], 18: ["Jb", "Ayb"],
+    19: ["Ps", "Psa", "Psalm", "Pss", "Mzm"], 20: ["Prov", "Pr", "Prv", "Ams"],
+    21: ["Eccl", "Ecc", "Qoh", "Pkh"], 22: ["Song", "Song of Songs", "SOS", "Canticles", "Kid"],
+    23: ["Isa", "Is", "Yes"], 24: ["Jer", "Yer"], 25: ["Lam", "Rat"], 26: ["Ezek", "Eze", "Yeh"],
+    27: ["Dan", "Dn"], 28: ["Hos"], 29: ["Jl", "Yl"], 30: ["Am"], 31: ["Obad", "Ob"],
+    32: ["Jon", "Yun"], 33: ["Mic", "Mi"], 34: ["Nah"], 35: ["Hab"], 36: ["Zeph", "Zep", "Zef"],
+    37: ["Hag"], 38: ["Zech", "Zec", "Za"], 39: ["Mal"], 40: ["Matt", "Mt", "Mat"],
+    41: ["Mk", "Mrk"], 42: ["Lk", "Luk"], 43: ["Jn", "Jhn", "Yoh"], 44: ["Act", "Kis"],
+    45: ["Rom", "Rm"], 46: ["1 Cor", "1 Kor"], 47: ["2 Cor", "2 Kor"], 48: ["Gal"],
+    49: ["Eph", "Ef"], 50: ["Phil", "Php", "Flp"], 51: ["Col", "Kol"],
+    52: ["1 Thess", "1 Thes", "1 Tes"], 53: ["2 Thess", "2 Thes", "2 Tes"],
+    54: ["1 Tim"], 55: ["2 Tim"], 56: ["Tit"], 57: ["Phlm", "Philem", "Flm"],
+    58: ["Heb", "Ibr"], 59: ["Jas", "Jms", "Yak"], 60: ["1 Pet", "1 Pt", "1 Ptr"],
+    61: ["2 Pet", "2 Pt", "2 Ptr"], 62: ["1 Jn", "1 Jhn", "1 Yoh"], 63: ["2 Jn", "2 Jhn", "2 Yoh"],
+    64: ["3 Jn", "3 Jhn", "3 Yoh"], 65: ["Jud", "Jd", "Yud"], 66: ["Rev", "Revelations", "Rv", "Why"],
+}
+
+_ROMAN_PREFIX = re.compile(r"^(iii|ii|i|first|second|third)\s+")
+_ROMAN_VALUES = {"i": "1", "ii": "2", "iii": "3", "first": "1", "second": "2", "third": "3"}
+_SEPARATORS = re.compile(r"[\s.\-_'’]+")
+
+
+def normalize_book_name(name: str) -> str:
+    """Normalize a book name for lookup ("I John" / "1 Jn." -> "1john" / "1jn")"""
+    value = name.strip().lower()
+    value = _ROMAN_PREFIX.sub(lambda m: _ROMAN_VALUES[m.group(1)], value)
+    return _SEPARATORS.sub("", value)
+
+
+class BookResolver:
+    """Resolves book names and aliases in any loaded language to book numbers"""
+
+    def __init__(self):
+        self._aliases: Dict[str, int] = {}
+        self._ambiguous: set = set()
+        for number, name in enumerate(ENGLISH_BOOK_NAMES, start=1):
+            self.add(name, number)
+        for number, name in enumerate(INDONESIAN_BOOK_NAMES, start=1):
+            self.add(name, number)
+        for number, aliases in BOOK_ABBREVIATIONS.items():
+            for alias in aliases:
+                self.add(alias, number)
+
+    def add(self, name: Optional[str], book_number: int) -> None:
+        """Register an alias; aliases claimed by two different books are dropped"""
+        if not name:
+            return
+        key = normalize_book_name(name)
+        if not key or key in self._ambiguous:
+            return
+        existing = self._aliases.get(key)
+        if existing is not None and existing != book_number:
+            self._ambiguous.add(key)
+            del self._aliases[key]
+            return
+        self._aliases[key] = book_number
+
+    def resolve(self, name: str) -> Optional[int]:
+        """
+        Book number for a name, alias, unique prefix or "1"-"66"
+
+        Returns:
+            Book number or None if unknown/ambiguous
+        """
+        if name is None:
+            return None
+        text = str(name).strip()
+        if text.isdigit():
+            number = int(text)
+            return number if 1 <= number <= 66 else None
+
+        key = normalize_book_name(text)
+        number = self._aliases.get(key)
+        if number is not None or len(key) < 2:
+            return number
+
+        # Unique prefix ("Philipp", "Kisah")
+        matches = {n for alias, n in self._aliases.items() if alias.startswith(key)}
+        return matches.pop() if len(matches) == 1 else None
+
+
+class BibleVersionText:
+    """One Bible version packed into a single UTF-8 buffer"""
+
+    __slots__ = ("code", "buffer", "offsets", "keys", "index", "chapters", "book_names", "verse_count")
+
+    def __init__(self, code: str, rows: Iterable[Tuple[int, int, int, str, Optional[str]]]):
+        """
+        Args:
+            code: Version code (TB, NIV, ...)
+            rows: (book_number, chapter, verse, text, local_book_name) tuples
+        """
+        self.code = code
+        self.offsets = array("I", [0])
+        self.keys = array("I")
+        self.index: Dict[Tuple[int, int, int], int] = {}
+        self.chapters: Dict[Tuple[int, int], Tuple[int, int]] = {}
+        self.book_names: Dict[int, str] = {}
+
+        parts: List[bytes] = []
+        position = 0
+        for book, chapter, verse, text, book_name in sorted(rows, key=lambda r: (r[0], r[1], r[2])):
+            if (book, chapter, verse) in self.index:
+                continue  # Duplicate rows from repeated imports
+            i = len(self.keys)
+            data = (text or "").strip().encode("utf-8")
+            parts.append(data)
+            position += len(data)
+            self.offsets.append(position)
+            self.keys.append(self._pack(book, chapter, verse))
+            self.index[(book, chapter, verse)] = i
+
+            first, _ = self.chapters.get((book, chapter), (i, i))
+            self.chapters[(book, chapter)] = (first, i + 1)
+            if book_name and book not in self.book_names:
+                self.book_names[book] = book_name
+
+        self.buffer = b"".join(parts)
+        self.verse_count = len(self.keys)
+
+    @staticmethod
+    def _pack(book: int, chapter: int, verse: int) -> int:
+        return book * 1_000_000 + chapter * 1_000 + verse
+
+    def text_at(self, i: int) -> str:
+        return self.buffer[self.offsets[i]:self.offsets[i + 1]].decode("utf-8")
+
+    def book_name(self, book: int) -> str:
+        return self.book_names.get(book) or ENGLISH_BOOK_NAMES[book - 1]
+
+    def chapter_count(self, book: int) -> int:
+        return sum(1 for (b, _) in self.chapters if b == book)
+
+    def _verse_dict(self, i: int) -> Dict[str, Any]:
+        key = self.keys[i]
+        book, rest = divmod(key, 1_000_000)
+        chapter, verse = divmod(rest, 1_000)
+        return {
+            "id": f"{self.code}_{book}_{chapter}_{verse}",
+            "version_code": self.code,
+            "book": self.book_name(book),
+            "book_number": book,
+            "chapter": chapter,
+            "verse": verse,
+            "text": self.text_at(i),
+        }
+
+    def verse(self, book: int, chapter: int, verse: int) -> Optional[Dict[str, Any]]:
+        i = self.index.get((book, chapter, verse))
+        return self._verse_dict(i) if i is not None else None
+
+    def chapter(self, book: int, chapter: int) -> List[Dict[str, Any]]:
+        bounds = self.chapters.get((book, chapter))
+        if not bounds:
+            return []
+        return [self._verse_dict(i) for i in range(*bounds)]
+
+    def verse_range(self, book: int, chapter: int, start: int, end: int) -> List[Dict[str, Any]]:
+        bounds = self.chapters.get((book, chapter))
+        if not bounds:
+            return []
+        lo = bisect_left(self.keys, self._pack(book, chapter, start), *bounds)
+        hi = bisect_right(self.keys, self._pack(book, chapter, end), *bounds)
+        return [self._verse_dict(i) for i in range(lo, hi)]
+
+
+class BibleStore:
+    """Lazily loaded, in-memory Bible versions shared by the whole process"""
+
+    def __init__(self, data_dir: Path = BIBLE_DATA_DIR):
+        self.data_dir = data_dir
+        self.resolver = BookResolver()
+        self._db = None
+        self._versions: Dict[str, BibleVersionText] = {}
+        self._missing: Dict[str, float] = {}   # code -> monotonic time of failed load
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._books: Optional[List[Dict[str, Any]]] = None
+
+    def bind(self, db) -> None:
+        """Attach the database used when a version has no JSON file"""
+        self._db = db
+
+    # ==================== Loading ====================
+
+    def _load_json(self, code: str) -> Optional[BibleVersionText]:
+        filename = VERSION_FILES.get(code)
+        path = self.data_dir / filename if filename else None
+        if not path or not path.exists() or path.stat().st_size == 0:
+            return None
+
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        rows = [
+            (int(v["book"]), int(v["chapter"]), int(v["verse"]), v.get("text", ""), v.get("book_name"))
+            for v in data.get("verses", [])
+            if v.get("book") and v.get("chapter") and v.get("verse")
+        ]
+        return BibleVersionText(code, rows) if rows else None
+
+    async def _load_mongo(self, code: str) -> Optional[BibleVersionText]:
+        if self._db is None:
+            return None
+        cursor = self._db.bible_verses.find(
+            {"version_code": code},
+            {"_id": 0, "book_number": 1, "chapter": 1, "verse": 1, "text": 1, "book": 1},
+            batch_size=5000,
+        )
+        rows = [
+            (doc["book_number"], doc["chapter"], doc["verse"], doc.get("text", ""), doc.get("book"))
+            async for doc in cursor
+            if doc.get("book_number") and doc.get("chapter") and doc.get("verse")
+        ]
+        return BibleVersionText(code, rows) if rows else None
+
+    async def get_version(self, version: str) -> Optional[BibleVersionText]:
+        """Get a loaded version, loading it on first use (None if no data)"""
+        code = (version or "").upper()
+        loaded = self._versions.get(code)
+        if loaded is not None:
+            return loaded
+
+        # Don't hammer the database for versions that have no data
+        failed_at = self._missing.get(code)
+        if failed_at and time.monotonic() - failed_at < 300:
+            return None
+
+        lock = self._locks.setdefault(code, asyncio.Lock())
+        async with lock:
+            if code in self._versions:
+                return self._versions[code]
+
+            started = time.perf_counter()
+            text = await asyncio.to_thread(self._load_json, code)
+            source = "json"
+            if text is None:
+                text = await self._load_mongo(code)
+                source = "mongo"
+
+            if text is None:
+                self._missing[code] = time.monotonic()
+                logger.warning(f"[BibleStore] No verses found for version {code}")
+                return None
+
+            await self.get_books()  # Registers reference names (English, local, Chinese)
+            for number, name in text.book_names.items():
+                self.resolver.add(name, number)
+            self._versions[code] = text
+            self._missing.pop(code, None)
+            logger.info(
+                f"[BibleStore] Loaded {code} from {source}: {text.verse_count:,} verses, "
+                f"{len(text.buffer) / 1_048_576:.1f} MB in {(time.perf_counter() - started) * 1000:.0f}ms"
+            )
+            return text
+
+    async def warm(self, db) -> None:
+        """Load every version listed in bible_versions (run in the background at startup)"""
+        self.bind(db)
+        try:
+            codes = [v["code"] for v in await db.bible_versions.find({}, {"_id": 0, "code": 1}).to_list(100) if v.get("code")]
+            for code in codes:
+                await self.get_version(code)
+        except Exception as e:
+            logger.warning(f"[BibleStore] Warm-up failed: {e}")
+
+    # ==================== Lookups ====================
+
+    async def get_books(self) -> List[Dict[str, Any]]:
+        """Reference book list from bible_books (cached; also feeds the resolver)"""
+        if self._books is None and self._db is not None:
+            books = await self._db.bible_books.find({}, {"_id": 0}).sort("book_number", 1).to_list(100)
+            for book in books:
+                for field in ("name", "name_local", "name_zh"):
+                    self.resolver.add(book.get(field), book.get("book_number"))
+            self._books = books
+        return self._books or []
+
+    async def list_books(self, version: str) -> List[Dict[str, Any]]:
+        """Books of a version with that version's own book names and chapter counts"""
+        books = await self.get_books()
+        text = await self.get_version(version)
+        if text is None:
+            return books
+
+        result = []
+        for number in sorted({b for (b, _) in text.chapters}):
+            base = next((b for b in books if b.get("book_number") == number), {})
+            result.append({
+                **base,
+                "name": base.get("name") or ENGLISH_BOOK_NAMES[number - 1],
+                "name_local": text.book_name(number),
+                "testament": base.get("testament") or ("OT" if number <= 39 else "NT"),
+                "book_number": number,
+                "chapter_count": text.chapter_count(number),
+                "version_code": text.code,
+            })
+        return result
+
+    async def get_chapter(self, version: str, book: str, chapter: int) -> List[Dict[str, Any]]:
+        book_number = self.resolver.resolve(book)
+        text = await self.get_version(version)
+        if text is None or book_number is None:
+            return []
+        return text.chapter(book_number, chapter)
+
+    async def get_verses(
+        self, version: str, book: str, chapter: int, start_verse: int, end_verse: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        book_number = self.resolver.resolve(book)
+        text = await self.get_version(version)
+        if text is None or book_number is None:
+            return []
+        return text.verse_range(book_number, chapter, start_verse, end_verse or start_verse)
+
+    async def get_passage_text(
+        self, version: str, book: str, chapter: int, start_verse: int, end_verse: Optional[int] = None
+    ) -> Optional[str]:
+        """Plain text of a verse or verse range (None if not found)"""
+        verses = await self.get_verses(version, book, chapter, start_verse, end_verse)
+        return " ".join(v["text"] for v in verses) if verses else None
+
+
+# Global instance
+bible_store = BibleStore()
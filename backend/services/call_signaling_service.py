@@ -86,6 +86,29 @@ class CallSignalingService:
         """Build member-specific topic for call notifications."""
         return f"{TOPIC_PREFIX}/{church_id}/member/{member_id}/{suffix}"
 
+    async def _notify_members(
+        self,
+        church_id: str,
+        call_id: str,
+        member_ids: List[str],
+        suffix: str,
+        payload: dict
+    ) -> int:
+        """
+        Publish a signal to each member's topic and the call topic (encoded once).
+
+        Returns:
+            Number of distinct members with a message queued
+        """
+        data = self.mqtt.encode(payload)
+        notified = 0
+        for member_id in dict.fromkeys(member_ids):
+            topic = self._build_member_topic(church_id, member_id, suffix)
+            if await self.mqtt.publish(topic, data, qos=QOS_EXACTLY_ONCE):
+                notified += 1
+        await self.mqtt.publish(self._build_call_topic(church_id, call_id), data, qos=QOS_EXACTLY_ONCE)
+        return notified
+
     # =========================================================================
     # Call Invitation Signals
     # =========================================================================
@@ -107,7 +130,7 @@ class CallSignalingService:
         """
         Send call invitation to callee(s).
 
-        Publishes to each callee's personal incoming_call topic.
+        Publishes to each callee's personal incoming_call topic (payload encoded once).
 
         Args:
             church_id: Church ID
@@ -123,7 +146,7 @@ class CallSignalingService:
             livekit_url: LiveKit server URL
 
         Returns:
-            Number of successful invitations sent
+            Number of distinct callees whose invitation was queued
         """
         await self.mqtt.connect()
 
@@ -144,18 +167,14 @@ class CallSignalingService:
             "timestamp": datetime.utcnow().isoformat()
         }
 
-        success_count = 0
-        for callee_id in callee_ids:
-            topic = self._build_member_topic(church_id, callee_id, "incoming_call")
-            if await self.mqtt.publish(topic, payload, qos=QOS_EXACTLY_ONCE):
-                success_count += 1
-                logger.info(f"Sent call invite to {callee_id} for call {call_id}")
-            else:
-                logger.error(f"Failed to send call invite to {callee_id}")
+        # Each callee's incoming_call topic plus the call's signal topic (for tracking)
+        callees = list(dict.fromkeys(callee_ids))
+        success_count = await self._notify_members(church_id, call_id, callees, "incoming_call", payload)
 
-        # Also publish to the call's signal topic for tracking
-        call_topic = self._build_call_topic(church_id, call_id)
-        await self.mqtt.publish(call_topic, payload, qos=QOS_EXACTLY_ONCE)
+        if success_count < len(callees):
+            logger.error(f"Queued call invite to {success_count}/{len(callees)} callees for call {call_id}")
+        else:
+            logger.info(f"Sent call invite to {success_count} callees for call {call_id}")
 
         return success_count
 
@@ -284,7 +303,7 @@ class CallSignalingService:
             callee_ids: List of callee IDs to notify
 
         Returns:
-            Number of successful notifications
+            Number of distinct callees notified
         """
         await self.mqtt.connect()
 
@@ -295,19 +314,8 @@ class CallSignalingService:
             "timestamp": datetime.utcnow().isoformat()
         }
 
-        success_count = 0
-
-        # Notify each callee
-        for callee_id in callee_ids:
-            topic = self._build_member_topic(church_id, callee_id, "call_status")
-            if await self.mqtt.publish(topic, payload, qos=QOS_EXACTLY_ONCE):
-                success_count += 1
-
-        # Also publish to call topic
-        call_topic = self._build_call_topic(church_id, call_id)
-        await self.mqtt.publish(call_topic, payload, qos=QOS_EXACTLY_ONCE)
-
-        return success_count
+        # Notify each callee, and the call topic
+        return await self._notify_members(church_id, call_id, callee_ids, "call_status", payload)
 
     # =========================================================================
     # Call End Signals
@@ -334,7 +342,7 @@ class CallSignalingService:
             participant_ids: All participant IDs to notify
 
         Returns:
-            Number of successful notifications
+            Number of distinct participants notified
         """
         await self.mqtt.connect()
 
@@ -347,19 +355,8 @@ class CallSignalingService:
             "timestamp": datetime.utcnow().isoformat()
         }
 
-        success_count = 0
-
-        # Notify each participant
-        for participant_id in participant_ids:
-            topic = self._build_member_topic(church_id, participant_id, "call_status")
-            if await self.mqtt.publish(topic, payload, qos=QOS_EXACTLY_ONCE):
-                success_count += 1
-
-        # Also publish to call topic
-        call_topic = self._build_call_topic(church_id, call_id)
-        await self.mqtt.publish(call_topic, payload, qos=QOS_EXACTLY_ONCE)
-
-        return success_count
+        # Notify each participant, and the call topic
+        return await self._notify_members(church_id, call_id, participant_ids, "call_status", payload)
 
     # =========================================================================
     # Participant Update Signals
@@ -0,0 +1,314 @@
+"""
+Chat Context Resolver
+
+Every mobile chat action needs the same three lookups before doing any
+work: the community (for its settings), the member's membership (role)
+and the member's display info. Done serially against MongoDB that is
+3+ round trips per send, reaction or typing event.
+
+The resolver caches them in two tiers:
+
+- L1: in-process dict with a short TTL
+- L2: Redis hashes shared by all instances
+    chat:ctx:community:{church_id}                 field community_id
+    chat:ctx:membership:{church_id}:{community_id} field member_id
+    chat:ctx:sender:{church_id}                    field member_id
+
+Misses are read from Redis in one pipeline and the rest fetched from
+MongoDB concurrently (single-flighted per key). Negative results (not a
+member, unknown community) are cached too.
+
+Invalidation: writers call invalidate_community / invalidate_membership /
+invalidate_member, which delete the Redis fields, drop the local L1 entry
+and publish on the pub/sub invalidation channel so other instances drop
+their L1 entries.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from config.redis import get_redis
+from services.redis.utils import redis_key
+from utils.serialization import json_dumps_str, json_loads
+
+logger = logging.getLogger(__name__)
+
+
+L1_TTL = 30            # seconds
+L1_MAX_ENTRIES = 20_000
+L2_TTL = 600           # seconds a Redis entry is trusted
+
+COMMUNITY_PROJECTION = {"_id": 0, "id": 1, "church_id": 1, "name": 1, "settings": 1}
+MEMBERSHIP_PROJECTION = {"_id": 0, "member_id": 1, "community_id": 1, "role": 1, "status": 1}
+
+# Cache entry kinds
+COMMUNITY = "community"
+MEMBERSHIP = "membership"
+SENDER = "sender"
+
+CacheKey = Tuple[str, str, str, str]  # (kind, church_id, scope, field)
+
+
+@dataclass
+class ChatContext:
+    """Resolved context of a member acting in a community"""
+
+    community: Optional[Dict[str, Any]]
+    membership: Optional[Dict[str, Any]]
+    sender: Dict[str, Any]
+
+
+class ChatContextResolver:
+    """Two-tier cache of community settings, membership roles and sender info"""
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self._l1: Dict[CacheKey, Tuple[float, Any]] = {}
+        self._inflight: Dict[CacheKey, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    # ==================== KEYS ====================
+
+    @staticmethod
+    def _community_key(church_id: str, community_id: str) -> CacheKey:
+        return (COMMUNITY, church_id, "", community_id)
+
+    @staticmethod
+    def _membership_key(church_id: str, community_id: str, member_id: str) -> CacheKey:
+        return (MEMBERSHIP, church_id, community_id, member_id)
+
+    @staticmethod
+    def _sender_key(church_id: str, member_id: str) -> CacheKey:
+        return (SENDER, church_id, "", member_id)
+
+    @staticmethod
+    def _redis_hash(key: CacheKey) -> str:
+        kind, church_id, scope, _ = key
+        if kind == MEMBERSHIP:
+            return redis_key("chat", "ctx", kind, church_id, scope)
+        return redis_key("chat", "ctx", kind, church_id)
+
+    # ==================== LOADERS ====================
+
+    def _loader(self, key: CacheKey) -> Callable[[], Awaitable[Any]]:
+        kind, church_id, scope, field = key
+        if kind == COMMUNITY:
+            return lambda: self.db.communities.find_one(
+                {"id": field, "church_id": church_id}, COMMUNITY_PROJECTION
+            )
+        if kind == MEMBERSHIP:
+            return lambda: self.db.community_memberships.find_one(
+                {"community_id": scope, "member_id": field, "church_id": church_id, "status": "active"},
+                MEMBERSHIP_PROJECTION,
+            )
+        return lambda: self._load_sender(church_id, field)
+
+    async def _load_sender(self, church_id: str, member_id: str) -> Dict[str, Any]:
+        member = await self.db.members.find_one(
+            {"id": member_id, "church_id": church_id},
+            {"_id": 0, "full_name": 1, "photo": 1}
+        )
+        if member:
+            return {"name": member.get("full_name", "Unknown"), "avatar_fid": member.get("photo")}
+        return {"name": "Unknown", "avatar_fid": None}
+
+    async def _load(self, key: CacheKey) -> Any:
+        """Fetch from MongoDB, sharing one in-flight query per key"""
+        future = self._inflight.get(key)
+        if future is not None:
+            return await asyncio.shield(future)
+
+        future = asyncio.ensure_future(self._loader(key)())
+        self._inflight[key] = future
+        future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(future)
+
+    # ==================== RESOLUTION ====================
+
+    def _l1_get(self, key: CacheKey) -> Tuple[bool, Any]:
+        entry = self._l1.get(key)
+        if entry is None:
+            return False, None
+        if entry[0] < time.monotonic():
+            self._l1.pop(key, None)
+            return False, None
+        return True, entry[1]
+
+    def _l1_set(self, key: CacheKey, value: Any) -> None:
+        if len(self._l1) >= L1_MAX_ENTRIES:
+            # Drop the oldest insertions (dicts keep insertion order)
+            for old in list(self._l1)[: L1_MAX_ENTRIES // 10]:
+                self._l1.pop(old, None)
+        self._l1[key] = (time.monotonic() + L1_TTL, value)
+
+    async def _resolve_many(self, keys: List[CacheKey]) -> Dict[CacheKey, Any]:
+        """Resolve keys through L1, then one Redis pipeline, then MongoDB concurrently"""
+        results: Dict[CacheKey, Any] = {}
+        missing: List[CacheKey] = []
+        for key in keys:
+            found, value = self._l1_get(key)
+            if found:
+                results[key] = value
+            else:
+                missing.append(key)
+
+        self.hits += len(keys) - len(missing)
+        if not missing:
+            return results
+
+        redis = None
+        try:
+            redis = await get_redis()
+            pipe = redis.pipeline(transaction=False)
+            for key in missing:
+                pipe.hget(self._redis_hash(key), key[3])
+            cached = await pipe.execute()
+
+            now = time.time()
+            still_missing = []
+            for key, raw in zip(missing, cached):
+                entry = json_loads(raw) if raw else None
+                if entry and now - entry.get("t", 0) < L2_TTL:
+                    results[key] = entry.get("v")
+                    self._l1_set(key, entry.get("v"))
+                else:
+                    still_missing.append(key)
+            self.hits += len(missing) - len(still_missing)
+            missing = still_missing
+        except Exception as e:
+            logger.debug(f"Chat context Redis read failed: {e}")
+
+        if not missing:
+            return results
+
+        self.misses += len(missing)
+        loaded = await asyncio.gather(*(self._load(key) for key in missing))
+        now = time.time()
+        for key, value in zip(missing, loaded):
+            results[key] = value
+            self._l1_set(key, value)
+
+        if redis is not None:
+            try:
+                pipe = redis.pipeline(transaction=False)
+                for key, value in zip(missing, loaded):
+                    redis_hash = self._redis_hash(key)
+                    pipe.hset(redis_hash, key[3], json_dumps_str({"v": value, "t": now}))
+                    pipe.expire(redis_hash, L2_TTL)
+                await pipe.execute()
+            except Exception as e:
+                logger.debug(f"Chat context Redis write failed: {e}")
+
+        return results
+
+    async def resolve(
+        self,
+        church_id: str,
+        community_id: str,
+        member_id: str,
+        include_sender: bool = True,
+    ) -> ChatContext:
+        """Community, active membership and sender display info in one pass"""
+        keys = [
+            self._community_key(church_id, community_id),
+            self._membership_key(church_id, community_id, member_id),
+        ]
+        if include_sender:
+            keys.append(self._sender_key(church_id, member_id))
+
+        values = await self._resolve_many(keys)
+        return ChatContext(
+            community=values[keys[0]],
+            membership=values[keys[1]],
+            sender=values[keys[2]] if include_sender else {},
+        )
+
+    async def get_community(self, church_id: str, community_id: str) -> Optional[Dict[str, Any]]:
+        key = self._community_key(church_id, community_id)
+        return (await self._resolve_many([key]))[key]
+
+    async def get_membership(
+        self, church_id: str, community_id: str, member_id: str
+    ) -> Optional[Dict[str, Any]]:
+        key = self._membership_key(church_id, community_id, member_id)
+        return (await self._resolve_many([key]))[key]
+
+    async def get_sender(self, church_id: str, member_id: str) -> Dict[str, Any]:
+        key = self._sender_key(church_id, member_id)
+        return (await self._resolve_many([key]))[key]
+
+    # ==================== INVALIDATION ====================
+
+    def drop_local(self, kind: str, church_id: str, scope: str = "", field: str = "") -> None:
+        """Drop L1 entries (called for invalidations from other instances)"""
+        if field:
+            self._l1.pop((kind, church_id, scope, field), None)
+            return
+        # No field: drop everything of this kind in the church/scope
+        for key in [k for k in self._l1 if k[0] == kind and k[1] == church_id and (not scope or k[2] == scope)]:
+            self._l1.pop(key, None)
+
+    async def _invalidate(self, key: CacheKey, invalidation_type: str, entity_id: str) -> None:
+        kind, church_id, scope, field = key
+        self.drop_local(kind, church_id, scope, field)
+        try:
+            redis = await get_redis()
+            await redis.hdel(self._redis_hash(key), field)
+        except Exception as e:
+            logger.debug(f"Chat context Redis invalidation failed: {e}")
+
+        from services.redis.pubsub import pubsub_service, InvalidationType
+        await pubsub_service.publish_invalidation(
+            InvalidationType(invalidation_type), church_id=church_id, entity_id=entity_id
+        )
+
+    async def invalidate_community(self, church_id: str, community_id: str) -> None:
+        """Call when a community's settings or name change"""
+        await self._invalidate(
+            self._community_key(church_id, community_id), "community", community_id
+        )
+
+    async def invalidate_membership(self, church_id: str, community_id: str, member_id: str) -> None:
+        """Call when a member joins, leaves or changes role in a community"""
+        await self._invalidate(
+            self._membership_key(church_id, community_id, member_id),
+            "community_membership",
+            f"{community_id}:{member_id}",
+        )
+
+    async def invalidate_member(self, church_id: str, member_id: str) -> None:
+        """Call when a member's name or photo changes"""
+        await self._invalidate(self._sender_key(church_id, member_id), "member", member_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "l1_entries": len(self._l1),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+# ==================== SINGLETON ACCESS ====================
+
+_chat_context_resolver: Optional[ChatContextResolver] = None
+
+
+def get_chat_context_resolver(db: AsyncIOMotorDatabase) -> ChatContextResolver:
+    """Get or create ChatContextResolver instance"""
+    global _chat_context_resolver
+    if _chat_context_resolver is None:
+        _chat_context_resolver = ChatContextResolver(db)
+    return _chat_context_resolver
+
+
+def get_existing_chat_context_resolver() -> Optional[ChatContextResolver]:
+    """The resolver if one was created (pub/sub handlers must not create it)"""
+    return _chat_context_resolver
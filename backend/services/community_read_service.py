@@ -0,0 +1,443 @@
+"""
+Community Read Watermarks
+
+Read state for community chat is tracked as one watermark per member per
+channel (the last message read, and its channel sequence number) instead
+of a receipt pushed onto every message:
+
+- Every message gets a per-channel sequence number (``seq``) from
+  ``community_channel_sequences`` when it is stored
+- ``community_read_watermarks`` holds one small document per member and
+  channel; it only ever moves forward, so re-reading older messages
+  (scrolling back up) writes nothing
+- Both are mirrored in Redis hashes, so unread counts are
+  ``channel seq - watermark seq`` without touching MongoDB; a hash is only
+  trusted once it has been filled from MongoDB (COMPLETE_FIELD)
+- MQTT read receipts are coalesced: a member scrolling through a channel
+  produces one publication per channel per window with the newest
+  message read, not one per message
+
+A message's read count is the number of watermarks at or past its seq.
+
+Channels are identified by (community_id, channel_type, subgroup_id).
+Messages stored before sequencing have no seq and count as seq 0.
+"""
+
+import asyncio
+import logging
+from bisect import bisect_left
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from config.redis import get_redis
+from services.redis.utils import redis_key
+
+logger = logging.getLogger(__name__)
+
+
+# Read receipts for the same member/channel within this window are merged
+RECEIPT_COALESCE_SECONDS = 1.0
+
+# Redis mirrors expire if untouched (rebuilt from MongoDB on demand)
+MIRROR_TTL = 7 * 24 * 3600
+
+# Set when a mirror hash is filled from MongoDB. Single-field writes after
+# the hash expired recreate it without this marker, so a hash lacking it
+# is partial and gets backfilled before it is trusted.
+COMPLETE_FIELD = "~complete"
+
+
+def channel_field(channel_type: str, subgroup_id: Optional[str] = None) -> str:
+    """Field naming a channel within a community ("general:", "subgroup:<id>")"""
+    return f"{channel_type}:{subgroup_id or ''}"
+
+
+def _parse_channel_field(field: str) -> Tuple[str, Optional[str]]:
+    channel_type, _, subgroup_id = field.partition(":")
+    return channel_type, subgroup_id or None
+
+
+class CommunityReadService:
+    """Channel sequences, read watermarks and unread counts for community chat"""
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.sequences = db.community_channel_sequences
+        self.watermarks = db.community_read_watermarks
+
+        # (church_id, community_id, channel_type, subgroup_id, member_id) -> (message_id, seq)
+        self._pending_receipts: Dict[Tuple, Tuple[str, int]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+
+    # ==================== REDIS KEYS ====================
+
+    @staticmethod
+    def _seq_key(church_id: str, community_id: str) -> str:
+        return redis_key("chat", "seq", church_id, community_id)
+
+    @staticmethod
+    def _watermark_key(church_id: str, member_id: str) -> str:
+        return redis_key("chat", "watermark", church_id, member_id)
+
+    @staticmethod
+    def _watermark_field(community_id: str, channel_type: str, subgroup_id: Optional[str]) -> str:
+        return f"{community_id}:{channel_field(channel_type, subgroup_id)}"
+
+    # ==================== SEQUENCES ====================
+
+    async def next_sequence(
+        self,
+        church_id: str,
+        community_id: str,
+        channel_type: str,
+        subgroup_id: Optional[str] = None,
+    ) -> int:
+        """Allocate the next sequence number for a channel (call before storing a message)"""
+        doc = await self.sequences.find_one_and_update(
+            {
+                "church_id": church_id,
+                "community_id": community_id,
+                "channel_type": channel_type,
+                "subgroup_id": subgroup_id,
+            },
+            {"$inc": {"seq": 1}, "$set": {"updated_at": datetime.utcnow()}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+            projection={"_id": 0, "seq": 1},
+        )
+        seq = doc["seq"]
+
+        try:
+            redis = await get_redis()
+            key = self._seq_key(church_id, community_id)
+            pipe = redis.pipeline(transaction=False)
+            pipe.hset(key, channel_field(channel_type, subgroup_id), seq)
+            pipe.expire(key, MIRROR_TTL)
+            await pipe.execute()
+        except Exception as e:
+            logger.debug(f"Channel sequence mirror failed: {e}")
+
+        return seq
+
+    async def _channel_sequences(self, church_id: str, community_id: str) -> Dict[str, int]:
+        """Current sequence of every channel in a community (Redis, then MongoDB)"""
+        key = self._seq_key(church_id, community_id)
+        cached: Dict[str, str] = {}
+        try:
+            redis = await get_redis()
+            cached = await redis.hgetall(key)
+            if cached.pop(COMPLETE_FIELD, None) is not None:
+                return {field: int(seq) for field, seq in cached.items()}
+        except Exception as e:
+            redis = None
+            logger.debug(f"Channel sequence read failed: {e}")
+
+        sequences = {
+            channel_field(doc["channel_type"], doc.get("subgroup_id")): doc["seq"]
+            async for doc in self.sequences.find(
+                {"church_id": church_id, "community_id": community_id},
+                {"_id": 0, "channel_type": 1, "subgroup_id": 1, "seq": 1},
+            )
+        }
+        if redis is not None:
+            await self._backfill_mirror(redis, key, sequences)
+        for field, seq in cached.items():
+            sequences[field] = max(sequences.get(field, 0), int(seq))
+        return sequences
+
+    @staticmethod
+    async def _backfill_mirror(redis, key: str, values: Dict[str, Any]) -> None:
+        """Fill the fields a mirror hash is missing (newer writes win), mark it complete, reset its TTL"""
+        try:
+            pipe = redis.pipeline(transaction=False)
+            for field, value in values.items():
+                pipe.hsetnx(key, field, value)
+            pipe.hset(key, COMPLETE_FIELD, 1)
+            pipe.expire(key, MIRROR_TTL)
+            await pipe.execute()
+        except Exception as e:
+            logger.debug(f"Mirror backfill failed: {e}")
+
+    # ==================== WATERMARKS ====================
+
+    async def mark_read(
+        self,
+        church_id: str,
+        member_id: str,
+        message: Dict[str, Any],
+        publish: bool = True,
+    ) -> bool:
+        """
+        Move a member's watermark for the message's channel up to this message
+
+        Args:
+            church_id: Church ID
+            member_id: Reader
+            message: Message document (needs id, community_id, channel_type,
+                subgroup_id, created_at and seq)
+            publish: Queue a coalesced MQTT read receipt
+
+        Returns:
+            True if the watermark advanced
+        """
+        community_id = message["community_id"]
+        channel_type = message.get("channel_type", "general")
+        subgroup_id = message.get("subgroup_id")
+        seq = message.get("seq") or 0
+        field = self._watermark_field(community_id, channel_type, subgroup_id)
+
+        # Already at or past this message: nothing to write
+        redis = None
+        try:
+            redis = await get_redis()
+            current = await redis.hget(self._watermark_key(church_id, member_id), field)
+            if current is not None and int(current.split("|", 1)[0]) >= seq:
+                return False
+        except Exception as e:
+            logger.debug(f"Watermark mirror read failed: {e}")
+
+        key = {
+            "church_id": church_id,
+            "member_id": member_id,
+            "community_id": community_id,
+            "channel_type": channel_type,
+            "subgroup_id": subgroup_id,
+        }
+        now = datetime.utcnow()
+        values = {
+            "last_read_message_id": message["id"],
+            "last_read_seq": seq,
+            "last_read_at": message.get("created_at"),
+            "updated_at": now,
+        }
+
+        result = await self.watermarks.update_one(
+            {**key, "last_read_seq": {"$lt": seq}}, {"$set": values}
+        )
+        advanced = result.modified_count > 0
+        if not advanced:
+            try:
+                result = await self.watermarks.update_one(
+                    key, {"$setOnInsert": values}, upsert=True
+                )
+                advanced = result.upserted_id is not None
+            except DuplicateKeyError:
+                # Concurrent first read of this channel; retry the forward-only update
+                result = await self.watermarks.update_one(
+                    {**key, "last_read_seq": {"$lt": seq}}, {"$set": values}
+                )
+                advanced = result.modified_count > 0
+
+        if not advanced:
+            await self._mirror_watermark_from_db(church_id, member_id, key, field)
+            return False
+
+        if redis is not None:
+            try:
+                wm_key = self._watermark_key(church_id, member_id)
+                pipe = redis.pipeline(transaction=False)
+                pipe.hset(wm_key, field, f"{seq}|{message['id']}")
+                pipe.expire(wm_key, MIRROR_TTL)
+                await pipe.execute()
+            except Exception as e:
+                logger.debug(f"Watermark mirror write failed: {e}")
+
+        if publish:
+            self._queue_receipt(
+                (church_id, community_id, channel_type, subgroup_id, member_id),
+                message["id"],
+                seq,
+            )
+        return True
+
+    async def _mirror_watermark_from_db(
+        self, church_id: str, member_id: str, key: Dict[str, Any], field: str
+    ) -> None:
+        """Refresh the Redis mirror after a no-op write (mirror was missing or behind)"""
+        try:
+            doc = await self.watermarks.find_one(
+                key, {"_id": 0, "last_read_seq": 1, "last_read_message_id": 1}
+            )
+            if doc:
+                redis = await get_redis()
+                wm_key = self._watermark_key(church_id, member_id)
+                await redis.hset(wm_key, field, f"{doc.get('last_read_seq', 0)}|{doc.get('last_read_message_id', '')}")
+                await redis.expire(wm_key, MIRROR_TTL)
+        except Exception as e:
+            logger.debug(f"Watermark mirror refresh failed: {e}")
+
+    async def _member_watermarks(
+        self, church_id: str, member_id: str, community_ids: Iterable[str]
+    ) -> Dict[str, Dict[str, int]]:
+        """{community_id: {channel_field: watermark seq}} for a member"""
+        community_ids = list(community_ids)
+        result: Dict[str, Dict[str, int]] = {cid: {} for cid in community_ids}
+
+        key = self._watermark_key(church_id, member_id)
+        cached: Dict[str, str] = {}
+        try:
+            redis = await get_redis()
+            cached = await redis.hgetall(key)
+        except Exception as e:
+            redis = None
+            logger.debug(f"Watermark mirror read failed: {e}")
+
+        if cached.pop(COMPLETE_FIELD, None) is None:
+            # Missing or partial mirror: load every watermark of the member
+            # so the backfilled hash is complete for all their communities
+            mirrored: Dict[str, str] = {}
+            async for doc in self.watermarks.find(
+                {"church_id": church_id, "member_id": member_id},
+                {"_id": 0, "community_id": 1, "channel_type": 1, "subgroup_id": 1,
+                 "last_read_seq": 1, "last_read_message_id": 1},
+            ):
+                field = self._watermark_field(doc["community_id"], doc["channel_type"], doc.get("subgroup_id"))
+                seq = doc.get("last_read_seq", 0)
+                mirrored[field] = f"{seq}|{doc.get('last_read_message_id', '')}"
+                community_id, _, channel = field.partition(":")
+                if community_id in result:
+                    result[community_id][channel] = seq
+            if redis is not None:
+                await self._backfill_mirror(redis, key, mirrored)
+
+        for field, value in cached.items():
+            community_id, _, channel = field.partition(":")
+            if community_id in result:
+                seq = int(value.split("|", 1)[0])
+                result[community_id][channel] = max(result[community_id].get(channel, 0), seq)
+        return result
+
+    # ==================== UNREAD COUNTS ====================
+
+    async def get_unread_counts(
+        self, church_id: str, member_id: str, community_ids: Iterable[str]
+    ) -> Dict[str, Dict[str, int]]:
+        """
+        Unread messages per channel, derived from sequences and watermarks
+
+        Returns:
+            {community_id: {channel_field: unread}} (channels with messages only)
+        """
+        community_ids = list(community_ids)
+        sequences, watermarks = await asyncio.gather(
+            asyncio.gather(*(self._channel_sequences(church_id, cid) for cid in community_ids)),
+            self._member_watermarks(church_id, member_id, community_ids),
+        )
+
+        counts: Dict[str, Dict[str, int]] = {}
+        for community_id, channel_seqs in zip(community_ids, sequences):
+            read = watermarks.get(community_id, {})
+            counts[community_id] = {
+                channel: max(0, seq - read.get(channel, 0))
+                for channel, seq in channel_seqs.items()
+            }
+        return counts
+
+    async def get_channel_unread(
+        self,
+        church_id: str,
+        member_id: str,
+        community_id: str,
+        channel_type: str,
+        subgroup_id: Optional[str] = None,
+    ) -> int:
+        """Unread messages in one channel"""
+        counts = await self.get_unread_counts(church_id, member_id, [community_id])
+        return counts[community_id].get(channel_field(channel_type, subgroup_id), 0)
+
+    # ==================== READ COUNTS ====================
+
+    async def apply_read_counts(
+        self,
+        church_id: str,
+        community_id: str,
+        channel_type: str,
+        subgroup_id: Optional[str],
+        messages: List[Dict[str, Any]],
+    ) -> None:
+        """Set read_count on a page of messages from the channel's watermarks (one query)"""
+        if not messages:
+            return
+        lowest = min(m.get("seq") or 0 for m in messages)
+        cursor = self.watermarks.find(
+            {
+                "church_id": church_id,
+                "community_id": community_id,
+                "channel_type": channel_type,
+                "subgroup_id": subgroup_id,
+                "last_read_seq": {"$gte": lowest},
+            },
+            {"_id": 0, "last_read_seq": 1},
+        )
+        marks = sorted([doc.get("last_read_seq", 0) async for doc in cursor])
+        for message in messages:
+            if message.get("seq"):
+                message["read_count"] = len(marks) - bisect_left(marks, message["seq"])
+
+    async def get_readers(
+        self, church_id: str, message: Dict[str, Any], limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        """Members whose watermark is at or past a message (most recent readers first)"""
+        if not message.get("seq"):
+            return []
+        cursor = self.watermarks.find(
+            {
+                "church_id": church_id,
+                "community_id": message["community_id"],
+                "channel_type": message.get("channel_type", "general"),
+                "subgroup_id": message.get("subgroup_id"),
+                "last_read_seq": {"$gte": message["seq"]},
+            },
+            {"_id": 0, "member_id": 1, "updated_at": 1},
+        ).sort("updated_at", -1).limit(limit)
+        return [
+            {"member_id": doc["member_id"], "read_at": doc.get("updated_at")}
+            async for doc in cursor
+        ]
+
+    # ==================== COALESCED RECEIPTS ====================
+
+    def _queue_receipt(self, key: Tuple, message_id: str, seq: int) -> None:
+        pending = self._pending_receipts.get(key)
+        if pending is None or pending[1] < seq:
+            self._pending_receipts[key] = (message_id, seq)
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_receipts())
+
+    async def _flush_receipts(self) -> None:
+        """Publish the newest read position per member/channel after the coalesce window"""
+        await asyncio.sleep(RECEIPT_COALESCE_SECONDS)
+        pending, self._pending_receipts = self._pending_receipts, {}
+
+        from services.mqtt_service import get_mqtt_service
+        mqtt = get_mqtt_service()
+        for (church_id, community_id, channel_type, subgroup_id, member_id), (message_id, seq) in pending.items():
+            try:
+                await mqtt.publish_read_receipt(
+                    church_id=church_id,
+                    community_id=community_id,
+                    member_id=member_id,
+                    message_id=message_id,
+                    subgroup_id=subgroup_id,
+                    channel_type=channel_type,
+                    seq=seq,
+                )
+            except Exception as e:
+                logger.warning(f"Read receipt publish failed: {e}")
+
+
+# ==================== SINGLETON ACCESS ====================
+
+_community_read_service: Optional[CommunityReadService] = None
+
+
+def get_community_read_service(db: AsyncIOMotorDatabase) -> CommunityReadService:
+    """Get or create CommunityReadService instance"""
+    global _community_read_service
+    if _community_read_service is None:
+        _community_read_service = CommunityReadService(db)
+    return _community_read_service
@@ -0,0 +1,329 @@
+"""
+Community Message Search
+
+Messages carry a ``search_terms`` array (tokens plus English/Indonesian
+stems from utils.text_analysis) maintained on send, edit and delete.
+A multikey index on (church_id, community_id, search_terms, created_at)
+makes it an inverted index: lookups are index range scans instead of
+an unanchored regex over every message in the community.
+
+Search modes:
+- relevance (default): messages matching any query word, scored by
+  matched words (rarer words weigh more), exact phrase and recency
+- recent: messages matching all query words, newest first
+
+The last query word also matches as a prefix (search-as-you-type).
+Results come with a snippet and highlight ranges within it. Pagination
+uses an opaque cursor (keyset for recent, offset into the ranked window
+for relevance).
+
+Relevance only ranks the newest RELEVANCE_WINDOW matches, so an older
+message can be missing from relevance results when a query matches more
+than that; recent mode pages through every match.
+
+Messages stored before search terms existed are indexed at startup by
+``backfill_search_terms()`` (or scripts/backfill_message_search.py).
+"""
+
+import base64
+import logging
+import math
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+
+from utils.serialization import json_dumps, json_loads
+from utils.text_analysis import index_terms, normalize, query_words, term_variants, tokenize
+
+logger = logging.getLogger(__name__)
+
+
+# Matches considered for relevance ranking (newest first); older matches
+# only show up with sort=recent
+RELEVANCE_WINDOW = 500
+
+SNIPPET_RADIUS = 60
+
+RESULT_PROJECTION = {"_id": 0, "search_terms": 0}
+
+
+def _encode_cursor(data: Dict[str, Any]) -> str:
+    return base64.urlsafe_b64encode(json_dumps(data)).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: Optional[str]) -> Dict[str, Any]:
+    if not cursor:
+        return {}
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return json_loads(base64.urlsafe_b64decode(padded))
+    except Exception:
+        return {}
+
+
+class CommunitySearchService:
+    """Maintains and queries the message search terms"""
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.collection = db.community_messages
+
+    # ==================== INDEXING ====================
+
+    @staticmethod
+    def terms_for(text: Optional[str]) -> List[str]:
+        """Search terms to store on a message"""
+        return index_terms(text) if text else []
+
+    async def reindex_message(self, message_id: str, text: Optional[str]) -> None:
+        """Refresh a message's terms after its text changed (edit / delete for everyone)"""
+        await self.collection.update_one(
+            {"id": message_id}, {"$set": {"search_terms": self.terms_for(text)}}
+        )
+
+    async def backfill(self, church_id: Optional[str] = None, batch_size: int = 1000) -> int:
+        """
+        Index messages that have no search terms yet
+
+        Returns:
+            Number of messages indexed
+        """
+        query: Dict[str, Any] = {"search_terms": {"$exists": False}}
+        if church_id:
+            query["church_id"] = church_id
+
+        indexed = 0
+        ops: List[UpdateOne] = []
+        async for doc in self.collection.find(query, {"_id": 0, "id": 1, "text": 1, "is_deleted": 1}):
+            text = None if doc.get("is_deleted") else doc.get("text")
+            ops.append(UpdateOne({"id": doc["id"]}, {"$set": {"search_terms": self.terms_for(text)}}))
+            if len(ops) >= batch_size:
+                await self.collection.bulk_write(ops, ordered=False)
+                indexed += len(ops)
+                ops = []
+        if ops:
+            await self.collection.bulk_write(ops, ordered=False)
+            indexed += len(ops)
+        return indexed
+
+    # ==================== QUERY ====================
+
+    @staticmethod
+    def _word_clause(word: str, prefix: bool) -> Dict[str, Any]:
+        values: List[Any] = list(term_variants(word))
+        if prefix:
+            values.append(re.compile("^" + re.escape(word)))
+        return {"search_terms": {"$in": values}}
+
+    async def search(
+        self,
+        church_id: str,
+        community_id: str,
+        query: str,
+        channel_type: Optional[str] = None,
+        subgroup_id: Optional[str] = None,
+        sender_member_id: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        sort: str = "relevance",
+        cursor: Optional[str] = None,
+        limit: int = 20,
+    ) -> Dict[str, Any]:
+        """
+        Search a community's messages
+
+        Returns:
+            Dict with messages, highlights (by message id), next_cursor, has_more
+        """
+        words = query_words(query)
+        if not words:
+            return {"messages": [], "highlights": {}, "next_cursor": None, "has_more": False}
+
+        base: Dict[str, Any] = {
+            "church_id": church_id,
+            "community_id": community_id,
+            "is_deleted": {"$ne": True},
+        }
+        if channel_type:
+            base["channel_type"] = channel_type
+        if subgroup_id:
+            base["subgroup_id"] = subgroup_id
+        if sender_member_id:
+            base["sender_member_id"] = sender_member_id
+        if date_from or date_to:
+            # created_at is stored as an ISO string (model_dump(mode="json"))
+            created: Dict[str, str] = {}
+            if date_from:
+                created["$gte"] = date_from.isoformat()
+            if date_to:
+                created["$lte"] = date_to.isoformat()
+            base["created_at"] = created
+
+        last = len(words) - 1
+        clauses = [self._word_clause(w, prefix=(i == last)) for i, w in enumerate(words)]
+        state = _decode_cursor(cursor)
+
+        if sort == "recent":
+            messages, next_cursor = await self._search_recent(base, clauses, state, limit)
+        else:
+            messages, next_cursor = await self._search_relevance(base, clauses, words, query, state, limit)
+
+        highlights = {m["id"]: self.highlight(m.get("text") or "", words) for m in messages}
+        return {
+            "messages": messages,
+            "highlights": highlights,
+            "next_cursor": next_cursor,
+            "has_more": next_cursor is not None,
+        }
+
+    async def _search_recent(
+        self, base: Dict[str, Any], clauses: List[Dict[str, Any]], state: Dict[str, Any], limit: int
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """All words must match; newest first with a (created_at, id) keyset cursor"""
+        query = {**base, "$and": list(clauses)}
+        if state.get("c"):
+            query["$and"].append({
+                "$or": [
+                    {"created_at": {"$lt": state["c"]}},
+                    {"created_at": state["c"], "id": {"$lt": state["i"]}},
+                ]
+            })
+
+        docs = await self.collection.find(query, RESULT_PROJECTION).sort(
+            [("created_at", -1), ("id", -1)]
+        ).limit(limit + 1).to_list(length=limit + 1)
+
+        next_cursor = None
+        if len(docs) > limit:
+            docs = docs[:limit]
+            next_cursor = _encode_cursor({"c": docs[-1]["created_at"], "i": docs[-1]["id"]})
+        return docs, next_cursor
+
+    async def _search_relevance(
+        self,
+        base: Dict[str, Any],
+        clauses: List[Dict[str, Any]],
+        words: List[str],
+        query: str,
+        state: Dict[str, Any],
+        limit: int,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Any word may match; rank the newest RELEVANCE_WINDOW matches"""
+        match = {**base, "$or": clauses} if len(clauses) > 1 else {**base, **clauses[0]}
+        candidates = await self.collection.find(
+            match, {"_id": 0, "id": 1, "text": 1, "created_at": 1, "search_terms": 1}
+        ).sort("created_at", -1).limit(RELEVANCE_WINDOW).to_list(length=RELEVANCE_WINDOW)
+
+        ranked = self.rank(candidates, words, query)
+        offset = int(state.get("o", 0))
+        page_ids = [c["id"] for c in ranked[offset:offset + limit]]
+
+        docs_by_id = {
+            doc["id"]: doc
+            async for doc in self.collection.find({"id": {"$in": page_ids}}, RESULT_PROJECTION)
+        }
+        docs = [docs_by_id[i] for i in page_ids if i in docs_by_id]
+
+        next_cursor = None
+        if offset + limit < len(ranked):
+            next_cursor = _encode_cursor({"o": offset + limit})
+        return docs, next_cursor
+
+    # ==================== RANKING & HIGHLIGHTING ====================
+
+    @staticmethod
+    def _word_matches(word: str, terms: Set[str], prefix: bool) -> bool:
+        if terms.intersection(term_variants(word)):
+            return True
+        return prefix and any(t.startswith(word) for t in terms)
+
+    @classmethod
+    def rank(cls, candidates: List[Dict[str, Any]], words: List[str], query: str) -> List[Dict[str, Any]]:
+        """
+        Order candidates by score
+
+        Score = sum of matched words weighted by rarity within the
+        candidates (idf), + 2 for the exact phrase, + up to 1 for recency.
+        """
+        if not candidates:
+            return []
+
+        last = len(words) - 1
+        term_sets = [set(c.get("search_terms") or []) for c in candidates]
+        matches = [
+            [cls._word_matches(w, terms, prefix=(i == last)) for i, w in enumerate(words)]
+            for terms in term_sets
+        ]
+
+        n = len(candidates)
+        idf = [
+            1.0 + math.log((n + 1) / (1 + sum(row[i] for row in matches)))
+            for i in range(len(words))
+        ]
+
+        phrase = normalize(query).strip()
+        now = datetime.utcnow()
+        scored = []
+        for candidate, row in zip(candidates, matches):
+            score = sum(weight for weight, matched in zip(idf, row) if matched)
+            if len(words) > 1 and phrase and phrase in normalize(candidate.get("text") or ""):
+                score += 2.0
+            try:
+                age_days = (now - datetime.fromisoformat(str(candidate.get("created_at")))).days
+                score += math.exp(-max(age_days, 0) / 30)
+            except ValueError:
+                pass
+            scored.append((score, str(candidate.get("created_at")), candidate))
+
+        scored.sort(key=lambda s: (s[0], s[1]), reverse=True)
+        return [c for _, _, c in scored]
+
+    @staticmethod
+    def highlight(text: str, words: List[str]) -> Dict[str, Any]:
+        """A snippet around the first matching word, and the character ranges of matching words in it"""
+        wanted: Set[str] = set()
+        for word in words:
+            wanted.update(term_variants(word))
+        prefix = words[-1] if words else ""
+
+        ranges = []
+        for token, start, end in tokenize(text):
+            if wanted.intersection(term_variants(token)) or (prefix and token.startswith(prefix)):
+                ranges.append([start, end])
+
+        snippet = text
+        if ranges and len(text) > 2 * SNIPPET_RADIUS:
+            start = max(0, ranges[0][0] - SNIPPET_RADIUS)
+            end = min(len(text), ranges[0][1] + SNIPPET_RADIUS)
+            lead = "…" if start else ""
+            snippet = lead + text[start:end] + ("…" if end < len(text) else "")
+            # Shift ranges into the snippet, dropping words cut off by it
+            shift = len(lead) - start
+            ranges = [[s + shift, e + shift] for s, e in ranges if s >= start and e <= end]
+        return {"ranges": ranges, "snippet": snippet}
+
+
+async def backfill_search_terms(db: AsyncIOMotorDatabase) -> None:
+    """Index community messages missing search terms (startup task)."""
+    try:
+        indexed = await CommunitySearchService(db).backfill()
+        if indexed:
+            logger.info(f"Message search backfill: {indexed} messages")
+    except Exception as e:
+        logger.warning(f"Message search backfill failed: {e}")
+
+
+# ==================== SINGLETON ACCESS ====================
+
+_community_search_service: Optional[CommunitySearchService] = None
+
+
+def get_community_search_service(db: AsyncIOMotorDatabase) -> CommunitySearchService:
+    """Get or create CommunitySearchService instance"""
+    global _community_search_service
+    if _community_search_service is None:
+        _community_search_service = CommunitySearchService(db)
+    return _community_search_service
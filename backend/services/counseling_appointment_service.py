@@ -13,6 +13,8 @@ from motor.motor_asyncio import AsyncIOMotorDatabase
 import logging
 import uuid
 
+from services.counseling_availability_service import CounselingAvailabilityService
+
 logger = logging.getLogger(__name__)
 
 
@@ -43,14 +45,12 @@ class CounselingAppointmentService:
         Raises:
             ValueError: If slot not available or validation fails
         """
-        # Step 1: Get slot and verify
-        slot = await self.db.counseling_time_slots.find_one({
-            "id": slot_id,
-            "church_id": church_id
-        })
+        # Step 1: Get slot (storing a computed slot) and verify
+        slot = await CounselingAvailabilityService(self.db).materialize_slot(church_id, slot_id)
         
         if not slot:
             raise ValueError("SLOT_NOT_FOUND")
+        slot_id = slot["id"]
         
         if slot["status"] != "open":
             raise ValueError("SLOT_NOT_AVAILABLE")
@@ -132,13 +132,11 @@ class CounselingAppointmentService:
         Similar to create_from_member but marks as staff-created.
         """
         # Get slot and verify
-        slot = await self.db.counseling_time_slots.find_one({
-            "id": slot_id,
-            "church_id": church_id
-        })
+        slot = await CounselingAvailabilityService(self.db).materialize_slot(church_id, slot_id)
         
         if not slot:
             raise ValueError("SLOT_NOT_FOUND")
+        slot_id = slot["id"]
         
         if slot["status"] != "open":
             raise ValueError("SLOT_NOT_AVAILABLE")
@@ -1,149 +1,346 @@
-"""Service for managing counseling availability and slot generation.
+"""Service for computing counseling availability.
 
 Handles:
-- Generating time slots from recurring rules
-- Applying date-specific overrides
-- Managing slot availability status
+- Computing time slots from recurring rules and date overrides
+- Subtracting blocks and booked appointments (interval arithmetic)
+- Materializing a slot only when it is booked or reserved
+
+Availability for a date range is computed in memory from one query per
+collection (counselors, recurring rules, overrides, appointments and
+materialized slots), so open slots never need to be pre-generated.
+Computed slots carry a deterministic id ("{counselor_id}_{date}_{HHMM}")
+that the booking flow turns into a stored slot with materialize_slot().
 """
 
+import asyncio
 from datetime import datetime, date, time, timedelta
-from typing import Optional, Literal
+from typing import Dict, List, Optional, Literal, Tuple
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Default window when no date range is given
+DEFAULT_RANGE_DAYS = 30
+
+# Maximum slots returned by get_available_slots
+MAX_SLOTS = 1000
+
+# Extra slots from add_extra overrides
+OVERRIDE_SLOT_MINUTES = 60
+
+# Appointment statuses that occupy their time
+ACTIVE_APPOINTMENT_STATUSES = ["pending", "approved", "completed"]
+
+# Stored slot statuses that take precedence over the computed status
+HELD_SLOT_STATUSES = ["booked", "reserved"]
+
+# Open slots materialized this recently may belong to a booking in progress
+MATERIALIZED_SLOT_GRACE = timedelta(hours=1)
+
+Interval = Tuple[int, int]  # [start, end) in minutes since midnight
+
+
+def _minutes(hhmm: str) -> int:
+    t = time.fromisoformat(hhmm)
+    return t.hour * 60 + t.minute
+
+
+def _hhmm(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def _overlaps(a: Interval, b: Interval) -> bool:
+    return a[0] < b[1] and b[0] < a[1]
+
+
+def _split(start: int, end: int, length: int) -> List[Interval]:
+    """Cut [start, end) into consecutive slots of `length` minutes."""
+    return [(m, m + length) for m in range(start, end - length + 1, length)]
+
+
+def slot_id_for(counselor_id: str, date_str: str, start_time: str) -> str:
+    """Deterministic id of a computed slot."""
+    return f"{counselor_id}_{date_str}_{start_time.replace(':', '')}"
+
+
+def parse_slot_id(slot_id: str) -> Optional[Tuple[str, str, str]]:
+    """(counselor_id, date, start_time) of a computed slot id, or None."""
+    parts = slot_id.rsplit("_", 2)
+    if len(parts) != 3 or len(parts[2]) != 4 or not parts[2].isdigit():
+        return None
+    try:
+        date.fromisoformat(parts[1])
+    except ValueError:
+        return None
+    return parts[0], parts[1], f"{parts[2][:2]}:{parts[2][2:]}"
+
 
 class CounselingAvailabilityService:
-    """Service for generating and managing counseling time slots."""
-    
+    """Service for computing and booking counseling time slots."""
+
     def __init__(self, db: AsyncIOMotorDatabase):
         self.db = db
-    
-    async def generate_slots_for_date(
+
+    # ==================== DATA LOADING ====================
+
+    async def _load(
         self,
         church_id: str,
-        counselor_id: str,
-        target_date: date
+        start_date: date,
+        end_date: date,
+        counselor_id: Optional[str] = None
     ) -> dict:
+        """Load everything needed for a date range: one query per collection."""
+        scope = {"church_id": church_id}
+        if counselor_id:
+            scope["counselor_id"] = counselor_id
+        date_range = {"$gte": start_date.isoformat(), "$lte": end_date.isoformat()}
+
+        counselor_query = {"church_id": church_id, "is_active": True}
+        if counselor_id:
+            counselor_query["id"] = counselor_id
+
+        counselors, rules, overrides, appointments, held_slots = await asyncio.gather(
+            self.db.counselors.find(
+                counselor_query, {"_id": 0, "id": 1, "display_name": 1}
+            ).to_list(1000),
+            self.db.counseling_recurring_rules.find(
+                {**scope, "is_active": True}, {"_id": 0}
+            ).to_list(10000),
+            self.db.counseling_overrides.find(
+                {**scope, "date": date_range}, {"_id": 0}
+            ).to_list(10000),
+            self.db.counseling_appointments.find(
+                {**scope, "date": date_range, "status": {"$in": ACTIVE_APPOINTMENT_STATUSES}},
+                {"_id": 0, "id": 1, "counselor_id": 1, "slot_id": 1, "date": 1,
+                 "start_time": 1, "end_time": 1, "status": 1}
+            ).to_list(100000),
+            self.db.counseling_time_slots.find(
+                {**scope, "date": date_range, "status": {"$in": HELD_SLOT_STATUSES}}, {"_id": 0}
+            ).to_list(100000),
+        )
+
+        return {
+            "counselors": counselors,
+            "rules": rules,
+            "overrides": overrides,
+            "appointments": appointments,
+            "held_slots": held_slots,
+        }
+
+    # ==================== COMPUTATION ====================
+
+    def _compute(self, church_id: str, data: dict, start_date: date, end_date: date) -> List[dict]:
         """
-        Generate time slots for a specific date based on recurring rules and overrides.
-        
-        Returns:
-            dict: { "generated": int, "blocked": int, "skipped": int }
+        Compute all slots in the range.
+
+        Per counselor and date:
+        - candidate slots = recurring rule slots for the weekday + add_extra override slots
+        - slots overlapping a block override -> "blocked"
+        - a held (booked/reserved) stored slot replaces the computed one
+        - other slots overlapping a held slot or an active appointment are dropped
         """
-        generated = 0
-        blocked = 0
-        skipped = 0
-        
-        date_str = target_date.isoformat()
-        day_of_week = target_date.weekday()  # 0=Monday, 6=Sunday
-        
-        # Step 1: Check for overrides first
-        overrides = await self.db.counseling_overrides.find({
-            "church_id": church_id,
-            "counselor_id": counselor_id,
-            "date": date_str
-        }).to_list(100)
-        
-        # Step 2: Get recurring rules for this day of week
-        recurring_rules = await self.db.counseling_recurring_rules.find({
-            "church_id": church_id,
-            "counselor_id": counselor_id,
-            "day_of_week": day_of_week,
-            "is_active": True
-        }).to_list(100)
-        
-        # Step 3: Generate base slots from recurring rules
-        base_slots = []
-        for rule in recurring_rules:
-            slots = self._generate_slots_from_rule(date_str, rule, church_id, counselor_id)
-            base_slots.extend(slots)
-        
-        # Step 4: Apply overrides
-        block_ranges = []
-        add_extra_slots = []
-        
-        for override in overrides:
-            if override["action"] == "block":
-                block_ranges.append({
-                    "start": time.fromisoformat(override["start_time"]),
-                    "end": time.fromisoformat(override["end_time"])
-                })
-            elif override["action"] == "add_extra":
-                # Generate extra slots from override
-                extra_slots = self._generate_slots_from_time_range(
-                    date_str,
-                    override["start_time"],
-                    override["end_time"],
-                    60,  # default 1-hour slots
-                    "override_add",
-                    church_id,
-                    counselor_id
-                )
-                add_extra_slots.extend(extra_slots)
-        
-        # Step 5: Filter blocked slots from base slots
-        final_slots = []
-        for slot in base_slots:
-            slot_start = time.fromisoformat(slot["start_time"])
-            slot_end = time.fromisoformat(slot["end_time"])
-            
-            is_blocked = any(
-                self._time_ranges_overlap(slot_start, slot_end, br["start"], br["end"])
-                for br in block_ranges
+        rules_by_day: Dict[Tuple[str, int], List[dict]] = {}
+        for rule in data["rules"]:
+            rules_by_day.setdefault((rule["counselor_id"], rule["day_of_week"]), []).append(rule)
+
+        overrides_by_date: Dict[Tuple[str, str], List[dict]] = {}
+        for override in data["overrides"]:
+            overrides_by_date.setdefault((override["counselor_id"], override["date"]), []).append(override)
+
+        held_by_date: Dict[Tuple[str, str], List[dict]] = {}
+        for slot in data["held_slots"]:
+            held_by_date.setdefault((slot["counselor_id"], slot["date"]), []).append(slot)
+
+        busy_by_date: Dict[Tuple[str, str], List[Interval]] = {}
+        for appointment in data["appointments"]:
+            busy_by_date.setdefault((appointment["counselor_id"], appointment["date"]), []).append(
+                (_minutes(appointment["start_time"]), _minutes(appointment["end_time"]))
             )
-            
-            if is_blocked:
-                # Create blocked slot
-                slot["status"] = "blocked"
-                slot["source"] = "override_block"
-                blocked += 1
-            
-            final_slots.append(slot)
-        
-        # Step 6: Add extra slots
-        final_slots.extend(add_extra_slots)
-        
-        # Step 7: Insert/update slots in database (avoid duplicates)
-        for slot in final_slots:
-            # Check if slot already exists
-            existing = await self.db.counseling_time_slots.find_one({
-                "church_id": church_id,
-                "counselor_id": counselor_id,
-                "date": slot["date"],
-                "start_time": slot["start_time"]
-            })
-            
-            if existing:
-                # Don't overwrite booked slots
-                if existing["status"] in ["booked", "reserved"]:
-                    skipped += 1
-                    continue
-                
-                # Update existing slot
-                await self.db.counseling_time_slots.update_one(
-                    {"_id": existing["_id"]},
-                    {
-                        "$set": {
-                            "status": slot["status"],
-                            "source": slot["source"],
-                            "updated_at": datetime.utcnow()
-                        }
+
+        now = datetime.utcnow()
+        slots: List[dict] = []
+        current = start_date
+        while current <= end_date:
+            date_str = current.isoformat()
+            weekday = current.weekday()
+
+            for counselor in data["counselors"]:
+                counselor_id = counselor["id"]
+                key = (counselor_id, date_str)
+
+                candidates: Dict[int, Tuple[Interval, str]] = {}
+                for rule in rules_by_day.get((counselor_id, weekday), []):
+                    for interval in _split(_minutes(rule["start_time"]), _minutes(rule["end_time"]),
+                                           rule["slot_length_minutes"]):
+                        candidates.setdefault(interval[0], (interval, "recurring"))
+
+                blocks: List[Interval] = []
+                for override in overrides_by_date.get(key, []):
+                    span = (_minutes(override["start_time"]), _minutes(override["end_time"]))
+                    if override["action"] == "block":
+                        blocks.append(span)
+                    elif override["action"] == "add_extra":
+                        for interval in _split(span[0], span[1], OVERRIDE_SLOT_MINUTES):
+                            candidates.setdefault(interval[0], (interval, "override_add"))
+
+                held = {slot["start_time"]: slot for slot in held_by_date.get(key, [])}
+                busy = busy_by_date.get(key, []) + [
+                    (_minutes(slot["start_time"]), _minutes(slot["end_time"])) for slot in held.values()
+                ]
+
+                for start in sorted(set(candidates) | {_minutes(s) for s in held}):
+                    start_time = _hhmm(start)
+                    if start_time in held:
+                        slots.append({**held[start_time], "counselor_name": counselor.get("display_name")})
+                        continue
+
+                    interval, source = candidates[start]
+                    if any(_overlaps(interval, b) for b in busy):
+                        continue
+
+                    status = "open"
+                    if any(_overlaps(interval, b) for b in blocks):
+                        status, source = "blocked", "override_block"
+
+                    slots.append({
+                        "id": slot_id_for(counselor_id, date_str, start_time),
+                        "church_id": church_id,
+                        "counselor_id": counselor_id,
+                        "counselor_name": counselor.get("display_name"),
+                        "date": date_str,
+                        "start_time": start_time,
+                        "end_time": _hhmm(interval[1]),
+                        "status": status,
+                        "source": source,
+                        "appointment_id": None,
+                        "created_at": now,
+                        "updated_at": now
+                    })
+
+            current += timedelta(days=1)
+
+        return slots
+
+    async def compute_slots(
+        self,
+        church_id: str,
+        start_date: date,
+        end_date: date,
+        counselor_id: Optional[str] = None
+    ) -> List[dict]:
+        """All slots (open, blocked, booked, reserved) in a date range, sorted by date and time."""
+        data = await self._load(church_id, start_date, end_date, counselor_id)
+        slots = self._compute(church_id, data, start_date, end_date)
+        slots.sort(key=lambda s: (s["date"], s["start_time"], s["counselor_id"]))
+        return slots
+
+    # ==================== MATERIALIZATION ====================
+
+    async def materialize_slot(self, church_id: str, slot_id: str) -> Optional[dict]:
+        """
+        Return the stored slot for a slot id, storing a computed slot first.
+
+        Used by the booking flow before atomically marking the slot booked.
+        Returns None if the id is unknown or no longer part of availability.
+        """
+        slot = await self.db.counseling_time_slots.find_one(
+            {"id": slot_id, "church_id": church_id}, {"_id": 0}
+        )
+        if slot:
+            return slot
+
+        parsed = parse_slot_id(slot_id)
+        if not parsed:
+            return None
+        counselor_id, date_str, start_time = parsed
+
+        target = date.fromisoformat(date_str)
+        computed = await self.compute_slots(church_id, target, target, counselor_id)
+        match = next((s for s in computed if s["start_time"] == start_time), None)
+        if not match:
+            return None
+        if match["status"] != "open":
+            return {k: v for k, v in match.items() if k != "counselor_name"}
+
+        doc = {k: v for k, v in match.items() if k != "counselor_name"}
+        # Upsert on the natural key so concurrent bookings share one document
+        await self.db.counseling_time_slots.update_one(
+            {"church_id": church_id, "counselor_id": counselor_id,
+             "date": date_str, "start_time": start_time},
+            {"$setOnInsert": doc},
+            upsert=True
+        )
+        return await self.db.counseling_time_slots.find_one(
+            {"church_id": church_id, "counselor_id": counselor_id,
+             "date": date_str, "start_time": start_time},
+            {"_id": 0}
+        )
+
+    async def _persist_held_slots(
+        self,
+        church_id: str,
+        data: dict,
+        start_date: date,
+        end_date: date
+    ) -> int:
+        """
+        Store booked slots for active appointments that lack one, and drop
+        stored open/blocked slots (those are computed now). Slots touched
+        within MATERIALIZED_SLOT_GRACE are kept: materialize_slot() stores
+        an open slot just before the booking flow marks it booked.
+
+        Returns:
+            int: Number of booked slots upserted
+        """
+        held_ids = {slot["id"] for slot in data["held_slots"]}
+        held_keys = {(s["counselor_id"], s["date"], s["start_time"]) for s in data["held_slots"]}
+        now = datetime.utcnow()
+
+        operations = []
+        for appointment in data["appointments"]:
+            if appointment["status"] == "completed" or appointment.get("slot_id") in held_ids:
+                continue
+            key = (appointment["counselor_id"], appointment["date"], appointment["start_time"])
+            if key in held_keys:
+                continue
+            operations.append(UpdateOne(
+                {"church_id": church_id, "counselor_id": key[0], "date": key[1], "start_time": key[2]},
+                {
+                    "$set": {
+                        "status": "booked",
+                        "appointment_id": appointment["id"],
+                        "end_time": appointment["end_time"],
+                        "updated_at": now
+                    },
+                    "$setOnInsert": {
+                        "id": appointment.get("slot_id") or slot_id_for(*key),
+                        "source": "recurring",
+                        "created_at": now
                     }
-                )
-            else:
-                # Insert new slot
-                await self.db.counseling_time_slots.insert_one(slot)
-                if slot["status"] == "open":
-                    generated += 1
-        
-        return {
-            "generated": generated,
-            "blocked": blocked,
-            "skipped": skipped
-        }
-    
+                },
+                upsert=True
+            ))
+
+        if operations:
+            await self.db.counseling_time_slots.bulk_write(operations, ordered=False)
+
+        counselor_ids = [c["id"] for c in data["counselors"]]
+        await self.db.counseling_time_slots.delete_many({
+            "church_id": church_id,
+            "counselor_id": {"$in": counselor_ids},
+            "date": {"$gte": start_date.isoformat(), "$lte": end_date.isoformat()},
+            "status": {"$in": ["open", "blocked"]},
+            "appointment_id": None,
+            "updated_at": {"$lt": now - MATERIALIZED_SLOT_GRACE}
+        })
+
+        return len(operations)
+
+    # ==================== SLOT GENERATION (RECONCILIATION) ====================
+
     async def generate_slots_for_range(
         self,
         church_id: str,
@@ -152,72 +349,96 @@ class CounselingAvailabilityService:
         end_date: date
     ) -> dict:
         """
-        Generate slots for a date range.
-        
+        Reconcile stored slots for a counselor and date range.
+
+        Open and blocked slots are computed on request, so only booked
+        slots are persisted here.
+
         Returns:
             dict: Aggregated stats { "total_generated": int, "total_blocked": int, "total_skipped": int }
         """
-        total_generated = 0
-        total_blocked = 0
-        total_skipped = 0
-        
-        current_date = start_date
-        while current_date <= end_date:
-            result = await self.generate_slots_for_date(church_id, counselor_id, current_date)
-            total_generated += result["generated"]
-            total_blocked += result["blocked"]
-            total_skipped += result["skipped"]
-            
-            current_date += timedelta(days=1)
-        
+        data = await self._load(church_id, start_date, end_date, counselor_id)
+        slots = self._compute(church_id, data, start_date, end_date)
+        await self._persist_held_slots(church_id, data, start_date, end_date)
+
+        total_generated = sum(1 for s in slots if s["status"] == "open")
+        total_blocked = sum(1 for s in slots if s["status"] == "blocked")
+        total_skipped = sum(1 for s in slots if s["status"] in HELD_SLOT_STATUSES)
+
         logger.info(
-            f"Generated slots for {counselor_id}: "
-            f"{total_generated} open, {total_blocked} blocked, {total_skipped} skipped"
+            f"Computed slots for {counselor_id}: "
+            f"{total_generated} open, {total_blocked} blocked, {total_skipped} booked"
         )
-        
+
         return {
             "total_generated": total_generated,
             "total_blocked": total_blocked,
             "total_skipped": total_skipped
         }
-    
+
+    async def generate_slots_for_date(
+        self,
+        church_id: str,
+        counselor_id: str,
+        target_date: date
+    ) -> dict:
+        """
+        Reconcile stored slots for a single date.
+
+        Returns:
+            dict: { "generated": int, "blocked": int, "skipped": int }
+        """
+        result = await self.generate_slots_for_range(church_id, counselor_id, target_date, target_date)
+        return {
+            "generated": result["total_generated"],
+            "blocked": result["total_blocked"],
+            "skipped": result["total_skipped"]
+        }
+
     async def generate_slots_for_all_counselors(
         self,
         church_id: str,
         days_ahead: int
     ) -> dict:
         """
-        Generate slots for all active counselors in a church.
-        
+        Reconcile stored slots for all active counselors in a church.
+
+        One load for the whole church and horizon instead of per counselor per date.
+
         Args:
             church_id: Church ID
-            days_ahead: Number of days ahead to generate (or 365 for "forever")
-        
+            days_ahead: Number of days ahead to reconcile (or 365 for "forever")
+
         Returns:
             dict: Stats per counselor
         """
-        # Get all active counselors
-        counselors = await self.db.counselors.find({
-            "church_id": church_id,
-            "is_active": True
-        }).to_list(1000)
-        
         start_date = date.today()
         end_date = start_date + timedelta(days=days_ahead)
-        
-        results = {}
-        for counselor in counselors:
-            counselor_id = counselor["id"]
-            result = await self.generate_slots_for_range(
-                church_id,
-                counselor_id,
-                start_date,
-                end_date
-            )
-            results[counselor_id] = result
-        
+
+        data = await self._load(church_id, start_date, end_date)
+        slots = self._compute(church_id, data, start_date, end_date)
+        persisted = await self._persist_held_slots(church_id, data, start_date, end_date)
+
+        results = {
+            counselor["id"]: {"total_generated": 0, "total_blocked": 0, "total_skipped": 0}
+            for counselor in data["counselors"]
+        }
+        for slot in slots:
+            stats = results[slot["counselor_id"]]
+            if slot["status"] == "open":
+                stats["total_generated"] += 1
+            elif slot["status"] == "blocked":
+                stats["total_blocked"] += 1
+            else:
+                stats["total_skipped"] += 1
+
+        if persisted:
+            logger.info(f"Persisted {persisted} booked slots for church {church_id}")
+
         return results
-    
+
+    # ==================== QUERIES ====================
+
     async def get_available_slots(
         self,
         church_id: str,
@@ -227,104 +448,18 @@ class CounselingAvailabilityService:
         status: Literal["open", "booked", "blocked", "reserved"] = "open"
     ) -> list:
         """
-        Query available time slots.
-        
+        Query time slots, computed from rules, overrides and bookings.
+
         Returns:
-            list: List of slot documents
+            list: Slot documents (with counselor_name) sorted by date and time
         """
-        query = {
-            "church_id": church_id,
-            "status": status
-        }
-        
-        if counselor_id:
-            query["counselor_id"] = counselor_id
-        
-        if date_from:
-            query["date"] = {"$gte": date_from}
-        
-        if date_to:
-            if "date" in query:
-                query["date"]["$lte"] = date_to
-            else:
-                query["date"] = {"$lte": date_to}
-        
-        slots = await self.db.counseling_time_slots.find(query, {"_id": 0}).sort([
-            ("date", 1),
-            ("start_time", 1)
-        ]).to_list(1000)
-        
-        return slots
-    
-    def _generate_slots_from_rule(self, date_str: str, rule: dict, church_id: str, counselor_id: str) -> list:
-        """Generate slots from a recurring rule."""
-        return self._generate_slots_from_time_range(
-            date_str,
-            rule["start_time"],
-            rule["end_time"],
-            rule["slot_length_minutes"],
-            "recurring",
-            church_id,
-            counselor_id
+        start_date = date.fromisoformat(date_from) if date_from else date.today()
+        end_date = (
+            date.fromisoformat(date_to) if date_to
+            else start_date + timedelta(days=DEFAULT_RANGE_DAYS)
         )
-    
-    def _generate_slots_from_time_range(
-        self,
-        date_str: str,
-        start_time_str: str,
-        end_time_str: str,
-        slot_length_minutes: int,
-        source: str,
-        church_id: str,
-        counselor_id: str
-    ) -> list:
-        """Generate individual time slots from a time range."""
-        import uuid
-        
-        start_time = time.fromisoformat(start_time_str)
-        end_time = time.fromisoformat(end_time_str)
-        
-        # Convert to minutes
-        start_minutes = start_time.hour * 60 + start_time.minute
-        end_minutes = end_time.hour * 60 + end_time.minute
-        
-        slots = []
-        current_minutes = start_minutes
-        
-        while current_minutes + slot_length_minutes <= end_minutes:
-            slot_start = time(hour=current_minutes // 60, minute=current_minutes % 60)
-            slot_end_minutes = current_minutes + slot_length_minutes
-            slot_end = time(hour=slot_end_minutes // 60, minute=slot_end_minutes % 60)
-            
-            slots.append({
-                "id": str(uuid.uuid4()),
-                "church_id": church_id,
-                "counselor_id": counselor_id,
-                "date": date_str,
-                "start_time": slot_start.isoformat(timespec='minutes'),
-                "end_time": slot_end.isoformat(timespec='minutes'),
-                "status": "open",
-                "source": source,
-                "created_at": datetime.utcnow(),
-                "updated_at": datetime.utcnow()
-            })
-            
-            current_minutes += slot_length_minutes
-        
-        return slots
-    
-    @staticmethod
-    def _time_ranges_overlap(
-        start1: time,
-        end1: time,
-        start2: time,
-        end2: time
-    ) -> bool:
-        """Check if two time ranges overlap."""
-        # Convert to minutes for easier comparison
-        s1 = start1.hour * 60 + start1.minute
-        e1 = end1.hour * 60 + end1.minute
-        s2 = start2.hour * 60 + start2.minute
-        e2 = end2.hour * 60 + end2.minute
-        
-        return not (e1 <= s2 or e2 <= s1)
+        if end_date < start_date:
+            return []
+
+        slots = await self.compute_slots(church_id, start_date, end_date, counselor_id)
+        return [s for s in slots if s["status"] == status][:MAX_SLOTS]
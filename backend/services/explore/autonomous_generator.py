@@ -827,7 +827,9 @@ The goal is thematic coherence that reinforces learning without feeling repetiti
         """
         Autonomously generate content without any user input.
 
-        This is the main entry point for scheduled/background generation.
+        This is the main entry point for one-off background generation. Batch
+        runs go through GenerationPipeline, which drives the same stages
+        (text -> image -> document) concurrently across churches.
 
         Args:
             content_type: Type of content to generate
@@ -837,7 +839,37 @@ The goal is thematic coherence that reinforces learning without feeling repetiti
         Returns:
             Generated content document (published or draft based on settings)
         """
-        from routes.ai.streaming import stream_explore_content, generate_coherent_image
+        text_result = await self.generate_text_content(content_type, church_id)
+        if "error" in text_result:
+            return text_result
+
+        # Generate and store image if requested
+        image_url = None
+        if generate_image and self.seaweedfs:
+            try:
+                image_url = await self.generate_and_store_image(
+                    content_type, text_result["content"], church_id
+                )
+            except Exception as e:
+                logger.error(f"Image generation/upload failed: {e}")
+                # Continue without image
+
+        return self.build_content_document(content_type, church_id, text_result, image_url)
+
+    async def generate_text_content(
+        self,
+        content_type: str,
+        church_id: str = "global",
+    ) -> Dict[str, Any]:
+        """
+        Text stage: select a topic, build the prompt and generate with Claude.
+
+        Returns:
+            Dict with parsed "content" plus the "model", "traditions" and
+            "auto_publish" used, or {"error", "raw"} if the response was not
+            valid JSON.
+        """
+        from routes.ai.streaming import stream_explore_content
 
         # Get church settings for auto-publish and traditions
         church_settings = await self.get_church_settings(church_id)
@@ -947,60 +979,91 @@ This is a systematic study - lessons should form a coherent learning journey.
             content_type=content_type,
             params=params,
             church_id=church_id,
-            model=model
+            model=model,
+            use_cache=False,  # Scheduled content must be new each day, never a replay
         ):
             full_content += chunk
 
         # Parse generated content
-        import json
         try:
             parsed_content = json.loads(full_content)
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse generated content: {e}")
             return {"error": "Failed to parse AI response", "raw": full_content}
 
-        # Generate and store image if requested
-        image_url = None
-        if generate_image and self.seaweedfs:
-            try:
-                image_result = await generate_coherent_image(
-                    content_type=content_type,
-                    content_data=parsed_content,
-                    width=1024,
-                    height=1024,
-                )
+        return {
+            "content": parsed_content,
+            "model": model,
+            "traditions": traditions,
+            "auto_publish": auto_publish,
+        }
 
-                # Upload to SeaweedFS
-                from services.seaweedfs_service import StorageCategory
-                import base64
-
-                image_bytes = base64.b64decode(image_result["image_base64"])
-                filename = f"{content_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-
-                # Determine storage category
-                category_map = {
-                    "bible_figure": StorageCategory.EXPLORE_FIGURE,
-                    "daily_devotion": StorageCategory.EXPLORE_DEVOTION,
-                    "verse_of_the_day": StorageCategory.EXPLORE_VERSE,
-                    "daily_quiz": StorageCategory.EXPLORE_QUIZ,
-                    "bible_study": StorageCategory.EXPLORE_STUDY,
-                }
-                category = category_map.get(content_type, StorageCategory.AI_GENERATED)
-
-                upload_result = await self.seaweedfs.upload_bytes(
-                    file_bytes=image_bytes,
-                    filename=filename,
-                    church_id=church_id if church_id != "global" else "platform",
-                    category=category,
-                    content_type="image/png",
-                )
+    async def generate_and_store_image(
+        self,
+        content_type: str,
+        parsed_content: Dict[str, Any],
+        church_id: str = "global",
+    ) -> Optional[str]:
+        """
+        Image stage: build a coherent image prompt, generate, upload to SeaweedFS.
 
-                image_url = upload_result.get("public_url") or upload_result.get("url")
-                logger.info(f"Image uploaded to SeaweedFS: {image_url}")
+        Raises on failure so callers can decide whether to retry or continue
+        without an image.
 
-            except Exception as e:
-                logger.error(f"Image generation/upload failed: {e}")
-                # Continue without image
+        Returns:
+            Public URL of the stored image
+        """
+        from routes.ai.streaming import generate_coherent_image
+
+        image_result = await generate_coherent_image(
+            content_type=content_type,
+            content_data=parsed_content,
+            width=1024,
+            height=1024,
+        )
+
+        # Upload to SeaweedFS
+        from services.seaweedfs_service import StorageCategory
+        import base64
+
+        image_bytes = base64.b64decode(image_result["image_base64"])
+        filename = f"{content_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
+
+        # Determine storage category
+        category_map = {
+            "bible_figure": StorageCategory.EXPLORE_FIGURE,
+            "daily_devotion": StorageCategory.EXPLORE_DEVOTION,
+            "verse_of_the_day": StorageCategory.EXPLORE_VERSE,
+            "daily_quiz": StorageCategory.EXPLORE_QUIZ,
+            "bible_study": StorageCategory.EXPLORE_STUDY,
+        }
+        category = category_map.get(content_type, StorageCategory.AI_GENERATED)
+
+        upload_result = await self.seaweedfs.upload_bytes(
+            file_bytes=image_bytes,
+            filename=filename,
+            church_id=church_id if church_id != "global" else "platform",
+            category=category,
+            content_type="image/png",
+        )
+
+        image_url = upload_result.get("public_url") or upload_result.get("url")
+        logger.info(f"Image uploaded to SeaweedFS: {image_url}")
+
+        return image_url
+
+    def build_content_document(
+        self,
+        content_type: str,
+        church_id: str,
+        text_result: Dict[str, Any],
+        image_url: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Document stage: wrap generated content in the Explore content schema."""
+        parsed_content = text_result["content"]
+        model = text_result["model"]
+        traditions = text_result["traditions"]
+        auto_publish = text_result["auto_publish"]
 
         # Determine status based on auto_publish setting
         # If auto_publish is True, content goes directly to "published"
@@ -1040,27 +1103,21 @@ This is a systematic study - lessons should form a coherent learning journey.
         """
         Generate all daily content types for the next day.
 
-        This should be called by a scheduler (APScheduler) at a set time.
+        Content types are generated concurrently through GenerationPipeline
+        (documents are returned, not persisted). Scheduled batch runs across
+        many churches should use GenerationPipeline.run directly.
         """
-        content_types = [
-            "daily_devotion",
-            "verse_of_the_day",
-            "bible_figure",
-            "daily_quiz",
-        ]
+        from services.explore.generation_pipeline import GenerationPipeline, DAILY_CONTENT_TYPES
+
+        pipeline = GenerationPipeline(self.db, self, persist=False)
+        report = await pipeline.run([church_id], DAILY_CONTENT_TYPES, job="schedule_daily_generation")
 
         results = {}
-        for content_type in content_types:
-            try:
-                result = await self.generate_content_autonomously(
-                    content_type=content_type,
-                    church_id=church_id,
-                    generate_image=True,
-                )
-                results[content_type] = {"success": True, "document": result}
-            except Exception as e:
-                logger.error(f"Failed to generate {content_type}: {e}")
-                results[content_type] = {"success": False, "error": str(e)}
+        for task in report.tasks:
+            if task.document is not None:
+                results[task.content_type] = {"success": True, "document": task.document}
+            else:
+                results[task.content_type] = {"success": False, "error": task.error}
 
         return results
 
@@ -0,0 +1,373 @@
+"""
+Explore Content Counters
+
+The Content Center dashboard (``/explore/admin/stats``) and analytics
+overview used to run ~25 ``count_documents`` calls across the content
+collections on every load. These counters keep the same figures in
+Redis, maintained incrementally by the writers, so the dashboard answers
+from one pipelined read.
+
+Layout (one hash per scope, ``scope`` = "global" or a church_id)::
+
+    explore:counters:<scope>   <coll>:total | <coll>:published | <coll>:draft
+                               <coll>:review | <coll>:sched:<YYYY-MM-DD>
+    explore:counters:_all      <coll>:review (every scope), jobs:<status>
+
+Only documents with ``deleted: False`` are counted, matching the
+dashboard queries. Writers report a document's before/after state
+(record_insert / record_change / update_one) and the counters apply the
+difference, so any field change - publish, schedule, delete, scope move -
+is accounted for without per-route bookkeeping.
+
+Writers outside the Explore admin routes and the generation pipeline are
+not tracked; reconcile() (scheduler job every RECONCILE_INTERVAL seconds,
+and at startup) rebuilds all hashes from Mongo and swaps them in
+atomically, bounding any drift.
+"""
+
+import logging
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from pymongo import ReturnDocument
+
+from config.redis import get_redis
+from services.redis.utils import redis_key
+
+logger = logging.getLogger(__name__)
+
+
+# Collection -> dashboard name
+CONTENT_COLLECTIONS = {
+    "daily_devotions": "devotions",
+    "verses_of_the_day": "verses",
+    "bible_figures": "figures",
+    "daily_quizzes": "quizzes",
+    "bible_studies": "studies",
+    "topical_categories": "categories",
+    "topical_verses": "topical_verses",
+    "devotion_plans": "plans",
+}
+
+# Collections included in published/draft/review totals
+STATUS_COLLECTIONS = ("daily_devotions", "verses_of_the_day", "bible_figures", "daily_quizzes", "bible_studies")
+
+# Collections included in the scheduled total
+SCHEDULE_COLLECTIONS = ("daily_devotions", "verses_of_the_day", "bible_figures", "daily_quizzes")
+
+JOBS_COLLECTION = "ai_generation_jobs"
+PENDING_JOB_STATUSES = ("pending", "generating")
+
+# Fields that decide which counters a document contributes to
+COUNTER_PROJECTION = {
+    "_id": 0,
+    "scope": 1,
+    "church_id": 1,
+    "status": 1,
+    "deleted": 1,
+    "ai_generated": 1,
+    "scheduled_date": 1,
+}
+
+ALL_SCOPES = "_all"
+META_KEY = redis_key("explore", "counters", "meta")
+SCOPES_KEY = redis_key("explore", "counters", "scopes")
+RECONCILE_LOCK_KEY = redis_key("explore", "counters", "reconcile_lock")
+
+RECONCILE_INTERVAL = 1800  # seconds
+
+
+def _hash_key(scope: str) -> str:
+    return redis_key("explore", "counters", scope)
+
+
+def _scheduled_day(value: Any) -> Optional[str]:
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    return str(value)[:10]
+
+
+def counter_fields(collection_name: str, doc: Optional[Dict[str, Any]]) -> Dict[str, Dict[str, int]]:
+    """
+    Counters a document contributes to, as {hash scope: {field: 1}}.
+
+    Empty for missing/deleted documents and untracked collections.
+    """
+    if not doc:
+        return {}
+
+    if collection_name == JOBS_COLLECTION:
+        if doc.get("deleted") is True:
+            return {}
+        return {ALL_SCOPES: {f"jobs:{doc.get('status')}": 1}}
+
+    if collection_name not in CONTENT_COLLECTIONS or doc.get("deleted") is not False:
+        return {}
+
+    scope = "global" if doc.get("scope") == "global" else doc.get("church_id")
+    if not scope:
+        return {}
+
+    status = doc.get("status")
+    fields = {f"{collection_name}:total": 1}
+    if status == "published":
+        fields[f"{collection_name}:published"] = 1
+    elif status in ("draft", None):
+        fields[f"{collection_name}:draft"] = 1
+
+    counters = {scope: fields}
+    if doc.get("ai_generated") is True and status in ("draft", None):
+        fields[f"{collection_name}:review"] = 1
+        counters[ALL_SCOPES] = {f"{collection_name}:review": 1}
+
+    day = _scheduled_day(doc.get("scheduled_date"))
+    if day:
+        fields[f"{collection_name}:sched:{day}"] = 1
+
+    return counters
+
+
+def _apply_update(before: Dict[str, Any], update: Dict[str, Any]) -> Dict[str, Any]:
+    """After-image of the counter fields for a $set/$unset update."""
+    after = dict(before)
+    for field, value in update.get("$set", {}).items():
+        if field in COUNTER_PROJECTION:
+            after[field] = value
+    for field in update.get("$unset", {}):
+        after.pop(field, None)
+    return after
+
+
+class ExploreCounters:
+    """Incrementally maintained Explore content counts in Redis."""
+
+    # ==================== Writers ====================
+
+    async def _apply(self, deltas: Dict[str, Counter]) -> None:
+        deltas = {scope: {f: n for f, n in fields.items() if n} for scope, fields in deltas.items()}
+        deltas = {scope: fields for scope, fields in deltas.items() if fields}
+        if not deltas:
+            return
+        try:
+            redis = await get_redis()
+            async with redis.pipeline(transaction=False) as pipe:
+                for scope, fields in deltas.items():
+                    for field, n in fields.items():
+                        pipe.hincrby(_hash_key(scope), field, n)
+                    if scope != ALL_SCOPES:
+                        pipe.sadd(SCOPES_KEY, scope)
+                await pipe.execute()
+        except Exception as e:
+            # reconcile() repairs whatever was missed
+            logger.debug(f"Explore counter update failed: {e}")
+
+    @staticmethod
+    def _diff(collection_name: str, before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]) -> Dict[str, Counter]:
+        deltas: Dict[str, Counter] = defaultdict(Counter)
+        for scope, fields in counter_fields(collection_name, before).items():
+            deltas[scope].subtract(fields)
+        for scope, fields in counter_fields(collection_name, after).items():
+            deltas[scope].update(fields)
+        return deltas
+
+    async def record_change(
+        self,
+        collection_name: str,
+        before: Optional[Dict[str, Any]],
+        after: Optional[Dict[str, Any]],
+    ) -> None:
+        """Apply the counter difference between two states of a document."""
+        await self._apply(self._diff(collection_name, before, after))
+
+    async def record_insert(self, collection_name: str, doc: Dict[str, Any]) -> None:
+        """Count a newly inserted document."""
+        await self.record_change(collection_name, None, doc)
+
+    async def record_many(self, collection_name: str, changes: Iterable[tuple]) -> None:
+        """Apply several (before, after) changes in one pipeline."""
+        total: Dict[str, Counter] = defaultdict(Counter)
+        for before, after in changes:
+            for scope, fields in self._diff(collection_name, before, after).items():
+                total[scope].update(fields)
+        await self._apply(total)
+
+    async def update_one(self, collection, query: Dict[str, Any], update: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        ``update_one`` that keeps the counters in step.
+
+        Returns:
+            The matched document's counter fields before the update, or None
+            if nothing matched (use like ``matched_count == 0``)
+        """
+        before = await collection.find_one_and_update(
+            query, update, projection=COUNTER_PROJECTION, return_document=ReturnDocument.BEFORE
+        )
+        if before is not None:
+            await self.record_change(collection.name, before, _apply_update(before, update))
+        return before
+
+    async def update_many(self, collection, query: Dict[str, Any], update: Dict[str, Any]):
+        """``update_many`` that keeps the counters in step (returns the UpdateResult)."""
+        befores = await collection.find(query, COUNTER_PROJECTION).to_list(length=None)
+        result = await collection.update_many(query, update)
+        await self.record_many(collection.name, ((b, _apply_update(b, update)) for b in befores))
+        return result
+
+    # ==================== Readers ====================
+
+    async def read(self, scopes: List[str]) -> Optional[Dict[str, Dict[str, int]]]:
+        """
+        Counter hashes for the given scopes (plus the cross-scope hash).
+
+        Returns None when Redis is unavailable or counters haven't been
+        built yet - callers fall back to counting in Mongo.
+        """
+        try:
+            redis = await get_redis()
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.exists(META_KEY)
+                pipe.hgetall(_hash_key(ALL_SCOPES))
+                for scope in scopes:
+                    pipe.hgetall(_hash_key(scope))
+                built, all_scopes, *hashes = await pipe.execute()
+        except Exception as e:
+            logger.debug(f"Explore counters unavailable: {e}")
+            return None
+
+        if not built:
+            return None
+
+        result = {ALL_SCOPES: {f: int(v) for f, v in all_scopes.items()}}
+        for scope, values in zip(scopes, hashes):
+            result[scope] = {f: int(v) for f, v in values.items()}
+        return result
+
+    async def dashboard_stats(self, session_church_id: str) -> Optional[Dict[str, Any]]:
+        """The Content Center dashboard figures, or None if counters aren't available."""
+        scopes = ["global"] if session_church_id == "global" else ["global", session_church_id]
+        counters = await self.read(scopes)
+        if counters is None:
+            return None
+
+        def total(field_suffix: str, collections: Iterable[str]) -> int:
+            return sum(
+                counters[scope].get(f"{coll}:{field_suffix}", 0)
+                for scope in scopes for coll in collections
+            )
+
+        content_dict = {name: total("total", [coll]) for coll, name in CONTENT_COLLECTIONS.items()}
+
+        today = datetime.now().date().isoformat()
+        scheduled = 0
+        for scope in scopes:
+            for field, count in counters[scope].items():
+                coll, _, rest = field.partition(":sched:")
+                if rest and coll in SCHEDULE_COLLECTIONS and rest >= today:
+                    scheduled += count
+
+        if session_church_id == "global":
+            # Global context reviews AI drafts from every church
+            pending_review = sum(counters[ALL_SCOPES].get(f"{coll}:review", 0) for coll in STATUS_COLLECTIONS)
+        else:
+            pending_review = total("review", STATUS_COLLECTIONS)
+
+        return {
+            "content_counts": {
+                **content_dict,
+                "total": sum(content_dict.values()),
+            },
+            "status_counts": {
+                "published": total("published", STATUS_COLLECTIONS),
+                "draft": total("draft", STATUS_COLLECTIONS),
+                "scheduled": scheduled,
+            },
+            "ai_generation": {
+                "pending_jobs": sum(counters[ALL_SCOPES].get(f"jobs:{s}", 0) for s in PENDING_JOB_STATUSES),
+            },
+            "pending_review": pending_review,
+        }
+
+    # ==================== Reconciliation ====================
+
+    async def reconcile(self, db) -> bool:
+        """
+        Rebuild every counter hash from Mongo and swap them in atomically.
+
+        Returns:
+            True if the counters were rebuilt
+        """
+        try:
+            redis = await get_redis()
+            if not await redis.set(RECONCILE_LOCK_KEY, "1", nx=True, ex=600):
+                return False  # Another instance is reconciling
+        except Exception as e:
+            logger.debug(f"Explore counter reconcile skipped, Redis unavailable: {e}")
+            return False
+
+        try:
+            totals: Dict[str, Counter] = defaultdict(Counter)
+
+            group_id = {field: f"${field}" for field in COUNTER_PROJECTION if field != "_id"}
+            for collection_name in CONTENT_COLLECTIONS:
+                pipeline = [
+                    {"$match": {"deleted": False}},
+                    {"$group": {"_id": group_id, "n": {"$sum": 1}}},
+                ]
+                async for group in db[collection_name].aggregate(pipeline):
+                    for scope, fields in counter_fields(collection_name, group["_id"]).items():
+                        for field in fields:
+                            totals[scope][field] += group["n"]
+
+            async for group in db[JOBS_COLLECTION].aggregate([
+                {"$match": {"deleted": {"$ne": True}}},
+                {"$group": {"_id": "$status", "n": {"$sum": 1}}},
+            ]):
+                totals[ALL_SCOPES][f"jobs:{group['_id']}"] += group["n"]
+
+            old_scopes = await redis.smembers(SCOPES_KEY)
+            new_scopes = {scope for scope in totals if scope != ALL_SCOPES}
+
+            # Stage under temporary keys, then swap everything in one transaction
+            async with redis.pipeline(transaction=False) as pipe:
+                for scope, fields in totals.items():
+                    tmp = _hash_key(f"rebuild:{scope}")
+                    pipe.delete(tmp)
+                    if fields:
+                        pipe.hset(tmp, mapping=dict(fields))
+                await pipe.execute()
+
+            async with redis.pipeline(transaction=True) as pipe:
+                for scope in (set(old_scopes) - new_scopes) | ({ALL_SCOPES} - set(totals)):
+                    pipe.delete(_hash_key(scope))
+                for scope, fields in totals.items():
+                    if fields:
+                        pipe.rename(_hash_key(f"rebuild:{scope}"), _hash_key(scope))
+                    else:
+                        pipe.delete(_hash_key(scope))
+                pipe.delete(SCOPES_KEY)
+                if new_scopes:
+                    pipe.sadd(SCOPES_KEY, *new_scopes)
+                pipe.set(META_KEY, datetime.utcnow().isoformat())
+                await pipe.execute()
+
+            logger.debug(f"Reconciled Explore counters for {len(new_scopes)} scopes")
+            return True
+        except Exception as e:
+            logger.error(f"Explore counter reconcile failed: {e}")
+            return False
+        finally:
+            try:
+                await redis.delete(RECONCILE_LOCK_KEY)
+            except Exception:
+                pass
+
+
+explore_counters = ExploreCounters()
+
+
+async def reconcile_explore_counters(db) -> None:
+    """Scheduler job: rebuild Explore content counters from Mongo."""
+    await explore_counters.reconcile(db)
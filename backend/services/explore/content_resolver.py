@@ -8,6 +8,7 @@ Handles content resolution with:
 - Language preference
 """
 
+import asyncio
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
 from motor.motor_asyncio import AsyncIOMotorClient
@@ -58,40 +59,79 @@ class ContentResolver:
         Returns:
             Content dict or None if not found
         """
-        # Step 1: Check church settings
+        bundle = await self.get_daily_bundle(church_id, date, [content_type], [language])
+        return bundle[language][content_type]
+
+    async def get_daily_bundle(
+        self,
+        church_id: str,
+        date: datetime,
+        content_types: List[ContentType],
+        languages: List[Language],
+    ) -> Dict[str, Dict[str, Optional[Dict[str, Any]]]]:
+        """
+        Resolve several daily content types at once
+
+        Same rules as get_daily_content (feature flags, takeover before
+        global schedule, platform default as fallback), but with one
+        settings lookup and one schedule query for all types, and the
+        content formatted once per language.
+
+        Args:
+            church_id: Church identifier
+            date: Target date
+            content_types: Daily content types to resolve
+            languages: Languages to format the content for
+
+        Returns:
+            {language: {content_type: content dict or None}}
+        """
+        bundle: Dict[str, Dict[str, Optional[Dict[str, Any]]]] = {
+            language: {content_type: None for content_type in content_types}
+            for language in languages
+        }
+
+        # Step 1: Check church settings and enabled features
         settings = await self._get_church_settings(church_id)
         if not settings or not settings.get("explore_enabled"):
             logger.info(f"Explore not enabled for church {church_id}")
-            return None
+            return bundle
 
-        # Check if specific feature is enabled
-        feature_key = content_type
-        if not settings.get("features", {}).get(feature_key, {}).get("enabled", False):
-            logger.info(f"Feature {content_type} not enabled for church {church_id}")
-            return None
-
-        # Step 2: Check for scheduled content (with takeover support)
-        scheduled_content = await self._get_scheduled_content(
-            church_id, date, content_type
-        )
-
-        if scheduled_content:
-            # Get the actual content
-            content = await self._get_content_by_id(
-                scheduled_content["content_id"], content_type
-            )
+        features = settings.get("features", {})
+        enabled_types = [
+            content_type for content_type in content_types
+            if features.get(content_type, {}).get("enabled", False)
+        ]
+        if not enabled_types:
+            logger.info(f"No daily features enabled for church {church_id}")
+            return bundle
+
+        # Step 2: Scheduled content (takeover wins over global schedule)
+        schedule = await self._get_scheduled_content(church_id, date, enabled_types)
+
+        async def resolve(content_type: ContentType) -> Optional[Dict[str, Any]]:
+            entry = schedule.get(content_type)
+            if entry:
+                content = await self._get_content_by_id(entry["content_id"], content_type)
+                if content:
+                    return content
+
+            # Step 3: Fallback to platform default (if no church-specific content)
+            content = await self._get_default_daily_content(date, content_type)
+            if not content:
+                logger.warning(
+                    f"No content found for church={church_id}, date={date}, type={content_type}"
+                )
+            return content
+
+        contents = await asyncio.gather(*(resolve(ct) for ct in enabled_types))
+
+        for content_type, content in zip(enabled_types, contents):
             if content:
-                return self._format_content(content, language)
-
-        # Step 3: Fallback to platform default (if no church-specific content)
-        default_content = await self._get_default_daily_content(date, content_type)
-        if default_content:
-            return self._format_content(default_content, language)
+                for language in languages:
+                    bundle[language][content_type] = self._format_content(content, language)
 
-        logger.warning(
-            f"No content found for church={church_id}, date={date}, type={content_type}"
-        )
-        return None
+        return bundle
 
     async def get_self_paced_content(
         self,
@@ -183,10 +223,10 @@ class ContentResolver:
         )
 
     async def _get_scheduled_content(
-        self, church_id: str, date: datetime, content_type: ContentType
-    ) -> Optional[Dict[str, Any]]:
+        self, church_id: str, date: datetime, content_types: List[ContentType]
+    ) -> Dict[str, Dict[str, Any]]:
         """
-        Get scheduled content for a date
+        Get scheduled content for several types with a single query
 
         Priority:
         1. Church-specific takeover content
@@ -195,36 +235,25 @@ class ContentResolver:
         date_start = datetime(date.year, date.month, date.day)
         date_end = date_start + timedelta(days=1)
 
-        # Check for church takeover first
-        takeover = await self.db.content_schedule.find_one(
+        cursor = self.db.content_schedule.find(
             {
-                "church_id": church_id,
-                "content_type": content_type,
+                "church_id": {"$in": [church_id, "global"]},
+                "content_type": {"$in": content_types},
                 "date": {"$gte": date_start, "$lt": date_end},
-                "is_takeover": True,
                 "published": True,
                 "deleted": False,
             }
         )
 
-        if takeover:
-            logger.info(
-                f"Found takeover content for church {church_id}, date {date}, type {content_type}"
-            )
-            return takeover
-
-        # Fallback to global schedule
-        global_schedule = await self.db.content_schedule.find_one(
-            {
-                "church_id": "global",
-                "content_type": content_type,
-                "date": {"$gte": date_start, "$lt": date_end},
-                "published": True,
-                "deleted": False,
-            }
-        )
+        resolved: Dict[str, Dict[str, Any]] = {}
+        async for entry in cursor:
+            content_type = entry["content_type"]
+            if entry["church_id"] == church_id and entry.get("is_takeover"):
+                resolved[content_type] = entry
+            elif entry["church_id"] == "global":
+                resolved.setdefault(content_type, entry)
 
-        return global_schedule
+        return resolved
 
     async def _get_default_daily_content(
         self, date: datetime, content_type: ContentType
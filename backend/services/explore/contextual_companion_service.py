@@ -18,6 +18,7 @@ from typing import Optional, List, Dict, Any, Literal
 from motor.motor_asyncio import AsyncIOMotorClient
 import logging
 
+from services.bible_store import bible_store
 from services.explore.profile_service import get_profile_service
 
 logger = logging.getLogger(__name__)
@@ -484,17 +485,30 @@ class ContextualCompanionService:
         language: str = "en",
     ) -> Dict[str, Any]:
         """Build context data for verse meditation"""
-        verse = await self.db.verse_of_the_day.find_one({"id": verse_id})
+        verse = await self.db.verses_of_the_day.find_one({"id": verse_id})
         if not verse:
             return {}
 
         lang_key = language if language in ["en", "id"] else "en"
         verse_ref = verse.get("verse", {})
+        translation = verse_ref.get("translation", "NIV") if lang_key == "en" else "TB"
+
+        verse_text = (verse.get("verse_text") or {}).get(lang_key, "")
+        if not verse_text and verse_ref.get("book"):
+            # Fill in the Scripture from the in-memory Bible when the content lacks it
+            bible_store.bind(self.db)
+            verse_text = await bible_store.get_passage_text(
+                translation,
+                verse_ref["book"],
+                verse_ref.get("chapter", 0),
+                verse_ref.get("verse_start", 0),
+                verse_ref.get("verse_end"),
+            ) or ""
 
         return {
             "scripture": f"{verse_ref.get('book', '')} {verse_ref.get('chapter', '')}:{verse_ref.get('verse_start', '')}",
-            "translation": verse_ref.get("translation", "NIV"),
-            "verse_text": verse.get("verse_text", {}).get(lang_key, ""),
+            "translation": translation,
+            "verse_text": verse_text,
             "commentary": verse.get("commentary", {}).get(lang_key, ""),
             "reflection_prompt": verse.get("reflection_prompt", {}).get(lang_key, "How does this verse speak to you today?"),
         }
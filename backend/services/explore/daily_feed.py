@@ -0,0 +1,315 @@
+"""
+Daily Explore Feed Materializer
+
+The home screen shows the same devotion, verse, figure and quiz to everyone
+in a church on a given day, yet each request used to resolve every type
+separately (settings lookup, schedule lookup, content fetch, formatting).
+
+Instead the feed is materialized once per church, per day, per language:
+
+- ContentResolver.get_daily_bundle resolves all daily types with one
+  settings lookup and one schedule query, formatting for every language
+- The bundle is stored pre-encoded in a Redis hash with a content-hash ETag,
+  so GET /public/explore/feed serves stored bytes and answers 304 for an
+  unchanged If-None-Match
+- A scheduler job re-materializes each church's feed once its release time
+  (ScheduleService._get_release_time) has passed in the church's timezone
+- ScheduleService invalidates a church's bundle on takeover and schedule
+  edits; global schedule edits bump a version every bundle is checked against
+- Misses are rebuilt on demand, single-flighted per instance
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+import pytz
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from config.redis import get_redis
+from services.redis.utils import redis_key
+from services.explore.content_resolver import ContentResolver
+from services.explore.schedule_service import ScheduleService
+from utils.serialization import json_dumps, json_dumps_str, json_loads
+
+logger = logging.getLogger(__name__)
+
+
+# Daily content types in the home feed (same as the /home endpoint)
+DAILY_FEED_TYPES = [
+    "daily_devotion",
+    "verse_of_the_day",
+    "bible_figure_of_the_day",
+    "daily_quiz",
+]
+
+FEED_LANGUAGES = ("en", "id")
+
+# Bundles outlive the day slightly; invalidation handles edits
+FEED_TTL = 26 * 3600
+MATERIALIZED_MARKER_TTL = 2 * 24 * 3600
+
+# How long a church's timezone is memoized in-process
+TIMEZONE_MEMO_TTL = 300
+
+GLOBAL_VERSION_KEY = redis_key("explore", "feed", "version", "global")
+
+
+@dataclass
+class FeedBundle:
+    """Materialized feed for one church, day and language."""
+
+    church_id: str
+    date: str       # YYYY-MM-DD (church-local)
+    language: str
+    etag: str
+    body: str       # Pre-encoded JSON
+
+    @property
+    def data(self) -> Dict:
+        return json_loads(self.body)
+
+
+class DailyFeedService:
+    """Builds, stores and serves materialized daily Explore feeds"""
+
+    def __init__(self, db: AsyncIOMotorClient):
+        self.db = db
+        self.resolver = ContentResolver(db)
+        self.schedule = ScheduleService(db)
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._timezones: Dict[str, Tuple[float, str]] = {}
+
+    # ==================== KEYS & DATES ====================
+
+    @staticmethod
+    def _bundle_key(church_id: str, day: str, language: str) -> str:
+        return redis_key("explore", "feed", church_id, day, language)
+
+    @staticmethod
+    def _materialized_key(church_id: str, day: str) -> str:
+        return redis_key("explore", "feed", "materialized", church_id, day)
+
+    async def _church_timezone(self, church_id: str) -> str:
+        """Church timezone from Explore settings (memoized briefly)"""
+        cached = self._timezones.get(church_id)
+        if cached and time.monotonic() - cached[0] < TIMEZONE_MEMO_TTL:
+            return cached[1]
+
+        settings = await self.db.church_explore_settings.find_one(
+            {"church_id": church_id, "deleted": False}, {"_id": 0, "timezone": 1}
+        )
+        tz_name = (settings or {}).get("timezone") or "UTC"
+        self._timezones[church_id] = (time.monotonic(), tz_name)
+        return tz_name
+
+    @staticmethod
+    def _local_now(tz_name: str) -> datetime:
+        try:
+            tz = pytz.timezone(tz_name)
+        except pytz.UnknownTimeZoneError:
+            tz = pytz.UTC
+        return datetime.now(tz).replace(tzinfo=None)
+
+    async def local_today(self, church_id: str) -> datetime:
+        """Start of today in the church's timezone (naive, like schedule dates)"""
+        now = self._local_now(await self._church_timezone(church_id))
+        return datetime(now.year, now.month, now.day)
+
+    # ==================== BUILD & STORE ====================
+
+    async def build(self, church_id: str, day: datetime) -> Dict[str, FeedBundle]:
+        """Resolve and encode the feed for every language"""
+        resolved = await self.resolver.get_daily_bundle(
+            church_id, day, DAILY_FEED_TYPES, list(FEED_LANGUAGES)
+        )
+        day_str = day.strftime("%Y-%m-%d")
+
+        bundles = {}
+        for language, items in resolved.items():
+            # ETag covers the content only, so an identical rebuild keeps it
+            digest = hashlib.blake2b(json_dumps(items), digest_size=12).hexdigest()
+            body = json_dumps_str({
+                "church_id": church_id,
+                "date": day_str,
+                "language": language,
+                "generated_at": datetime.utcnow(),
+                **items,
+            })
+            bundles[language] = FeedBundle(
+                church_id=church_id,
+                date=day_str,
+                language=language,
+                etag=f'W/"{digest}"',
+                body=body,
+            )
+        return bundles
+
+    async def _store(self, bundles: Dict[str, FeedBundle], global_version: str) -> None:
+        redis = await get_redis()
+        pipe = redis.pipeline(transaction=False)
+        for bundle in bundles.values():
+            key = self._bundle_key(bundle.church_id, bundle.date, bundle.language)
+            pipe.hset(key, mapping={"etag": bundle.etag, "body": bundle.body, "gv": global_version})
+            pipe.expire(key, FEED_TTL)
+        await pipe.execute()
+
+    async def materialize(
+        self, church_id: str, day: Optional[datetime] = None, global_version: Optional[str] = None
+    ) -> Dict[str, FeedBundle]:
+        """Build the feed for all languages and store it in Redis"""
+        day = day or await self.local_today(church_id)
+        bundles = await self.build(church_id, day)
+
+        try:
+            if global_version is None:
+                redis = await get_redis()
+                global_version = await redis.get(GLOBAL_VERSION_KEY) or "0"
+            await self._store(bundles, global_version)
+        except Exception as e:
+            logger.warning(f"[DailyFeed] Could not store feed for church {church_id}: {e}")
+
+        return bundles
+
+    # ==================== SERVE ====================
+
+    async def get(
+        self, church_id: str, language: str = "en", day: Optional[datetime] = None
+    ) -> FeedBundle:
+        """
+        Get the materialized feed, rebuilding it on a miss
+
+        A stored bundle is only used if it was built against the current
+        global schedule version.
+        """
+        day = day or await self.local_today(church_id)
+        day_str = day.strftime("%Y-%m-%d")
+        key = self._bundle_key(church_id, day_str, language)
+
+        global_version = None
+        try:
+            redis = await get_redis()
+            pipe = redis.pipeline(transaction=False)
+            pipe.hgetall(key)
+            pipe.get(GLOBAL_VERSION_KEY)
+            cached, global_version = await pipe.execute()
+            global_version = global_version or "0"
+
+            if cached and cached.get("gv") == global_version:
+                return FeedBundle(
+                    church_id=church_id,
+                    date=day_str,
+                    language=language,
+                    etag=cached["etag"],
+                    body=cached["body"],
+                )
+        except Exception as e:
+            logger.debug(f"[DailyFeed] Redis read failed, building directly: {e}")
+
+        bundles = await self._single_flight(
+            f"{church_id}:{day_str}",
+            lambda: self.materialize(church_id, day, global_version),
+        )
+        return bundles[language]
+
+    async def _single_flight(self, key: str, factory) -> Dict[str, FeedBundle]:
+        """Share one in-flight build per church/day between concurrent requests"""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    # ==================== INVALIDATION ====================
+
+    async def invalidate(self, church_id: str, day: Optional[datetime] = None) -> None:
+        """
+        Drop materialized feeds affected by a schedule or settings change
+
+        Args:
+            church_id: Church whose feed changed, or "global" for the platform
+                schedule (which every church falls back to)
+            day: Affected date (defaults to the church's today)
+        """
+        try:
+            redis = await get_redis()
+            if church_id == "global":
+                await redis.incr(GLOBAL_VERSION_KEY)
+                logger.info("[DailyFeed] Global schedule changed, all feeds invalidated")
+                return
+
+            self._timezones.pop(church_id, None)
+            day = day or await self.local_today(church_id)
+            day_str = day.strftime("%Y-%m-%d")
+            await redis.delete(
+                *(self._bundle_key(church_id, day_str, language) for language in FEED_LANGUAGES),
+                self._materialized_key(church_id, day_str),
+            )
+            logger.info(f"[DailyFeed] Invalidated feed for church {church_id} on {day_str}")
+        except Exception as e:
+            logger.warning(f"[DailyFeed] Feed invalidation failed for church {church_id}: {e}")
+
+    # ==================== RELEASE-TIME MATERIALIZATION ====================
+
+    async def materialize_due(self) -> int:
+        """
+        Materialize today's feed for every church whose release time has passed
+
+        Each church/day is built at most once here (tracked with a marker
+        key); invalidation clears the marker so the next run rebuilds.
+
+        Returns:
+            Number of churches materialized
+        """
+        redis = await get_redis()
+        global_version = await redis.get(GLOBAL_VERSION_KEY) or "0"
+        materialized = 0
+
+        cursor = self.db.church_explore_settings.find(
+            {"explore_enabled": True, "deleted": False},
+            {"_id": 0, "church_id": 1, "timezone": 1},
+        )
+        async for settings in cursor:
+            church_id = settings.get("church_id")
+            if not church_id:
+                continue
+
+            tz_name = settings.get("timezone") or "UTC"
+            self._timezones[church_id] = (time.monotonic(), tz_name)
+            local_now = self._local_now(tz_name)
+
+            release_time = await self.schedule._get_release_time(church_id)
+            if local_now.time() < release_time:
+                continue
+
+            day = datetime(local_now.year, local_now.month, local_now.day)
+            marker = self._materialized_key(church_id, day.strftime("%Y-%m-%d"))
+            if not await redis.set(marker, "1", nx=True, ex=MATERIALIZED_MARKER_TTL):
+                continue
+
+            try:
+                await self.materialize(church_id, day, global_version)
+                materialized += 1
+            except Exception as e:
+                await redis.delete(marker)
+                logger.error(f"[DailyFeed] Failed to materialize feed for church {church_id}: {e}")
+
+        return materialized
+
+
+# ==================== SINGLETON ACCESS ====================
+
+_daily_feed_service: Optional[DailyFeedService] = None
+
+
+def get_daily_feed_service(db: AsyncIOMotorClient) -> DailyFeedService:
+    """Get or create DailyFeedService instance"""
+    global _daily_feed_service
+    if _daily_feed_service is None:
+        _daily_feed_service = DailyFeedService(db)
+    return _daily_feed_service
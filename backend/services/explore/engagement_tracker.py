@@ -0,0 +1,734 @@
+"""
+Write-Behind Explore Engagement Tracker
+
+Content opens, completions and actions used to load the whole
+UserSpiritualProfile, mutate ``content_engagements`` in Python and ``$set``
+the entire array back on every request. During the morning devotion peak
+that meant thousands of full-profile rewrites per minute and lost updates
+when two requests for the same user raced.
+
+This module turns tracking into an append-only event log:
+
+    request ──XADD──► faithflow:explore:engagement:events (Redis stream)
+                      └─► overlay hash per user (read-your-writes)
+
+    aggregator (consumer group) ──XREADGROUP batch──► fold per profile
+                      └─► bulk_write of atomic $inc / $max / $push+$slice ops
+
+- Requests never read the profile; they append an event and bump a small
+  per-user overlay hash so the user sees their own activity immediately
+- The aggregator folds a batch of events into one set of atomic operators
+  per profile, so concurrent writers can no longer overwrite each other
+- Events left pending by a crashed instance are re-claimed after
+  PENDING_IDLE_MS by any other instance
+- When Redis is unavailable (or EXPLORE_ENGAGEMENT_WRITE_BEHIND=false) the
+  same fold is applied synchronously, so the write path is still atomic
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from config.redis import get_redis
+from services.redis.utils import redis_key
+from utils.serialization import json_dumps_str, json_loads
+
+logger = logging.getLogger(__name__)
+
+
+# Stream, consumer group and overlay keys
+STREAM_KEY = redis_key("explore", "engagement", "events")
+CONSUMER_GROUP = "profile-aggregator"
+
+# Keep the stream bounded even if no aggregator is running
+STREAM_MAXLEN = 500_000
+
+# Overlay hashes expire on their own once the aggregator has caught up
+OVERLAY_TTL = 3600
+
+# Re-claim events a consumer has held longer than this (ms)
+PENDING_IDLE_MS = 60_000
+
+# Caps mirrored from the original in-place implementation
+MAX_CONTENT_ENGAGEMENTS = 100
+MAX_TOPIC_INTERESTS = 20
+MAX_PREFERRED_HOURS = 5
+MAX_PREFERRED_DAYS = 4
+
+# Overlay counters are folded into the profile and then decremented
+OVERLAY_COUNTERS = ("views", "time", "companion")
+
+ACTION_FIELDS = {
+    "bookmark": "bookmarked",
+    "favorite": "favorited",
+    "share": "shared",
+    "companion": "companion_interactions",
+}
+
+OLD_TESTAMENT_BOOKS = frozenset([
+    "Genesis", "Exodus", "Leviticus", "Numbers", "Deuteronomy",
+    "Joshua", "Judges", "Ruth", "1 Samuel", "2 Samuel",
+    "1 Kings", "2 Kings", "1 Chronicles", "2 Chronicles",
+    "Ezra", "Nehemiah", "Esther", "Job", "Psalms", "Proverbs",
+    "Ecclesiastes", "Song of Solomon", "Isaiah", "Jeremiah",
+    "Lamentations", "Ezekiel", "Daniel", "Hosea", "Joel", "Amos",
+    "Obadiah", "Jonah", "Micah", "Nahum", "Habakkuk", "Zephaniah",
+    "Haggai", "Zechariah", "Malachi",
+])
+
+
+def testament_for_book(book: str) -> str:
+    """Return "old" or "new" for a Bible book name."""
+    return "old" if book in OLD_TESTAMENT_BOOKS else "new"
+
+
+# ==================== EVENT FOLDING ====================
+
+@dataclass
+class ContentDelta:
+    """Accumulated changes to one content engagement."""
+
+    content_type: str = ""
+    views: int = 0
+    first_viewed_at: Optional[datetime] = None
+    last_viewed_at: Optional[datetime] = None
+    time_spent_seconds: int = 0
+    completion_percentage: Optional[int] = None
+    bookmarked: Optional[bool] = None
+    favorited: Optional[bool] = None
+    shared: bool = False
+    companion_interactions: int = 0
+
+
+@dataclass
+class ProfileDelta:
+    """Accumulated changes to one user's spiritual profile."""
+
+    church_id: str
+    user_id: str
+    contents: Dict[str, ContentDelta] = field(default_factory=dict)
+    topics: Dict[str, Tuple[int, datetime]] = field(default_factory=dict)      # topic -> (count, last)
+    books: Dict[str, Tuple[int, Set[int], datetime]] = field(default_factory=dict)  # book -> (count, chapters, last)
+    hours: List[int] = field(default_factory=list)   # Most recent first
+    days: List[int] = field(default_factory=list)    # Most recent first
+    last_activity: Optional[datetime] = None
+
+    def content(self, content_id: str) -> ContentDelta:
+        return self.contents.setdefault(content_id, ContentDelta())
+
+
+def _event_time(event: Dict[str, Any]) -> datetime:
+    return datetime.fromtimestamp(float(event.get("ts") or time.time()))
+
+
+def fold_events(events: List[Dict[str, Any]]) -> Dict[Tuple[str, str], ProfileDelta]:
+    """
+    Fold engagement events (in stream order) into one delta per profile.
+
+    Counters are summed, "last value wins" fields keep the latest event and
+    timestamps keep their min/max.
+    """
+    deltas: Dict[Tuple[str, str], ProfileDelta] = {}
+
+    for event in events:
+        key = (event["church_id"], event["user_id"])
+        delta = deltas.get(key)
+        if delta is None:
+            delta = deltas[key] = ProfileDelta(church_id=key[0], user_id=key[1])
+
+        kind = event.get("kind")
+        at = _event_time(event)
+        content = delta.content(event["content_id"])
+
+        if kind == "view":
+            content.content_type = event.get("content_type") or content.content_type
+            content.views += 1
+            content.first_viewed_at = min(filter(None, [content.first_viewed_at, at]))
+            content.last_viewed_at = max(filter(None, [content.last_viewed_at, at]))
+
+            for topic in event.get("topics") or []:
+                count, _ = delta.topics.get(topic, (0, at))
+                delta.topics[topic] = (count + 1, at)
+
+            bible_ref = event.get("bible_reference") or {}
+            book = bible_ref.get("book")
+            if book:
+                count, chapters, _ = delta.books.get(book, (0, set(), at))
+                if bible_ref.get("chapter"):
+                    chapters.add(int(bible_ref["chapter"]))
+                delta.books[book] = (count + 1, chapters, at)
+
+            for values, value in ((delta.hours, at.hour), (delta.days, at.weekday())):
+                if value in values:
+                    values.remove(value)
+                values.insert(0, value)
+            delta.last_activity = max(filter(None, [delta.last_activity, at]))
+
+        elif kind == "completion":
+            content.completion_percentage = int(event.get("completion_percentage") or 0)
+            content.time_spent_seconds += int(event.get("time_spent_seconds") or 0)
+            content.last_viewed_at = max(filter(None, [content.last_viewed_at, at]))
+
+        elif kind == "action":
+            action = event.get("action")
+            value = bool(event.get("value", True))
+            if action == "bookmark":
+                content.bookmarked = value
+            elif action == "favorite":
+                content.favorited = value
+            elif action == "share":
+                content.shared = True
+            elif action == "companion":
+                content.companion_interactions += 1
+
+    return deltas
+
+
+def build_profile_operations(delta: ProfileDelta, now: Optional[datetime] = None) -> List[UpdateOne]:
+    """
+    Translate a ProfileDelta into atomic update operations.
+
+    Each array entry gets an "update if present" op (positional ``$``)
+    followed by a "push if absent" op guarded by ``$ne``; exactly one of the
+    pair matches, so the list must be executed with ``ordered=True``.
+    """
+    now = now or datetime.now()
+    base = {"church_id": delta.church_id, "user_id": delta.user_id, "deleted": False}
+    ops: List[UpdateOne] = []
+
+    # --- Content engagements ---
+    for content_id, c in delta.contents.items():
+        inc: Dict[str, int] = {}
+        maxes: Dict[str, Any] = {}
+        sets: Dict[str, Any] = {}
+        prefix = "content_engagements.$."
+
+        if c.views:
+            inc[prefix + "total_views"] = c.views
+        if c.time_spent_seconds:
+            inc[prefix + "time_spent_seconds"] = c.time_spent_seconds
+        if c.companion_interactions:
+            inc[prefix + "companion_interactions"] = c.companion_interactions
+        if c.last_viewed_at:
+            maxes[prefix + "last_viewed_at"] = c.last_viewed_at
+        if c.completion_percentage is not None:
+            sets[prefix + "completion_percentage"] = c.completion_percentage
+        if c.bookmarked is not None:
+            sets[prefix + "bookmarked"] = c.bookmarked
+        if c.favorited is not None:
+            sets[prefix + "favorited"] = c.favorited
+        if c.shared:
+            sets[prefix + "shared"] = True
+
+        update = {op: body for op, body in (("$inc", inc), ("$max", maxes), ("$set", sets)) if body}
+        if update:
+            ops.append(UpdateOne({**base, "content_engagements.content_id": content_id}, update))
+
+        # Completions and actions on content never opened are ignored, as before
+        if c.views:
+            engagement = {
+                "content_id": content_id,
+                "content_type": c.content_type,
+                "first_viewed_at": c.first_viewed_at,
+                "last_viewed_at": c.last_viewed_at,
+                "total_views": c.views,
+                "time_spent_seconds": c.time_spent_seconds,
+                "completion_percentage": c.completion_percentage or 0,
+                "bookmarked": bool(c.bookmarked),
+                "favorited": bool(c.favorited),
+                "shared": c.shared,
+                "companion_interactions": c.companion_interactions,
+            }
+            ops.append(UpdateOne(
+                {**base, "content_engagements.content_id": {"$ne": content_id}},
+                {"$push": {"content_engagements": {
+                    "$each": [engagement],
+                    "$sort": {"last_viewed_at": -1},
+                    "$slice": MAX_CONTENT_ENGAGEMENTS,
+                }}},
+            ))
+
+    # --- Topic interests (+2 per engagement, new topics start at 10) ---
+    for topic, (count, last) in delta.topics.items():
+        ops.append(UpdateOne(
+            {**base, "topic_interests.topic": topic},
+            {
+                "$inc": {
+                    "topic_interests.$.engagement_score": 2 * count,
+                    "topic_interests.$.content_count": count,
+                },
+                "$max": {"topic_interests.$.last_engagement": last},
+            },
+        ))
+        ops.append(UpdateOne(
+            {**base, "topic_interests.topic": {"$ne": topic}},
+            {"$push": {"topic_interests": {
+                "$each": [{
+                    "topic": topic,
+                    "engagement_score": float(min(100, 10 + 2 * (count - 1))),
+                    "explicit_interest": False,
+                    "first_engagement": last,
+                    "last_engagement": last,
+                    "content_count": count,
+                }],
+                "$sort": {"engagement_score": -1},
+                "$slice": MAX_TOPIC_INTERESTS,
+            }}},
+        ))
+    if delta.topics:
+        ops.append(UpdateOne(
+            {**base, "topic_interests.engagement_score": {"$gt": 100}},
+            {"$min": {"topic_interests.$[capped].engagement_score": 100}},
+            array_filters=[{"capped.engagement_score": {"$gt": 100}}],
+        ))
+
+    # --- Bible exploration ---
+    for book, (count, chapters, last) in delta.books.items():
+        update: Dict[str, Any] = {
+            "$inc": {"bible_exploration.$.engagement_count": count},
+            "$max": {"bible_exploration.$.last_explored": last},
+        }
+        if chapters:
+            update["$addToSet"] = {"bible_exploration.$.chapters_explored": {"$each": sorted(chapters)}}
+        ops.append(UpdateOne({**base, "bible_exploration.book": book}, update))
+        ops.append(UpdateOne(
+            {**base, "bible_exploration.book": {"$ne": book}},
+            {"$push": {"bible_exploration": {
+                "book": book,
+                "testament": testament_for_book(book),
+                "chapters_explored": sorted(chapters),
+                "verses_bookmarked": [],
+                "total_time_spent_seconds": 0,
+                "engagement_count": count,
+                "last_explored": last,
+            }}},
+        ))
+
+    # --- Learning pattern + activity (pipeline update, recent hours/days first) ---
+    if delta.last_activity:
+        def recent_first(path: str, values: List[int], limit: int) -> Dict[str, Any]:
+            return {"$slice": [
+                {"$concatArrays": [values, {"$setDifference": [{"$ifNull": [f"${path}", []]}, values]}]},
+                limit,
+            ]}
+
+        ops.append(UpdateOne(base, [{"$set": {
+            "learning_pattern.preferred_hours": recent_first(
+                "learning_pattern.preferred_hours", delta.hours, MAX_PREFERRED_HOURS
+            ),
+            "learning_pattern.preferred_days": recent_first(
+                "learning_pattern.preferred_days", delta.days, MAX_PREFERRED_DAYS
+            ),
+            "learning_pattern.last_updated": delta.last_activity,
+            "last_activity": {"$max": ["$last_activity", delta.last_activity]},
+            "updated_at": now,
+        }}]))
+    else:
+        ops.append(UpdateOne(base, {"$set": {"updated_at": now}}))
+
+    return ops
+
+
+# ==================== TRACKER ====================
+
+class EngagementTracker:
+    """
+    Records Explore engagement events and folds them into profiles.
+
+    Usage:
+        await engagement_tracker.record_view(church_id, user_id, content_id, "daily_devotion")
+        profile = await engagement_tracker.apply_overlay(profile)
+
+        # startup / shutdown
+        await engagement_tracker.start(db)
+        await engagement_tracker.stop()
+    """
+
+    def __init__(self):
+        self.enabled = os.getenv("EXPLORE_ENGAGEMENT_WRITE_BEHIND", "true").lower() == "true"
+        self.batch_size = int(os.getenv("EXPLORE_ENGAGEMENT_BATCH_SIZE", "500"))
+        self.block_ms = int(os.getenv("EXPLORE_ENGAGEMENT_FLUSH_MS", "1000"))
+        self.consumer = f"{socket.gethostname()}:{os.getpid()}"
+
+        self._db = None
+        self._task: Optional[asyncio.Task] = None
+        self._running = False
+        self._group_ready = False
+        self._last_reclaim = 0.0
+        self._stats = {"recorded": 0, "applied_sync": 0, "folded": 0, "batches": 0, "errors": 0, "dropped_ops": 0}
+
+    def bind(self, db) -> None:
+        """Attach the database used for synchronous fallback and aggregation."""
+        self._db = db
+
+    @staticmethod
+    def _overlay_key(church_id: str, user_id: str) -> str:
+        return redis_key("explore", "engagement", "overlay", church_id, user_id)
+
+    # ==================== Recording ====================
+
+    async def record_view(
+        self,
+        church_id: str,
+        user_id: str,
+        content_id: str,
+        content_type: str,
+        topics: Optional[List[str]] = None,
+        bible_reference: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        await self._record({
+            "kind": "view",
+            "church_id": church_id,
+            "user_id": user_id,
+            "content_id": content_id,
+            "content_type": content_type,
+            "topics": topics or [],
+            "bible_reference": bible_reference or None,
+        })
+
+    async def record_completion(
+        self,
+        church_id: str,
+        user_id: str,
+        content_id: str,
+        completion_percentage: int,
+        time_spent_seconds: int,
+    ) -> None:
+        await self._record({
+            "kind": "completion",
+            "church_id": church_id,
+            "user_id": user_id,
+            "content_id": content_id,
+            "completion_percentage": completion_percentage,
+            "time_spent_seconds": time_spent_seconds,
+        })
+
+    async def record_action(
+        self,
+        church_id: str,
+        user_id: str,
+        content_id: str,
+        action: str,
+        value: bool = True,
+    ) -> None:
+        await self._record({
+            "kind": "action",
+            "church_id": church_id,
+            "user_id": user_id,
+            "content_id": content_id,
+            "action": action,
+            "value": value,
+        })
+
+    async def _record(self, event: Dict[str, Any]) -> None:
+        """Append an event to the stream, falling back to a direct atomic write."""
+        event["ts"] = time.time()
+        self._stats["recorded"] += 1
+
+        if self.enabled:
+            try:
+                redis = await get_redis()
+                pipe = redis.pipeline(transaction=False)
+                pipe.xadd(STREAM_KEY, {"e": json_dumps_str(event)}, maxlen=STREAM_MAXLEN, approximate=True)
+                self._queue_overlay(pipe, event)
+                await pipe.execute()
+                return
+            except Exception as e:
+                logger.warning(f"[Engagement] Stream append failed, writing directly: {e}")
+
+        if self._db is None:
+            logger.error("[Engagement] No database bound; dropping engagement event")
+            return
+        await self.apply_events([event])
+        self._stats["applied_sync"] += 1
+
+    def _queue_overlay(self, pipe, event: Dict[str, Any]) -> None:
+        """Mirror the event into the user's overlay hash (same pipeline)."""
+        key = self._overlay_key(event["church_id"], event["user_id"])
+        cid = event["content_id"]
+        kind = event["kind"]
+
+        if kind == "view":
+            pipe.hincrby(key, f"{cid}|views", 1)
+            pipe.hset(key, mapping={f"{cid}|type": event.get("content_type") or "", f"{cid}|last": event["ts"]})
+        elif kind == "completion":
+            pipe.hincrby(key, f"{cid}|time", int(event.get("time_spent_seconds") or 0))
+            pipe.hset(key, mapping={
+                f"{cid}|completion": int(event.get("completion_percentage") or 0),
+                f"{cid}|last": event["ts"],
+            })
+        elif kind == "action":
+            action = event.get("action")
+            if action == "companion":
+                pipe.hincrby(key, f"{cid}|companion", 1)
+            elif action in ("bookmark", "favorite", "share"):
+                value = True if action == "share" else bool(event.get("value", True))
+                pipe.hset(key, f"{cid}|{ACTION_FIELDS[action]}", int(value))
+        pipe.expire(key, OVERLAY_TTL)
+
+    # ==================== Read-your-writes ====================
+
+    async def apply_overlay(self, profile):
+        """
+        Layer not-yet-aggregated events over a loaded UserSpiritualProfile.
+
+        Counters still in the overlay are added; "last value" fields are
+        re-applied, which is harmless once the aggregator has persisted them.
+        """
+        if not self.enabled:
+            return profile
+
+        try:
+            redis = await get_redis()
+            raw = await redis.hgetall(self._overlay_key(profile.church_id, profile.user_id))
+        except Exception as e:
+            logger.debug(f"[Engagement] Overlay read failed: {e}")
+            return profile
+        if not raw:
+            return profile
+
+        from models.explore.user_profile import ContentEngagement
+
+        pending: Dict[str, Dict[str, str]] = defaultdict(dict)
+        for name, value in raw.items():
+            cid, _, attr = name.rpartition("|")
+            pending[cid][attr] = value
+
+        engagements = {e.content_id: e for e in profile.content_engagements}
+        for cid, attrs in pending.items():
+            views = max(0, int(attrs.get("views", 0)))
+            last = datetime.fromtimestamp(float(attrs["last"])) if attrs.get("last") else None
+            engagement = engagements.get(cid)
+
+            if engagement is None:
+                if not views:
+                    continue
+                engagement = ContentEngagement(
+                    content_id=cid,
+                    content_type=attrs.get("type", ""),
+                    first_viewed_at=last or datetime.now(),
+                    last_viewed_at=last or datetime.now(),
+                    total_views=0,
+                )
+                profile.content_engagements.append(engagement)
+                engagements[cid] = engagement
+
+            engagement.total_views += views
+            engagement.time_spent_seconds += max(0, int(attrs.get("time", 0)))
+            engagement.companion_interactions += max(0, int(attrs.get("companion", 0)))
+            if "completion" in attrs:
+                engagement.completion_percentage = int(attrs["completion"])
+            for attr in ("bookmarked", "favorited", "shared"):
+                if attr in attrs:
+                    setattr(engagement, attr, attrs[attr] == "1")
+            if last and last > engagement.last_viewed_at:
+                engagement.last_viewed_at = last
+            if views and last and (profile.last_activity is None or last > profile.last_activity):
+                profile.last_activity = last
+
+        return profile
+
+    async def _release_overlay(self, deltas: Dict[Tuple[str, str], ProfileDelta], sign: int = -1) -> None:
+        """Subtract folded counters from the overlay (``sign=1`` puts them back)."""
+        redis = await get_redis()
+        pipe = redis.pipeline(transaction=False)
+        for (church_id, user_id), delta in deltas.items():
+            key = self._overlay_key(church_id, user_id)
+            for cid, c in delta.contents.items():
+                for attr, amount in zip(OVERLAY_COUNTERS, (c.views, c.time_spent_seconds, c.companion_interactions)):
+                    if amount:
+                        pipe.hincrby(key, f"{cid}|{attr}", sign * amount)
+        await pipe.execute()
+
+    # ==================== Aggregation ====================
+
+    async def _bulk_write(self, ops: List[UpdateOne]) -> None:
+        """
+        Ordered bulk_write that never re-applies an op.
+
+        An ordered bulk stops at the first write error with everything before
+        it applied, so only the suffix after the failing op is sent again; the
+        failing op itself is dropped and logged. Transient network errors are
+        retried per op by the driver (retryable writes).
+        """
+        profiles = self._db.user_spiritual_profiles
+        start = 0
+        while start < len(ops):
+            try:
+                await profiles.bulk_write(ops[start:], ordered=True)
+                return
+            except BulkWriteError as e:
+                errors = e.details.get("writeErrors") or []
+                if not errors:
+                    return  # write concern error only: every op was applied
+                failed = start + errors[0]["index"]
+                self._stats["dropped_ops"] += 1
+                logger.error(f"[Engagement] Dropping profile update #{failed}: {errors[0].get('errmsg')}")
+                start = failed + 1
+
+    async def apply_events(self, events: List[Dict[str, Any]], release_overlay: bool = False) -> int:
+        """
+        Fold events and apply them to Mongo with one bulk_write.
+
+        With ``release_overlay`` the folded counters leave the overlay right
+        before the write (and are put back if it fails), so a read may briefly
+        miss them but never counts them twice.
+
+        Returns:
+            Number of profiles touched
+        """
+        deltas = fold_events(events)
+        if not deltas:
+            return 0
+
+        from services.explore.profile_service import get_profile_service
+        profiles = self._db.user_spiritual_profiles
+
+        # Ensure every profile exists so the update-or-push pairs have a target
+        existing = set()
+        async for doc in profiles.find(
+            {"$or": [{"church_id": c, "user_id": u} for c, u in deltas], "deleted": False},
+            {"_id": 0, "church_id": 1, "user_id": 1},
+        ):
+            existing.add((doc["church_id"], doc["user_id"]))
+        service = get_profile_service(self._db)
+        for church_id, user_id in deltas.keys() - existing:
+            await service.get_or_create_profile(church_id, user_id)
+
+        now = datetime.now()
+        ops: List[UpdateOne] = []
+        for delta in deltas.values():
+            ops.extend(build_profile_operations(delta, now))
+
+        if release_overlay:
+            try:
+                await self._release_overlay(deltas)
+            except Exception as e:
+                release_overlay = False
+                logger.debug(f"[Engagement] Overlay release failed: {e}")
+        try:
+            await self._bulk_write(ops)
+        except Exception:
+            if release_overlay:
+                try:
+                    await self._release_overlay(deltas, sign=1)
+                except Exception as e:
+                    logger.debug(f"[Engagement] Overlay restore failed: {e}")
+            raise
+        return len(deltas)
+
+    async def _ensure_group(self, redis) -> None:
+        if self._group_ready:
+            return
+        try:
+            await redis.xgroup_create(STREAM_KEY, CONSUMER_GROUP, id="0", mkstream=True)
+        except Exception as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._group_ready = True
+
+    async def _process(self, redis, entries: List[Tuple[str, Dict[str, str]]]) -> None:
+        events = []
+        for _, fields in entries:
+            try:
+                events.append(json_loads(fields["e"]))
+            except Exception as e:
+                logger.warning(f"[Engagement] Skipping malformed event: {e}")
+
+        profiles = await self.apply_events(events, release_overlay=True) if events else 0
+
+        ids = [entry_id for entry_id, _ in entries]
+        await redis.xack(STREAM_KEY, CONSUMER_GROUP, *ids)
+        await redis.xdel(STREAM_KEY, *ids)
+
+        self._stats["folded"] += len(events)
+        self._stats["batches"] += 1
+        logger.debug(f"[Engagement] Folded {len(events)} event(s) into {profiles} profile(s)")
+
+    async def _reclaim_stale(self, redis) -> None:
+        """Take over events left pending by a consumer that died."""
+        result = await redis.xautoclaim(
+            STREAM_KEY, CONSUMER_GROUP, self.consumer,
+            min_idle_time=PENDING_IDLE_MS, start_id="0-0", count=self.batch_size,
+        )
+        entries = [entry for entry in (result[1] if result else []) if entry and entry[1]]
+        if entries:
+            logger.info(f"[Engagement] Re-claimed {len(entries)} stale event(s)")
+            await self._process(redis, entries)
+
+    async def _run(self) -> None:
+        """Background aggregator loop."""
+        while self._running:
+            try:
+                redis = await get_redis()
+                await self._ensure_group(redis)
+
+                if time.monotonic() - self._last_reclaim > PENDING_IDLE_MS / 1000:
+                    self._last_reclaim = time.monotonic()
+                    await self._reclaim_stale(redis)
+
+                response = await redis.xreadgroup(
+                    CONSUMER_GROUP, self.consumer, {STREAM_KEY: ">"},
+                    count=self.batch_size, block=self.block_ms,
+                )
+                if response:
+                    await self._process(redis, response[0][1])
+
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                self._stats["errors"] += 1
+                self._group_ready = False
+                logger.error(f"[Engagement] Aggregator error: {e}")
+                await asyncio.sleep(5)
+
+    async def start(self, db) -> None:
+        """Start the aggregator. Should be called during application startup."""
+        self.bind(db)
+        if not self.enabled or self._running:
+            return
+        self._running = True
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Started engagement aggregator (consumer: {self.consumer})")
+
+    async def stop(self) -> None:
+        """
+        Stop the aggregator.
+
+        Unacknowledged events stay pending in the stream and are re-claimed
+        by the next running instance.
+        """
+        self._running = False
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        logger.info("Stopped engagement aggregator")
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Local counters plus stream backlog."""
+        stats: Dict[str, Any] = {**self._stats, "enabled": self.enabled, "running": self._running}
+        try:
+            redis = await get_redis()
+            stats["stream_length"] = await redis.xlen(STREAM_KEY)
+            pending = await redis.xpending(STREAM_KEY, CONSUMER_GROUP)
+            stats["pending"] = pending.get("pending", 0) if isinstance(pending, dict) else 0
+        except Exception:
+            pass
+        return stats
+
+
+# Global instance
+engagement_tracker = EngagementTracker()
@@ -0,0 +1,315 @@
+"""
+Bounded-Parallel Explore Generation Pipeline
+
+Drives AutonomousContentGenerator across many churches and content types
+as a small DAG per task:
+
+    text (Claude) ──► image (prompt build + Stability + SeaweedFS) ──► persist
+
+- Tasks fan out across churches and content types under a global text
+  concurrency budget (EXPLORE_GENERATION_CONCURRENCY, default 4)
+- Image generation runs under its own budget (EXPLORE_IMAGE_CONCURRENCY,
+  default 2) and releases the text slot first, so one task's image overlaps
+  with the next task's text generation
+- Each stage retries independently with exponential backoff; a failed image
+  never discards a successful text generation
+- Every run produces a GenerationRunReport with per-stage latency, stored in
+  the ``explore_generation_runs`` collection
+"""
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# Default daily content types (matches schedule_daily_generation)
+DAILY_CONTENT_TYPES = [
+    "daily_devotion",
+    "verse_of_the_day",
+    "bible_figure",
+    "daily_quiz",
+]
+
+# Collection each generated content type is persisted to
+CONTENT_COLLECTIONS = {
+    "bible_figure": "bible_figures",
+    "daily_devotion": "daily_devotions",
+    "verse_of_the_day": "verses_of_the_day",
+    "daily_quiz": "daily_quizzes",
+    "bible_study": "bible_studies",
+}
+
+
+class GenerationStageError(Exception):
+    """Raised when a pipeline stage fails after all retries."""
+
+    def __init__(self, stage: str, message: str):
+        super().__init__(f"{stage}: {message}")
+        self.stage = stage
+
+
+@dataclass
+class GenerationTaskReport:
+    """Outcome and timings of one (church, content_type) task."""
+
+    church_id: str
+    content_type: str
+    status: str = "pending"                   # pending, success, partial, failed
+    document_id: Optional[str] = None
+    collection: Optional[str] = None
+    error: Optional[str] = None
+    attempts: Dict[str, int] = field(default_factory=dict)
+    stage_ms: Dict[str, float] = field(default_factory=dict)
+    queued_ms: float = 0.0                    # Time spent waiting for a text slot
+    document: Optional[Dict[str, Any]] = field(default=None, repr=False)  # Not stored in run report
+
+
+@dataclass
+class GenerationRunReport:
+    """Report for a whole pipeline run."""
+
+    run_id: str
+    job: str
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    duration_ms: float = 0.0
+    text_concurrency: int = 0
+    image_concurrency: int = 0
+    tasks: List[GenerationTaskReport] = field(default_factory=list)
+
+    @property
+    def succeeded(self) -> int:
+        return sum(1 for t in self.tasks if t.status in ("success", "partial"))
+
+    @property
+    def failed(self) -> int:
+        return sum(1 for t in self.tasks if t.status == "failed")
+
+    def stage_summary(self) -> Dict[str, Dict[str, float]]:
+        """Aggregate per-stage latency (count, avg, max, total) across tasks."""
+        summary: Dict[str, Dict[str, float]] = {}
+        for task in self.tasks:
+            for stage, ms in task.stage_ms.items():
+                entry = summary.setdefault(stage, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+                entry["count"] += 1
+                entry["total_ms"] += ms
+                entry["max_ms"] = max(entry["max_ms"], ms)
+        for entry in summary.values():
+            entry["avg_ms"] = round(entry["total_ms"] / entry["count"], 1) if entry["count"] else 0.0
+            entry["total_ms"] = round(entry["total_ms"], 1)
+            entry["max_ms"] = round(entry["max_ms"], 1)
+        return summary
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {f.name: getattr(self, f.name) for f in fields(self) if f.name != "tasks"}
+        data["tasks"] = [
+            {f.name: getattr(task, f.name) for f in fields(task) if f.name != "document"}
+            for task in self.tasks
+        ]
+        data["succeeded"] = self.succeeded
+        data["failed"] = self.failed
+        data["stage_summary"] = self.stage_summary()
+        return data
+
+
+class GenerationPipeline:
+    """
+    Concurrent driver for autonomous Explore content generation.
+
+    Usage:
+        generator = AutonomousContentGenerator(db, seaweedfs)
+        pipeline = GenerationPipeline(db, generator)
+        report = await pipeline.run(["global", *church_ids], DAILY_CONTENT_TYPES)
+    """
+
+    def __init__(
+        self,
+        db,
+        generator,
+        text_concurrency: Optional[int] = None,
+        image_concurrency: Optional[int] = None,
+        max_attempts: int = 3,
+        backoff_seconds: float = 2.0,
+        persist: bool = True,
+    ):
+        """
+        Args:
+            db: MongoDB database instance
+            generator: AutonomousContentGenerator instance
+            text_concurrency: Max concurrent Claude generations
+            image_concurrency: Max concurrent image generations/uploads
+            max_attempts: Attempts per stage before giving up
+            backoff_seconds: Base delay for exponential backoff between attempts
+            persist: Insert generated documents into their content collections
+        """
+        self.db = db
+        self.generator = generator
+        self.text_concurrency = text_concurrency or int(os.getenv("EXPLORE_GENERATION_CONCURRENCY", "4"))
+        self.image_concurrency = image_concurrency or int(os.getenv("EXPLORE_IMAGE_CONCURRENCY", "2"))
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.persist = persist
+
+        self._text_slots = asyncio.Semaphore(self.text_concurrency)
+        self._image_slots = asyncio.Semaphore(self.image_concurrency)
+
+    async def _with_retries(
+        self,
+        stage: str,
+        task: GenerationTaskReport,
+        func: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Run a stage with exponential backoff, recording attempts and latency."""
+        last_error: Optional[Exception] = None
+        started = time.perf_counter()
+
+        for attempt in range(1, self.max_attempts + 1):
+            task.attempts[stage] = attempt
+            try:
+                result = await func()
+                task.stage_ms[stage] = round((time.perf_counter() - started) * 1000, 1)
+                return result
+            except Exception as e:
+                last_error = e
+                logger.warning(
+                    f"[Pipeline] {stage} failed for {task.content_type}/{task.church_id} "
+                    f"(attempt {attempt}/{self.max_attempts}): {e}"
+                )
+                if attempt < self.max_attempts:
+                    await asyncio.sleep(self.backoff_seconds * (2 ** (attempt - 1)))
+
+        task.stage_ms[stage] = round((time.perf_counter() - started) * 1000, 1)
+        raise GenerationStageError(stage, str(last_error))
+
+    async def _generate_text(self, task: GenerationTaskReport) -> Dict[str, Any]:
+        async def attempt():
+            result = await self.generator.generate_text_content(task.content_type, task.church_id)
+            if "error" in result:
+                raise ValueError(result["error"])
+            return result
+
+        return await self._with_retries("text", task, attempt)
+
+    async def _generate_image(self, task: GenerationTaskReport, content: Dict[str, Any]) -> Optional[str]:
+        async with self._image_slots:
+            return await self._with_retries(
+                "image",
+                task,
+                lambda: self.generator.generate_and_store_image(task.content_type, content, task.church_id),
+            )
+
+    async def _persist(self, task: GenerationTaskReport, document: Dict[str, Any]) -> None:
+        collection = CONTENT_COLLECTIONS.get(task.content_type, f"{task.content_type}s")
+        # Upsert by id so a retry after a write that did land is a no-op
+        await self._with_retries(
+            "persist",
+            task,
+            lambda: self.db[collection].replace_one({"id": document["id"]}, document, upsert=True),
+        )
+        task.collection = collection
+
+        from services.explore.content_counters import explore_counters
+        await explore_counters.record_insert(collection, document)
+
+    async def _run_task(
+        self,
+        task: GenerationTaskReport,
+        generate_image: bool,
+    ) -> None:
+        """Run text -> image -> persist for one task. Never raises."""
+        queued_at = time.perf_counter()
+        try:
+            # Text slot is released before the image stage so the next task's
+            # text generation overlaps with this task's image generation.
+            async with self._text_slots:
+                task.queued_ms = round((time.perf_counter() - queued_at) * 1000, 1)
+                text_result = await self._generate_text(task)
+
+            image_url = None
+            if generate_image and self.generator.seaweedfs:
+                try:
+                    image_url = await self._generate_image(task, text_result["content"])
+                except GenerationStageError as e:
+                    task.error = str(e)
+
+            document = self.generator.build_content_document(
+                task.content_type, task.church_id, text_result, image_url
+            )
+            task.document_id = document.get("id")
+            task.document = document
+
+            if self.persist:
+                await self._persist(task, document)
+
+            task.status = "partial" if task.error else "success"
+
+        except GenerationStageError as e:
+            task.status = "failed"
+            task.error = str(e)
+            logger.error(f"[Pipeline] ✗ {task.content_type} for {task.church_id}: {e}")
+        except Exception as e:
+            task.status = "failed"
+            task.error = str(e)
+            logger.error(f"[Pipeline] ✗ {task.content_type} for {task.church_id}: unexpected error {e}")
+
+    async def run(
+        self,
+        church_ids: List[str],
+        content_types: Optional[List[str]] = None,
+        generate_image: bool = True,
+        job: str = "explore_generation",
+    ) -> GenerationRunReport:
+        """
+        Generate every content type for every church concurrently.
+
+        Args:
+            church_ids: Churches to generate for ("global" for platform content)
+            content_types: Content types per church (defaults to daily types)
+            generate_image: Whether to run the image stage
+            job: Job name recorded in the run report
+
+        Returns:
+            GenerationRunReport (also stored in explore_generation_runs)
+        """
+        content_types = content_types or DAILY_CONTENT_TYPES
+        report = GenerationRunReport(
+            run_id=str(uuid.uuid4()),
+            job=job,
+            started_at=datetime.utcnow(),
+            text_concurrency=self.text_concurrency,
+            image_concurrency=self.image_concurrency,
+        )
+        started = time.perf_counter()
+
+        report.tasks = [
+            GenerationTaskReport(church_id=church_id, content_type=content_type)
+            for church_id in church_ids
+            for content_type in content_types
+        ]
+        await asyncio.gather(*(self._run_task(task, generate_image) for task in report.tasks))
+
+        report.finished_at = datetime.utcnow()
+        report.duration_ms = round((time.perf_counter() - started) * 1000, 1)
+
+        logger.info(
+            f"[Pipeline] {job} finished in {report.duration_ms / 1000:.1f}s: "
+            f"{report.succeeded} succeeded, {report.failed} failed "
+            f"({len(church_ids)} church(es) x {len(content_types)} type(s))"
+        )
+
+        await self._save_report(report)
+        return report
+
+    async def _save_report(self, report: GenerationRunReport) -> None:
+        """Store the run report for the admin dashboard / post-mortems."""
+        try:
+            await self.db.explore_generation_runs.insert_one(report.to_dict())
+        except Exception as e:
+            logger.warning(f"[Pipeline] Failed to store run report {report.run_id}: {e}")
@@ -0,0 +1,448 @@
+"""
+Prayer Follow-up Dispatcher
+
+Follow-ups used to go out from a daily 9:00 job that read at most 100 due
+follow-ups and awaited one push and one update per item, so anything past
+the first 100 slipped a day. Follow-ups are now dispatched as they fall due:
+
+    _schedule_followup ──ZADD──► faithflow:prayer:followups:due (score = due epoch)
+
+    dispatcher ──claim (Lua ZRANGEBYSCORE + ZREM)──► batch of follow-up ids
+               └─► quiet hours? re-ZADD at the member's quiet-hours end
+               └─► mark sent in Mongo ──► batched Expo push ──► bulk_write status
+
+- At-most-once: an id leaves the set atomically for exactly one consumer,
+  and a follow-up is marked sent (guarded on ``follow_up_sent: False``)
+  before its push goes out. A crash mid-batch loses those pushes rather
+  than sending them twice
+- Quiet hours come from the member's notification preferences
+  (DEFAULT_QUIET_HOURS otherwise), in the member's timezone, then the
+  church's, then UTC
+- The hourly sweep job re-adds unsent follow-ups the set doesn't know
+  about (Redis was down at scheduling time, follow-ups created before the
+  dispatcher existed). Without Redis the sweep sends due follow-ups itself
+- Every API process (SCHEDULER_MODE=embedded) or ARQ worker runs a
+  consumer; claims are atomic so any number can run side by side
+"""
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytz
+from pymongo import UpdateOne
+
+from config.redis import get_redis
+from services.fcm_service import fcm_service
+from services.redis.utils import redis_key
+
+logger = logging.getLogger(__name__)
+
+
+DUE_KEY = redis_key("prayer", "followups", "due")
+
+CLAIM_BATCH = 200
+MAX_DEVICES_PER_MEMBER = 10
+
+# Idle poll cap, so follow-ups added by other instances are picked up promptly
+MAX_IDLE_SECONDS = 30
+ERROR_BACKOFF_SECONDS = 5
+
+# Member-local quiet hours when the member hasn't set any (start, end)
+DEFAULT_QUIET_HOURS = ("21:00", "08:00")
+
+# How long a church's timezone is memoized in-process
+TIMEZONE_MEMO_TTL = 300
+
+FOLLOWUP_TITLE = "How are you doing?"
+FOLLOWUP_BODY = "We've been praying with you. Would you like to share an update?"
+NOTIFICATION_TYPE = "prayer_followup"
+
+# Atomically take up to ARGV[2] ids due at or before ARGV[1]
+_CLAIM_SCRIPT = """
+local ids = redis.call("ZRANGEBYSCORE", KEYS[1], "-inf", ARGV[1], "LIMIT", 0, ARGV[2])
+if #ids > 0 then
+    redis.call("ZREM", KEYS[1], unpack(ids))
+end
+return ids
+"""
+
+
+def _parse_hhmm(value: Optional[str], default: str) -> Tuple[int, int]:
+    try:
+        hour, minute = (value or default).split(":")
+        return int(hour), int(minute)
+    except (AttributeError, ValueError):
+        hour, minute = default.split(":")
+        return int(hour), int(minute)
+
+
+def quiet_hours_end(now: float, tz_name: str, start: Optional[str] = None, end: Optional[str] = None) -> Optional[float]:
+    """
+    When the quiet period ``now`` falls in ends (epoch seconds), or None.
+
+    ``start``/``end`` are member-local HH:MM; a window may wrap midnight
+    (21:00-08:00). Equal start and end means no quiet hours.
+    """
+    try:
+        tz = pytz.timezone(tz_name or "UTC")
+    except pytz.UnknownTimeZoneError:
+        tz = pytz.UTC
+
+    start_hm = _parse_hhmm(start, DEFAULT_QUIET_HOURS[0])
+    end_hm = _parse_hhmm(end, DEFAULT_QUIET_HOURS[1])
+    if start_hm == end_hm:
+        return None
+
+    local = datetime.fromtimestamp(now, tz)
+    current = (local.hour, local.minute)
+    if start_hm < end_hm:
+        quiet = start_hm <= current < end_hm
+    else:
+        quiet = current >= start_hm or current < end_hm
+    if not quiet:
+        return None
+
+    ends = local.replace(hour=end_hm[0], minute=end_hm[1], second=0, microsecond=0, tzinfo=None)
+    if (ends.hour, ends.minute) <= current:
+        ends += timedelta(days=1)
+    return tz.localize(ends).timestamp()
+
+
+class PrayerFollowUpDispatcher:
+    """Sends prayer follow-ups as they fall due, in batches."""
+
+    def __init__(self, batch_size: int = CLAIM_BATCH):
+        self.batch_size = batch_size
+        self.enabled = os.getenv("REDIS_ENABLED", "true").lower() == "true"
+        self._db = None
+        self._task: Optional[asyncio.Task] = None
+        self._running = False
+        self._timezones: Dict[str, Tuple[float, str]] = {}
+        self._stats = {"scheduled": 0, "claimed": 0, "sent": 0, "deferred": 0, "skipped": 0, "failed": 0, "stale": 0, "batches": 0, "errors": 0}
+
+    # ==================== QUEUE ====================
+
+    async def schedule(self, followup_id: str, due_at: datetime) -> None:
+        """Queue a follow-up for its due time (the sweep catches up on failure)."""
+        if not self.enabled:
+            return
+        try:
+            redis = await get_redis()
+            await redis.zadd(DUE_KEY, {followup_id: due_at.timestamp()})
+            self._stats["scheduled"] += 1
+        except Exception as e:
+            logger.warning(f"Could not queue prayer follow-up {followup_id}: {e}")
+
+    async def _claim(self, redis, now: float) -> List[str]:
+        return await redis.eval(_CLAIM_SCRIPT, 1, DUE_KEY, now, self.batch_size)
+
+    async def _next_due_in(self, redis, now: float) -> float:
+        head = await redis.zrange(DUE_KEY, 0, 0, withscores=True)
+        if not head:
+            return MAX_IDLE_SECONDS
+        return min(max(head[0][1] - now, 0.0), MAX_IDLE_SECONDS)
+
+    async def sweep(self, db) -> int:
+        """
+        Queue unsent follow-ups missing from the due set.
+
+        Without Redis, sends the ones already due instead.
+        Returns the number queued (or processed).
+        """
+        if not self.enabled:
+            return await self._dispatch_due_from_db(db)
+
+        redis = await get_redis()
+        queued = 0
+        chunk: Dict[str, float] = {}
+        cursor = db.prayer_followups.find(
+            {"follow_up_sent": False, "deleted": False},
+            {"_id": 0, "id": 1, "follow_up_due_at": 1},
+        )
+        async for doc in cursor:
+            chunk[doc["id"]] = doc["follow_up_due_at"].timestamp()
+            if len(chunk) >= 1000:
+                queued += await redis.zadd(DUE_KEY, chunk, nx=True)
+                chunk = {}
+        if chunk:
+            queued += await redis.zadd(DUE_KEY, chunk, nx=True)
+
+        if queued:
+            logger.info(f"Queued {queued} prayer follow-ups missing from the due set")
+        return queued
+
+    async def _dispatch_due_from_db(self, db) -> int:
+        processed = 0
+        # Ids left unsent (quiet hours) are skipped so paging moves on
+        held: List[str] = []
+        while True:
+            docs = await db.prayer_followups.find(
+                {"follow_up_sent": False, "follow_up_due_at": {"$lte": datetime.now()},
+                 "deleted": False, "id": {"$nin": held}},
+                {"_id": 0, "id": 1},
+            ).limit(self.batch_size).to_list(self.batch_size)
+            if not docs:
+                return processed
+            ids = [d["id"] for d in docs]
+            result = await self.process_batch(db, ids, redis=None)
+            handled = result["sent"] + result["skipped"] + result["failed"]
+            processed += handled
+            if handled < len(ids):
+                sent = {
+                    doc["id"] for doc in await db.prayer_followups.find(
+                        {"id": {"$in": ids}, "follow_up_sent": True}, {"_id": 0, "id": 1}
+                    ).to_list(len(ids))
+                }
+                held.extend(i for i in ids if i not in sent)
+
+    # ==================== DISPATCH ====================
+
+    async def _church_timezones(self, db, church_ids: List[str]) -> Dict[str, str]:
+        """Church timezones from church settings (memoized briefly)"""
+        now = time.monotonic()
+        missing = [
+            cid for cid in church_ids
+            if cid not in self._timezones or now - self._timezones[cid][0] >= TIMEZONE_MEMO_TTL
+        ]
+        if missing:
+            settings = await db.church_settings.find(
+                {"church_id": {"$in": missing}}, {"_id": 0, "church_id": 1, "timezone": 1}
+            ).to_list(len(missing))
+            found = {s["church_id"]: s.get("timezone") or "UTC" for s in settings}
+            for cid in missing:
+                self._timezones[cid] = (now, found.get(cid, "UTC"))
+        return {cid: self._timezones[cid][1] for cid in church_ids}
+
+    async def process_batch(self, db, followup_ids: List[str], redis=None) -> Dict[str, int]:
+        """
+        Send the follow-ups among ``followup_ids`` that are still unsent.
+
+        Follow-ups inside the member's quiet hours are re-queued for the
+        end of the quiet period (left for the next sweep without Redis).
+        """
+        result = {"sent": 0, "deferred": 0, "skipped": 0, "failed": 0}
+        followups = await db.prayer_followups.find(
+            {"id": {"$in": followup_ids}, "follow_up_sent": False, "deleted": False},
+            {"_id": 0, "id": 1, "church_id": 1, "user_id": 1, "prayer_request_id": 1, "prayer_themes": 1},
+        ).to_list(len(followup_ids))
+        if not followups:
+            return result
+
+        member_ids = list({f["user_id"] for f in followups})
+        prefs = {
+            (p["church_id"], p["member_id"]): p
+            for p in await db.notification_preferences.find(
+                {"member_id": {"$in": member_ids}},
+                {"_id": 0, "church_id": 1, "member_id": 1, "push_enabled": 1,
+                 "quiet_hours_start": 1, "quiet_hours_end": 1, "timezone": 1},
+            ).to_list(None)
+        }
+        church_tz = await self._church_timezones(db, list({f["church_id"] for f in followups}))
+
+        # Hold back follow-ups inside the member's quiet hours
+        now = time.time()
+        ready, deferred = [], {}
+        for followup in followups:
+            member_prefs = prefs.get((followup["church_id"], followup["user_id"]), {})
+            resume_at = quiet_hours_end(
+                now,
+                member_prefs.get("timezone") or church_tz[followup["church_id"]],
+                member_prefs.get("quiet_hours_start"),
+                member_prefs.get("quiet_hours_end"),
+            )
+            if resume_at is None:
+                ready.append(followup)
+            else:
+                deferred[followup["id"]] = resume_at
+        if deferred:
+            if redis is not None:
+                await redis.zadd(DUE_KEY, deferred)
+            result["deferred"] = len(deferred)
+        if not ready:
+            return result
+
+        # Mark sent before sending: whatever this claim gets is sent at most once
+        claim = str(uuid.uuid4())
+        sent_at = datetime.now()
+        ready_ids = [f["id"] for f in ready]
+        await db.prayer_followups.update_many(
+            {"id": {"$in": ready_ids}, "follow_up_sent": False},
+            {"$set": {"follow_up_sent": True, "follow_up_sent_at": sent_at, "dispatch_claim": claim}},
+        )
+        owned = {
+            doc["id"] for doc in await db.prayer_followups.find(
+                {"id": {"$in": ready_ids}, "dispatch_claim": claim}, {"_id": 0, "id": 1}
+            ).to_list(len(ready))
+        }
+        ready = [f for f in ready if f["id"] in owned]
+        if not ready:
+            return result
+
+        tokens: Dict[Tuple[str, str], List[str]] = {}
+        async for device in db.device_tokens.find(
+            {"member_id": {"$in": list({f["user_id"] for f in ready})}, "is_active": True},
+            {"_id": 0, "church_id": 1, "member_id": 1, "fcm_token": 1},
+        ):
+            member_tokens = tokens.setdefault((device["church_id"], device["member_id"]), [])
+            if len(member_tokens) < MAX_DEVICES_PER_MEMBER:
+                member_tokens.append(device["fcm_token"])
+
+        # One Expo message per device; remember which follow-up each belongs to
+        messages, owners, status = [], [], {}
+        for followup in ready:
+            member = (followup["church_id"], followup["user_id"])
+            if not prefs.get(member, {}).get("push_enabled", True):
+                status[followup["id"]] = ("push_disabled", None)
+                continue
+            if not tokens.get(member):
+                status[followup["id"]] = ("no_devices", None)
+                continue
+            data = {
+                "type": NOTIFICATION_TYPE,
+                "prayer_request_id": followup["prayer_request_id"],
+                "followup_id": followup["id"],
+                "themes": followup.get("prayer_themes", []),
+            }
+            for token in tokens[member]:
+                messages.append({
+                    "to": token,
+                    "title": FOLLOWUP_TITLE,
+                    "body": FOLLOWUP_BODY,
+                    "sound": "default",
+                    "priority": "high",
+                    "data": data,
+                    "channelId": NOTIFICATION_TYPE,
+                })
+                owners.append(followup)
+
+        # A follow-up is delivered if any of the member's devices accepted it
+        errors: Dict[str, List[str]] = {}
+        for followup, error in zip(owners, await fcm_service.send_messages(messages)):
+            errors.setdefault(followup["id"], [])
+            if error:
+                errors[followup["id"]].append(error)
+        delivered = {
+            followup["id"]: followup for followup in owners
+            if len(errors[followup["id"]]) < len(tokens[(followup["church_id"], followup["user_id"])])
+        }
+        for followup_id, followup_errors in errors.items():
+            if followup_id in delivered:
+                status[followup_id] = ("sent", None)
+            else:
+                status[followup_id] = ("failed", "; ".join(sorted(set(followup_errors))))
+
+        await db.prayer_followups.bulk_write([
+            UpdateOne(
+                {"id": followup_id},
+                {"$set": {"delivery_status": delivery_status, "delivery_error": error},
+                 "$unset": {"dispatch_claim": ""}},
+            )
+            for followup_id, (delivery_status, error) in status.items()
+        ], ordered=False)
+
+        if delivered:
+            await db.push_notifications.insert_many([
+                {
+                    "id": str(uuid.uuid4()),
+                    "church_id": followup["church_id"],
+                    "member_id": followup["user_id"],
+                    "title": FOLLOWUP_TITLE,
+                    "body": FOLLOWUP_BODY,
+                    "data": {
+                        "type": NOTIFICATION_TYPE,
+                        "prayer_request_id": followup["prayer_request_id"],
+                        "followup_id": followup["id"],
+                        "themes": followup.get("prayer_themes", []),
+                    },
+                    "notification_type": NOTIFICATION_TYPE,
+                    "sent_at": datetime.utcnow(),
+                    "is_read": False,
+                }
+                for followup in delivered.values()
+            ], ordered=False)
+
+        for delivery_status, _ in status.values():
+            if delivery_status == "sent":
+                result["sent"] += 1
+            elif delivery_status == "failed":
+                result["failed"] += 1
+            else:
+                result["skipped"] += 1
+        return result
+
+    # ==================== CONSUMER ====================
+
+    async def _run(self) -> None:
+        """Background consumer loop."""
+        while self._running:
+            try:
+                redis = await get_redis()
+                now = time.time()
+                ids = await self._claim(redis, now)
+                if not ids:
+                    await asyncio.sleep(await self._next_due_in(redis, now))
+                    continue
+
+                self._stats["claimed"] += len(ids)
+                self._stats["batches"] += 1
+                result = await self.process_batch(self._db, ids, redis)
+                for key, value in result.items():
+                    self._stats[key] += value
+                # Claimed ids already sent (or deleted) by the time we got them
+                self._stats["stale"] += len(ids) - sum(result.values())
+                logger.info(
+                    f"Prayer follow-ups: {result['sent']} sent, {result['deferred']} deferred "
+                    f"(quiet hours), {result['skipped']} skipped, {result['failed']} failed"
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.error(f"Prayer follow-up dispatcher error: {e}")
+                await asyncio.sleep(ERROR_BACKOFF_SECONDS)
+
+    async def start(self, db) -> None:
+        """Start the consumer. Should be called during application/worker startup."""
+        self._db = db
+        if not self.enabled or self._running:
+            return
+        self._running = True
+        self._task = asyncio.create_task(self._run())
+        logger.info("Started prayer follow-up dispatcher")
+
+    async def stop(self) -> None:
+        """
+        Stop the consumer.
+
+        A batch interrupted mid-send is not retried (at-most-once); ids not
+        yet claimed stay in the due set for the next running instance.
+        """
+        self._running = False
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        logger.info("Stopped prayer follow-up dispatcher")
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Local counters plus due-set backlog."""
+        stats: Dict[str, Any] = {**self._stats, "enabled": self.enabled, "running": self._running}
+        try:
+            redis = await get_redis()
+            stats["queued"] = await redis.zcard(DUE_KEY)
+            stats["due_now"] = await redis.zcount(DUE_KEY, "-inf", time.time())
+        except Exception:
+            pass
+        return stats
+
+
+# Global instance
+prayer_followup_dispatcher = PrayerFollowUpDispatcher()
@@ -19,8 +19,11 @@ from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
 from motor.motor_asyncio import AsyncIOMotorClient
 from pydantic import BaseModel, Field
+from pymongo import UpdateOne
 
+from services.explore.prayer_followup_dispatcher import prayer_followup_dispatcher
 from services.explore.profile_service import get_profile_service
+from utils.text_analysis import KeywordMatcher
 
 logger = logging.getLogger(__name__)
 
@@ -64,6 +67,7 @@ class PrayerFollowUp(BaseModel):
     follow_up_due_at: datetime
     follow_up_sent: bool = False
     follow_up_sent_at: Optional[datetime] = None
+    delivery_status: Optional[str] = None  # "sent", "failed", "no_devices", "push_disabled"
     user_responded: bool = False
     response_sentiment: Optional[str] = None  # "improved", "same", "worse", "resolved"
 
@@ -238,6 +242,67 @@ EMOTIONAL_KEYWORDS = {
     },
 }
 
+# All theme and emotion keywords compiled once, labelled "theme:<name>" / "emotion:<name>"
+KEYWORD_MATCHER = KeywordMatcher(
+    [
+        (f"theme:{theme}", keyword)
+        for theme, config in PRAYER_THEME_KEYWORDS.items()
+        for keyword in config["keywords_en"] + config["keywords_id"]
+    ]
+    + [
+        (f"emotion:{emotion}", keyword)
+        for emotion, keywords in EMOTIONAL_KEYWORDS.items()
+        for keyword in keywords["en"] + keywords["id"]
+    ]
+)
+
+
+def build_prayer_analysis(prayer_request_id: str, prayer_text: str) -> PrayerThemeAnalysis:
+    """
+    Score a prayer text against the theme and emotion keywords (no I/O)
+
+    Keywords match whole words and their English/Indonesian stems, so
+    "mendoakan" hits "doa" but "mission" does not hit "miss".
+    """
+    analysis = PrayerThemeAnalysis(prayer_request_id=prayer_request_id)
+    hits = KEYWORD_MATCHER.match(prayer_text or "")
+
+    # 1. Themes (confidence based on distinct keyword matches, max 1.0)
+    for theme, config in PRAYER_THEME_KEYWORDS.items():
+        matches = hits.get(f"theme:{theme}", 0)
+        if matches > 0:
+            analysis.themes[theme] = min(1.0, matches * 0.25)
+            analysis.content_themes.extend(config["content_themes"])
+            analysis.suggested_scriptures.extend(config["scriptures"][:2])
+
+    # 2. Emotional state
+    for emotion in EMOTIONAL_KEYWORDS:
+        matches = hits.get(f"emotion:{emotion}", 0)
+        if matches > 0:
+            analysis.emotional_indicators[emotion] = min(1.0, matches * 0.3)
+
+    # 3. Urgency
+    distress_level = analysis.emotional_indicators.get("distress", 0)
+    if distress_level >= 0.7:
+        analysis.urgency = "crisis"
+    elif distress_level >= 0.4:
+        analysis.urgency = "high"
+    elif distress_level > 0:
+        analysis.urgency = "normal"
+    else:
+        analysis.urgency = "low"
+
+    # 4. Deduplicate content themes
+    analysis.content_themes = list(dict.fromkeys(analysis.content_themes))[:5]
+    return analysis
+
+
+def prayer_request_text(prayer_request: Dict[str, Any]) -> str:
+    """Text to analyze for a stored prayer request (kiosk or staff-entered)"""
+    if prayer_request.get("request_text"):
+        return prayer_request["request_text"]
+    return " ".join(filter(None, [prayer_request.get("title"), prayer_request.get("description")]))
+
 
 class PrayerIntelligenceService:
     """Service for analyzing prayers and providing intelligent responses"""
@@ -262,53 +327,19 @@ class PrayerIntelligenceService:
 
         This is called when a new prayer request is submitted.
         """
-        analysis = PrayerThemeAnalysis(prayer_request_id=prayer_request_id)
-        text_lower = prayer_text.lower()
-
-        # 1. Extract themes
-        for theme, config in PRAYER_THEME_KEYWORDS.items():
-            keywords = config["keywords_en"] + config["keywords_id"]
-            matches = sum(1 for kw in keywords if kw in text_lower)
-
-            if matches > 0:
-                # Confidence based on matches (max 1.0)
-                confidence = min(1.0, matches * 0.25)
-                analysis.themes[theme] = confidence
-                analysis.content_themes.extend(config["content_themes"])
-                analysis.suggested_scriptures.extend(config["scriptures"][:2])
-
-        # 2. Detect emotional state
-        for emotion, keywords in EMOTIONAL_KEYWORDS.items():
-            all_keywords = keywords["en"] + keywords["id"]
-            matches = sum(1 for kw in all_keywords if kw in text_lower)
-            if matches > 0:
-                analysis.emotional_indicators[emotion] = min(1.0, matches * 0.3)
-
-        # 3. Determine urgency
-        distress_level = analysis.emotional_indicators.get("distress", 0)
-        if distress_level >= 0.7:
-            analysis.urgency = "crisis"
-        elif distress_level >= 0.4:
-            analysis.urgency = "high"
-        elif distress_level > 0:
-            analysis.urgency = "normal"
-        else:
-            analysis.urgency = "low"
-
-        # 4. Deduplicate content themes
-        analysis.content_themes = list(dict.fromkeys(analysis.content_themes))[:5]
+        analysis = build_prayer_analysis(prayer_request_id, prayer_text)
 
-        # 5. Store analysis
+        # Store analysis
         await self.analysis_collection.update_one(
             {"prayer_request_id": prayer_request_id},
             {"$set": analysis.model_dump()},
             upsert=True
         )
 
-        # 6. Update user profile with prayer themes (for subtle content personalization)
+        # Update user profile with prayer themes (for subtle content personalization)
         await self._update_user_prayer_themes(church_id, user_id, analysis)
 
-        # 7. Schedule follow-up
+        # Schedule follow-up
         await self._schedule_followup(
             church_id=church_id,
             user_id=user_id,
@@ -320,6 +351,71 @@ class PrayerIntelligenceService:
         logger.info(f"Analyzed prayer request {prayer_request_id}: themes={list(analysis.themes.keys())}, urgency={analysis.urgency}")
         return analysis
 
+    async def reanalyze_prayer_requests(
+        self,
+        church_id: Optional[str] = None,
+        batch_size: int = 500,
+        dry_run: bool = False,
+    ) -> Dict[str, int]:
+        """
+        Re-run analysis over stored prayer requests
+
+        Used after the keyword lists or matching change. Only the stored
+        analyses (and the summary on the prayer request) are rewritten;
+        profiles and follow-ups are left alone.
+        """
+        query: Dict[str, Any] = {"deleted": {"$ne": True}}
+        if church_id:
+            query["church_id"] = church_id
+
+        stats = {"scanned": 0, "changed": 0, "written": 0}
+        analysis_ops: List[UpdateOne] = []
+        request_ops: List[UpdateOne] = []
+
+        async def flush() -> None:
+            if analysis_ops and not dry_run:
+                await self.analysis_collection.bulk_write(analysis_ops, ordered=False)
+                await self.db.prayer_requests.bulk_write(request_ops, ordered=False)
+                stats["written"] += len(analysis_ops)
+            analysis_ops.clear()
+            request_ops.clear()
+
+        cursor = self.db.prayer_requests.find(
+            query,
+            {"_id": 0, "id": 1, "request_text": 1, "title": 1, "description": 1, "analysis": 1},
+        ).batch_size(batch_size)
+
+        async for prayer_request in cursor:
+            stats["scanned"] += 1
+            analysis = build_prayer_analysis(prayer_request["id"], prayer_request_text(prayer_request))
+
+            previous = prayer_request.get("analysis") or {}
+            if (
+                sorted(previous.get("themes", [])) != sorted(analysis.themes)
+                or previous.get("urgency") != analysis.urgency
+            ):
+                stats["changed"] += 1
+
+            analysis_ops.append(UpdateOne(
+                {"prayer_request_id": analysis.prayer_request_id},
+                {"$set": analysis.model_dump()},
+                upsert=True,
+            ))
+            request_ops.append(UpdateOne(
+                {"id": analysis.prayer_request_id},
+                {"$set": {"analysis": {
+                    "themes": list(analysis.themes.keys()),
+                    "urgency": analysis.urgency,
+                    "analyzed_at": analysis.analyzed_at,
+                }}},
+            ))
+            if len(analysis_ops) >= batch_size:
+                await flush()
+
+        await flush()
+        logger.info(f"Re-analyzed prayer requests{' for church ' + church_id if church_id else ''}: {stats}")
+        return stats
+
     async def get_immediate_resources(
         self, prayer_request_id: str
     ) -> Dict[str, Any]:
@@ -439,6 +535,7 @@ class PrayerIntelligenceService:
         )
 
         await self.followup_collection.insert_one(followup.model_dump())
+        await prayer_followup_dispatcher.schedule(followup.id, followup.follow_up_due_at)
 
     # ==================== FOLLOW-UP PROCESSING ====================
 
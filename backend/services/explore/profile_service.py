@@ -21,9 +21,7 @@ from collections import Counter
 from models.explore.user_profile import (
     UserSpiritualProfile,
     OnboardingResponse,
-    ContentEngagement,
     TopicInterest,
-    BibleExploration,
     LearningPattern,
     QuizPerformance,
     LifeSituation,
@@ -31,6 +29,7 @@ from models.explore.user_profile import (
     ProfileComputationResult,
     DEFAULT_ONBOARDING_QUESTIONS,
 )
+from services.explore.engagement_tracker import engagement_tracker
 
 logger = logging.getLogger(__name__)
 
@@ -76,12 +75,21 @@ CHALLENGE_TOPIC_PRIORITIES = {
 }
 
 
+def _decayed_topic_score(interest: TopicInterest, now: datetime) -> float:
+    """Engagement score with the 0.5/day decay applied after a week of inactivity"""
+    days_since = (now - interest.last_engagement).days
+    if days_since > 7:
+        return max(0.0, interest.engagement_score - (days_since * 0.5))
+    return interest.engagement_score
+
+
 class ProfileService:
     """Manages user spiritual profiles and personalization"""
 
     def __init__(self, db: AsyncIOMotorClient):
         self.db = db
         self.collection = db.user_spiritual_profiles
+        engagement_tracker.bind(db)
 
     # ==================== PROFILE CRUD ====================
 
@@ -94,7 +102,7 @@ class ProfileService:
         )
 
         if profile:
-            return UserSpiritualProfile(**profile)
+            return await engagement_tracker.apply_overlay(UserSpiritualProfile(**profile))
 
         # Create new profile
         new_profile = UserSpiritualProfile(
@@ -115,7 +123,9 @@ class ProfileService:
         profile = await self.collection.find_one(
             {"church_id": church_id, "user_id": user_id, "deleted": False}
         )
-        return UserSpiritualProfile(**profile) if profile else None
+        if not profile:
+            return None
+        return await engagement_tracker.apply_overlay(UserSpiritualProfile(**profile))
 
     async def update_profile(
         self, church_id: str, user_id: str, updates: Dict[str, Any]
@@ -227,54 +237,16 @@ class ProfileService:
         content_topics: List[str] = None,
         bible_reference: Dict[str, Any] = None,
     ) -> None:
-        """Track content view (called when user opens content)"""
-        profile = await self.get_or_create_profile(church_id, user_id)
-        now = datetime.now()
-
-        # Find existing engagement
-        engagements = profile.content_engagements
-        existing_idx = next(
-            (i for i, e in enumerate(engagements) if e.content_id == content_id),
-            None
-        )
-
-        if existing_idx is not None:
-            # Update existing
-            engagements[existing_idx].last_viewed_at = now
-            engagements[existing_idx].total_views += 1
-        else:
-            # Add new
-            engagements.append(ContentEngagement(
-                content_id=content_id,
-                content_type=content_type,
-                first_viewed_at=now,
-                last_viewed_at=now,
-            ))
-
-        # Keep last 100 engagements
-        if len(engagements) > 100:
-            engagements = sorted(engagements, key=lambda x: x.last_viewed_at, reverse=True)[:100]
-
-        # Update topic interests
-        if content_topics:
-            await self._update_topic_interests(profile, content_topics)
-
-        # Update Bible exploration
-        if bible_reference:
-            await self._update_bible_exploration(profile, bible_reference)
-
-        # Update last activity and learning pattern
-        await self._update_learning_pattern(profile, now)
+        """
+        Track content view (called when user opens content)
 
-        await self.collection.update_one(
-            {"id": profile.id},
-            {
-                "$set": {
-                    "content_engagements": [e.model_dump() for e in engagements],
-                    "last_activity": now,
-                    "updated_at": now,
-                }
-            }
+        Appended to the engagement stream; engagement, topic interests,
+        Bible exploration and learning pattern are folded in by the
+        write-behind aggregator (see engagement_tracker).
+        """
+        await engagement_tracker.record_view(
+            church_id, user_id, content_id, content_type,
+            topics=content_topics, bible_reference=bible_reference,
         )
 
     async def track_content_completion(
@@ -286,30 +258,10 @@ class ProfileService:
         time_spent_seconds: int,
     ) -> None:
         """Track content completion (called when user finishes content)"""
-        profile = await self.get_or_create_profile(church_id, user_id)
-
-        # Find engagement
-        engagements = profile.content_engagements
-        existing_idx = next(
-            (i for i, e in enumerate(engagements) if e.content_id == content_id),
-            None
+        await engagement_tracker.record_completion(
+            church_id, user_id, content_id, completion_percentage, time_spent_seconds
         )
 
-        if existing_idx is not None:
-            engagements[existing_idx].completion_percentage = completion_percentage
-            engagements[existing_idx].time_spent_seconds += time_spent_seconds
-            engagements[existing_idx].last_viewed_at = datetime.now()
-
-            await self.collection.update_one(
-                {"id": profile.id},
-                {
-                    "$set": {
-                        f"content_engagements.{existing_idx}": engagements[existing_idx].model_dump(),
-                        "updated_at": datetime.now(),
-                    }
-                }
-            )
-
     async def track_content_action(
         self,
         church_id: str,
@@ -319,34 +271,7 @@ class ProfileService:
         value: bool = True,
     ) -> None:
         """Track user action on content"""
-        profile = await self.get_or_create_profile(church_id, user_id)
-
-        engagements = profile.content_engagements
-        existing_idx = next(
-            (i for i, e in enumerate(engagements) if e.content_id == content_id),
-            None
-        )
-
-        if existing_idx is not None:
-            update_field = None
-            if action == "bookmark":
-                engagements[existing_idx].bookmarked = value
-                update_field = f"content_engagements.{existing_idx}.bookmarked"
-            elif action == "favorite":
-                engagements[existing_idx].favorited = value
-                update_field = f"content_engagements.{existing_idx}.favorited"
-            elif action == "share":
-                engagements[existing_idx].shared = True
-                update_field = f"content_engagements.{existing_idx}.shared"
-            elif action == "companion":
-                engagements[existing_idx].companion_interactions += 1
-                update_field = f"content_engagements.{existing_idx}.companion_interactions"
-
-            if update_field:
-                await self.collection.update_one(
-                    {"id": profile.id},
-                    {"$set": {update_field: getattr(engagements[existing_idx], action.replace("companion", "companion_interactions")) if action != "companion" else engagements[existing_idx].companion_interactions}}
-                )
+        await engagement_tracker.record_action(church_id, user_id, content_id, action, value)
 
     async def track_quiz_result(
         self,
@@ -637,81 +562,6 @@ class ProfileService:
             {"$set": {"topic_interests": [t.model_dump() for t in profile.topic_interests]}}
         )
 
-    async def _update_bible_exploration(
-        self, profile: UserSpiritualProfile, bible_ref: Dict[str, Any]
-    ) -> None:
-        """Update Bible exploration tracking"""
-        book = bible_ref.get("book")
-        chapter = bible_ref.get("chapter")
-        if not book:
-            return
-
-        now = datetime.now()
-        exploration = {e.book: e for e in profile.bible_exploration}
-
-        testament = "old" if book in [
-            "Genesis", "Exodus", "Leviticus", "Numbers", "Deuteronomy",
-            "Joshua", "Judges", "Ruth", "1 Samuel", "2 Samuel",
-            "1 Kings", "2 Kings", "1 Chronicles", "2 Chronicles",
-            "Ezra", "Nehemiah", "Esther", "Job", "Psalms", "Proverbs",
-            "Ecclesiastes", "Song of Solomon", "Isaiah", "Jeremiah",
-            "Lamentations", "Ezekiel", "Daniel", "Hosea", "Joel", "Amos",
-            "Obadiah", "Jonah", "Micah", "Nahum", "Habakkuk", "Zephaniah",
-            "Haggai", "Zechariah", "Malachi"
-        ] else "new"
-
-        if book in exploration:
-            exploration[book].engagement_count += 1
-            exploration[book].last_explored = now
-            if chapter and chapter not in exploration[book].chapters_explored:
-                exploration[book].chapters_explored.append(chapter)
-        else:
-            exploration[book] = BibleExploration(
-                book=book,
-                testament=testament,
-                chapters_explored=[chapter] if chapter else [],
-                engagement_count=1,
-                last_explored=now,
-            )
-
-        profile.bible_exploration = list(exploration.values())
-
-        await self.collection.update_one(
-            {"id": profile.id},
-            {"$set": {"bible_exploration": [e.model_dump() for e in profile.bible_exploration]}}
-        )
-
-    async def _update_learning_pattern(
-        self, profile: UserSpiritualProfile, now: datetime
-    ) -> None:
-        """Update learning pattern from activity"""
-        hour = now.hour
-        day = now.weekday()
-
-        pattern = profile.learning_pattern
-
-        # Update preferred hours (keep top 5)
-        if hour not in pattern.preferred_hours:
-            pattern.preferred_hours.append(hour)
-        if len(pattern.preferred_hours) > 5:
-            # Keep most frequent
-            hour_counts = Counter(pattern.preferred_hours)
-            pattern.preferred_hours = [h for h, _ in hour_counts.most_common(5)]
-
-        # Update preferred days
-        if day not in pattern.preferred_days:
-            pattern.preferred_days.append(day)
-        if len(pattern.preferred_days) > 4:
-            day_counts = Counter(pattern.preferred_days)
-            pattern.preferred_days = [d for d, _ in day_counts.most_common(4)]
-
-        pattern.last_updated = now
-
-        await self.collection.update_one(
-            {"id": profile.id},
-            {"$set": {"learning_pattern": pattern.model_dump()}}
-        )
-
     def _compute_content_weights(self, profile: UserSpiritualProfile) -> Dict[str, float]:
         """Compute weights for content type selection"""
         weights = profile.content_affinity.copy()
@@ -745,8 +595,14 @@ class ProfileService:
                 if t not in priorities:
                     priorities.append(t)
 
-        # 3. High-engagement topics
-        for interest in profile.topic_interests[:5]:
+        # 3. High-engagement topics (decayed at read time; the write path only accumulates)
+        now = datetime.now()
+        ranked = sorted(
+            profile.topic_interests,
+            key=lambda t: _decayed_topic_score(t, now),
+            reverse=True,
+        )
+        for interest in ranked[:5]:
             if interest.topic not in priorities:
                 priorities.append(interest.topic)
 
@@ -12,6 +12,7 @@ Tracks user engagement with Explore content:
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument
 import logging
 
 from models.explore import (
@@ -151,30 +152,35 @@ class ProgressService:
                 {"$push": {"content_progress": content_progress}},
             )
 
-        # Update totals
-        update_fields = {}
+        # Update totals (returns the post-update document, so streak and
+        # achievements below work from it instead of re-reading progress)
+        total_field = None
         if content_type == "daily_devotion":
-            update_fields["$inc"] = {"total_devotions_read": 1}
+            total_field = "total_devotions_read"
         elif content_type in ["bible_study"]:
-            update_fields["$inc"] = {"total_studies_completed": 1}
+            total_field = "total_studies_completed"
         elif content_type in ["verse_of_the_day", "topical_verse"]:
-            update_fields["$inc"] = {"total_verses_read": 1}
+            total_field = "total_verses_read"
         elif content_type in ["bible_figure", "bible_figure_of_the_day"]:
-            update_fields["$inc"] = {"total_figures_learned": 1}
+            total_field = "total_figures_learned"
 
-        if update_fields:
-            await self.db.user_explore_progress.update_one(
-                {"id": progress["id"]}, update_fields
+        if total_field:
+            progress = await self.db.user_explore_progress.find_one_and_update(
+                {"id": progress["id"]},
+                {"$inc": {total_field: 1}},
+                return_document=ReturnDocument.AFTER,
             )
+        else:
+            progress = await self.db.user_explore_progress.find_one({"id": progress["id"]})
 
         # Update streak
-        await self._update_streak(church_id, user_id)
+        await self._update_streak(church_id, user_id, progress)
 
         # Check achievements
-        await self._check_achievements(church_id, user_id)
+        await self._check_achievements(church_id, user_id, progress)
 
         logger.info(f"User {user_id} completed {content_type}: {content_id}")
-        return await self.get_user_progress(church_id, user_id)
+        return progress
 
     async def update_content_progress(
         self,
@@ -277,22 +283,23 @@ class ProgressService:
             "time_taken_seconds": time_taken_seconds,
         }
 
-        await self.db.user_explore_progress.update_one(
+        progress = await self.db.user_explore_progress.find_one_and_update(
             {"id": progress["id"]},
             {
                 "$push": {"quiz_attempts": quiz_attempt},
                 "$inc": {"total_quizzes_completed": 1},
             },
+            return_document=ReturnDocument.AFTER,
         )
 
         # Update streak
-        await self._update_streak(church_id, user_id)
+        await self._update_streak(church_id, user_id, progress)
 
         # Check achievements
-        await self._check_achievements(church_id, user_id)
+        await self._check_achievements(church_id, user_id, progress)
 
         logger.info(f"User {user_id} completed quiz {quiz_id} with score {score}")
-        return await self.get_user_progress(church_id, user_id)
+        return progress
 
     async def get_statistics(
         self, church_id: str, user_id: str
@@ -320,10 +327,20 @@ class ProgressService:
 
     # ==================== PRIVATE HELPERS ====================
 
-    async def _update_streak(self, church_id: str, user_id: str):
-        """Update user's streak"""
-        progress = await self.get_user_progress(church_id, user_id)
-        streak = progress.get("streak", {})
+    async def _update_streak(
+        self, church_id: str, user_id: str, progress: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Update user's streak
+
+        Works from the caller's progress document and updates ``progress``
+        in place. The write is conditional on the last activity date it was
+        computed from, so two completions racing on the same day cannot both
+        extend the streak.
+        """
+        if progress is None:
+            progress = await self.get_user_progress(church_id, user_id)
+        streak = progress.setdefault("streak", {})
 
         today = datetime.now().date()
         last_activity = streak.get("last_activity_date")
@@ -375,23 +392,27 @@ class ProgressService:
                 logger.info(f"User {user_id} reached {threshold}-day streak milestone!")
 
         # Update database
-        await self.db.user_explore_progress.update_one(
-            {"id": progress["id"]},
-            {
-                "$set": {
-                    "streak.current_streak": current_streak,
-                    "streak.longest_streak": longest_streak,
-                    "streak.last_activity_date": datetime.now(),
-                    "streak.total_days_active": total_days_active,
-                    "streak.streak_milestones": streak_milestones,
-                }
-            },
+        updated_streak = {
+            "current_streak": current_streak,
+            "longest_streak": longest_streak,
+            "last_activity_date": datetime.now(),
+            "total_days_active": total_days_active,
+            "streak_milestones": streak_milestones,
+        }
+        result = await self.db.user_explore_progress.update_one(
+            {"id": progress["id"], "streak.last_activity_date": last_activity},
+            {"$set": {f"streak.{key}": value for key, value in updated_streak.items()}},
         )
+        if result.modified_count:
+            streak.update(updated_streak)
 
-    async def _check_achievements(self, church_id: str, user_id: str):
-        """Check and award achievements"""
-        progress = await self.get_user_progress(church_id, user_id)
-        achievements = progress.get("achievements", [])
+    async def _check_achievements(
+        self, church_id: str, user_id: str, progress: Optional[Dict[str, Any]] = None
+    ):
+        """Check and award achievements from the caller's progress document"""
+        if progress is None:
+            progress = await self.get_user_progress(church_id, user_id)
+        achievements = progress.setdefault("achievements", [])
 
         # Define achievement criteria
         new_achievements = []
@@ -427,4 +448,5 @@ class ProgressService:
                 {"id": progress["id"]},
                 {"$addToSet": {"achievements": {"$each": new_achievements}}},
             )
+            achievements.extend(new_achievements)
             logger.info(f"User {user_id} earned achievements: {new_achievements}")
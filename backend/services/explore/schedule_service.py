@@ -24,6 +24,18 @@ from models.explore import (
 logger = logging.getLogger(__name__)
 
 
+def _parse_release_time(value: Any) -> Optional[time]:
+    """Release time as stored in settings ("HH:MM[:SS]" string or time)"""
+    if isinstance(value, time):
+        return value
+    if isinstance(value, str) and value:
+        try:
+            return time.fromisoformat(value)
+        except ValueError:
+            logger.warning(f"Invalid daily_content_release_time: {value!r}")
+    return None
+
+
 class ScheduleService:
     """Manages content scheduling"""
 
@@ -176,6 +188,7 @@ class ScheduleService:
                     }
                 },
             )
+            await self._invalidate_daily_feed(church_id, schedule_datetime)
             return await self.db.content_schedule.find_one({"id": existing["id"]})
 
         # Find what global content would be replaced
@@ -212,6 +225,7 @@ class ScheduleService:
         logger.info(
             f"Created takeover for church {church_id}, date {schedule_datetime}, type {content_type}"
         )
+        await self._invalidate_daily_feed(church_id, schedule_datetime)
         return entry
 
     async def remove_takeover(
@@ -234,6 +248,7 @@ class ScheduleService:
             logger.info(
                 f"Removed takeover for church {church_id}, date {schedule_datetime}, type {content_type}"
             )
+            await self._invalidate_daily_feed(church_id, schedule_datetime)
             return True
 
         return False
@@ -242,8 +257,8 @@ class ScheduleService:
         self, schedule_id: str, published_by: str
     ) -> bool:
         """Mark scheduled content as published"""
-        result = await self.db.content_schedule.update_one(
-            {"id": schedule_id, "deleted": False},
+        entry = await self.db.content_schedule.find_one_and_update(
+            {"id": schedule_id, "deleted": False, "published": {"$ne": True}},
             {
                 "$set": {
                     "published": True,
@@ -254,7 +269,11 @@ class ScheduleService:
             },
         )
 
-        return result.modified_count > 0
+        if not entry:
+            return False
+
+        await self._invalidate_daily_feed(entry["church_id"], entry["date"])
+        return True
 
     async def get_schedule(
         self,
@@ -304,6 +323,7 @@ class ScheduleService:
         )
 
         published_count = 0
+        changed_feeds = set()
         async for entry in cursor:
             await self.db.content_schedule.update_one(
                 {"id": entry["id"]},
@@ -317,10 +337,14 @@ class ScheduleService:
                 },
             )
             published_count += 1
+            changed_feeds.add((entry["church_id"], entry["date"]))
             logger.info(
                 f"Auto-published: {entry['content_type']} for {entry['date']} (church: {entry['church_id']})"
             )
 
+        for church_id, date in changed_feeds:
+            await self._invalidate_daily_feed(church_id, date)
+
         return published_count
 
     # ==================== PRIVATE HELPERS ====================
@@ -329,20 +353,28 @@ class ScheduleService:
         """Get daily content release time for church"""
         if church_id != "global":
             settings = await self._get_church_settings(church_id)
-            if settings and settings.get("daily_content_release_time"):
-                return settings["daily_content_release_time"]
+            release_time = _parse_release_time((settings or {}).get("daily_content_release_time"))
+            if release_time:
+                return release_time
 
         # Fallback to platform default
         platform_settings = await self.db.platform_settings.find_one(
             {"id": "explore_platform_settings"}
         )
 
-        if platform_settings and platform_settings.get("daily_content_release_time"):
-            return platform_settings["daily_content_release_time"]
+        release_time = _parse_release_time((platform_settings or {}).get("daily_content_release_time"))
+        if release_time:
+            return release_time
 
         # Ultimate fallback: midnight UTC
         return time(0, 0)
 
+    async def _invalidate_daily_feed(self, church_id: str, date: datetime) -> None:
+        """Drop the materialized daily feed a schedule change affects"""
+        from services.explore.daily_feed import get_daily_feed_service
+
+        await get_daily_feed_service(self.db).invalidate(church_id, date)
+
     async def _get_church_settings(self, church_id: str) -> Optional[Dict[str, Any]]:
         """Get church settings"""
         return await self.db.church_explore_settings.find_one(
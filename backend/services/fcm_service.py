@@ -23,6 +23,10 @@ INITIAL_RETRY_DELAY = 1.0  # seconds
 MAX_RETRY_DELAY = 10.0  # seconds
 RETRY_MULTIPLIER = 2.0
 
+# Expo accepts at most 100 messages per request
+EXPO_BATCH_SIZE = 100
+BATCH_CONCURRENCY = 4
+
 
 class FCMService:
     """
@@ -100,78 +104,128 @@ class FCMService:
                 messages.append(message)
 
             # Send to Expo Push API with retry logic
-            last_error = None
-            retry_delay = INITIAL_RETRY_DELAY
+            tickets, error = await self._post_messages(messages)
+            if error:
+                return False, error
 
-            for attempt in range(MAX_RETRIES + 1):
-                try:
-                    async with httpx.AsyncClient(timeout=self.timeout) as client:
-                        response = await client.post(
-                            self.expo_push_url,
-                            json=messages,
-                            headers={"Content-Type": "application/json"}
-                        )
-
-                        if response.status_code == 200:
-                            result = response.json()
-
-                            # Check for errors in response
-                            errors = []
-                            for item in result.get("data", []):
-                                if item.get("status") == "error":
-                                    errors.append(item.get("message", "Unknown error"))
-
-                            if errors:
-                                logger.error(f"Expo Push errors: {errors}")
-                                return False, f"Push notification errors: {', '.join(errors)}"
-
-                            logger.info(f"Push notifications sent successfully to {len(expo_tokens)} devices")
-                            return True, None
-
-                        # Retry on 5xx errors (server issues)
-                        elif response.status_code >= 500:
-                            last_error = f"Expo Push API error: {response.status_code}"
-                            if attempt < MAX_RETRIES:
-                                logger.warning(f"Retry {attempt + 1}/{MAX_RETRIES} after {retry_delay}s: {last_error}")
-                                await asyncio.sleep(retry_delay)
-                                retry_delay = min(retry_delay * RETRY_MULTIPLIER, MAX_RETRY_DELAY)
-                                continue
-                            logger.error(last_error)
-                            return False, last_error
-
-                        # Don't retry on 4xx errors (client issues)
-                        else:
-                            error_msg = f"Expo Push API error: {response.status_code}"
-                            logger.error(error_msg)
-                            return False, error_msg
-
-                except httpx.TimeoutException:
-                    last_error = "Push notification timeout"
-                    if attempt < MAX_RETRIES:
-                        logger.warning(f"Retry {attempt + 1}/{MAX_RETRIES} after {retry_delay}s: {last_error}")
-                        await asyncio.sleep(retry_delay)
-                        retry_delay = min(retry_delay * RETRY_MULTIPLIER, MAX_RETRY_DELAY)
-                        continue
-                    logger.error(last_error)
-                    return False, last_error
-
-                except (httpx.ConnectError, httpx.ReadError) as e:
-                    last_error = f"Network error: {str(e)}"
-                    if attempt < MAX_RETRIES:
-                        logger.warning(f"Retry {attempt + 1}/{MAX_RETRIES} after {retry_delay}s: {last_error}")
-                        await asyncio.sleep(retry_delay)
-                        retry_delay = min(retry_delay * RETRY_MULTIPLIER, MAX_RETRY_DELAY)
-                        continue
-                    logger.error(last_error)
-                    return False, last_error
-
-            # Should not reach here, but just in case
-            return False, last_error or "Max retries exceeded"
+            # Check for errors in response
+            errors = [t.get("message", "Unknown error") for t in tickets if t.get("status") == "error"]
+            if errors:
+                logger.error(f"Expo Push errors: {errors}")
+                return False, f"Push notification errors: {', '.join(errors)}"
+
+            logger.info(f"Push notifications sent successfully to {len(expo_tokens)} devices")
+            return True, None
 
         except Exception as e:
             logger.error(f"Push notification error: {e}")
             return False, str(e)
 
+    async def _post_messages(
+        self,
+        messages: List[Dict[str, Any]],
+        client: Optional[httpx.AsyncClient] = None
+    ) -> tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        POST messages to the Expo Push API, retrying transient failures.
+
+        5xx responses, timeouts and network errors are retried with
+        exponential backoff; 4xx responses are not.
+
+        Returns:
+            Tuple of (tickets in message order, error_message)
+        """
+        if client is None:
+            async with httpx.AsyncClient(timeout=self.timeout) as client:
+                return await self._post_messages(messages, client)
+
+        last_error = None
+        retry_delay = INITIAL_RETRY_DELAY
+
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                response = await client.post(
+                    self.expo_push_url,
+                    json=messages,
+                    headers={"Content-Type": "application/json"}
+                )
+
+                if response.status_code == 200:
+                    return response.json().get("data", []), None
+
+                # Don't retry on 4xx errors (client issues)
+                if response.status_code < 500:
+                    error_msg = f"Expo Push API error: {response.status_code}"
+                    logger.error(error_msg)
+                    return [], error_msg
+
+                # Retry on 5xx errors (server issues)
+                last_error = f"Expo Push API error: {response.status_code}"
+
+            except httpx.TimeoutException:
+                last_error = "Push notification timeout"
+
+            except (httpx.ConnectError, httpx.ReadError) as e:
+                last_error = f"Network error: {str(e)}"
+
+            if attempt < MAX_RETRIES:
+                logger.warning(f"Retry {attempt + 1}/{MAX_RETRIES} after {retry_delay}s: {last_error}")
+                await asyncio.sleep(retry_delay)
+                retry_delay = min(retry_delay * RETRY_MULTIPLIER, MAX_RETRY_DELAY)
+
+        logger.error(last_error)
+        return [], last_error or "Max retries exceeded"
+
+    async def send_messages(
+        self,
+        messages: List[Dict[str, Any]],
+        concurrency: int = BATCH_CONCURRENCY
+    ) -> List[Optional[str]]:
+        """
+        Send prepared Expo messages in batches.
+
+        Messages (each already carrying its own ``to``, ``title``, ``body``,
+        ...) are posted EXPO_BATCH_SIZE per request over one connection
+        pool, a few requests at a time.
+
+        Args:
+            messages: Expo push messages
+            concurrency: Max batches in flight
+
+        Returns:
+            One entry per message: None if Expo accepted it, else the error
+        """
+        results: List[Optional[str]] = [None] * len(messages)
+        if not messages:
+            return results
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def send_batch(client: httpx.AsyncClient, offset: int) -> None:
+            batch = messages[offset:offset + EXPO_BATCH_SIZE]
+            async with semaphore:
+                try:
+                    tickets, error = await self._post_messages(batch, client)
+                except Exception as e:
+                    tickets, error = [], str(e)
+            for i in range(len(batch)):
+                if error:
+                    results[offset + i] = error
+                elif i >= len(tickets):
+                    results[offset + i] = "Missing push ticket"
+                elif tickets[i].get("status") == "error":
+                    results[offset + i] = tickets[i].get("message", "Unknown error")
+
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            await asyncio.gather(*(
+                send_batch(client, offset)
+                for offset in range(0, len(messages), EXPO_BATCH_SIZE)
+            ))
+
+        failed = sum(1 for r in results if r)
+        logger.info(f"Sent {len(messages) - failed}/{len(messages)} push messages in batches")
+        return results
+
     async def send_to_member(
         self,
         db,
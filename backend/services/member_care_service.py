@@ -36,6 +36,13 @@ from models.member_care_request import (
     GuidedPrayerConfig,
 )
 from models.whatsapp_template import WhatsAppTemplateType
+from services.member_search_index import (
+    MemberSearchIndex,
+    member_search_fields,
+    notify_members_changed,
+    search_fields,
+)
+from utils.cache import get_church_settings
 
 
 logger = logging.getLogger(__name__)
@@ -86,6 +93,7 @@ class MemberCareService:
             "updated_at": datetime.now(timezone.utc),
             "staff_notified": False,
         }
+        request_dict.update(search_fields(request_dict["full_name"], request_dict["phone"], request_dict["email"]))
 
         await self.db[self.COLLECTION_NAME].insert_one(request_dict)
 
@@ -126,6 +134,7 @@ class MemberCareService:
             "updated_at": datetime.now(timezone.utc),
             "staff_notified": False,
         }
+        request_dict.update(search_fields(request_dict["full_name"], request_dict["phone"], request_dict["email"]))
 
         await self.db[self.COLLECTION_NAME].insert_one(request_dict)
 
@@ -178,6 +187,7 @@ class MemberCareService:
             "updated_at": datetime.now(timezone.utc),
             "staff_notified": False,
         }
+        request_dict.update(search_fields(request_dict["full_name"], request_dict["phone"], request_dict["email"]))
 
         await self.db[self.COLLECTION_NAME].insert_one(request_dict)
 
@@ -230,6 +240,7 @@ class MemberCareService:
             "updated_at": datetime.now(timezone.utc),
             "staff_notified": False,
         }
+        request_dict.update(search_fields(request_dict["full_name"], request_dict["phone"], request_dict["email"]))
 
         await self.db[self.COLLECTION_NAME].insert_one(request_dict)
 
@@ -285,10 +296,8 @@ class MemberCareService:
         if assigned_to:
             query["assigned_to_user_id"] = assigned_to
         if search:
-            query["$or"] = [
-                {"full_name": {"$regex": search, "$options": "i"}},
-                {"phone": {"$regex": search, "$options": "i"}},
-            ]
+            search_index = MemberSearchIndex(self.db, collection=self.COLLECTION_NAME, phone_field="phone")
+            query["$and"] = [await search_index.filter_for(search, dict(query))]
         if start_date:
             query["created_at"] = {"$gte": start_date}
         if end_date:
@@ -461,10 +470,7 @@ class MemberCareService:
     ) -> str:
         """Get guided prayer text from church settings or return default."""
         # Try to get from church settings
-        church_settings = await self.db.church_settings.find_one(
-            {"church_id": church_id},
-            {"member_care_settings": 1}
-        )
+        church_settings = await get_church_settings(self.db, church_id)
 
         if church_settings:
             member_care_settings = church_settings.get("member_care_settings", {})
@@ -517,10 +523,7 @@ class MemberCareService:
     ) -> Optional[str]:
         """Auto-register a new member for spouse/couple not in system."""
         # Get default membership status from church settings
-        church_settings = await self.db.church_settings.find_one(
-            {"church_id": church_id},
-            {"member_care_settings": 1}
-        )
+        church_settings = await get_church_settings(self.db, church_id)
 
         default_status = "Pre-Visitor"
         if church_settings:
@@ -548,8 +551,10 @@ class MemberCareService:
             "updated_at": datetime.now(timezone.utc),
             "deleted": False,
         }
+        member_doc.update(member_search_fields(member_doc))
 
         await self.db.members.insert_one(member_doc)
+        await notify_members_changed(church_id)
         logger.info(f"Auto-registered member {member_id} for {full_name} ({phone})")
 
         return member_id
@@ -616,10 +621,7 @@ class MemberCareService:
             from services.whatsapp_service import send_member_care_confirmation
 
             # Get church settings for notification config
-            church_settings = await self.db.church_settings.find_one(
-                {"church_id": church_id},
-                {"member_care_settings": 1}
-            )
+            church_settings = await get_church_settings(self.db, church_id)
 
             member_care_settings = church_settings.get("member_care_settings", {}) if church_settings else {}
             if not member_care_settings.get("notify_on_new_request", True):
@@ -914,21 +916,18 @@ class MemberSearchService:
         if len(query) < 2:
             return {"members": [], "total": 0, "query": query}
 
-        search_query: Dict[str, Any] = {
+        base: Dict[str, Any] = {
             "church_id": church_id,
             "deleted": {"$ne": True},
-            "$or": [
-                {"full_name": {"$regex": query, "$options": "i"}},
-                {"phone_whatsapp": {"$regex": query, "$options": "i"}},
-            ]
         }
 
         if exclude_ids:
-            search_query["id"] = {"$nin": exclude_ids}
+            base["id"] = {"$nin": exclude_ids}
 
-        cursor = self.db.members.find(
-            search_query,
-            {
+        members = await MemberSearchIndex(self.db).search(
+            query,
+            base=base,
+            projection={
                 "_id": 0,
                 "id": 1,
                 "full_name": 1,
@@ -936,10 +935,9 @@ class MemberSearchService:
                 "photo_url": 1,
                 "photo_thumbnail_url": 1,
                 "membership_status": 1,
-            }
-        ).limit(limit)
-
-        members = await cursor.to_list(length=limit)
+            },
+            limit=limit,
+        )
 
         return {
             "members": members,
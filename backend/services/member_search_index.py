@@ -0,0 +1,439 @@
+"""
+Member Search Index
+
+Member search used to OR unanchored, case-insensitive $regex clauses over
+name, email and phone, which scans every member of the church on each
+keystroke. Instead, each searchable document carries precomputed fields:
+
+- search_tokens: normalized name words, plus the email and its local part
+- search_grams:  trigrams of the name words ("^bu", "bud", "udi", "di$")
+- phone_e164:    phone in E.164 form ("+6281234567890")
+
+Queries are index-friendly:
+- words -> every word is an anchored prefix of some token (AND)
+- digits -> anchored prefix of phone_e164
+- no prefix hits -> trigram overlap (typo tolerant, "budy" finds "Budi")
+
+The same fields are kept on members and member care requests. Writers
+call search_fields() before insert and reindex_member() after updates
+that touch name, phone or email; backfill() indexes existing documents
+(at startup and via scripts/backfill_member_search.py).
+
+KioskPrefixIndex keeps a per-church in-memory sorted token list for
+kiosk autocomplete, rebuilt in the background when members change
+(pub/sub MEMBER_SEARCH invalidation).
+"""
+
+import asyncio
+import bisect
+import logging
+import math
+import re
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+
+from utils.helpers import normalize_phone_number
+from utils.text_analysis import normalize, tokenize
+
+logger = logging.getLogger(__name__)
+
+
+# Member fields whose change requires reindex_member()
+SEARCHABLE_MEMBER_FIELDS = {"full_name", "phone_whatsapp", "email"}
+
+MIN_PHONE_DIGITS = 4
+# Share of a word's trigrams that must match for a fuzzy hit
+FUZZY_MIN_OVERLAP = 0.5
+# Prefix matches fetched for in-process ranking
+RANK_CANDIDATES = 200
+
+KIOSK_INDEX_TTL = 600          # seconds before a full rebuild
+KIOSK_INDEX_MAX_CHURCHES = 50
+KIOSK_MEMBER_PROJECTION = {
+    "_id": 0, "id": 1, "full_name": 1, "phone_whatsapp": 1, "photo_url": 1,
+    "photo_thumbnail_url": 1, "gender": 1, "status": 1, "membership_date": 1,
+}
+
+
+# ==================== NORMALIZATION ====================
+
+def to_e164(phone: Optional[str]) -> Optional[str]:
+    """E.164 form of a phone number (Indonesian numbers assumed without country code)."""
+    if not phone:
+        return None
+    digits = normalize_phone_number(str(phone))
+    if not 8 <= len(digits) <= 15:
+        return None
+    return "+" + digits
+
+
+def name_tokens(name: Optional[str]) -> List[str]:
+    """Normalized words of a name."""
+    return [token for token, _, _ in tokenize(name or "")]
+
+
+def trigrams(token: str, complete: bool = True) -> Set[str]:
+    """Trigrams of a word with boundary markers (no end marker for an unfinished word)."""
+    padded = "^" + token + ("$" if complete else "")
+    if len(padded) < 3:
+        return set()
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def search_fields(
+    name: Optional[str],
+    phone: Optional[str] = None,
+    email: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Search fields to store on a member (or member care request)."""
+    tokens = set(name_tokens(name))
+    grams: Set[str] = set()
+    for token in tokens:
+        grams |= trigrams(token)
+    if email:
+        email = email.strip().lower()
+        tokens.add(email)
+        tokens.add(email.split("@", 1)[0])
+    return {
+        "search_tokens": sorted(tokens),
+        "search_grams": sorted(grams),
+        "phone_e164": to_e164(phone),
+    }
+
+
+def member_search_fields(member: Dict[str, Any]) -> Dict[str, Any]:
+    """Search fields for a member document."""
+    return search_fields(member.get("full_name"), member.get("phone_whatsapp"), member.get("email"))
+
+
+def _phone_query(query: str) -> Optional[str]:
+    """E.164 prefix for a query that looks like a phone number."""
+    cleaned = re.sub(r"[\s\-().]", "", query)
+    digits = cleaned.lstrip("+")
+    if len(digits) < MIN_PHONE_DIGITS or not digits.isdigit():
+        return None
+    return "+" + normalize_phone_number(cleaned)
+
+
+def _query_terms(query: str) -> List[str]:
+    """Prefix terms of a text query (an email-looking query is one term)."""
+    query = query.strip()
+    if "@" in query:
+        return [normalize(query)]
+    return list(dict.fromkeys(name_tokens(query)))
+
+
+# ==================== MONGO INDEX ====================
+
+class MemberSearchIndex:
+    """Builds and queries search fields on a collection (members by default)."""
+
+    def __init__(
+        self,
+        db: AsyncIOMotorDatabase,
+        collection: str = "members",
+        name_field: str = "full_name",
+        phone_field: str = "phone_whatsapp",
+    ):
+        self.db = db
+        self.collection = db[collection]
+        self.name_field = name_field
+        self.phone_field = phone_field
+
+    # ---------- query building ----------
+
+    def prefix_filter(self, query: str) -> Optional[Dict[str, Any]]:
+        """Exact/prefix filter for a query, or None if it has no searchable terms."""
+        phone = _phone_query(query)
+        if phone:
+            return {"phone_e164": {"$regex": "^" + re.escape(phone)}}
+
+        terms = _query_terms(query)
+        if not terms:
+            return None
+        clauses = [{"search_tokens": {"$regex": "^" + re.escape(term)}} for term in terms]
+        return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+    @staticmethod
+    def _query_grams(query: str) -> Tuple[List[str], int]:
+        """Trigrams of the query and the minimum overlap for a fuzzy hit."""
+        terms = name_tokens(query)
+        grams: Set[str] = set()
+        for i, term in enumerate(terms):
+            grams |= trigrams(term, complete=i < len(terms) - 1)
+        return sorted(grams), max(1, math.ceil(len(grams) * FUZZY_MIN_OVERLAP))
+
+    def fuzzy_filter(self, query: str) -> Optional[Dict[str, Any]]:
+        """Trigram-overlap filter (typo tolerant), or None for phone/too-short queries."""
+        if _phone_query(query):
+            return None
+        grams, minimum = self._query_grams(query)
+        if len(grams) < 2:
+            return None
+        return {
+            "search_grams": {"$in": grams},
+            "$expr": {"$gte": [
+                {"$size": {"$setIntersection": [{"$ifNull": ["$search_grams", []]}, grams]}},
+                minimum,
+            ]},
+        }
+
+    async def filter_for(self, query: str, base: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Search clause to AND into a list query.
+
+        Prefix matches when there are any, otherwise typo-tolerant matches.
+        """
+        prefix = self.prefix_filter(query)
+        if prefix is None:
+            return {"_id": {"$exists": False}}  # Matches nothing
+
+        if await self.collection.find_one({**base, **prefix}, {"_id": 1}):
+            return prefix
+        return self.fuzzy_filter(query) or prefix
+
+    # ---------- ranked search ----------
+
+    def _rank(self, docs: List[Dict[str, Any]], query: str) -> List[Dict[str, Any]]:
+        """Exact word matches first, then names starting with the first word, then by name."""
+        terms = _query_terms(query)
+
+        def score(doc: Dict[str, Any]) -> Tuple[int, int, str]:
+            words = name_tokens(doc.get(self.name_field))
+            exact = sum(1 for t in terms if t in words)
+            starts = 1 if words and terms and words[0].startswith(terms[0]) else 0
+            return (-exact, -starts, normalize(doc.get(self.name_field) or ""))
+
+        return sorted(docs, key=score)
+
+    async def search(
+        self,
+        query: str,
+        base: Dict[str, Any],
+        projection: Dict[str, Any],
+        limit: int = 10,
+    ) -> List[Dict[str, Any]]:
+        """Ranked search: prefix matches, falling back to trigram similarity."""
+        prefix = self.prefix_filter(query)
+        if prefix is None:
+            return []
+
+        projection = {**projection, "_id": 0}
+        docs = await self.collection.find({**base, **prefix}, projection).limit(
+            RANK_CANDIDATES
+        ).to_list(length=RANK_CANDIDATES)
+        if docs:
+            return self._rank(docs, query)[:limit]
+
+        fuzzy = self.fuzzy_filter(query)
+        if fuzzy is None:
+            return []
+        grams, _ = self._query_grams(query)
+        pipeline = [
+            {"$match": {**base, **fuzzy}},
+            {"$addFields": {"_score": {"$size": {"$setIntersection": ["$search_grams", grams]}}}},
+            {"$sort": {"_score": -1, self.name_field: 1}},
+            {"$limit": limit},
+            {"$project": {**projection, "_score": 0} if all(v == 0 for v in projection.values())
+             else projection},
+        ]
+        return await self.collection.aggregate(pipeline).to_list(length=limit)
+
+    # ---------- maintenance ----------
+
+    def fields_for(self, doc: Dict[str, Any]) -> Dict[str, Any]:
+        return search_fields(doc.get(self.name_field), doc.get(self.phone_field), doc.get("email"))
+
+    async def reindex(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        """Recompute one document's search fields; returns the document's church_id/id."""
+        doc = await self.collection.find_one(
+            {"id": doc_id},
+            {"_id": 0, "id": 1, "church_id": 1, self.name_field: 1, self.phone_field: 1, "email": 1},
+        )
+        if doc:
+            await self.collection.update_one({"id": doc_id}, {"$set": self.fields_for(doc)})
+        return doc
+
+    async def backfill(
+        self,
+        church_id: Optional[str] = None,
+        only_missing: bool = True,
+        batch_size: int = 1000,
+    ) -> int:
+        """Compute search fields for existing documents; returns the number updated."""
+        query: Dict[str, Any] = {}
+        if only_missing:
+            query["search_grams"] = {"$exists": False}
+        if church_id:
+            query["church_id"] = church_id
+
+        projection = {"_id": 0, "id": 1, self.name_field: 1, self.phone_field: 1, "email": 1}
+        updated = 0
+        ops: List[UpdateOne] = []
+        async for doc in self.collection.find(query, projection):
+            if not doc.get("id"):
+                continue
+            ops.append(UpdateOne({"id": doc["id"]}, {"$set": self.fields_for(doc)}))
+            if len(ops) >= batch_size:
+                await self.collection.bulk_write(ops, ordered=False)
+                updated += len(ops)
+                ops = []
+        if ops:
+            await self.collection.bulk_write(ops, ordered=False)
+            updated += len(ops)
+        return updated
+
+
+# ==================== KIOSK PREFIX INDEX ====================
+
+class _ChurchIndex:
+    __slots__ = ("keys", "ids", "phones", "members", "built_at")
+
+    def __init__(self, members: List[Dict[str, Any]]):
+        entries: List[Tuple[str, str]] = []
+        phones: List[Tuple[str, str]] = []
+        self.members: Dict[str, Dict[str, Any]] = {}
+        for member in members:
+            member_id = member.get("id")
+            if not member_id:
+                continue
+            self.members[member_id] = member
+            for token in set(name_tokens(member.get("full_name"))):
+                entries.append((token, member_id))
+            e164 = to_e164(member.get("phone_whatsapp"))
+            if e164:
+                phones.append((e164, member_id))
+        entries.sort()
+        phones.sort()
+        self.keys = [k for k, _ in entries]
+        self.ids = [i for _, i in entries]
+        self.phones = phones
+        self.built_at = time.monotonic()
+
+    def _prefix_ids(self, prefix: str, cap: int = 5000) -> Set[str]:
+        found: Set[str] = set()
+        i = bisect.bisect_left(self.keys, prefix)
+        while i < len(self.keys) and self.keys[i].startswith(prefix) and len(found) < cap:
+            found.add(self.ids[i])
+            i += 1
+        return found
+
+    def lookup(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        phone = _phone_query(query)
+        if phone:
+            i = bisect.bisect_left(self.phones, (phone, ""))
+            ids = []
+            while i < len(self.phones) and self.phones[i][0].startswith(phone) and len(ids) < limit:
+                ids.append(self.phones[i][1])
+                i += 1
+            return [self.members[m] for m in ids]
+
+        terms = _query_terms(query)
+        if not terms:
+            return []
+        matched: Optional[Set[str]] = None
+        for term in terms:
+            ids = self._prefix_ids(term)
+            matched = ids if matched is None else matched & ids
+            if not matched:
+                return []
+
+        def score(member_id: str) -> Tuple[int, int, str]:
+            member = self.members[member_id]
+            words = name_tokens(member.get("full_name"))
+            exact = sum(1 for t in terms if t in words)
+            starts = 1 if words and words[0].startswith(terms[0]) else 0
+            return (-exact, -starts, normalize(member.get("full_name") or ""))
+
+        return [self.members[m] for m in sorted(matched, key=score)[:limit]]
+
+
+class KioskPrefixIndex:
+    """
+    Per-church in-memory autocomplete index for kiosk member lookup.
+
+    Built from one projected query per church; invalidation marks it stale
+    and the next lookup serves the old index while it rebuilds.
+    """
+
+    def __init__(self):
+        self._indexes: Dict[str, _ChurchIndex] = {}
+        self._stale: Set[str] = set()
+        self._building: Dict[str, asyncio.Task] = {}
+
+    async def _build(self, db: AsyncIOMotorDatabase, church_id: str) -> _ChurchIndex:
+        members = await db.members.find(
+            {"church_id": church_id, "is_deleted": {"$ne": True}},
+            KIOSK_MEMBER_PROJECTION,
+        ).to_list(length=None)
+        index = _ChurchIndex(members)
+        if len(self._indexes) >= KIOSK_INDEX_MAX_CHURCHES and church_id not in self._indexes:
+            oldest = min(self._indexes, key=lambda c: self._indexes[c].built_at)
+            self._indexes.pop(oldest, None)
+        self._indexes[church_id] = index
+        self._stale.discard(church_id)
+        logger.debug(f"Kiosk member index built for church {church_id}: {len(index.members)} members")
+        return index
+
+    def _rebuild(self, db: AsyncIOMotorDatabase, church_id: str) -> asyncio.Task:
+        task = self._building.get(church_id)
+        if task is None or task.done():
+            task = asyncio.ensure_future(self._build(db, church_id))
+            self._building[church_id] = task
+            task.add_done_callback(lambda _: self._building.pop(church_id, None))
+        return task
+
+    async def lookup(
+        self,
+        db: AsyncIOMotorDatabase,
+        church_id: str,
+        query: str,
+        limit: int = 10,
+    ) -> List[Dict[str, Any]]:
+        """Members whose name words start with the query words (or phone starts with it)."""
+        index = self._indexes.get(church_id)
+        if index is None:
+            index = await asyncio.shield(self._rebuild(db, church_id))
+        elif church_id in self._stale or time.monotonic() - index.built_at > KIOSK_INDEX_TTL:
+            self._rebuild(db, church_id)  # Serve the current index meanwhile
+        return index.lookup(query, limit)
+
+    def invalidate(self, church_id: str) -> None:
+        if church_id in self._indexes:
+            self._stale.add(church_id)
+
+
+kiosk_prefix_index = KioskPrefixIndex()
+
+
+# ==================== WRITE HOOKS ====================
+
+async def notify_members_changed(church_id: str) -> None:
+    """Mark kiosk indexes stale here and on other instances."""
+    kiosk_prefix_index.invalidate(church_id)
+    try:
+        from services.redis.pubsub import pubsub_service, InvalidationType
+        await pubsub_service.publish_invalidation(InvalidationType.MEMBER_SEARCH, church_id=church_id)
+    except Exception as e:
+        logger.debug(f"Member search invalidation publish failed: {e}")
+
+
+async def reindex_member(db: AsyncIOMotorDatabase, member_id: str) -> None:
+    """Refresh a member's search fields after name, phone or email changed."""
+    member = await MemberSearchIndex(db).reindex(member_id)
+    if member:
+        await notify_members_changed(member.get("church_id", ""))
+
+
+async def backfill_search_fields(db: AsyncIOMotorDatabase) -> None:
+    """Index members and member care requests missing search fields (startup task)."""
+    try:
+        members = await MemberSearchIndex(db).backfill()
+        requests = await MemberSearchIndex(db, collection="member_care_requests", phone_field="phone").backfill()
+        if members or requests:
+            logger.info(f"Member search backfill: {members} members, {requests} member care requests")
+    except Exception as e:
+        logger.warning(f"Member search backfill failed: {e}")
@@ -11,6 +11,9 @@ Features:
 - Publish reactions
 - Update member presence
 - System notifications
+- Non-blocking publishing: bounded outbound queue drained by an I/O
+  thread, background reconnect with exponential backoff, payloads
+  encoded once with msgspec, latency/queue-depth metrics (get_stats)
 
 Topic Structure:
 - faithflow/{church_id}/presence/{member_id}
@@ -26,13 +29,17 @@ Configuration:
 - MQTT_BROKER_PORT: EMQX broker port (default: 1883)
 - MQTT_USERNAME: System client username
 - MQTT_PASSWORD: System client password or JWT token
+- MQTT_QUEUE_SIZE: Max messages waiting to be published (default: 10000)
 """
 
 import asyncio
-import json
 import logging
 import os
-from typing import Optional, Dict, Any, List
+import queue
+import threading
+import time
+from collections import deque
+from typing import Optional, Dict, Any, Iterable, List, Union
 from datetime import datetime
 import uuid
 
@@ -44,6 +51,8 @@ except ImportError:
     import paho.mqtt.client as mqtt
     PAHO_V2 = False
 
+from utils.serialization import json_dumps
+
 logger = logging.getLogger(__name__)
 
 # Configuration
@@ -53,6 +62,14 @@ MQTT_USERNAME = os.environ.get("MQTT_USERNAME", "faithflow-system")
 MQTT_PASSWORD = os.environ.get("MQTT_PASSWORD", "")
 MQTT_CLIENT_ID = os.environ.get("MQTT_CLIENT_ID", f"faithflow-backend-{uuid.uuid4().hex[:8]}")
 
+# Outbound queue / reconnect tuning
+MQTT_QUEUE_SIZE = int(os.environ.get("MQTT_QUEUE_SIZE", "10000"))
+MQTT_RECONNECT_MIN_DELAY = 1    # seconds, doubles per failed attempt
+MQTT_RECONNECT_MAX_DELAY = 60
+MQTT_MAX_INFLIGHT = 200         # unacknowledged QoS 1/2 messages
+PUBLISH_BATCH_SIZE = 500        # messages handed to paho per drain pass
+LATENCY_SAMPLES = 2048
+
 # QoS Levels
 QOS_AT_MOST_ONCE = 0   # Fire and forget (typing indicators)
 QOS_AT_LEAST_ONCE = 1  # Guaranteed delivery (reactions, read receipts)
@@ -61,12 +78,21 @@ QOS_EXACTLY_ONCE = 2   # Exactly once (messages)
 # Topic prefix
 TOPIC_PREFIX = "faithflow"
 
+_STOP = object()
+
 
 class MQTTServiceError(Exception):
     """Base exception for MQTT operations."""
     pass
 
 
+def _percentile(samples: List[float], pct: float) -> Optional[float]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * pct))] * 1000, 2)
+
+
 class MQTTService:
     """
     Service for publishing messages to EMQX MQTT broker.
@@ -78,6 +104,13 @@ class MQTTService:
     4. Send reactions
     5. Update presence information
     6. Send system notifications
+
+    Publishing never blocks the event loop: payloads are encoded once
+    (msgspec) and put on a bounded queue that a dedicated I/O thread
+    drains into paho. paho's network thread connects in the background
+    and reconnects with exponential backoff; while disconnected messages
+    wait in the queue, and once it is full new ones are dropped (counted
+    in get_stats()).
     """
 
     def __init__(
@@ -86,7 +119,8 @@ class MQTTService:
         broker_port: int = MQTT_BROKER_PORT,
         username: str = MQTT_USERNAME,
         password: str = MQTT_PASSWORD,
-        client_id: str = MQTT_CLIENT_ID
+        client_id: str = MQTT_CLIENT_ID,
+        queue_size: int = MQTT_QUEUE_SIZE
     ):
         """
         Initialize MQTT service.
@@ -97,6 +131,7 @@ class MQTTService:
             username: MQTT username
             password: MQTT password or JWT token
             client_id: Unique client ID
+            queue_size: Maximum messages waiting to be published
         """
         self.broker_host = broker_host
         self.broker_port = broker_port
@@ -105,7 +140,24 @@ class MQTTService:
         self.client_id = client_id
         self._client: Optional[mqtt.Client] = None
         self._connected = False
-        self._lock = asyncio.Lock()
+        self._connected_event = threading.Event()
+        self._start_lock = threading.Lock()
+
+        # Outbound queue of (topic, payload bytes, qos, retain, enqueued_at)
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._io_thread: Optional[threading.Thread] = None
+
+        # Metrics
+        self._stats_lock = threading.Lock()
+        self._enqueued = 0
+        self._published = 0
+        self._dropped = 0
+        self._failed = 0
+        self._reconnects = 0
+        self._max_depth = 0
+        self._pending_acks: Dict[int, float] = {}
+        self._early_acks: Dict[int, float] = {}
+        self._latencies: deque = deque(maxlen=LATENCY_SAMPLES)
 
     def _create_client(self) -> mqtt.Client:
         """Create and configure MQTT client."""
@@ -125,6 +177,9 @@ class MQTTService:
         if self.username:
             client.username_pw_set(self.username, self.password)
 
+        client.reconnect_delay_set(MQTT_RECONNECT_MIN_DELAY, MQTT_RECONNECT_MAX_DELAY)
+        client.max_inflight_messages_set(MQTT_MAX_INFLIGHT)
+
         # Set callbacks
         client.on_connect = self._on_connect
         client.on_disconnect = self._on_disconnect
@@ -137,71 +192,170 @@ class MQTTService:
         if rc == 0:
             logger.info(f"Connected to MQTT broker at {self.broker_host}:{self.broker_port}")
             self._connected = True
+            self._connected_event.set()
         else:
             logger.error(f"MQTT connection failed with code: {rc}")
             self._connected = False
+            self._connected_event.clear()
 
-    def _on_disconnect(self, client, userdata, rc, *args):
-        """Callback when disconnected from broker."""
+    def _on_disconnect(self, client, userdata, *args):
+        """Callback when disconnected from broker (paho reconnects with backoff)."""
+        rc = args[1] if PAHO_V2 and len(args) > 1 else (args[0] if args else None)
+        if self._connected:
+            self._reconnects += 1
         logger.warning(f"Disconnected from MQTT broker (rc={rc})")
         self._connected = False
+        self._connected_event.clear()
 
     def _on_publish(self, client, userdata, mid, *args):
-        """Callback when message is published."""
-        logger.debug(f"Message published (mid={mid})")
+        """Callback when a message is written (QoS 0) or acknowledged (QoS 1/2)."""
+        now = time.monotonic()
+        with self._stats_lock:
+            enqueued_at = self._pending_acks.pop(mid, None)
+            if enqueued_at is None:
+                # Acknowledged before the I/O thread recorded the mid
+                self._early_acks[mid] = now
+            else:
+                self._latencies.append(now - enqueued_at)
+
+    # =========================================================================
+    # Connection & I/O thread
+    # =========================================================================
+
+    def _start(self) -> None:
+        """Start paho's network thread and the publisher thread (idempotent, non-blocking)."""
+        with self._start_lock:
+            if self._io_thread is not None and self._io_thread.is_alive():
+                return
+
+            self._client = self._create_client()
+            # connect_async + loop_start: the TCP connect happens on paho's
+            # thread, retried with reconnect_delay backoff until it succeeds
+            self._client.connect_async(self.broker_host, self.broker_port, keepalive=60)
+            self._client.loop_start()
+
+            self._io_thread = threading.Thread(
+                target=self._io_loop, name="mqtt-publisher", daemon=True
+            )
+            self._io_thread.start()
+
+    def _io_loop(self) -> None:
+        """Drain the outbound queue into paho in batches while connected."""
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+
+            batch = [item]
+            stop = False
+            while len(batch) < PUBLISH_BATCH_SIZE:
+                try:
+                    nxt = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is _STOP:
+                    stop = True
+                    break
+                batch.append(nxt)
+
+            # Hold the batch until the broker is reachable
+            while not self._connected_event.wait(timeout=1.0):
+                if self._client is None:
+                    return
+
+            for topic, payload, qos, retain, enqueued_at in batch:
+                self._publish_now(topic, payload, qos, retain, enqueued_at)
+
+            if stop:
+                return
+
+    def _publish_now(self, topic: str, payload: bytes, qos: int, retain: bool, enqueued_at: float) -> None:
+        try:
+            info = self._client.publish(topic, payload, qos=qos, retain=retain)
+        except Exception as e:
+            logger.error(f"Error publishing to {topic}: {e}")
+            self._failed += 1
+            return
+
+        if info.rc != mqtt.MQTT_ERR_SUCCESS and info.rc != mqtt.MQTT_ERR_NO_CONN:
+            # NO_CONN: paho keeps QoS 1/2 messages and resends after reconnect
+            logger.error(f"Failed to publish to {topic}: rc={info.rc}")
+            self._failed += 1
+            return
+
+        with self._stats_lock:
+            self._published += 1
+            acked_at = self._early_acks.pop(info.mid, None)
+            if acked_at is not None:
+                self._latencies.append(acked_at - enqueued_at)
+            else:
+                if len(self._pending_acks) > MQTT_MAX_INFLIGHT * 50:
+                    self._pending_acks.clear()  # Lost acks (e.g. dropped QoS 0 on disconnect)
+                self._pending_acks[info.mid] = enqueued_at
 
     async def connect(self) -> bool:
         """
-        Connect to MQTT broker.
+        Start connecting to the MQTT broker in the background.
+
+        Does not wait for the connection; publishes are queued until it is up.
 
         Returns:
-            True if connected successfully
+            True if currently connected
         """
-        async with self._lock:
-            if self._connected:
-                return True
+        self._start()
+        return self._connected
 
-            try:
-                self._client = self._create_client()
-                self._client.connect(self.broker_host, self.broker_port, keepalive=60)
-                self._client.loop_start()
-
-                # Wait for connection
-                for _ in range(10):  # 5 second timeout
-                    if self._connected:
-                        return True
-                    await asyncio.sleep(0.5)
-
-                logger.error("MQTT connection timeout")
-                return False
+    async def wait_connected(self, timeout: float = 5.0) -> bool:
+        """Wait (without blocking the loop) until connected or timeout."""
+        self._start()
+        return await asyncio.to_thread(self._connected_event.wait, timeout)
 
-            except Exception as e:
-                logger.error(f"Failed to connect to MQTT broker: {e}")
-                return False
+    async def disconnect(self, flush_timeout: float = 5.0):
+        """Flush queued messages (up to flush_timeout) and disconnect from MQTT broker."""
+        if self._io_thread is not None:
+            try:
+                self._queue.put(_STOP, timeout=1.0)
+            except queue.Full:
+                pass
+            await asyncio.to_thread(self._io_thread.join, flush_timeout)
+            self._io_thread = None
 
-    async def disconnect(self):
-        """Disconnect from MQTT broker."""
         if self._client:
-            self._client.loop_stop()
-            self._client.disconnect()
+            client, self._client = self._client, None
+            await asyncio.to_thread(client.disconnect)
+            await asyncio.to_thread(client.loop_stop)
             self._connected = False
+            self._connected_event.clear()
             logger.info("Disconnected from MQTT broker")
 
-    async def _ensure_connected(self):
-        """Ensure client is connected before publishing."""
-        if not self._connected:
-            connected = await self.connect()
-            if not connected:
-                raise MQTTServiceError("Failed to connect to MQTT broker")
-
     def _build_topic(self, *parts: str) -> str:
         """Build topic string from parts."""
         return "/".join([TOPIC_PREFIX] + list(parts))
 
+    @staticmethod
+    def encode(payload: Union[Dict[str, Any], bytes]) -> bytes:
+        """Encode a payload once (msgspec) so it can be fanned out to many topics."""
+        if isinstance(payload, (bytes, bytearray)):
+            return bytes(payload)
+        return json_dumps(payload)
+
+    def _enqueue(self, topic: str, data: bytes, qos: int, retain: bool) -> bool:
+        try:
+            self._queue.put_nowait((topic, data, qos, retain, time.monotonic()))
+        except queue.Full:
+            self._dropped += 1
+            logger.warning(f"MQTT outbound queue full, dropping message to {topic}")
+            return False
+        self._enqueued += 1
+        depth = self._queue.qsize()
+        if depth > self._max_depth:
+            self._max_depth = depth
+        return True
+
     async def publish(
         self,
         topic: str,
-        payload: Dict[str, Any],
+        payload: Union[Dict[str, Any], bytes],
         qos: int = QOS_AT_LEAST_ONCE,
         retain: bool = False
     ) -> bool:
@@ -210,30 +364,63 @@ class MQTTService:
 
         Args:
             topic: MQTT topic
-            payload: Message payload (will be JSON encoded)
+            payload: Message payload (dict, JSON encoded here) or pre-encoded bytes
             qos: Quality of Service level
             retain: Whether to retain message
 
         Returns:
-            True if published successfully
+            True if queued for publishing
         """
-        await self._ensure_connected()
-
+        self._start()
         try:
-            message = json.dumps(payload, default=str)
-            result = self._client.publish(topic, message, qos=qos, retain=retain)
-
-            if result.rc == mqtt.MQTT_ERR_SUCCESS:
-                logger.debug(f"Published to {topic}: {message[:100]}...")
-                return True
-            else:
-                logger.error(f"Failed to publish to {topic}: rc={result.rc}")
-                return False
-
+            return self._enqueue(topic, self.encode(payload), qos, retain)
         except Exception as e:
             logger.error(f"Error publishing to {topic}: {e}")
             return False
 
+    async def publish_many(
+        self,
+        topics: Iterable[str],
+        payload: Union[Dict[str, Any], bytes],
+        qos: int = QOS_AT_LEAST_ONCE,
+        retain: bool = False
+    ) -> int:
+        """
+        Publish the same payload to many topics (encoded once).
+
+        Returns:
+            Number of messages queued
+        """
+        self._start()
+        try:
+            data = self.encode(payload)
+        except Exception as e:
+            logger.error(f"Error encoding MQTT payload: {e}")
+            return 0
+        return sum(1 for topic in topics if self._enqueue(topic, data, qos, retain))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Publisher metrics: queue depth, counters and publish latency (ms)."""
+        with self._stats_lock:
+            latencies = list(self._latencies)
+        return {
+            "connected": self._connected,
+            "queue_depth": self._queue.qsize(),
+            "queue_max_depth": self._max_depth,
+            "queue_capacity": self._queue.maxsize,
+            "enqueued": self._enqueued,
+            "published": self._published,
+            "dropped": self._dropped,
+            "failed": self._failed,
+            "reconnects": self._reconnects,
+            "latency_ms": {
+                "p50": _percentile(latencies, 0.50),
+                "p95": _percentile(latencies, 0.95),
+                "p99": _percentile(latencies, 0.99),
+                "samples": len(latencies),
+            },
+        }
+
     # =========================================================================
     # Community Message Publishing
     # =========================================================================
@@ -327,17 +514,24 @@ class MQTTService:
         community_id: str,
         member_id: str,
         message_id: str,
-        subgroup_id: Optional[str] = None
+        subgroup_id: Optional[str] = None,
+        channel_type: Optional[str] = None,
+        seq: Optional[int] = None
     ) -> bool:
         """
         Publish read receipt for a message.
 
+        The member has read everything in the channel up to and including
+        this message (read watermark).
+
         Args:
             church_id: Church ID
             community_id: Community ID
             member_id: Member who read the message
-            message_id: ID of message that was read
+            message_id: ID of the newest message read
             subgroup_id: Subgroup ID if applicable
+            channel_type: Channel of the message
+            seq: Channel sequence number of the message
 
         Returns:
             True if published successfully
@@ -350,6 +544,8 @@ class MQTTService:
             "member_id": member_id,
             "message_id": message_id,
             "subgroup_id": subgroup_id,
+            "channel_type": channel_type,
+            "seq": seq,
             "read_at": datetime.utcnow().isoformat()
         }
 
@@ -534,18 +730,13 @@ class MQTTService:
             notification: Notification payload
 
         Returns:
-            Number of successful publishes
+            Number of messages queued
         """
-        success_count = 0
-
-        for member_id in member_ids:
-            topic = self._build_topic(
-                church_id, "member", member_id, "notifications"
-            )
-            if await self.publish(topic, notification, qos=QOS_AT_LEAST_ONCE):
-                success_count += 1
-
-        return success_count
+        topics = [
+            self._build_topic(church_id, "member", member_id, "notifications")
+            for member_id in member_ids
+        ]
+        return await self.publish_many(topics, notification, qos=QOS_AT_LEAST_ONCE)
 
     # =========================================================================
     # Poll and Event Updates
@@ -662,14 +853,14 @@ async def get_mqtt() -> MQTTService:
 
 # Startup/shutdown hooks for FastAPI
 async def mqtt_startup():
-    """Call on FastAPI startup to connect MQTT."""
+    """Call on FastAPI startup to start connecting MQTT in the background."""
     service = get_mqtt_service()
     await service.connect()
-    logger.info("MQTT service connected on startup")
+    logger.info("MQTT publisher started")
 
 
 async def mqtt_shutdown():
-    """Call on FastAPI shutdown to disconnect MQTT."""
+    """Call on FastAPI shutdown to flush queued messages and disconnect MQTT."""
     service = get_mqtt_service()
     await service.disconnect()
     logger.info("MQTT service disconnected on shutdown")
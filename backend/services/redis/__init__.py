@@ -3,9 +3,10 @@ FaithFlow Redis Services
 
 Provides Redis-backed services for:
 - Faith Assistant: Session cache, conversation summaries, intent classification, settings
+- AI Generation: Shared response cache for Explore content generation
 - Authentication: JWT cache, login rate limiting, session management
 - Real-time: Online presence, unread counts, typing indicators
-- Performance: Distributed caching, rate limiting, locks
+- Performance: Two-tier (L1 + Redis) caching, rate limiting, locks
 - Gamification: Leaderboards, streak tracking
 - Pub/Sub: Distributed cache invalidation across instances
 """
@@ -14,6 +15,7 @@ from .utils import redis_key, parse_redis_url
 from .session_cache import SessionCache, session_cache
 from .summary_store import SummaryStore, summary_store
 from .intent_cache import IntentCache, intent_cache
+from .generation_cache import GenerationCache, generation_cache
 from .settings_store import SettingsStore, settings_store
 from .rate_limit import RateLimiter, rate_limiter
 from .cache import (
@@ -26,6 +28,7 @@ from .cache import (
     pipeline_get_many,
     pipeline_set_many,
 )
+from .tiered import TieredCache, NamespaceConfig, tiered_cache
 from .locks import DistributedLock, distributed_lock
 from .auth import AuthRedis, auth_redis
 from .presence import PresenceService, presence_service
@@ -65,6 +68,8 @@ __all__ = [
     "summary_store",
     "IntentCache",
     "intent_cache",
+    "GenerationCache",
+    "generation_cache",
     "SettingsStore",
     "settings_store",
     # Rate Limiting
@@ -79,6 +84,9 @@ __all__ = [
     "mdelete",
     "pipeline_get_many",
     "pipeline_set_many",
+    "TieredCache",
+    "NamespaceConfig",
+    "tiered_cache",
     # Locks
     "DistributedLock",
     "distributed_lock",
@@ -15,6 +15,7 @@ from datetime import datetime
 
 from config.redis import get_redis
 from .utils import redis_key, TTL
+from .tiered import tiered_cache
 
 # Use centralized msgspec-based serialization
 from utils.serialization import redis_encode, redis_decode
@@ -304,50 +305,54 @@ def cached(
 
 
 # Convenience functions for common cache operations
+# (served by the two-tier cache: in-process L1 in front of Redis)
 
 async def get_cached_church_settings(church_id: str) -> Optional[dict]:
     """Get cached church settings."""
-    return await redis_cache.get("church_settings", church_id)
+    return await tiered_cache.get("church_settings", church_id)
 
 
 async def set_cached_church_settings(church_id: str, settings: dict) -> bool:
     """Cache church settings."""
-    return await redis_cache.set("church_settings", church_id, settings, TTL.CHURCH_SETTINGS)
+    return await tiered_cache.set("church_settings", church_id, settings)
 
 
 async def invalidate_church_settings(church_id: str) -> bool:
     """Invalidate church settings cache."""
-    return await redis_cache.delete("church_settings", church_id)
+    await tiered_cache.invalidate("church_settings", church_id)
+    return True
 
 
 async def get_cached_member_statuses(church_id: str) -> Optional[list]:
     """Get cached member statuses."""
-    return await redis_cache.get("member_statuses", church_id)
+    return await tiered_cache.get("member_statuses", church_id)
 
 
 async def set_cached_member_statuses(church_id: str, statuses: list) -> bool:
     """Cache member statuses."""
-    return await redis_cache.set("member_statuses", church_id, statuses, TTL.MEMBER_STATUSES)
+    return await tiered_cache.set("member_statuses", church_id, statuses)
 
 
 async def invalidate_member_statuses(church_id: str) -> bool:
     """Invalidate member statuses cache."""
-    return await redis_cache.delete("member_statuses", church_id)
+    await tiered_cache.invalidate("member_statuses", church_id)
+    return True
 
 
 async def get_cached_demographics(church_id: str) -> Optional[list]:
     """Get cached demographics."""
-    return await redis_cache.get("demographics", church_id)
+    return await tiered_cache.get("demographics", church_id)
 
 
 async def set_cached_demographics(church_id: str, demographics: list) -> bool:
     """Cache demographics."""
-    return await redis_cache.set("demographics", church_id, demographics, TTL.DEMOGRAPHICS)
+    return await tiered_cache.set("demographics", church_id, demographics)
 
 
 async def invalidate_demographics(church_id: str) -> bool:
     """Invalidate demographics cache."""
-    return await redis_cache.delete("demographics", church_id)
+    await tiered_cache.invalidate("demographics", church_id)
+    return True
 
 
 # =============================================================================
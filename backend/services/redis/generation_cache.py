@@ -0,0 +1,443 @@
+"""
+AI Generation Response Cache
+
+Caches Claude generations for Explore content so that near-identical prompts
+across churches (same figure, same topic, same language pair) are served
+from Redis instead of being regenerated.
+
+Lookup order:
+1. Exact match on sha256(normalized prompt + model + content type)
+2. Optional similarity match (GENERATION_CACHE_SIMILARITY=true) for callers
+   that pass the prompt's parameters: entries must have the same key
+   parameters (figure, passage, topic, language, date) and a hashed
+   character-trigram embedding of the remaining parameters (custom
+   instructions, quiz size...) close to the recent entries for the same
+   content type and model. The shared template is never embedded, so it
+   can't make prompts about different subjects look alike
+
+Cached entries keep the original stream chunks so SSE clients can be
+replayed the same event sequence they would get from a live generation.
+
+Churches can opt out via ``church_explore_settings.ai_generation_cache_enabled``.
+
+TTL: 7 days (configurable via GENERATION_CACHE_TTL)
+"""
+
+import hashlib
+import logging
+import math
+import os
+import re
+import time
+from typing import Optional, Dict, Any, List, Tuple
+from dataclasses import dataclass, asdict, field
+from datetime import datetime
+
+from config.redis import get_redis
+from .utils import redis_key, TTL
+
+# Use centralized msgspec-based serialization
+from utils.serialization import json_dumps_str, json_loads
+
+logger = logging.getLogger(__name__)
+
+
+# Dimension of the hashed trigram embedding used for similarity lookups
+EMBEDDING_DIM = 256
+
+# Seconds to remember a church's opt-out flag in-process
+OPT_OUT_CACHE_SECONDS = 300
+
+# Parameters that pick what a generation is about; similarity hits need them equal
+SIMILARITY_KEY_PARAMS = ("figure_name", "scripture_reference", "topic", "generate_both_languages", "language", "date")
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_prompt(prompt: str) -> str:
+    """
+    Normalize a prompt for cache keying.
+
+    Lowercases and collapses whitespace so formatting differences in
+    templates (indentation, trailing newlines) do not defeat the cache.
+    """
+    return _WHITESPACE_RE.sub(" ", (prompt or "").strip().lower())
+
+
+def embed_prompt(normalized: str, dim: int = EMBEDDING_DIM) -> List[float]:
+    """
+    Build a unit-length hashed character-trigram embedding.
+
+    This is a dependency-free approximation of a semantic embedding that is
+    good at catching prompts that differ only in small edits (a reordered
+    sentence, a different quiz size, a tweaked tradition guidance block).
+    """
+    vector = [0.0] * dim
+    text = f"  {normalized} "
+    for i in range(len(text) - 2):
+        bucket = int.from_bytes(
+            hashlib.blake2b(text[i:i + 3].encode("utf-8"), digest_size=4).digest(),
+            "little",
+        ) % dim
+        vector[bucket] += 1.0
+
+    norm = math.sqrt(sum(v * v for v in vector))
+    if norm == 0:
+        return vector
+    return [round(v / norm, 5) for v in vector]
+
+
+def split_params(params: Dict[str, Any]) -> Tuple[str, str]:
+    """
+    Split prompt parameters into (key, variable text).
+
+    The key is a canonical JSON of the SIMILARITY_KEY_PARAMS that are set;
+    the variable text is the normalized remaining parameters, the part the
+    similarity embedding is built from.
+    """
+    key = {k: params[k] for k in SIMILARITY_KEY_PARAMS if params.get(k) not in (None, "")}
+    variable = {k: v for k, v in params.items() if k not in SIMILARITY_KEY_PARAMS and v not in (None, "")}
+    return (
+        json_dumps_str(dict(sorted(key.items()))),
+        normalize_prompt(json_dumps_str(dict(sorted(variable.items())))),
+    )
+
+
+def cosine_similarity(a: List[float], b: List[float]) -> float:
+    """Cosine similarity for unit-length vectors."""
+    return sum(x * y for x, y in zip(a, b))
+
+
+@dataclass
+class CachedGeneration:
+    """Single cached generation entry."""
+
+    content_type: str
+    model: str
+    chunks: List[str]                 # Original stream chunks (for SSE replay)
+    prompt_hash: str = ""
+    created_at: str = ""
+    param_key: str = ""               # split_params key; similarity hits must match it
+    embedding: List[float] = field(default_factory=list)
+
+    def __post_init__(self):
+        if not self.created_at:
+            self.created_at = datetime.utcnow().isoformat()
+
+    @property
+    def text(self) -> str:
+        return "".join(self.chunks)
+
+    def replay_chunks(self, max_chars: int = 2048) -> List[str]:
+        """
+        Coalesce stored chunks for replay.
+
+        Live streams arrive as many tiny deltas; replaying them one by one
+        would reintroduce the per-chunk pacing delay of the SSE writer.
+        """
+        replay: List[str] = []
+        buffer = ""
+        for chunk in self.chunks:
+            buffer += chunk
+            if len(buffer) >= max_chars:
+                replay.append(buffer)
+                buffer = ""
+        if buffer:
+            replay.append(buffer)
+        return replay
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CachedGeneration":
+        return cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__})
+
+
+class GenerationCache:
+    """
+    Redis-backed cache for AI content generations.
+
+    Keys:
+    - faithflow:ai_gen:entry:{hash}               -> CachedGeneration JSON
+    - faithflow:ai_gen:index:{content_type}:{model} -> sorted set of hashes (by time)
+    - faithflow:ai_gen:stats:{content_type}       -> hash of hit/miss counters
+    """
+
+    def __init__(
+        self,
+        ttl: int = int(os.getenv("GENERATION_CACHE_TTL", str(TTL.DAYS_7))),
+        similarity_enabled: bool = os.getenv("GENERATION_CACHE_SIMILARITY", "false").lower() == "true",
+        similarity_threshold: float = float(os.getenv("GENERATION_CACHE_SIMILARITY_THRESHOLD", "0.97")),
+        max_index_entries: int = 200,
+    ):
+        """
+        Initialize generation cache.
+
+        Args:
+            ttl: Time-to-live for cached generations in seconds
+            similarity_enabled: Whether to fall back to similarity lookups
+            similarity_threshold: Minimum cosine similarity for a near-duplicate hit
+            max_index_entries: Entries kept per (content_type, model) similarity index
+        """
+        self.ttl = ttl
+        self.similarity_enabled = similarity_enabled
+        self.similarity_threshold = similarity_threshold
+        self.max_index_entries = max_index_entries
+        self._opt_out: Dict[str, Tuple[bool, float]] = {}
+
+    # ==================== Keys ====================
+
+    @staticmethod
+    def make_hash(content_type: str, model: str, prompt: str) -> str:
+        """Hash of normalized prompt + model + content type."""
+        raw = f"{content_type}|{model}|{normalize_prompt(prompt)}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _entry_key(self, prompt_hash: str) -> str:
+        return redis_key("ai_gen", "entry", prompt_hash)
+
+    def _index_key(self, content_type: str, model: str) -> str:
+        return redis_key("ai_gen", "index", content_type, model)
+
+    def _stats_key(self, content_type: str) -> str:
+        return redis_key("ai_gen", "stats", content_type)
+
+    # ==================== Opt-out ====================
+
+    async def is_enabled_for_church(self, church_id: Optional[str]) -> bool:
+        """
+        Check whether a church allows shared generation caching.
+
+        Global/platform generations always use the cache. The flag is
+        memoized in-process for a few minutes to keep the check off the
+        hot path.
+        """
+        if not church_id or church_id == "global":
+            return True
+
+        cached = self._opt_out.get(church_id)
+        now = time.monotonic()
+        if cached and cached[1] > now:
+            return cached[0]
+
+        enabled = True
+        try:
+            from utils.dependencies import get_db
+            db = await get_db()
+            settings = await db.church_explore_settings.find_one(
+                {"church_id": church_id, "deleted": False},
+                {"_id": 0, "ai_generation_cache_enabled": 1},
+            )
+            if settings is not None:
+                enabled = settings.get("ai_generation_cache_enabled", True) is not False
+        except Exception as e:
+            logger.debug(f"Generation cache opt-out lookup failed for {church_id}: {e}")
+
+        self._opt_out[church_id] = (enabled, now + OPT_OUT_CACHE_SECONDS)
+        return enabled
+
+    def forget_church(self, church_id: str) -> None:
+        """Drop the memoized opt-out flag (call after settings change)."""
+        self._opt_out.pop(church_id, None)
+
+    # ==================== Lookup ====================
+
+    async def get(
+        self,
+        content_type: str,
+        model: str,
+        prompt: str,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Optional[CachedGeneration]:
+        """
+        Look up a cached generation.
+
+        Tries an exact match first, then (if enabled and ``params`` given)
+        the most similar recent entry with the same key parameters.
+
+        Args:
+            content_type: Explore content type
+            model: Claude model name
+            prompt: Full prompt sent to the model
+            params: Parameters the prompt was built from (enables similarity)
+
+        Returns:
+            CachedGeneration or None on miss
+        """
+        prompt_hash = self.make_hash(content_type, model, prompt)
+
+        try:
+            redis = await get_redis()
+            data = await redis.get(self._entry_key(prompt_hash))
+
+            if data is not None:
+                await self._record(content_type, "hits")
+                return CachedGeneration.from_dict(json_loads(data))
+
+            if self.similarity_enabled and params is not None:
+                similar = await self._find_similar(redis, content_type, model, params)
+                if similar is not None:
+                    await self._record(content_type, "similar_hits")
+                    return similar
+
+            await self._record(content_type, "misses")
+            return None
+
+        except Exception as e:
+            logger.error(f"Generation cache get failed: {e}")
+            return None
+
+    async def _find_similar(
+        self,
+        redis,
+        content_type: str,
+        model: str,
+        params: Dict[str, Any],
+    ) -> Optional[CachedGeneration]:
+        """Scan the recent index for the closest entry with the same key parameters."""
+        hashes = await redis.zrevrange(self._index_key(content_type, model), 0, self.max_index_entries - 1)
+        if not hashes:
+            return None
+
+        raw_entries = await redis.mget([self._entry_key(h) for h in hashes])
+        param_key, variable = split_params(params)
+        query = embed_prompt(variable)
+
+        best: Optional[CachedGeneration] = None
+        best_score = self.similarity_threshold
+        for raw in raw_entries:
+            if raw is None:
+                continue
+            try:
+                entry = CachedGeneration.from_dict(json_loads(raw))
+            except Exception:
+                continue
+            if not entry.embedding or entry.param_key != param_key:
+                continue
+            score = cosine_similarity(query, entry.embedding)
+            if score >= best_score:
+                best, best_score = entry, score
+
+        if best is not None:
+            logger.debug(f"Generation cache similarity hit ({best_score:.3f}) for {content_type}")
+        return best
+
+    # ==================== Store ====================
+
+    async def set(
+        self,
+        content_type: str,
+        model: str,
+        prompt: str,
+        chunks: List[str],
+        params: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """
+        Store a completed generation.
+
+        Args:
+            content_type: Explore content type
+            model: Claude model name
+            prompt: Full prompt sent to the model
+            chunks: Stream chunks in order (a single-item list for non-streamed calls)
+            params: Parameters the prompt was built from (makes the entry a
+                similarity candidate)
+
+        Returns:
+            bool: True if stored successfully
+        """
+        prompt_hash = self.make_hash(content_type, model, prompt)
+        entry = CachedGeneration(
+            content_type=content_type,
+            model=model,
+            chunks=chunks,
+            prompt_hash=prompt_hash,
+        )
+        if self.similarity_enabled and params is not None:
+            entry.param_key, variable = split_params(params)
+            entry.embedding = embed_prompt(variable)
+
+        try:
+            redis = await get_redis()
+            index_key = self._index_key(content_type, model)
+
+            pipe = redis.pipeline()
+            pipe.set(self._entry_key(prompt_hash), json_dumps_str(entry.to_dict()), ex=self.ttl)
+            pipe.zadd(index_key, {prompt_hash: time.time()})
+            pipe.zremrangebyrank(index_key, 0, -(self.max_index_entries + 1))
+            pipe.expire(index_key, self.ttl)
+            await pipe.execute()
+
+            logger.debug(f"Cached {content_type} generation {prompt_hash[:12]}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Generation cache set failed: {e}")
+            return False
+
+    async def delete(self, content_type: str, model: str, prompt: str) -> bool:
+        """Remove a cached generation (e.g. after it was rejected in review)."""
+        prompt_hash = self.make_hash(content_type, model, prompt)
+        try:
+            redis = await get_redis()
+            pipe = redis.pipeline()
+            pipe.delete(self._entry_key(prompt_hash))
+            pipe.zrem(self._index_key(content_type, model), prompt_hash)
+            await pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(f"Generation cache delete failed: {e}")
+            return False
+
+    # ==================== Metrics ====================
+
+    async def _record(self, content_type: str, field_name: str) -> None:
+        """Increment a hit/miss counter."""
+        try:
+            redis = await get_redis()
+            await redis.hincrby(self._stats_key(content_type), field_name, 1)
+        except Exception as e:
+            logger.debug(f"Generation cache stats update failed: {e}")
+
+    async def get_stats(self, content_types: List[str]) -> Dict[str, Any]:
+        """
+        Get hit-rate metrics per content type.
+
+        Returns:
+            Dict with per-type counters, hit_rate, and overall totals
+        """
+        result: Dict[str, Any] = {"by_type": {}, "hits": 0, "similar_hits": 0, "misses": 0}
+
+        try:
+            redis = await get_redis()
+            pipe = redis.pipeline()
+            for content_type in content_types:
+                pipe.hgetall(self._stats_key(content_type))
+            raw_stats = await pipe.execute()
+        except Exception as e:
+            logger.error(f"Generation cache stats failed: {e}")
+            raw_stats = [{} for _ in content_types]
+
+        for content_type, stats in zip(content_types, raw_stats):
+            hits = int(stats.get("hits", 0))
+            similar = int(stats.get("similar_hits", 0))
+            misses = int(stats.get("misses", 0))
+            total = hits + similar + misses
+            result["by_type"][content_type] = {
+                "hits": hits,
+                "similar_hits": similar,
+                "misses": misses,
+                "hit_rate": round((hits + similar) / total, 4) if total else 0.0,
+            }
+            result["hits"] += hits
+            result["similar_hits"] += similar
+            result["misses"] += misses
+
+        total = result["hits"] + result["similar_hits"] + result["misses"]
+        result["hit_rate"] = round((result["hits"] + result["similar_hits"]) / total, 4) if total else 0.0
+        return result
+
+
+# Global instance
+generation_cache = GenerationCache()
@@ -9,11 +9,22 @@ Provides Redis-backed leaderboards for:
 - Community participation
 
 Uses Redis sorted sets for efficient ranking operations.
+
+Each church also has an "overall" sorted set per time frame: the sum of a
+member's scores across all board types. It is updated in the same
+transaction as every score change, so overall rank is a single ZREVRANK
+(O(log n)) instead of summing every board. rebuild_overall() recomputes
+it from the boards with ZUNIONSTORE (scheduled job, and after a board is
+cleared). Boards written before overall boards existed are folded in
+once by backfill_overall_leaderboards() (startup); overall reads are not
+trusted until it has run.
+
+Read paths that need several boards (member dashboard, aggregate
+score) fetch everything in one pipelined round-trip.
 """
 
-import time
 import logging
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Optional, List, Dict, Any, Tuple, Union
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
@@ -37,6 +48,18 @@ class LeaderboardType(str, Enum):
     PRAYER = "prayer"                    # Prayer partner interactions
 
 
+# Sum of all board types (maintained alongside every score change)
+OVERALL_BOARD = "overall"
+
+# Churches with leaderboard activity (for the overall rebuild job)
+LEADERBOARD_CHURCHES_KEY = redis_key("leaderboard", "churches")
+
+# Set once overall boards have been built from boards that predate them;
+# until then overall reads fall back to the boards (see overall_ready)
+OVERALL_BACKFILLED_KEY = redis_key("leaderboard", "overall_backfilled")
+OVERALL_BACKFILL_LOCK_KEY = redis_key("leaderboard", "overall_backfill_lock")
+
+
 class TimeFrame(str, Enum):
     """Leaderboard time frames."""
 
@@ -85,6 +108,55 @@ class MemberRankInfo:
             "percentile": round(self.percentile, 1),
         }
 
+    @classmethod
+    def from_redis(
+        cls,
+        member_id: str,
+        rank: Optional[int],
+        score: Optional[float],
+        total: int,
+    ) -> Optional["MemberRankInfo"]:
+        """Build from ZREVRANK (0-indexed) / ZSCORE / ZCARD results (None if unranked)."""
+        if rank is None:
+            return None
+        return cls(
+            member_id=member_id,
+            score=score or 0,
+            rank=rank + 1,  # Convert to 1-indexed
+            total_members=total,
+            percentile=((rank + 1) / total) * 100 if total > 0 else 100,  # Top X%
+        )
+
+
+# Replace a board score and move the overall score by the difference
+_SET_SCORE_SCRIPT = """
+local old = tonumber(redis.call("zscore", KEYS[1], ARGV[1]) or "0")
+redis.call("zadd", KEYS[1], ARGV[2], ARGV[1])
+local delta = tonumber(ARGV[2]) - old
+if delta ~= 0 then
+    redis.call("zincrby", KEYS[2], delta, ARGV[1])
+end
+if tonumber(ARGV[3]) > 0 then
+    redis.call("expire", KEYS[1], ARGV[3])
+    redis.call("expire", KEYS[2], ARGV[3])
+end
+return 1
+"""
+
+# Remove a member from a board and take their score out of the overall board
+_REMOVE_MEMBER_SCRIPT = """
+local old = redis.call("zscore", KEYS[1], ARGV[1])
+if not old then
+    return 0
+end
+redis.call("zrem", KEYS[1], ARGV[1])
+local remaining = tonumber(redis.call("zincrby", KEYS[2], -tonumber(old), ARGV[1]))
+if remaining == 0 then
+    redis.call("zrem", KEYS[2], ARGV[1])
+end
+return 1
+"""
+
 
 class LeaderboardService:
     """
@@ -96,21 +168,36 @@ class LeaderboardService:
 
     def __init__(self):
         """Initialize leaderboard service."""
-        pass
+        self._overall_ready = False
 
-    def _make_key(
+    def board_key(
         self,
         church_id: str,
-        board_type: LeaderboardType,
+        board_type: Union[LeaderboardType, str],
         timeframe: TimeFrame = TimeFrame.ALL_TIME,
+        period: Optional[str] = None,
     ) -> str:
-        """Create Redis key for leaderboard."""
+        """Create Redis key for leaderboard (a board type or OVERALL_BOARD)."""
+        board = board_type.value if isinstance(board_type, LeaderboardType) else board_type
         if timeframe == TimeFrame.ALL_TIME:
-            return redis_key("leaderboard", church_id, board_type.value)
+            return redis_key("leaderboard", church_id, board)
         else:
             # Include time period suffix for time-based boards
-            period = self._get_period_suffix(timeframe)
-            return redis_key("leaderboard", church_id, board_type.value, period)
+            period = period or self._get_period_suffix(timeframe)
+            return redis_key("leaderboard", church_id, board, period)
+
+    def _board_keys(
+        self,
+        church_id: str,
+        board_type: LeaderboardType,
+        timeframe: TimeFrame,
+    ) -> Tuple[str, str]:
+        """Keys of a board and of the overall board for the same period."""
+        period = self._get_period_suffix(timeframe)
+        return (
+            self.board_key(church_id, board_type, timeframe, period),
+            self.board_key(church_id, OVERALL_BOARD, timeframe, period),
+        )
 
     def _get_period_suffix(self, timeframe: TimeFrame) -> str:
         """Get period suffix for time-based leaderboards."""
@@ -137,6 +224,16 @@ class LeaderboardService:
         else:
             return 0  # No expiry for all-time
 
+    async def overall_ready(self) -> bool:
+        """Whether overall boards include scores from before they existed (backfill done)."""
+        if not self._overall_ready:
+            try:
+                redis = await get_redis()
+                self._overall_ready = bool(await redis.exists(OVERALL_BACKFILLED_KEY))
+            except Exception as e:
+                logger.debug(f"Overall backfill check failed: {e}")
+        return self._overall_ready
+
     # ==================== Score Management ====================
 
     async def add_points(
@@ -160,27 +257,57 @@ class LeaderboardService:
         Returns:
             float: New total score
         """
-        try:
-            redis = await get_redis()
-            key = self._make_key(church_id, board_type, timeframe)
+        scores = await self.add_points_many(church_id, member_id, points, board_type, [timeframe])
+        return scores.get(timeframe, 0.0)
 
-            # Increment score
-            new_score = await redis.zincrby(key, points, member_id)
+    async def add_points_many(
+        self,
+        church_id: str,
+        member_id: str,
+        points: float,
+        board_type: LeaderboardType,
+        timeframes: List[TimeFrame],
+    ) -> Dict[TimeFrame, float]:
+        """
+        Add points to a board in several time frames in one transaction.
 
-            # Set TTL for time-based boards
-            ttl = self._get_ttl(timeframe)
-            if ttl > 0:
-                await redis.expire(key, ttl)
+        The overall board of each time frame is incremented in the same
+        MULTI/EXEC, so it never disagrees with the sum of the boards.
+
+        Returns:
+            Dict of time frame -> new score on the board ({} on failure)
+        """
+        try:
+            redis = await get_redis()
+            pipe = redis.pipeline(transaction=True)
+            for timeframe in timeframes:
+                key, overall_key = self._board_keys(church_id, board_type, timeframe)
+                pipe.zincrby(key, points, member_id)
+                pipe.zincrby(overall_key, points, member_id)
+
+                # Set TTL for time-based boards
+                ttl = self._get_ttl(timeframe)
+                if ttl > 0:
+                    pipe.expire(key, ttl)
+                    pipe.expire(overall_key, ttl)
+            pipe.sadd(LEADERBOARD_CHURCHES_KEY, church_id)
+            results = await pipe.execute()
+
+            scores: Dict[TimeFrame, float] = {}
+            index = 0
+            for timeframe in timeframes:
+                scores[timeframe] = results[index]
+                index += 4 if self._get_ttl(timeframe) > 0 else 2
 
             logger.debug(
                 f"Added {points} {board_type.value} points to member {member_id}, "
-                f"new score: {new_score}"
+                f"new scores: {scores}"
             )
-            return new_score
+            return scores
 
         except Exception as e:
             logger.error(f"Failed to add points: {e}")
-            return 0.0
+            return {}
 
     async def set_score(
         self,
@@ -205,15 +332,14 @@ class LeaderboardService:
         """
         try:
             redis = await get_redis()
-            key = self._make_key(church_id, board_type, timeframe)
-
-            await redis.zadd(key, {member_id: score})
-
-            # Set TTL for time-based boards
-            ttl = self._get_ttl(timeframe)
-            if ttl > 0:
-                await redis.expire(key, ttl)
+            key, overall_key = self._board_keys(church_id, board_type, timeframe)
 
+            # Set the score and adjust the overall board atomically
+            await redis.eval(
+                _SET_SCORE_SCRIPT, 2, key, overall_key,
+                member_id, score, self._get_ttl(timeframe),
+            )
+            await redis.sadd(LEADERBOARD_CHURCHES_KEY, church_id)
             return True
 
         except Exception as e:
@@ -224,7 +350,7 @@ class LeaderboardService:
         self,
         church_id: str,
         member_id: str,
-        board_type: LeaderboardType,
+        board_type: Union[LeaderboardType, str],
         timeframe: TimeFrame = TimeFrame.ALL_TIME,
     ) -> float:
         """
@@ -233,7 +359,7 @@ class LeaderboardService:
         Args:
             church_id: Church identifier
             member_id: Member identifier
-            board_type: Type of leaderboard
+            board_type: Type of leaderboard (or OVERALL_BOARD)
             timeframe: Time frame
 
         Returns:
@@ -241,7 +367,7 @@ class LeaderboardService:
         """
         try:
             redis = await get_redis()
-            key = self._make_key(church_id, board_type, timeframe)
+            key = self.board_key(church_id, board_type, timeframe)
 
             score = await redis.zscore(key, member_id)
             return score if score is not None else 0.0
@@ -250,6 +376,38 @@ class LeaderboardService:
             logger.error(f"Failed to get score: {e}")
             return 0.0
 
+    async def get_scores(
+        self,
+        church_id: str,
+        member_id: str,
+        board_types: Optional[List[LeaderboardType]] = None,
+        timeframe: TimeFrame = TimeFrame.ALL_TIME,
+    ) -> Dict[LeaderboardType, float]:
+        """
+        Get member's scores on several boards in one round-trip.
+
+        Args:
+            church_id: Church identifier
+            member_id: Member identifier
+            board_types: Boards to read (default: all)
+            timeframe: Time frame
+
+        Returns:
+            Dict of board type -> score (0 if not found)
+        """
+        board_types = list(LeaderboardType) if board_types is None else board_types
+        try:
+            redis = await get_redis()
+            pipe = redis.pipeline(transaction=False)
+            for board_type in board_types:
+                pipe.zscore(self.board_key(church_id, board_type, timeframe), member_id)
+            results = await pipe.execute()
+            return {bt: score or 0.0 for bt, score in zip(board_types, results)}
+
+        except Exception as e:
+            logger.error(f"Failed to get scores: {e}")
+            return {bt: 0.0 for bt in board_types}
+
     # ==================== Ranking Operations ====================
 
     async def get_rank(
@@ -271,36 +429,58 @@ class LeaderboardService:
         Returns:
             MemberRankInfo or None if not ranked
         """
-        try:
-            redis = await get_redis()
-            key = self._make_key(church_id, board_type, timeframe)
+        ranks = await self.get_ranks(church_id, member_id, [board_type], timeframe)
+        return ranks.get(board_type)
 
-            # Get rank (0-indexed, None if not in set)
-            rank = await redis.zrevrank(key, member_id)
-
-            if rank is None:
-                return None
-
-            # Get score
-            score = await redis.zscore(key, member_id)
-
-            # Get total count
-            total = await redis.zcard(key)
+    async def get_ranks(
+        self,
+        church_id: str,
+        member_id: str,
+        board_types: List[Union[LeaderboardType, str]],
+        timeframe: TimeFrame = TimeFrame.ALL_TIME,
+    ) -> Dict[Union[LeaderboardType, str], Optional[MemberRankInfo]]:
+        """
+        Get member's rank on several boards in one round-trip.
 
-            # Calculate percentile (top X%)
-            percentile = ((rank + 1) / total) * 100 if total > 0 else 100
+        Args:
+            church_id: Church identifier
+            member_id: Member identifier
+            board_types: Board types (or OVERALL_BOARD)
+            timeframe: Time frame
 
-            return MemberRankInfo(
-                member_id=member_id,
-                score=score or 0,
-                rank=rank + 1,  # Convert to 1-indexed
-                total_members=total,
-                percentile=percentile,
-            )
+        Returns:
+            Dict of board -> MemberRankInfo (None if not ranked)
+        """
+        try:
+            redis = await get_redis()
+            pipe = redis.pipeline(transaction=False)
+            for board_type in board_types:
+                key = self.board_key(church_id, board_type, timeframe)
+                pipe.zrevrank(key, member_id)  # 0-indexed, None if not in set
+                pipe.zscore(key, member_id)
+                pipe.zcard(key)
+            results = await pipe.execute()
+            overall_ready = OVERALL_BOARD not in board_types or await self.overall_ready()
+
+            return {
+                board_type: MemberRankInfo.from_redis(member_id, *results[i * 3:i * 3 + 3])
+                if board_type != OVERALL_BOARD or overall_ready else None
+                for i, board_type in enumerate(board_types)
+            }
 
         except Exception as e:
             logger.error(f"Failed to get rank: {e}")
-            return None
+            return {board_type: None for board_type in board_types}
+
+    async def get_overall_rank(
+        self,
+        church_id: str,
+        member_id: str,
+        timeframe: TimeFrame = TimeFrame.ALL_TIME,
+    ) -> Optional[MemberRankInfo]:
+        """Get member's rank by total score across all boards."""
+        ranks = await self.get_ranks(church_id, member_id, [OVERALL_BOARD], timeframe)
+        return ranks.get(OVERALL_BOARD)
 
     async def get_top(
         self,
@@ -325,7 +505,7 @@ class LeaderboardService:
         """
         try:
             redis = await get_redis()
-            key = self._make_key(church_id, board_type, timeframe)
+            key = self.board_key(church_id, board_type, timeframe)
 
             # Get top members with scores
             end = offset + limit - 1
@@ -368,7 +548,7 @@ class LeaderboardService:
         """
         try:
             redis = await get_redis()
-            key = self._make_key(church_id, board_type, timeframe)
+            key = self.board_key(church_id, board_type, timeframe)
 
             # Get member's rank
             rank = await redis.zrevrank(key, member_id)
@@ -610,7 +790,7 @@ class LeaderboardService:
         """Get total number of members in a leaderboard."""
         try:
             redis = await get_redis()
-            key = self._make_key(church_id, board_type, timeframe)
+            key = self.board_key(church_id, board_type, timeframe)
 
             return await redis.zcard(key)
 
@@ -628,9 +808,9 @@ class LeaderboardService:
         """Remove member from a leaderboard."""
         try:
             redis = await get_redis()
-            key = self._make_key(church_id, board_type, timeframe)
+            key, overall_key = self._board_keys(church_id, board_type, timeframe)
 
-            await redis.zrem(key, member_id)
+            await redis.eval(_REMOVE_MEMBER_SCRIPT, 2, key, overall_key, member_id)
             return True
 
         except Exception as e:
@@ -646,9 +826,10 @@ class LeaderboardService:
         """Clear entire leaderboard."""
         try:
             redis = await get_redis()
-            key = self._make_key(church_id, board_type, timeframe)
+            key = self.board_key(church_id, board_type, timeframe)
 
             await redis.delete(key)
+            await self.rebuild_overall(church_id, timeframe)
             logger.info(f"Cleared leaderboard {board_type.value} for {church_id}")
             return True
 
@@ -665,7 +846,9 @@ class LeaderboardService:
         """
         Get aggregate score across multiple leaderboards.
 
-        Useful for overall "faith points" calculation.
+        Useful for overall "faith points" calculation. The default (all
+        boards) is read from the overall board; a subset is summed from one
+        pipelined read.
 
         Args:
             church_id: Church identifier
@@ -675,20 +858,43 @@ class LeaderboardService:
         Returns:
             float: Total aggregate score
         """
-        try:
-            if board_types is None:
-                board_types = list(LeaderboardType)
+        if board_types is None and await self.overall_ready():
+            # The overall board holds exactly this sum
+            score = await self.get_score(church_id, member_id, OVERALL_BOARD)
+            if score:
+                return score
 
-            total = 0.0
-            for board_type in board_types:
-                score = await self.get_score(church_id, member_id, board_type)
-                total += score
+        scores = await self.get_scores(church_id, member_id, board_types)
+        return sum(scores.values())
+
+    async def rebuild_overall(
+        self,
+        church_id: str,
+        timeframe: TimeFrame = TimeFrame.ALL_TIME,
+    ) -> int:
+        """
+        Recompute a church's overall board from its boards (ZUNIONSTORE).
+
+        Returns:
+            int: Members on the rebuilt overall board
+        """
+        try:
+            redis = await get_redis()
+            period = self._get_period_suffix(timeframe)
+            keys = [self.board_key(church_id, bt, timeframe, period) for bt in LeaderboardType]
+            overall_key = self.board_key(church_id, OVERALL_BOARD, timeframe, period)
 
-            return total
+            pipe = redis.pipeline(transaction=True)
+            pipe.zunionstore(overall_key, keys)
+            ttl = self._get_ttl(timeframe)
+            if ttl > 0:
+                pipe.expire(overall_key, ttl)
+            results = await pipe.execute()
+            return results[0]
 
         except Exception as e:
-            logger.error(f"Failed to aggregate scores: {e}")
-            return 0.0
+            logger.error(f"Failed to rebuild overall leaderboard for {church_id}: {e}")
+            return 0
 
 
 # Global instance
@@ -717,26 +923,15 @@ async def add_faith_points(
     """
     logger.info(f"Adding {points} faith points to {member_id} from {source}")
 
-    # Add to all-time
-    score = await leaderboard_service.add_points(
+    # All-time plus daily, weekly, monthly in one transaction
+    scores = await leaderboard_service.add_points_many(
         church_id,
         member_id,
         points,
         LeaderboardType.FAITH_POINTS,
-        TimeFrame.ALL_TIME,
+        [TimeFrame.ALL_TIME, TimeFrame.DAILY, TimeFrame.WEEKLY, TimeFrame.MONTHLY],
     )
-
-    # Also update daily, weekly, monthly
-    for tf in [TimeFrame.DAILY, TimeFrame.WEEKLY, TimeFrame.MONTHLY]:
-        await leaderboard_service.add_points(
-            church_id,
-            member_id,
-            points,
-            LeaderboardType.FAITH_POINTS,
-            tf,
-        )
-
-    return score
+    return scores.get(TimeFrame.ALL_TIME, 0.0)
 
 
 async def record_bible_reading(
@@ -816,36 +1011,119 @@ async def get_member_dashboard_stats(
     """
     Get comprehensive stats for member dashboard.
 
+    Everything (faith points rank, overall rank, all board scores,
+    Bible streak, badges) is read in one pipelined round-trip.
+
     Returns:
         Dict with faith points, streaks, ranks, badges
     """
-    # Get faith points rank
-    faith_rank = await leaderboard_service.get_rank(
-        church_id,
-        member_id,
-        LeaderboardType.FAITH_POINTS,
-    )
-
-    # Get Bible streak
-    bible_streak = await leaderboard_service.get_streak(
-        church_id,
-        member_id,
-        "bible_reading",
-    )
-
-    # Get badges
-    badges = await leaderboard_service.get_badges(church_id, member_id)
+    service = leaderboard_service
+    board_types = list(LeaderboardType)
+    try:
+        redis = await get_redis()
+        pipe = redis.pipeline(transaction=False)
+        for board in (LeaderboardType.FAITH_POINTS, OVERALL_BOARD):
+            key = service.board_key(church_id, board)
+            pipe.zrevrank(key, member_id)
+            pipe.zscore(key, member_id)
+            pipe.zcard(key)
+        for board_type in board_types:
+            pipe.zscore(service.board_key(church_id, board_type), member_id)
+        pipe.get(redis_key("streak", church_id, member_id, "bible_reading"))
+        pipe.smembers(redis_key("badges", church_id, member_id))
+        results = await pipe.execute()
+    except Exception as e:
+        logger.error(f"Failed to get member dashboard stats: {e}")
+        return {
+            "total_faith_points": 0.0,
+            "faith_rank": None,
+            "overall_rank": None,
+            "bible_streak": 0,
+            "badges": [],
+            "badge_count": 0,
+        }
 
-    # Get aggregate score
-    total_points = await leaderboard_service.aggregate_scores(
-        church_id,
-        member_id,
-    )
+    faith_rank = MemberRankInfo.from_redis(member_id, *results[0:3])
+    overall_rank = MemberRankInfo.from_redis(member_id, *results[3:6]) if await service.overall_ready() else None
+    scores = results[6:6 + len(board_types)]
+    streak, badges = results[6 + len(board_types):]
 
     return {
-        "total_faith_points": total_points,
+        "total_faith_points": sum(score or 0.0 for score in scores),
         "faith_rank": faith_rank.to_dict() if faith_rank else None,
-        "bible_streak": bible_streak,
-        "badges": badges,
+        "overall_rank": overall_rank.to_dict() if overall_rank else None,
+        "bible_streak": int(streak) if streak else 0,
+        "badges": list(badges),
         "badge_count": len(badges),
     }
+
+
+async def rebuild_overall_leaderboards() -> int:
+    """
+    Scheduler job: rebuild every church's overall boards.
+
+    Run just after the UTC day starts, so each new daily/weekly/monthly
+    period's overall board is seeded from its boards, and any drift in
+    the all-time board is repaired.
+
+    Returns:
+        int: Overall boards rebuilt
+    """
+    redis = await get_redis()
+    church_ids = await redis.smembers(LEADERBOARD_CHURCHES_KEY)
+
+    rebuilt = 0
+    for church_id in church_ids:
+        for timeframe in TimeFrame:
+            await leaderboard_service.rebuild_overall(church_id, timeframe)
+            rebuilt += 1
+
+    if rebuilt:
+        logger.info(f"Rebuilt {rebuilt} overall leaderboards for {len(church_ids)} church(es)")
+    return rebuilt
+
+
+async def backfill_overall_leaderboards() -> int:
+    """
+    Build overall boards from boards that predate them (runs once).
+
+    Registers every church with a leaderboard key in
+    LEADERBOARD_CHURCHES_KEY (so the nightly rebuild covers it), rebuilds
+    its overall boards and marks the backfill done. Called at startup;
+    a no-op once OVERALL_BACKFILLED_KEY is set or while another instance
+    holds the backfill lock.
+
+    Returns:
+        int: Overall boards rebuilt
+    """
+    try:
+        redis = await get_redis()
+        if await redis.exists(OVERALL_BACKFILLED_KEY):
+            return 0
+        if not await redis.set(OVERALL_BACKFILL_LOCK_KEY, "1", nx=True, ex=TTL.MINUTES_10):
+            return 0
+    except Exception as e:
+        logger.warning(f"Overall leaderboard backfill skipped: {e}")
+        return 0
+
+    try:
+        boards = {bt.value for bt in LeaderboardType}
+        prefix = redis_key("leaderboard") + ":"
+        church_ids = set()
+        async for key in redis.scan_iter(match=prefix + "*", count=1000):
+            parts = key[len(prefix):].split(":")
+            if len(parts) >= 2 and parts[1] in boards:
+                church_ids.add(parts[0])
+        if church_ids:
+            await redis.sadd(LEADERBOARD_CHURCHES_KEY, *church_ids)
+
+        rebuilt = await rebuild_overall_leaderboards()
+        await redis.set(OVERALL_BACKFILLED_KEY, datetime.utcnow().isoformat())
+        leaderboard_service._overall_ready = True
+        logger.info(f"Backfilled overall leaderboards for {len(church_ids)} church(es)")
+        return rebuilt
+    except Exception as e:
+        logger.error(f"Overall leaderboard backfill failed: {e}")
+        return 0
+    finally:
+        await redis.delete(OVERALL_BACKFILL_LOCK_KEY)
@@ -44,12 +44,17 @@ class InvalidationType(str, Enum):
     # Member-level invalidations
     MEMBER = "member"
     MEMBER_LIST = "member_list"
+    MEMBER_SEARCH = "member_search"
 
     # Content invalidations
     ARTICLE = "article"
     EVENT = "event"
     GROUP = "group"
     COMMUNITY = "community"
+    COMMUNITY_MEMBERSHIP = "community_membership"
+
+    # Generic tiered cache entry / scope (entity_id is "namespace:key")
+    CACHE = "cache"
 
     # User/Auth invalidations
     USER_SESSION = "user_session"
@@ -330,37 +335,76 @@ pubsub_service = PubSubService()
 
 async def _handle_church_settings_invalidation(message: InvalidationMessage) -> None:
     """Handle church settings invalidation."""
-    from .cache import redis_cache
-    await redis_cache.delete("church_settings", message.church_id)
+    from .tiered import tiered_cache
+    await tiered_cache.invalidate("church_settings", message.church_id, publish=False)
 
 
 async def _handle_member_statuses_invalidation(message: InvalidationMessage) -> None:
     """Handle member statuses invalidation."""
-    from .cache import redis_cache
-    await redis_cache.delete("member_statuses", message.church_id)
+    from .tiered import tiered_cache
+    await tiered_cache.invalidate("member_statuses", message.church_id, publish=False)
 
 
 async def _handle_demographics_invalidation(message: InvalidationMessage) -> None:
     """Handle demographics invalidation."""
-    from .cache import redis_cache
-    await redis_cache.delete("demographics", message.church_id)
+    from .tiered import tiered_cache
+    await tiered_cache.invalidate("demographics", message.church_id, publish=False)
 
 
 async def _handle_member_list_invalidation(message: InvalidationMessage) -> None:
     """Handle member list invalidation."""
-    from .cache import redis_cache
-    # Invalidate all member-related caches for this church
-    await redis_cache.invalidate_pattern("members", f"*{message.church_id}*")
+    from .tiered import tiered_cache
+    # One version bump drops every member-related entry of the church (no SCAN)
+    await tiered_cache.invalidate_scope("members", message.church_id, publish=False)
+
+
+async def _handle_cache_invalidation(message: InvalidationMessage) -> None:
+    """Handle tiered cache invalidation (L2 was already updated by the publisher)."""
+    from .tiered import tiered_cache
+    namespace, _, key = message.entity_id.partition(":")
+    tiered_cache.drop_local(namespace, key, scope=message.church_id)
 
 
 async def _handle_user_session_invalidation(message: InvalidationMessage) -> None:
     """Handle user session invalidation."""
     from .auth import auth_redis
+    from utils.principal_cache import principal_cache
     # Clear all sessions for this user
     if message.entity_id:
+        principal_cache.evict_subject(message.entity_id)
         await auth_redis.delete_all_user_sessions(message.entity_id)
 
 
+def _drop_chat_context(kind: str, message: InvalidationMessage, scope: str = "", field: str = "") -> None:
+    """Drop this instance's L1 chat context entry (Redis tier is cleared by the publisher)."""
+    from services.chat_context_service import get_existing_chat_context_resolver
+    resolver = get_existing_chat_context_resolver()
+    if resolver is not None:
+        resolver.drop_local(kind, message.church_id, scope, field)
+
+
+async def _handle_community_invalidation(message: InvalidationMessage) -> None:
+    """Handle community (settings) invalidation."""
+    _drop_chat_context("community", message, field=message.entity_id)
+
+
+async def _handle_community_membership_invalidation(message: InvalidationMessage) -> None:
+    """Handle community membership invalidation (entity_id is community_id:member_id)."""
+    community_id, _, member_id = message.entity_id.partition(":")
+    _drop_chat_context("membership", message, scope=community_id, field=member_id)
+
+
+async def _handle_member_invalidation(message: InvalidationMessage) -> None:
+    """Handle member profile invalidation."""
+    _drop_chat_context("sender", message, field=message.entity_id)
+
+
+async def _handle_member_search_invalidation(message: InvalidationMessage) -> None:
+    """Handle member search invalidation (kiosk autocomplete index is rebuilt lazily)."""
+    from services.member_search_index import kiosk_prefix_index
+    kiosk_prefix_index.invalidate(message.church_id)
+
+
 def register_default_handlers() -> None:
     """Register default cache invalidation handlers."""
     pubsub_service.register_handler(
@@ -379,10 +423,30 @@ def register_default_handlers() -> None:
         InvalidationType.MEMBER_LIST,
         _handle_member_list_invalidation,
     )
+    pubsub_service.register_handler(
+        InvalidationType.CACHE,
+        _handle_cache_invalidation,
+    )
     pubsub_service.register_handler(
         InvalidationType.USER_SESSION,
         _handle_user_session_invalidation,
     )
+    pubsub_service.register_handler(
+        InvalidationType.COMMUNITY,
+        _handle_community_invalidation,
+    )
+    pubsub_service.register_handler(
+        InvalidationType.COMMUNITY_MEMBERSHIP,
+        _handle_community_membership_invalidation,
+    )
+    pubsub_service.register_handler(
+        InvalidationType.MEMBER,
+        _handle_member_invalidation,
+    )
+    pubsub_service.register_handler(
+        InvalidationType.MEMBER_SEARCH,
+        _handle_member_search_invalidation,
+    )
 
     logger.info("Registered default cache invalidation handlers")
 
@@ -411,4 +475,7 @@ async def invalidate_on_member_change(church_id: str, member_id: str = "") -> No
 
 async def invalidate_user_sessions(user_id: str) -> None:
     """Call to invalidate all sessions for a user (password change, etc.)."""
+    from utils.dependencies import invalidate_cached_principals
+    # Own messages are skipped by the listener, so evict here first
+    await invalidate_cached_principals(user_id)
     await pubsub_service.publish_user_session_invalidated(user_id)
@@ -0,0 +1,330 @@
+"""
+Two-Tier Cache (in-process L1 + Redis L2)
+
+Church settings, member statuses and demographic presets are read on
+nearly every request. With RedisCache alone each read is a network round
+trip; the old in-process LRUCache took an asyncio lock per get and never
+heard about writes on other instances.
+
+TieredCache combines both:
+
+- L1: per-namespace bounded LRU dict with a short TTL. No lock: entries
+  are only touched from the event loop and no await happens mid-update.
+  Values are kept encoded and decoded per hit, so callers can mutate
+  what they get and L1 / L2 hits return identical shapes.
+- L2: Redis, shared by all instances. Each value carries its own
+  freshness deadline; the Redis TTL adds a stale window on top.
+- Single-flight: concurrent misses for a key share one L2 read / loader
+  call instead of stampeding MongoDB.
+- Stale-while-revalidate: a value past its freshness deadline (but inside
+  the stale window) is returned immediately and refreshed in the
+  background.
+- Version counters: keys live under a per (namespace, scope) version, so
+  dropping a whole scope (e.g. every "members" entry of a church) is one
+  INCR instead of a SCAN + DELETE.
+- Coherence: invalidations drop the local L1 entry, delete / re-version
+  the L2 entry and publish a CACHE message; other instances drop their L1
+  entries in the pub/sub handler.
+
+Usage:
+    settings = await tiered_cache.get(
+        "church_settings", church_id,
+        loader=lambda: db.church_settings.find_one({"church_id": church_id}, {"_id": 0}),
+    )
+    await tiered_cache.invalidate("church_settings", church_id)
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from config.redis import get_redis
+from .utils import redis_key, TTL
+
+from utils.serialization import json_dumps_str, json_loads
+
+logger = logging.getLogger(__name__)
+
+
+Loader = Callable[[], Awaitable[Any]]
+
+# Local copy of a namespace version is re-read from Redis after this long,
+# bounding staleness if an invalidation message is missed
+VERSION_TTL = 60
+
+
+@dataclass(frozen=True)
+class NamespaceConfig:
+    """Cache policy for one namespace."""
+
+    ttl: int = TTL.MINUTES_5        # Seconds a value is fresh
+    stale_ttl: int = TTL.MINUTE_1   # Extra seconds a stale value may be served while refreshing
+    l1_ttl: int = 30                # Seconds an L1 entry is trusted without asking Redis
+    l1_max: int = 1000              # L1 entries kept for the namespace
+
+
+DEFAULT_CONFIG = NamespaceConfig()
+
+NAMESPACES: Dict[str, NamespaceConfig] = {
+    "church_settings": NamespaceConfig(ttl=TTL.CHURCH_SETTINGS, l1_ttl=60, l1_max=2000),
+    "member_statuses": NamespaceConfig(ttl=TTL.MEMBER_STATUSES, l1_ttl=60, l1_max=2000),
+    "demographics": NamespaceConfig(ttl=TTL.DEMOGRAPHICS, l1_ttl=60, l1_max=2000),
+    "categories": NamespaceConfig(ttl=TTL.MINUTES_30, l1_ttl=60, l1_max=5000),
+    "church": NamespaceConfig(ttl=TTL.HOUR_1, l1_ttl=60, l1_max=2000),
+}
+
+L1Key = Tuple[str, str]  # (scope, key)
+
+
+@dataclass
+class _L1Entry:
+    data: str           # Encoded value
+    expires_at: float   # monotonic: trust L1 until
+    stale_until: float  # monotonic: may serve (and refresh) until
+
+
+class TieredCache:
+    """In-process L1 in front of Redis L2, kept coherent through pub/sub."""
+
+    def __init__(self, namespaces: Optional[Dict[str, NamespaceConfig]] = None):
+        self._configs: Dict[str, NamespaceConfig] = dict(namespaces or {})
+        self._l1: Dict[str, "OrderedDict[L1Key, _L1Entry]"] = {}
+        self._versions: Dict[Tuple[str, str], Tuple[int, float]] = {}
+        self._inflight: Dict[Tuple[str, str, str, bool], asyncio.Future] = {}
+        # Bumped by every local invalidation; loads that straddle one aren't cached
+        self._generation = 0
+        self._stats = {"l1_hits": 0, "l2_hits": 0, "loads": 0, "stale_served": 0, "invalidations": 0}
+
+    def configure(self, namespace: str, config: NamespaceConfig) -> None:
+        self._configs[namespace] = config
+
+    def _config(self, namespace: str) -> NamespaceConfig:
+        return self._configs.get(namespace, DEFAULT_CONFIG)
+
+    # ==================== L1 ====================
+
+    def _l1_for(self, namespace: str) -> "OrderedDict[L1Key, _L1Entry]":
+        l1 = self._l1.get(namespace)
+        if l1 is None:
+            l1 = self._l1[namespace] = OrderedDict()
+        return l1
+
+    def _l1_set(self, namespace: str, l1_key: L1Key, data: str, fresh_for: float) -> None:
+        config = self._config(namespace)
+        now = time.monotonic()
+        l1 = self._l1_for(namespace)
+        l1[l1_key] = _L1Entry(
+            data=data,
+            expires_at=now + max(0.0, min(config.l1_ttl, fresh_for)),
+            stale_until=now + max(0.0, fresh_for) + config.stale_ttl,
+        )
+        l1.move_to_end(l1_key)
+        while len(l1) > config.l1_max:
+            l1.popitem(last=False)
+
+    def drop_local(self, namespace: str, key: str = "", scope: str = "") -> None:
+        """Drop L1 entries: one key, or the whole scope when key is empty."""
+        self._generation += 1
+        l1 = self._l1.get(namespace)
+        if key:
+            if l1 is not None:
+                l1.pop((scope, key), None)
+            return
+        self._versions.pop((namespace, scope), None)
+        if l1 is not None:
+            for l1_key in [k for k in l1 if k[0] == scope]:
+                del l1[l1_key]
+
+    # ==================== L2 ====================
+
+    @staticmethod
+    def _version_key(namespace: str, scope: str) -> str:
+        return redis_key("tcache", "ver", namespace, scope or "_")
+
+    async def _version(self, redis, namespace: str, scope: str) -> int:
+        cached = self._versions.get((namespace, scope))
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
+        version = int(await redis.get(self._version_key(namespace, scope)) or 0)
+        self._versions[(namespace, scope)] = (version, time.monotonic() + VERSION_TTL)
+        return version
+
+    async def _l2_key(self, redis, namespace: str, key: str, scope: str) -> str:
+        version = await self._version(redis, namespace, scope)
+        return redis_key("tcache", namespace, scope or "_", f"v{version}", key)
+
+    # ==================== READ ====================
+
+    async def get(
+        self,
+        namespace: str,
+        key: str,
+        loader: Optional[Loader] = None,
+        scope: str = "",
+    ) -> Optional[Any]:
+        """
+        Get a value, loading and caching it on a miss when a loader is given.
+
+        None results from the loader are not cached.
+        """
+        l1_key = (scope, key)
+        entry = self._l1_for(namespace).get(l1_key)
+        if entry is not None:
+            now = time.monotonic()
+            if entry.expires_at > now:
+                self._l1[namespace].move_to_end(l1_key)
+                self._stats["l1_hits"] += 1
+                return json_loads(entry.data)
+            if loader is not None and entry.stale_until > now:
+                self._stats["stale_served"] += 1
+                self._spawn_refresh(namespace, key, scope, loader, force_load=False)
+                return json_loads(entry.data)
+
+        data = await self._single_flight(namespace, key, scope, loader)
+        return json_loads(data) if data is not None else None
+
+    def _spawn_refresh(self, namespace: str, key: str, scope: str, loader: Loader, force_load: bool) -> None:
+        if (namespace, scope, key, force_load) not in self._inflight:
+            asyncio.ensure_future(self._single_flight(namespace, key, scope, loader, force_load))
+
+    async def _single_flight(
+        self,
+        namespace: str,
+        key: str,
+        scope: str,
+        loader: Optional[Loader],
+        force_load: bool = False,
+    ) -> Optional[str]:
+        flight_key = (namespace, scope, key, force_load)
+        future = self._inflight.get(flight_key)
+        if future is None:
+            future = asyncio.ensure_future(self._fetch(namespace, key, scope, loader, force_load))
+            self._inflight[flight_key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(flight_key, None))
+        try:
+            return await asyncio.shield(future)
+        except Exception as e:
+            logger.error(f"Tiered cache fetch failed for {namespace}:{key}: {e}")
+            return None
+
+    async def _fetch(
+        self,
+        namespace: str,
+        key: str,
+        scope: str,
+        loader: Optional[Loader],
+        force_load: bool,
+    ) -> Optional[str]:
+        """L2 lookup, then the loader; fills L1 (and L2 after a load)."""
+        config = self._config(namespace)
+        l1_key = (scope, key)
+        generation = self._generation
+        redis = None
+        l2_key = None
+        try:
+            redis = await get_redis()
+            l2_key = await self._l2_key(redis, namespace, key, scope)
+            raw = None if force_load else await redis.get(l2_key)
+        except Exception as e:
+            logger.debug(f"Tiered cache L2 unavailable: {e}")
+            raw = None
+
+        if raw is not None:
+            envelope = json_loads(raw)
+            fresh_for = envelope["f"] - time.time()
+            data = json_dumps_str(envelope["v"])
+            self._l1_set(namespace, l1_key, data, fresh_for)
+            self._stats["l2_hits"] += 1
+            if fresh_for <= 0 and loader is not None:
+                self._stats["stale_served"] += 1
+                self._spawn_refresh(namespace, key, scope, loader, force_load=True)
+            return data
+
+        if loader is None:
+            return None
+
+        value = await loader()
+        self._stats["loads"] += 1
+        if value is None:
+            return None
+
+        data = json_dumps_str(value)
+        if generation != self._generation:
+            return data  # Invalidated while loading: don't cache a possibly stale value
+        self._l1_set(namespace, l1_key, data, config.ttl)
+        if redis is not None and l2_key is not None:
+            try:
+                envelope = '{"f":%f,"v":%s}' % (time.time() + config.ttl, data)
+                await redis.set(l2_key, envelope, ex=config.ttl + config.stale_ttl)
+            except Exception as e:
+                logger.debug(f"Tiered cache L2 write failed: {e}")
+        return data
+
+    # ==================== WRITE / INVALIDATE ====================
+
+    async def set(self, namespace: str, key: str, value: Any, scope: str = "") -> bool:
+        """Store a value in both tiers (other instances' L1 entries are dropped)."""
+        config = self._config(namespace)
+        data = json_dumps_str(value)
+        self._l1_set(namespace, (scope, key), data, config.ttl)
+        try:
+            redis = await get_redis()
+            l2_key = await self._l2_key(redis, namespace, key, scope)
+            envelope = '{"f":%f,"v":%s}' % (time.time() + config.ttl, data)
+            await redis.set(l2_key, envelope, ex=config.ttl + config.stale_ttl)
+        except Exception as e:
+            logger.debug(f"Tiered cache L2 write failed: {e}")
+            return False
+        await self._publish(namespace, key, scope)
+        return True
+
+    async def invalidate(self, namespace: str, key: str, scope: str = "", publish: bool = True) -> None:
+        """Drop one key from both tiers here, and from L1 on other instances."""
+        self._stats["invalidations"] += 1
+        self.drop_local(namespace, key, scope)
+        try:
+            redis = await get_redis()
+            await redis.delete(await self._l2_key(redis, namespace, key, scope))
+        except Exception as e:
+            logger.debug(f"Tiered cache L2 delete failed: {e}")
+        if publish:
+            await self._publish(namespace, key, scope)
+
+    async def invalidate_scope(self, namespace: str, scope: str = "", publish: bool = True) -> None:
+        """Drop every key of a scope (the whole namespace for scope="") by bumping its version."""
+        self._stats["invalidations"] += 1
+        self.drop_local(namespace, "", scope)
+        try:
+            redis = await get_redis()
+            version = await redis.incr(self._version_key(namespace, scope))
+            self._versions[(namespace, scope)] = (int(version), time.monotonic() + VERSION_TTL)
+        except Exception as e:
+            logger.debug(f"Tiered cache version bump failed: {e}")
+        if publish:
+            await self._publish(namespace, "", scope)
+
+    async def _publish(self, namespace: str, key: str, scope: str) -> None:
+        try:
+            from .pubsub import pubsub_service, InvalidationType
+            await pubsub_service.publish_invalidation(
+                InvalidationType.CACHE, church_id=scope, entity_id=f"{namespace}:{key}"
+            )
+        except Exception as e:
+            logger.debug(f"Tiered cache invalidation publish failed: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        hits = self._stats["l1_hits"] + self._stats["l2_hits"]
+        total = hits + self._stats["loads"]
+        return {
+            **self._stats,
+            "hit_rate": f"{(hits / total * 100) if total else 0:.1f}%",
+            "l1_entries": {ns: len(entries) for ns, entries in self._l1.items()},
+            "inflight": len(self._inflight),
+        }
+
+
+# Global instance
+tiered_cache = TieredCache(NAMESPACES)
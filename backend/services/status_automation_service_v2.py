@@ -10,6 +10,7 @@ from motor.motor_asyncio import AsyncIOMotorDatabase
 import uuid
 
 from services.status_rule_engine_v2 import RuleEngineService
+from utils.cache import invalidate_settings_cache
 
 logger = logging.getLogger(__name__)
 
@@ -284,6 +285,7 @@ class StatusAutomationService:
                 }
             }
         )
+        await invalidate_settings_cache(church_id)
         
         logger.info(f"Automation complete for church {church_id}: {stats}")
         return stats
@@ -268,15 +268,17 @@ class WebhookService:
             }).limit(50).to_list(50)
             
             if not pending:
-                return
+                return 0
             
             logger.info(f"Processing {len(pending)} queued webhooks")
             
             for queue_item in pending:
                 await WebhookService._process_queued_webhook(db, queue_item)
+            return len(pending)
         
         except Exception as e:
             logger.error(f"Error processing webhook queue: {str(e)}")
+            raise
     
     @staticmethod
     async def _process_queued_webhook(db: AsyncIOMotorDatabase, queue_item: Dict[str, Any]):
@@ -0,0 +1,29 @@
+"""
+Fixtures for unit tests.
+
+Unit tests run without MongoDB or Redis: ``fake_redis`` swaps the shared
+client returned by ``config.redis.get_redis`` for an in-memory fakeredis
+instance and ``mock_db`` is an in-memory mongomock-motor database.
+"""
+
+import pytest
+import fakeredis.aioredis
+from mongomock_motor import AsyncMongoMockClient
+
+import config.redis as redis_config
+
+
+@pytest.fixture
+async def fake_redis(monkeypatch):
+    """In-memory Redis used by everything that calls get_redis()."""
+    client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(redis_config, "_client", client)
+    yield client
+    await client.flushall()
+    await client.aclose()
+
+
+@pytest.fixture
+def mock_db():
+    """In-memory MongoDB database."""
+    return AsyncMongoMockClient()["faithflow_unit"]
@@ -0,0 +1,65 @@
+"""
+Unit tests for call signaling fan-out.
+
+These tests verify:
+- Invite / cancel / end report the number of distinct members reached,
+  not the number of messages queued
+- Each member is signalled once, plus the call's signal topic
+
+Run with: pytest tests/unit/test_call_signaling_service.py
+"""
+
+import pytest
+
+from services.call_signaling_service import CallSignalingService
+from services.mqtt_service import MQTTService
+
+CHURCH = "church-1"
+CALL = "call-1"
+
+
+class RecordingMQTT:
+    """Records publishes; topics in ``full`` fail as if the queue were full."""
+
+    encode = staticmethod(MQTTService.encode)
+
+    def __init__(self, full=()):
+        self.full = set(full)
+        self.topics = []
+
+    async def connect(self):
+        return True
+
+    async def publish(self, topic, payload, qos=1, retain=False):
+        self.topics.append(topic)
+        return topic not in self.full
+
+
+def member_topic(member_id, suffix):
+    return f"faithflow/{CHURCH}/member/{member_id}/{suffix}"
+
+
+@pytest.mark.unit
+async def test_invite_counts_each_callee_once():
+    mqtt = RecordingMQTT()
+    service = CallSignalingService(mqtt)
+
+    reached = await service.send_call_invite(
+        CHURCH, CALL, "room", "voice", "caller", "Caller", None, ["a", "b", "a"]
+    )
+
+    assert reached == 2
+    assert mqtt.topics == [
+        member_topic("a", "incoming_call"),
+        member_topic("b", "incoming_call"),
+        f"faithflow/{CHURCH}/call/{CALL}/signal",
+    ]
+
+
+@pytest.mark.unit
+async def test_failed_member_publishes_are_not_counted():
+    mqtt = RecordingMQTT(full={member_topic("b", "call_status")})
+    service = CallSignalingService(mqtt)
+
+    assert await service.send_call_cancel(CHURCH, CALL, "caller", ["a", "b"]) == 1
+    assert await service.send_call_end(CHURCH, CALL, "a", "normal", 30, ["a", "b", "c"]) == 2
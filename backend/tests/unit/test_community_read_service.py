@@ -0,0 +1,146 @@
+"""
+Unit tests for community read watermarks and their Redis mirrors.
+
+These tests verify:
+- Unread counts rebuilt from MongoDB when the mirrors are missing
+- Partly filled mirrors (recreated by a single write after expiry) are
+  backfilled instead of trusted
+- The batch-read endpoint rejects non-members
+
+Run with: pytest tests/unit/test_community_read_service.py
+"""
+
+import pytest
+from fastapi import HTTPException
+
+import services.chat_context_service as chat_context_service
+from routes.community_messages import mobile_mark_read_up_to
+from services.community_read_service import (
+    COMPLETE_FIELD,
+    MIRROR_TTL,
+    CommunityReadService,
+    channel_field,
+)
+
+CHURCH = "church-1"
+COMMUNITY = "community-1"
+MEMBER = "member-1"
+
+
+async def seed_channels(db, **sequences):
+    for channel_type, seq in sequences.items():
+        await db.community_channel_sequences.insert_one({
+            "church_id": CHURCH, "community_id": COMMUNITY,
+            "channel_type": channel_type, "subgroup_id": None, "seq": seq,
+        })
+
+
+async def seed_watermark(db, channel_type, seq, community_id=COMMUNITY):
+    await db.community_read_watermarks.insert_one({
+        "church_id": CHURCH, "member_id": MEMBER, "community_id": community_id,
+        "channel_type": channel_type, "subgroup_id": None,
+        "last_read_seq": seq, "last_read_message_id": f"msg-{seq}",
+    })
+
+
+@pytest.fixture
+def service(mock_db, fake_redis):
+    return CommunityReadService(mock_db)
+
+
+@pytest.mark.unit
+async def test_unread_counts_without_mirrors(service, mock_db, fake_redis):
+    """Counts come from MongoDB and both mirrors are filled and marked complete."""
+    await seed_channels(mock_db, general=10, announcement=4)
+    await seed_watermark(mock_db, "general", 7)
+
+    counts = await service.get_unread_counts(CHURCH, MEMBER, [COMMUNITY])
+
+    assert counts[COMMUNITY] == {channel_field("general"): 3, channel_field("announcement"): 4}
+    seq_key = service._seq_key(CHURCH, COMMUNITY)
+    wm_key = service._watermark_key(CHURCH, MEMBER)
+    assert await fake_redis.hget(seq_key, COMPLETE_FIELD) is not None
+    assert await fake_redis.hget(wm_key, COMPLETE_FIELD) is not None
+    assert 0 < await fake_redis.ttl(seq_key) <= MIRROR_TTL
+
+
+@pytest.mark.unit
+async def test_partial_sequence_mirror_is_backfilled(service, mock_db, fake_redis):
+    """A sequence hash recreated by one write after expiry doesn't hide other channels."""
+    await seed_channels(mock_db, general=10, announcement=4)
+    seq_key = service._seq_key(CHURCH, COMMUNITY)
+    await fake_redis.hset(seq_key, channel_field("general"), 11)  # newer than MongoDB
+
+    counts = await service.get_unread_counts(CHURCH, MEMBER, [COMMUNITY])
+
+    assert counts[COMMUNITY] == {channel_field("general"): 11, channel_field("announcement"): 4}
+    mirror = await fake_redis.hgetall(seq_key)
+    assert mirror[channel_field("general")] == "11"
+    assert mirror[channel_field("announcement")] == "4"
+    assert COMPLETE_FIELD in mirror
+    assert await fake_redis.ttl(seq_key) > 0
+
+
+@pytest.mark.unit
+async def test_partial_watermark_mirror_is_backfilled(service, mock_db, fake_redis):
+    """A watermark hash holding one channel doesn't reset the member's other watermarks."""
+    await seed_channels(mock_db, general=10, announcement=4)
+    await seed_watermark(mock_db, "general", 6)
+    await seed_watermark(mock_db, "announcement", 4)
+    await seed_watermark(mock_db, "general", 2, community_id="community-2")
+    wm_key = service._watermark_key(CHURCH, MEMBER)
+    await fake_redis.hset(wm_key, service._watermark_field(COMMUNITY, "general", None), "9|msg-9")
+
+    counts = await service.get_unread_counts(CHURCH, MEMBER, [COMMUNITY])
+
+    assert counts[COMMUNITY] == {channel_field("general"): 1, channel_field("announcement"): 0}
+    mirror = await fake_redis.hgetall(wm_key)
+    assert mirror[service._watermark_field(COMMUNITY, "general", None)] == "9|msg-9"
+    assert mirror[service._watermark_field(COMMUNITY, "announcement", None)] == "4|msg-4"
+    assert mirror[service._watermark_field("community-2", "general", None)] == "2|msg-2"
+    assert COMPLETE_FIELD in mirror
+
+
+@pytest.mark.unit
+async def test_complete_mirrors_are_trusted(service, mock_db, fake_redis):
+    """Once complete, counts are served from Redis without reading MongoDB."""
+    await seed_channels(mock_db, general=10)
+    await service.get_unread_counts(CHURCH, MEMBER, [COMMUNITY])
+    await mock_db.community_channel_sequences.delete_many({})
+
+    counts = await service.get_unread_counts(CHURCH, MEMBER, [COMMUNITY])
+
+    assert counts[COMMUNITY] == {channel_field("general"): 10}
+
+
+@pytest.mark.unit
+async def test_sequence_write_after_expiry_leaves_mirror_partial(service, mock_db, fake_redis):
+    """next_sequence on an expired mirror must not make it look complete."""
+    await seed_channels(mock_db, announcement=4)
+
+    await service.next_sequence(CHURCH, COMMUNITY, "general")
+
+    assert await fake_redis.hget(service._seq_key(CHURCH, COMMUNITY), COMPLETE_FIELD) is None
+    counts = await service.get_unread_counts(CHURCH, MEMBER, [COMMUNITY])
+    assert counts[COMMUNITY] == {channel_field("general"): 1, channel_field("announcement"): 4}
+
+
+@pytest.mark.unit
+async def test_batch_read_requires_membership(mock_db, fake_redis, monkeypatch):
+    """Non-members can't move watermarks or read unread counts of a community."""
+    monkeypatch.setattr(chat_context_service, "_chat_context_resolver", None)
+    await mock_db.community_messages.insert_one({
+        "id": "msg-1", "church_id": CHURCH, "community_id": COMMUNITY,
+        "channel_type": "general", "subgroup_id": None, "seq": 1,
+    })
+
+    with pytest.raises(HTTPException) as exc:
+        await mobile_mark_read_up_to(
+            community_id=COMMUNITY,
+            up_to_message_id="msg-1",
+            current_member={"id": MEMBER, "church_id": CHURCH},
+            db=mock_db,
+        )
+
+    assert exc.value.status_code == 403
+    assert await mock_db.community_read_watermarks.count_documents({}) == 0
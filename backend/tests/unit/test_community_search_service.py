@@ -0,0 +1,59 @@
+"""
+Unit tests for community message search.
+
+These tests verify:
+- Highlight ranges point into the returned snippet
+- Messages stored before search terms existed are found after the
+  startup backfill
+
+Run with: pytest tests/unit/test_community_search_service.py
+"""
+
+import pytest
+
+from services.community_search_service import (
+    SNIPPET_RADIUS,
+    CommunitySearchService,
+    backfill_search_terms,
+)
+
+CHURCH = "church-1"
+COMMUNITY = "community-1"
+
+
+def highlighted(result):
+    return [result["snippet"][s:e] for s, e in result["ranges"]]
+
+
+@pytest.mark.unit
+def test_short_text_ranges_are_text_offsets():
+    result = CommunitySearchService.highlight("Pray for peace", ["peace"])
+
+    assert result["snippet"] == "Pray for peace"
+    assert highlighted(result) == ["peace"]
+
+
+@pytest.mark.unit
+def test_ranges_are_relative_to_a_truncated_snippet():
+    text = "x " * SNIPPET_RADIUS + "we pray for peace today " + "y " * SNIPPET_RADIUS + "peace again"
+
+    result = CommunitySearchService.highlight(text, ["peace"])
+
+    assert result["snippet"].startswith("…") and result["snippet"].endswith("…")
+    assert highlighted(result) == ["peace"]
+
+
+@pytest.mark.unit
+async def test_backfilled_messages_are_searchable(mock_db):
+    await mock_db.community_messages.insert_many([
+        {"id": "old-1", "church_id": CHURCH, "community_id": COMMUNITY, "text": "Prayer meeting tonight",
+         "created_at": "2024-01-01T10:00:00"},
+        {"id": "old-2", "church_id": CHURCH, "community_id": COMMUNITY, "text": "Removed", "is_deleted": True,
+         "created_at": "2024-01-01T11:00:00"},
+    ])
+
+    await backfill_search_terms(mock_db)
+
+    assert await mock_db.community_messages.count_documents({"search_terms": {"$exists": False}}) == 0
+    result = await CommunitySearchService(mock_db).search(CHURCH, COMMUNITY, "meeting", sort="recent")
+    assert [m["id"] for m in result["messages"]] == ["old-1"]
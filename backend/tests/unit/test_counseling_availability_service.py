@@ -0,0 +1,41 @@
+"""
+Unit tests for counseling slot reconciliation.
+
+These tests verify:
+- The nightly reconciliation drops stale stored open/blocked slots
+- A slot materialized for a booking still in progress is kept
+
+Run with: pytest tests/unit/test_counseling_availability_service.py
+"""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from services.counseling_availability_service import CounselingAvailabilityService
+
+CHURCH = "church-1"
+COUNSELOR = "counselor-1"
+
+
+async def store_slot(db, slot_id, start_time, updated_at, status="open"):
+    await db.counseling_time_slots.insert_one({
+        "id": slot_id, "church_id": CHURCH, "counselor_id": COUNSELOR, "date": "2024-06-03",
+        "start_time": start_time, "status": status, "appointment_id": None, "updated_at": updated_at,
+    })
+
+
+@pytest.mark.unit
+async def test_reconcile_keeps_freshly_materialized_slots(mock_db):
+    now = datetime.utcnow()
+    await store_slot(mock_db, "stale-open", "09:00", now - timedelta(days=3))
+    await store_slot(mock_db, "stale-blocked", "10:00", now - timedelta(days=3), status="blocked")
+    await store_slot(mock_db, "booking-in-progress", "11:00", now - timedelta(seconds=5))
+    data = {"held_slots": [], "appointments": [], "counselors": [{"id": COUNSELOR}]}
+
+    await CounselingAvailabilityService(mock_db)._persist_held_slots(
+        CHURCH, data, date(2024, 6, 1), date(2024, 6, 30)
+    )
+
+    remaining = [s["id"] async for s in mock_db.counseling_time_slots.find({})]
+    assert remaining == ["booking-in-progress"]
@@ -0,0 +1,81 @@
+"""
+Unit tests for the AI generation cache.
+
+These tests verify:
+- Exact prompt hits
+- Similarity hits require the same key parameters (figure, passage, topic,
+  language, date), so a shared template can't serve one subject's content
+  for another
+- Similarity is only tried for callers that pass the prompt's parameters
+
+Run with: pytest tests/unit/test_generation_cache.py
+"""
+
+import pytest
+
+from services.redis.generation_cache import GenerationCache
+
+MODEL = "claude-test"
+TEMPLATE = "You are an expert Christian content creator. " * 40 + "Write a profile of {figure}. {extra}"
+
+
+def prompt(figure, extra=""):
+    return TEMPLATE.format(figure=figure, extra=extra)
+
+
+def params(figure, **extra):
+    return {"figure_name": figure, "generate_both_languages": True, "custom_prompt": "", **extra}
+
+
+@pytest.fixture
+def cache(fake_redis):
+    return GenerationCache(similarity_enabled=True, similarity_threshold=0.9)
+
+
+@pytest.mark.unit
+async def test_exact_hit(cache):
+    await cache.set("bible_figure", MODEL, prompt("Aaron"), ["{", "}"])
+
+    hit = await cache.get("bible_figure", MODEL, prompt("Aaron"))
+
+    assert hit is not None and hit.text == "{}"
+
+
+@pytest.mark.unit
+async def test_different_figure_is_not_a_similarity_hit(cache):
+    await cache.set("bible_figure", MODEL, prompt("Aaron"), ['{"name": "Aaron"}'], params("Aaron"))
+
+    assert await cache.get("bible_figure", MODEL, prompt("Moses"), params("Moses")) is None
+
+
+@pytest.mark.unit
+async def test_same_figure_with_near_identical_instructions_is_a_hit(cache):
+    await cache.set(
+        "bible_figure", MODEL, prompt("Aaron", "Keep it warm."), ['{"name": "Aaron"}'],
+        params("Aaron", custom_prompt="Keep it warm and pastoral for young adults."),
+    )
+
+    hit = await cache.get(
+        "bible_figure", MODEL, prompt("Aaron", "Keep it warm!"),
+        params("Aaron", custom_prompt="Keep it warm and pastoral for young adults!"),
+    )
+
+    assert hit is not None and hit.text == '{"name": "Aaron"}'
+
+
+@pytest.mark.unit
+async def test_different_language_is_not_a_hit(cache):
+    await cache.set("bible_figure", MODEL, prompt("Aaron"), ["{}"], params("Aaron"))
+
+    miss = await cache.get(
+        "bible_figure", MODEL, prompt("Aaron", "English only"), params("Aaron", generate_both_languages=False)
+    )
+
+    assert miss is None
+
+
+@pytest.mark.unit
+async def test_no_similarity_without_params(cache):
+    await cache.set("bible_figure", MODEL, prompt("Aaron"), ["{}"], params("Aaron"))
+
+    assert await cache.get("bible_figure", MODEL, prompt("Aaron", ".")) is None
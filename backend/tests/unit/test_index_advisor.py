@@ -0,0 +1,204 @@
+"""
+Unit tests for the index advisor's pure helpers.
+
+These tests verify:
+- index_options / index_key normalisation of declared and live specs
+- diff_indexes: missing, conflicting, undeclared and present indexes
+- redundant_indexes: prefix indexes, constraints and partial indexes
+- query_predicates for find / aggregate / update / count shapes
+- can_use and suggest_index (Equality-Sort-Range order)
+
+Run with: pytest tests/unit/test_index_advisor.py
+"""
+
+import pytest
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+
+from utils.index_advisor import (
+    can_use,
+    diff_indexes,
+    index_key,
+    index_options,
+    query_predicates,
+    redundant_indexes,
+    suggest_index,
+)
+
+ID_INDEX = {"v": 2, "key": {"_id": 1}, "name": "_id_"}
+
+
+def live(name, key, **options):
+    return {"v": 2, "key": dict(key), "name": name, **options}
+
+
+# ==================== Index specs ====================
+
+@pytest.mark.unit
+def test_index_options_keep_only_behavioural_options():
+    spec = live("a_1", [("a", 1)], unique=True, sparse=False, background=True, expireAfterSeconds=0)
+
+    assert index_options(spec) == {"unique": True, "expireAfterSeconds": 0}
+    assert index_options(live("a_1", [("a", 1)])) == {}
+
+
+@pytest.mark.unit
+def test_index_key_matches_declared_and_live_specs():
+    declared = IndexModel([("church_id", ASCENDING), ("date", DESCENDING)]).document
+
+    assert index_key(declared) == index_key(live("other_name", [("church_id", 1.0), ("date", -1.0)]))
+
+
+@pytest.mark.unit
+def test_text_index_key_is_its_fields():
+    declared = IndexModel([("title", TEXT), ("body", TEXT)]).document
+    spec = live("text", [("_fts", "text"), ("_ftsx", 1)], weights={"body": 1, "title": 1})
+
+    assert index_key(declared) == index_key(spec) == (("$text", ("body", "title")),)
+
+
+# ==================== diff_indexes ====================
+
+@pytest.mark.unit
+def test_diff_reports_missing_conflicting_and_undeclared():
+    declared = [
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("church_id", ASCENDING), ("date", DESCENDING)]),
+        IndexModel([("email", ASCENDING)]),
+    ]
+    live_specs = [
+        ID_INDEX,
+        live("id_1", [("id", 1)]),  # declared unique
+        live("legacy_name", [("church_id", 1), ("date", -1)]),
+        live("stale_1", [("stale", 1)]),
+    ]
+
+    diff = diff_indexes(declared, live_specs)
+
+    assert [m.document["key"] for m in diff["missing"]] == [declared[2].document["key"]]
+    assert diff["conflicts"] == [{
+        "index": "id_1", "key": [["id", 1]], "declared": {"unique": True}, "live": {},
+    }]
+    assert diff["undeclared"] == ["stale_1"]
+    assert diff["present"] == 1
+
+
+@pytest.mark.unit
+def test_diff_of_a_collection_that_does_not_exist_yet():
+    declared = [IndexModel([("id", ASCENDING)])]
+
+    diff = diff_indexes(declared, [])
+
+    assert diff["missing"] == declared
+    assert (diff["conflicts"], diff["undeclared"], diff["present"]) == ([], [], 0)
+
+
+# ==================== redundant_indexes ====================
+
+@pytest.mark.unit
+def test_prefix_index_is_redundant():
+    specs = [ID_INDEX, live("a_1", [("a", 1)]), live("a_1_b_1", [("a", 1), ("b", 1)])]
+
+    assert redundant_indexes(specs) == [{"index": "a_1", "covered_by": "a_1_b_1"}]
+
+
+@pytest.mark.unit
+def test_constraints_and_partial_indexes_are_not_redundant():
+    specs = [
+        live("a_1", [("a", 1)], unique=True),
+        live("b_1", [("b", 1)]),
+        live("b_1_c_1", [("b", 1), ("c", 1)], partialFilterExpression={"c": {"$exists": True}}),
+        live("d_1", [("d", 1)], expireAfterSeconds=60),
+        live("a_1_x_1", [("a", 1), ("x", 1)]),
+        live("d_1_x_1", [("d", 1), ("x", 1)]),
+    ]
+
+    assert redundant_indexes(specs) == []
+
+
+@pytest.mark.unit
+def test_different_direction_is_not_a_prefix():
+    specs = [live("a_-1", [("a", -1)]), live("a_1_b_1", [("a", 1), ("b", 1)])]
+
+    assert redundant_indexes(specs) == []
+
+
+# ==================== query_predicates ====================
+
+@pytest.mark.unit
+def test_find_predicates():
+    shape = {
+        "filter": {"church_id": "?", "status": {"$in": ["?"]}, "date": {"$gte": "?"}},
+        "sort": {"date": -1},
+    }
+
+    assert query_predicates("find", shape) == (["church_id", "status"], [("date", -1)], ["date"])
+
+
+@pytest.mark.unit
+def test_and_clauses_and_text_search():
+    shape = {"filter": {"$and": [{"church_id": "?"}, {"amount": {"$lt": "?"}}], "$text": {"$search": "?"}}}
+
+    assert query_predicates("find", shape) == (["church_id", "$text"], [], ["amount"])
+
+
+@pytest.mark.unit
+def test_range_on_an_equality_field_counts_as_equality():
+    shape = {"filter": {"$and": [{"date": "?"}, {"date": {"$gte": "?"}}]}}
+
+    assert query_predicates("find", shape) == (["date"], [], [])
+
+
+@pytest.mark.unit
+def test_aggregate_uses_leading_match_and_sort():
+    shape = {"pipeline": [{"$match": {"church_id": "?"}}, {"$sort": {"created_at": -1}}, {"$limit": "?"}]}
+
+    assert query_predicates("aggregate", shape) == (["church_id"], [("created_at", -1)], [])
+    assert query_predicates("aggregate", {"pipeline": [{"$group": {}}]}) is None
+
+
+@pytest.mark.unit
+def test_update_delete_and_count_shapes():
+    assert query_predicates("update", {"q": {"id": "?"}}) == (["id"], [], [])
+    assert query_predicates("delete", {"q": {"expires_at": {"$lt": "?"}}}) == ([], [], ["expires_at"])
+    assert query_predicates("count", {"query": {"church_id": "?"}}) == (["church_id"], [], [])
+
+
+@pytest.mark.unit
+def test_shapes_the_advisor_cannot_judge():
+    assert query_predicates("find", {"filter": {}}) is None
+    assert query_predicates("find", {"filter": {"a": "?"}, "hint": "a_1"}) is None
+    assert query_predicates("find", {"filter": {"$or": [{"a": "?"}, {"b": "?"}]}}) is None
+    assert query_predicates("insert", {"documents": "?"}) is None
+
+
+# ==================== can_use / suggest_index ====================
+
+@pytest.mark.unit
+def test_index_leading_with_a_filtered_field_is_usable():
+    key = (("church_id", 1), ("date", -1))
+
+    assert can_use(key, ["church_id"], [], [])
+    assert can_use(key, [], [], ["church_id"])
+    assert not can_use(key, ["date"], [], [])
+    assert not can_use((), ["church_id"], [], [])
+
+
+@pytest.mark.unit
+def test_index_providing_the_sort_is_usable_without_a_filter():
+    key = (("created_at", -1), ("id", 1))
+
+    assert can_use(key, [], [("created_at", -1)], [])
+    assert not can_use(key, [], [("updated_at", -1)], [])
+    assert not can_use(key, ["status"], [("created_at", -1)], [])
+
+
+@pytest.mark.unit
+def test_suggestion_follows_equality_sort_range():
+    suggestion = suggest_index(["status", "church_id", "$text"], [("date", -1)], ["amount"])
+
+    assert suggestion == [["church_id", 1], ["status", 1], ["date", -1], ["amount", 1]]
+
+
+@pytest.mark.unit
+def test_suggestion_does_not_repeat_fields():
+    assert suggest_index(["church_id"], [("church_id", 1), ("date", -1)], ["date"]) == [["church_id", 1], ["date", -1]]
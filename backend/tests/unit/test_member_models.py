@@ -0,0 +1,65 @@
+"""
+Unit tests for the member models.
+
+These tests verify:
+- MemberListItem (streamed member list) has the same fields, in the same
+  order, with the same defaults as the Member response model
+
+Run with: pytest tests/unit/test_member_models.py
+"""
+
+import msgspec
+import pytest
+from pydantic_core import PydanticUndefined
+
+from models.member import Member, MemberListItem
+
+# Member fields generated on create; stored documents always carry them
+GENERATED_FIELDS = {"id", "church_id", "created_at", "updated_at"}
+
+
+def struct_default(field):
+    if field.default_factory is not msgspec.NODEFAULT:
+        return field.default_factory()
+    return field.default
+
+
+@pytest.mark.unit
+def test_fields_match_member_in_order():
+    assert MemberListItem.__struct_fields__ == tuple(Member.model_fields)
+
+
+@pytest.mark.unit
+def test_defaults_match_member():
+    fields = {f.name: f for f in msgspec.structs.fields(MemberListItem)}
+    for name, info in Member.model_fields.items():
+        if name in GENERATED_FIELDS:
+            continue
+        if info.is_required():
+            assert fields[name].required, name
+        elif info.default_factory is not None:
+            assert struct_default(fields[name]) == info.default_factory(), name
+        else:
+            assert info.default is not PydanticUndefined
+            assert struct_default(fields[name]) == info.default, name
+
+
+@pytest.mark.unit
+def test_generated_fields_are_optional():
+    """Older documents missing them still stream instead of failing."""
+    fields = {f.name: f for f in msgspec.structs.fields(MemberListItem)}
+    assert not any(fields[name].required for name in GENERATED_FIELDS)
+
+
+@pytest.mark.unit
+def test_same_json_as_member_for_a_stored_document():
+    doc = {
+        "id": "m-1", "church_id": "c-1", "full_name": "Jane Doe", "email": "",
+        "date_of_birth": "1990-05-01", "created_at": "2024-01-01T00:00:00",
+        "updated_at": "2024-01-02T00:00:00",
+    }
+
+    streamed = msgspec.json.decode(msgspec.json.encode(msgspec.convert(doc, MemberListItem)))
+    validated = Member(**doc).model_dump(mode="json")
+
+    assert streamed == validated
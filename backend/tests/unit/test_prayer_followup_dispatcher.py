@@ -0,0 +1,207 @@
+"""
+Unit tests for the prayer follow-up dispatcher.
+
+These tests verify:
+- quiet_hours_end for plain and midnight-wrapping windows, DST changes and
+  start == end
+- process_batch defers follow-ups inside quiet hours to the end of the window
+- process_batch claims each follow-up at most once and records its delivery
+  status
+- The no-Redis sweep keeps paging past follow-ups held back by quiet hours
+
+Run with: pytest tests/unit/test_prayer_followup_dispatcher.py
+"""
+
+from datetime import datetime
+
+import pytest
+import pytz
+
+import services.explore.prayer_followup_dispatcher as dispatcher_module
+from services.explore.prayer_followup_dispatcher import (
+    DUE_KEY,
+    PrayerFollowUpDispatcher,
+    quiet_hours_end,
+)
+
+CHURCH = "church-1"
+
+# 2024-06-01 12:00 UTC
+NOON = datetime(2024, 6, 1, 12, 0, tzinfo=pytz.UTC).timestamp()
+
+
+def epoch(tz_name, *args):
+    return pytz.timezone(tz_name).localize(datetime(*args)).timestamp()
+
+
+# ==================== Quiet hours ====================
+
+@pytest.mark.unit
+def test_outside_quiet_hours():
+    assert quiet_hours_end(epoch("UTC", 2024, 6, 1, 12, 0), "UTC", "21:00", "08:00") is None
+    assert quiet_hours_end(epoch("UTC", 2024, 6, 1, 8, 0), "UTC", "21:00", "08:00") is None
+
+
+@pytest.mark.unit
+def test_same_day_window():
+    now = epoch("UTC", 2024, 6, 1, 13, 30)
+    assert quiet_hours_end(now, "UTC", "13:00", "14:00") == epoch("UTC", 2024, 6, 1, 14, 0)
+    assert quiet_hours_end(now, "UTC", "14:00", "15:00") is None
+
+
+@pytest.mark.unit
+def test_window_wrapping_midnight():
+    # Late evening: quiet until tomorrow morning
+    assert quiet_hours_end(epoch("UTC", 2024, 6, 1, 23, 0), "UTC", "21:00", "08:00") == epoch("UTC", 2024, 6, 2, 8, 0)
+    # Early morning: quiet until this morning
+    assert quiet_hours_end(epoch("UTC", 2024, 6, 2, 3, 0), "UTC", "21:00", "08:00") == epoch("UTC", 2024, 6, 2, 8, 0)
+
+
+@pytest.mark.unit
+def test_window_is_member_local():
+    tz = "Asia/Jakarta"  # UTC+7: 12:00 UTC is 19:00 local
+    assert quiet_hours_end(NOON, tz, "18:00", "20:00") == epoch(tz, 2024, 6, 1, 20, 0)
+    assert quiet_hours_end(NOON, "UTC", "18:00", "20:00") is None
+
+
+@pytest.mark.unit
+def test_window_across_dst_change():
+    tz = "America/New_York"
+    # Clocks go forward at 02:00 on 2024-03-10: the night is an hour shorter
+    now = epoch(tz, 2024, 3, 9, 23, 0)
+    resume = quiet_hours_end(now, tz, "21:00", "08:00")
+    assert resume == epoch(tz, 2024, 3, 10, 8, 0)
+    assert resume - now == 8 * 3600
+
+
+@pytest.mark.unit
+def test_equal_start_and_end_means_no_quiet_hours():
+    assert quiet_hours_end(NOON, "UTC", "12:00", "12:00") is None
+
+
+@pytest.mark.unit
+def test_defaults_for_missing_or_bad_settings():
+    late = epoch("UTC", 2024, 6, 1, 22, 0)
+    assert quiet_hours_end(late, "UTC") == epoch("UTC", 2024, 6, 2, 8, 0)
+    assert quiet_hours_end(late, "No/Such_Zone", "bad", None) == epoch("UTC", 2024, 6, 2, 8, 0)
+
+
+# ==================== process_batch ====================
+
+@pytest.fixture
+def pushes(monkeypatch):
+    """Stand-in for Expo: tokens starting with "bad" are rejected."""
+    sent = []
+
+    async def send_messages(messages):
+        sent.extend(messages)
+        return ["DeviceNotRegistered" if m["to"].startswith("bad") else None for m in messages]
+
+    monkeypatch.setattr(dispatcher_module.fcm_service, "send_messages", send_messages)
+    monkeypatch.setattr(dispatcher_module.time, "time", lambda: NOON)
+    return sent
+
+
+async def seed_followup(db, followup_id, member_id, due_at=datetime(2024, 6, 1, 11, 0)):
+    await db.prayer_followups.insert_one({
+        "id": followup_id, "church_id": CHURCH, "user_id": member_id,
+        "prayer_request_id": f"prayer-{followup_id}", "prayer_themes": ["health"],
+        "follow_up_due_at": due_at, "follow_up_sent": False, "deleted": False,
+    })
+
+
+async def seed_member(db, member_id, tokens=(), **prefs):
+    for token in tokens:
+        await db.device_tokens.insert_one({
+            "church_id": CHURCH, "member_id": member_id, "fcm_token": token, "is_active": True,
+        })
+    if prefs:
+        await db.notification_preferences.insert_one({"church_id": CHURCH, "member_id": member_id, **prefs})
+
+
+@pytest.mark.unit
+async def test_followups_in_quiet_hours_are_deferred(mock_db, fake_redis, pushes):
+    await seed_member(mock_db, "quiet", ["tok-quiet"], quiet_hours_start="11:00", quiet_hours_end="13:30")
+    await seed_member(mock_db, "awake", ["tok-awake"], quiet_hours_start="22:00", quiet_hours_end="07:00")
+    await seed_followup(mock_db, "f-quiet", "quiet")
+    await seed_followup(mock_db, "f-awake", "awake")
+
+    result = await PrayerFollowUpDispatcher().process_batch(mock_db, ["f-quiet", "f-awake"], fake_redis)
+
+    assert result == {"sent": 1, "deferred": 1, "skipped": 0, "failed": 0}
+    assert [m["to"] for m in pushes] == ["tok-awake"]
+    assert await fake_redis.zscore(DUE_KEY, "f-quiet") == epoch("UTC", 2024, 6, 1, 13, 30)
+    held = await mock_db.prayer_followups.find_one({"id": "f-quiet"})
+    assert held["follow_up_sent"] is False
+
+
+@pytest.mark.unit
+async def test_followups_are_claimed_at_most_once(mock_db, fake_redis, pushes):
+    await seed_member(mock_db, "m1", ["tok-1"])
+    await seed_followup(mock_db, "f-1", "m1")
+    dispatcher = PrayerFollowUpDispatcher()
+
+    first = await dispatcher.process_batch(mock_db, ["f-1"], fake_redis)
+    second = await dispatcher.process_batch(mock_db, ["f-1"], fake_redis)
+
+    assert first["sent"] == 1
+    assert second == {"sent": 0, "deferred": 0, "skipped": 0, "failed": 0}
+    assert len(pushes) == 1
+    assert await mock_db.push_notifications.count_documents({}) == 1
+
+
+@pytest.mark.unit
+async def test_claim_only_covers_this_batch(mock_db, fake_redis, pushes):
+    """Follow-ups another consumer already marked sent are left to it."""
+    await seed_member(mock_db, "m1", ["tok-1"])
+    await seed_followup(mock_db, "f-1", "m1")
+    await mock_db.prayer_followups.insert_one({
+        "id": "f-other", "church_id": CHURCH, "user_id": "m1", "follow_up_sent": True,
+        "deleted": False, "dispatch_claim": "someone-else",
+    })
+
+    result = await PrayerFollowUpDispatcher().process_batch(mock_db, ["f-1", "f-other"], fake_redis)
+
+    assert result["sent"] == 1
+    assert [m["data"]["followup_id"] for m in pushes] == ["f-1"]
+    other = await mock_db.prayer_followups.find_one({"id": "f-other"})
+    assert other["dispatch_claim"] == "someone-else"
+
+
+@pytest.mark.unit
+async def test_delivery_status_is_recorded(mock_db, fake_redis, pushes):
+    await seed_member(mock_db, "muted", ["tok-muted"], push_enabled=False)
+    await seed_member(mock_db, "no-devices")
+    await seed_member(mock_db, "one-bad", ["bad-1", "tok-ok"])
+    await seed_member(mock_db, "all-bad", ["bad-2", "bad-3"])
+    for member_id in ("muted", "no-devices", "one-bad", "all-bad"):
+        await seed_followup(mock_db, f"f-{member_id}", member_id)
+
+    result = await PrayerFollowUpDispatcher().process_batch(
+        mock_db, ["f-muted", "f-no-devices", "f-one-bad", "f-all-bad"], fake_redis
+    )
+
+    assert result == {"sent": 1, "deferred": 0, "skipped": 2, "failed": 1}
+    docs = {d["id"]: d async for d in mock_db.prayer_followups.find({})}
+    assert docs["f-muted"]["delivery_status"] == "push_disabled"
+    assert docs["f-no-devices"]["delivery_status"] == "no_devices"
+    assert docs["f-one-bad"]["delivery_status"] == "sent"
+    assert docs["f-one-bad"]["delivery_error"] is None
+    assert docs["f-all-bad"]["delivery_status"] == "failed"
+    assert docs["f-all-bad"]["delivery_error"] == "DeviceNotRegistered"
+    assert all(d["follow_up_sent"] and "dispatch_claim" not in d for d in docs.values())
+    notifications = await mock_db.push_notifications.find({}).to_list(None)
+    assert [n["member_id"] for n in notifications] == ["one-bad"]
+
+
+@pytest.mark.unit
+async def test_sweep_without_redis_pages_past_deferred_followups(mock_db, pushes):
+    await seed_member(mock_db, "quiet", ["tok-quiet"], quiet_hours_start="11:00", quiet_hours_end="13:00")
+    await seed_member(mock_db, "awake", ["tok-awake"])
+    await seed_followup(mock_db, "f-quiet", "quiet", due_at=datetime(2024, 6, 1, 9, 0))
+    await seed_followup(mock_db, "f-awake", "awake", due_at=datetime(2024, 6, 1, 10, 0))
+    dispatcher = PrayerFollowUpDispatcher(batch_size=1)
+    dispatcher.enabled = False
+
+    assert await dispatcher.sweep(mock_db) == 1
+    assert [m["to"] for m in pushes] == ["tok-awake"]
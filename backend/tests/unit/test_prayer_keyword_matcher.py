@@ -0,0 +1,61 @@
+"""
+Unit tests for prayer theme / emotion keyword matching.
+
+These tests verify:
+- Everyday words whose Indonesian root is shared with a keyword don't
+  match it ("tinggal" vs "meninggal", "masa" vs "bermasalah",
+  "putus" vs "keputusan")
+- Keywords still match inflected and derived forms of themselves, and
+  root keywords match derived text words
+
+Run with: pytest tests/unit/test_prayer_keyword_matcher.py
+"""
+
+import pytest
+
+from services.explore.prayer_intelligence_service import KEYWORD_MATCHER
+from utils.text_analysis import KeywordMatcher
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("text, unexpected", [
+    ("saya tinggal di Jakarta", {"theme:grief", "theme:faith_struggle"}),
+    ("pada masa itu", {"theme:anxiety"}),
+    ("putus asa", {"theme:guidance", "emotion:surrender"}),
+    ("saya putus dengan pacar", {"theme:guidance", "emotion:surrender"}),
+    ("we are on a mission trip", {"theme:grief"}),
+])
+def test_shared_roots_do_not_match(text, unexpected):
+    assert not unexpected & set(KEYWORD_MATCHER.match(text))
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("text, expected", [
+    ("putus asa", "emotion:distress"),
+    ("ayah saya meninggal", "theme:grief"),
+    ("ibunya meninggalnya kemarin", "theme:grief"),
+    ("aku merasa ditinggalkan Tuhan", "theme:faith_struggle"),
+    ("saya bermasalah di kantor", "theme:anxiety"),
+    ("kecemasannya makin berat", "theme:anxiety"),
+    ("apapun keputusan-Mu", "emotion:surrender"),
+    ("I keep worrying about it", "theme:anxiety"),
+    ("praying for healing", "theme:health"),
+])
+def test_keywords_match_their_own_forms(text, expected):
+    assert expected in KEYWORD_MATCHER.match(text)
+
+
+@pytest.mark.unit
+def test_root_keyword_matches_derived_text_words():
+    matcher = KeywordMatcher([("prayer", "doa")])
+
+    assert matcher.match("mohon mendoakan keluarga kami") == {"prayer": 1}
+    assert matcher.match("kami berdoa bersama") == {"prayer": 1}
+
+
+@pytest.mark.unit
+def test_phrases_match_on_whole_words():
+    matcher = KeywordMatcher([("health", "rumah sakit")])
+
+    assert matcher.match("ibu di rumah sakit") == {"health": 1}
+    assert matcher.match("rumah saya sakit hati") == {}
@@ -0,0 +1,304 @@
+"""
+Unit tests for the scheduler and periodic job runner.
+
+These tests verify:
+- ScheduledJob.period for interval and cron triggers
+- dispatch_scheduled_job queues each job once per time slot, with the
+  slot start as fire time
+- LeaderLease acquire / renew / step-down / resign
+- run_scheduled_job lock skipping, run recording and fire time
+- Status automation acts on the hour it fired in, not when it ran
+
+Run with: pytest tests/unit/test_scheduler.py
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+
+import jobs.scheduled as scheduled
+import jobs.worker as worker
+import scheduler
+from jobs.scheduled import (
+    JOBS_BY_ID,
+    RUNS_COLLECTION,
+    SCHEDULED_JOB_TIMEOUT,
+    SCHEDULED_JOBS,
+    JobResult,
+    ScheduledJob,
+    run_scheduled_job,
+    run_status_automation,
+)
+from scheduler import DistributedLock, LeaderLease
+
+
+async def noop(db):
+    return None
+
+
+def make_job(func=noop, trigger=None, lock_ttl=60, job_id="unit_test_job"):
+    return ScheduledJob(job_id, "Unit test job", func, trigger or IntervalTrigger(seconds=30), lock_ttl=lock_ttl)
+
+
+# ==================== ScheduledJob ====================
+
+@pytest.mark.unit
+def test_period_of_interval_trigger():
+    assert make_job(trigger=IntervalTrigger(seconds=30)).period == 30
+    assert make_job(trigger=IntervalTrigger(minutes=5)).period == 300
+
+
+@pytest.mark.unit
+def test_period_is_at_least_one_second():
+    assert make_job(trigger=IntervalTrigger(seconds=0.2)).period == 1
+
+
+@pytest.mark.unit
+def test_period_of_cron_trigger_is_one_minute():
+    assert make_job(trigger=CronTrigger(hour=3, minute=0)).period == 60
+
+
+@pytest.mark.unit
+def test_registered_jobs_have_unique_ids_and_fit_the_worker_timeout():
+    assert len(JOBS_BY_ID) == len(SCHEDULED_JOBS)
+    assert all(job.lock_ttl <= SCHEDULED_JOB_TIMEOUT for job in SCHEDULED_JOBS)
+    run_scheduled = next(f for f in worker.WorkerSettings.functions if getattr(f, "name", None) == "run_scheduled")
+    assert run_scheduled.timeout_s == SCHEDULED_JOB_TIMEOUT
+
+
+# ==================== Dispatch ====================
+
+@pytest.fixture
+def queued(monkeypatch):
+    """Stand-in for the ARQ queue: a job id is only accepted once."""
+    job_ids = []
+
+    async def enqueue_job(func_name, *args, _job_id=None, **kwargs):
+        if _job_id in job_ids:
+            return None
+        job_ids.append(_job_id)
+        return _job_id
+
+    monkeypatch.setattr(worker, "enqueue_job", enqueue_job)
+    return job_ids
+
+
+@pytest.mark.unit
+async def test_dispatch_queues_once_per_slot(queued, monkeypatch):
+    job = make_job(trigger=IntervalTrigger(seconds=30))
+
+    monkeypatch.setattr(scheduler.time, "time", lambda: 3000.0)
+    await scheduler.dispatch_scheduled_job(job)
+    monkeypatch.setattr(scheduler.time, "time", lambda: 3029.9)
+    await scheduler.dispatch_scheduled_job(job)  # same slot: deduplicated
+    monkeypatch.setattr(scheduler.time, "time", lambda: 3030.0)
+    await scheduler.dispatch_scheduled_job(job)
+
+    assert queued == ["scheduled:unit_test_job:100", "scheduled:unit_test_job:101"]
+
+
+@pytest.mark.unit
+async def test_dispatch_passes_the_slot_start_as_fire_time(monkeypatch):
+    calls = []
+
+    async def enqueue_job(func_name, *args, _job_id=None, **kwargs):
+        calls.append((func_name, args, _job_id))
+        return _job_id
+
+    monkeypatch.setattr(worker, "enqueue_job", enqueue_job)
+    monkeypatch.setattr(scheduler.time, "time", lambda: 3600.0 + 2.5)
+    await scheduler.dispatch_scheduled_job(make_job(trigger=CronTrigger(minute=0)))
+
+    assert calls == [("run_scheduled", ("unit_test_job", 3600), "scheduled:unit_test_job:60")]
+
+
+@pytest.mark.unit
+async def test_dispatch_failure_does_not_raise(monkeypatch):
+    async def enqueue_job(*args, **kwargs):
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(worker, "enqueue_job", enqueue_job)
+    await scheduler.dispatch_scheduled_job(make_job())
+
+
+# ==================== Leader lease ====================
+
+@pytest.mark.unit
+async def test_lease_has_a_single_leader(fake_redis):
+    first = LeaderLease(fake_redis, key="unit:leader", ttl_seconds=30)
+    second = LeaderLease(fake_redis, key="unit:leader", ttl_seconds=30)
+
+    assert await first.campaign() is True
+    assert await second.campaign() is False
+    assert await fake_redis.get("unit:leader") == first.token
+
+
+@pytest.mark.unit
+async def test_lease_renewal_extends_ttl(fake_redis):
+    lease = LeaderLease(fake_redis, key="unit:leader", ttl_seconds=30)
+    await lease.campaign()
+    await fake_redis.expire("unit:leader", 5)
+
+    assert await lease.campaign() is True
+    assert await fake_redis.ttl("unit:leader") > 5
+
+
+@pytest.mark.unit
+async def test_leader_steps_down_when_lease_is_lost(fake_redis):
+    first = LeaderLease(fake_redis, key="unit:leader", ttl_seconds=30)
+    second = LeaderLease(fake_redis, key="unit:leader", ttl_seconds=30)
+    await first.campaign()
+
+    # Lease expired and a standby took over before the renewal
+    await fake_redis.delete("unit:leader")
+    assert await second.campaign() is True
+    assert await first.campaign() is False
+    assert await fake_redis.get("unit:leader") == second.token
+
+
+@pytest.mark.unit
+async def test_leader_steps_down_on_redis_error(fake_redis, monkeypatch):
+    lease = LeaderLease(fake_redis, key="unit:leader", ttl_seconds=30)
+    await lease.campaign()
+
+    async def broken_eval(*args, **kwargs):
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(fake_redis, "eval", broken_eval)
+    assert await lease.campaign() is False
+    assert lease.is_leader is False
+
+
+@pytest.mark.unit
+async def test_resign_lets_a_standby_take_over(fake_redis):
+    first = LeaderLease(fake_redis, key="unit:leader", ttl_seconds=30)
+    second = LeaderLease(fake_redis, key="unit:leader", ttl_seconds=30)
+    await first.campaign()
+
+    await first.resign()
+
+    assert await second.campaign() is True
+
+
+# ==================== Runner ====================
+
+@pytest.fixture
+def register(monkeypatch, fake_redis):
+    """Register a job for run_scheduled_job (locks go to fake Redis)."""
+    monkeypatch.setenv("REDIS_ENABLED", "true")
+
+    def _register(func, lock_ttl=60):
+        job = make_job(func=func, lock_ttl=lock_ttl)
+        monkeypatch.setitem(scheduled.JOBS_BY_ID, job.id, job)
+        return job
+
+    return _register
+
+
+@pytest.mark.unit
+async def test_run_records_success(register, mock_db):
+    async def job(db):
+        return JobResult(processed=7, failed=2)
+
+    register(job)
+
+    run = await run_scheduled_job(mock_db, "unit_test_job", runner="worker")
+
+    assert run["status"] == "partial"
+    assert (run["items_processed"], run["failures"]) == (7, 2)
+    record = await mock_db[RUNS_COLLECTION].find_one({"id": run["id"]})
+    assert record["job_id"] == "unit_test_job"
+    assert record["runner"] == "worker"
+    assert record["duration_ms"] >= 0
+
+
+@pytest.mark.unit
+async def test_run_records_failure_and_releases_lock(register, mock_db, fake_redis):
+    async def job(db):
+        raise RuntimeError("boom")
+
+    register(job)
+
+    run = await run_scheduled_job(mock_db, "unit_test_job")
+
+    assert run["status"] == "failed"
+    assert run["error"] == "boom"
+    assert await fake_redis.exists("scheduler_lock:unit_test_job") == 0
+
+
+@pytest.mark.unit
+async def test_run_is_skipped_while_locked(register, mock_db, fake_redis):
+    calls = []
+
+    async def job(db):
+        calls.append(db)
+        return 1
+
+    register(job)
+    held = DistributedLock(fake_redis, "unit_test_job", ttl_seconds=60)
+    assert await held.acquire()
+
+    assert await run_scheduled_job(mock_db, "unit_test_job") is None
+    assert calls == []
+    assert await mock_db[RUNS_COLLECTION].count_documents({}) == 0
+
+    await held.release()
+    run = await run_scheduled_job(mock_db, "unit_test_job")
+    assert run["status"] == "success" and run["items_processed"] == 1
+
+
+@pytest.mark.unit
+async def test_unknown_job_raises(mock_db):
+    with pytest.raises(ValueError):
+        await run_scheduled_job(mock_db, "no_such_job")
+
+
+@pytest.mark.unit
+async def test_run_passes_fire_time_to_jobs_that_take_it(monkeypatch, mock_db, fake_redis):
+    monkeypatch.setenv("REDIS_ENABLED", "true")
+    seen = []
+
+    async def job(db, fire_time):
+        seen.append(fire_time)
+
+    registered = ScheduledJob("unit_test_job", "Unit test job", job, CronTrigger(minute=0), takes_fire_time=True)
+    monkeypatch.setitem(scheduled.JOBS_BY_ID, registered.id, registered)
+    due = datetime(2024, 6, 1, 9, 0, tzinfo=timezone.utc)
+
+    run = await run_scheduled_job(mock_db, "unit_test_job", fire_time=due)
+
+    assert seen == [due]
+    assert run["scheduled_for"] == due
+
+
+# ==================== Status automation ====================
+
+@pytest.fixture
+def automation_runs(monkeypatch):
+    from services.status_automation_service_v2 import StatusAutomationService
+
+    churches = []
+
+    async def run_automation_for_church(church_id, db):
+        churches.append(church_id)
+        return {}
+
+    monkeypatch.setattr(StatusAutomationService, "run_automation_for_church", staticmethod(run_automation_for_church))
+    return churches
+
+
+@pytest.mark.unit
+async def test_status_automation_uses_the_fire_time(mock_db, automation_runs):
+    await mock_db.church_settings.insert_many([
+        {"church_id": "jakarta", "status_automation_enabled": True,
+         "timezone": "Asia/Jakarta", "status_automation_schedule": "16:00"},
+        {"church_id": "utc", "status_automation_enabled": True, "status_automation_schedule": "10:00"},
+    ])
+
+    # Due at 09:00 UTC (16:00 in Jakarta), picked up 40 minutes late
+    result = await run_status_automation(mock_db, datetime(2024, 6, 1, 9, 0, tzinfo=timezone.utc))
+
+    assert automation_runs == ["jakarta"]
+    assert result.processed == 1
@@ -0,0 +1,91 @@
+"""
+Unit tests for streamed JSON responses.
+
+These tests verify:
+- stream_json emits a JSON array, an enveloped document or NDJSON
+- Documents that don't fit the schema are streamed with the bad fields
+  defaulted (or as stored) instead of breaking the response
+
+Run with: pytest tests/unit/test_serialization.py
+"""
+
+import json
+from typing import Optional
+
+import msgspec
+import pytest
+from starlette.requests import Request
+
+from utils.serialization import NDJSON_MEDIA_TYPE, stream_json
+
+
+class Item(msgspec.Struct):
+    id: str
+    count: int = 0
+    label: Optional[str] = None
+
+
+async def cursor(*docs):
+    for doc in docs:
+        yield doc
+
+
+def make_request(accept="application/json"):
+    return Request({"type": "http", "headers": [(b"accept", accept.encode())]})
+
+
+async def body(response):
+    return b"".join([chunk async for chunk in response.body_iterator])
+
+
+@pytest.mark.unit
+async def test_streams_a_json_array():
+    response = await stream_json(make_request(), cursor({"id": "a"}, {"id": "b", "count": 2}), schema=Item)
+
+    assert json.loads(await body(response)) == [
+        {"id": "a", "count": 0, "label": None},
+        {"id": "b", "count": 2, "label": None},
+    ]
+
+
+@pytest.mark.unit
+async def test_streams_an_envelope():
+    response = await stream_json(make_request(), cursor({"id": "a"}), envelope={"total": 1}, key="items")
+
+    assert json.loads(await body(response)) == {"items": [{"id": "a"}], "total": 1}
+
+
+@pytest.mark.unit
+async def test_streams_ndjson():
+    response = await stream_json(make_request(NDJSON_MEDIA_TYPE), cursor({"id": "a"}, {"id": "b"}))
+
+    assert response.media_type == NDJSON_MEDIA_TYPE
+    assert await body(response) == b'{"id":"a"}\n{"id":"b"}\n'
+
+
+@pytest.mark.unit
+async def test_empty_cursor():
+    response = await stream_json(make_request(), cursor(), envelope={"total": 0})
+
+    assert json.loads(await body(response)) == {"data": [], "total": 0}
+
+
+@pytest.mark.unit
+async def test_invalid_fields_fall_back_to_defaults(caplog):
+    docs = cursor({"id": "a", "count": "many", "label": 7}, {"id": "b", "count": 1})
+
+    response = await stream_json(make_request(), docs, schema=Item)
+
+    assert json.loads(await body(response)) == [
+        {"id": "a", "count": 0, "label": None},
+        {"id": "b", "count": 1, "label": None},
+    ]
+    assert "count" in caplog.text and "label" in caplog.text
+
+
+@pytest.mark.unit
+async def test_document_missing_required_field_is_sent_as_stored(caplog):
+    response = await stream_json(make_request(), cursor({"count": 3}, {"id": "b"}), schema=Item)
+
+    assert json.loads(await body(response)) == [{"count": 3}, {"id": "b", "count": 0, "label": None}]
+    assert "as stored" in caplog.text
@@ -3,6 +3,11 @@ Distributed caching utility with Redis backend.
 
 Provides backward-compatible API that now uses Redis instead of in-memory cache.
 This enables distributed caching across multiple backend instances.
+
+The per-church convenience functions (settings, statuses, demographics,
+categories, church) are served by the two-tier cache in
+services/redis/tiered.py: an in-process L1 in front of Redis, kept
+coherent across instances through pub/sub.
 """
 
 import json
@@ -11,6 +16,8 @@ from datetime import datetime
 from typing import Any, Optional, Callable
 from functools import wraps
 
+from services.redis.tiered import tiered_cache
+
 logger = logging.getLogger(__name__)
 
 # Cache TTL constants (seconds)
@@ -185,141 +192,84 @@ def cached(ttl_seconds: int = TTL_DEFAULT, key_prefix: str = ""):
 
 async def get_cached_settings(church_id: str, fetcher: Callable) -> Any:
     """
-    Get church settings with Redis caching.
+    Get church settings with two-tier (L1 + Redis) caching.
 
     Usage:
         settings = await get_cached_settings(
             church_id,
-            lambda: db.church_settings.find_one({"church_id": church_id})
+            lambda: db.church_settings.find_one({"church_id": church_id}, {"_id": 0})
         )
     """
-    cache_key = f"settings:{church_id}"
-    cached_value = await cache.get(cache_key)
-
-    if cached_value is not None:
-        return cached_value
+    return await tiered_cache.get("church_settings", church_id, loader=fetcher)
 
-    # Fetch from database
-    value = await fetcher()
-    if value:
-        await cache.set(cache_key, value, ttl_seconds=TTL_SETTINGS)
 
-    return value
+async def get_church_settings(db, church_id: str) -> Optional[dict]:
+    """Church settings document (without _id), cached."""
+    return await get_cached_settings(
+        church_id,
+        lambda: db.church_settings.find_one({"church_id": church_id}, {"_id": 0})
+    )
 
 
 async def get_cached_statuses(church_id: str, fetcher: Callable) -> Any:
-    """Get member statuses with Redis caching."""
-    cache_key = f"statuses:{church_id}"
-    cached_value = await cache.get(cache_key)
-
-    if cached_value is not None:
-        return cached_value
-
-    value = await fetcher()
-    if value:
-        await cache.set(cache_key, value, ttl_seconds=TTL_STATUSES)
-
-    return value
+    """Get member statuses with two-tier caching."""
+    return await tiered_cache.get("member_statuses", church_id, loader=fetcher)
 
 
 async def get_cached_demographics(church_id: str, fetcher: Callable) -> Any:
-    """Get demographics with Redis caching."""
-    cache_key = f"demographics:{church_id}"
-    cached_value = await cache.get(cache_key)
-
-    if cached_value is not None:
-        return cached_value
-
-    value = await fetcher()
-    if value:
-        await cache.set(cache_key, value, ttl_seconds=TTL_DEMOGRAPHICS)
-
-    return value
+    """Get demographics with two-tier caching."""
+    return await tiered_cache.get("demographics", church_id, loader=fetcher)
 
 
 async def get_cached_categories(church_id: str, category_type: str, fetcher: Callable) -> Any:
     """
-    Get categories with Redis caching.
+    Get categories with two-tier caching.
 
     Args:
         church_id: Church identifier
         category_type: Type of category (event, article, group)
         fetcher: Async function to fetch from database
     """
-    cache_key = f"categories:{category_type}:{church_id}"
-    cached_value = await cache.get(cache_key)
-
-    if cached_value is not None:
-        return cached_value
-
-    value = await fetcher()
-    if value:
-        await cache.set(cache_key, value, ttl_seconds=TTL_STATUSES)  # 30 min
-
-    return value
+    return await tiered_cache.get("categories", category_type, loader=fetcher, scope=church_id)
 
 
 async def get_cached_church(church_id: str, fetcher: Callable) -> Any:
-    """Get church data with Redis caching."""
-    cache_key = f"church:{church_id}"
-    cached_value = await cache.get(cache_key)
-
-    if cached_value is not None:
-        return cached_value
-
-    value = await fetcher()
-    if value:
-        await cache.set(cache_key, value, ttl_seconds=3600)  # 1 hour
-
-    return value
+    """Get church data with two-tier caching."""
+    return await tiered_cache.get("church", church_id, loader=fetcher)
 
 
 # ============================================================================
 # CACHE INVALIDATION FUNCTIONS
 # ============================================================================
+# Each invalidation drops the local L1 entry, the Redis entry and (via
+# pub/sub) the L1 entries of other instances.
 
 async def invalidate_church_cache(church_id: str):
     """Invalidate all cache entries for a church."""
-    await cache.delete(f"settings:{church_id}")
-    await cache.delete(f"statuses:{church_id}")
-    await cache.delete(f"demographics:{church_id}")
-    await cache.delete(f"church:{church_id}")
-
-    # Also notify other instances via pub/sub
-    try:
-        from services.redis import invalidate_church_cache as pubsub_invalidate
-        await pubsub_invalidate(church_id)
-    except ImportError:
-        pass  # Pub/sub not available
+    for namespace in ("church_settings", "member_statuses", "demographics", "church"):
+        await tiered_cache.invalidate(namespace, church_id)
+    await tiered_cache.invalidate_scope("categories", church_id)
 
 
 async def invalidate_settings_cache(church_id: str):
     """Invalidate only settings cache for a church."""
-    await cache.delete(f"settings:{church_id}")
-
-    # Also notify via pub/sub
-    try:
-        from services.redis import invalidate_on_settings_change
-        await invalidate_on_settings_change(church_id)
-    except ImportError:
-        pass
+    await tiered_cache.invalidate("church_settings", church_id)
 
 
 async def invalidate_statuses_cache(church_id: str):
     """Invalidate member statuses cache for a church."""
-    await cache.delete(f"statuses:{church_id}")
+    await tiered_cache.invalidate("member_statuses", church_id)
 
 
 async def invalidate_demographics_cache(church_id: str):
     """Invalidate demographics cache for a church."""
-    await cache.delete(f"demographics:{church_id}")
+    await tiered_cache.invalidate("demographics", church_id)
 
 
 async def invalidate_categories_cache(church_id: str, category_type: str = None):
     """Invalidate categories cache for a church."""
     if category_type:
-        await cache.delete(f"categories:{category_type}:{church_id}")
+        await tiered_cache.invalidate("categories", category_type, scope=church_id)
     else:
-        # Invalidate all category types
-        for cat_type in ["event", "article", "group"]:
-            await cache.delete(f"categories:{cat_type}:{church_id}")
+        # Invalidate all category types (one version bump)
+        await tiered_cache.invalidate_scope("categories", church_id)
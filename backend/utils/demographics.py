@@ -2,6 +2,8 @@ from datetime import date, datetime
 from typing import Optional
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
+from utils.cache import get_cached_demographics
+
 
 def calculate_age(birth_date: date) -> int:
     """Calculate age from birth date
@@ -42,19 +44,24 @@ async def auto_assign_demographic(member_data: dict, db: AsyncIOMotorDatabase) -
     
     age = calculate_age(birth_date)
     
-    # Find matching demographic preset
+    # Find matching demographic preset (church presets are cached; imports
+    # call this once per row)
     church_id = member_data.get('church_id')
-    demographics = await db.demographic_presets.find(
-        {
-            "church_id": church_id,
-            "is_active": True,
-            "min_age": {"$lte": age},
-            "max_age": {"$gte": age}
-        },
-        {"_id": 0}
-    ).sort("order", 1).to_list(10)
-    
-    if demographics:
-        return demographics[0]['name']
+
+    async def fetch_presets():
+        return await db.demographic_presets.find(
+            {"church_id": church_id},
+            {"_id": 0}
+        ).sort("order", 1).to_list(100)
+
+    presets = await get_cached_demographics(church_id, fetch_presets) or []
+    for preset in presets:
+        min_age, max_age = preset.get('min_age'), preset.get('max_age')
+        if (
+            preset.get('is_active') is True
+            and min_age is not None and max_age is not None
+            and min_age <= age <= max_age
+        ):
+            return preset['name']
     
     return None
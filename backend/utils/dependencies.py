@@ -3,11 +3,14 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Optional
 from motor.motor_asyncio import AsyncIOMotorDatabase, AsyncIOMotorClient
 import os
+import time
 import hashlib
 import json
 import logging
 
 from .security import decode_access_token, create_access_token
+from .principal_cache import principal_cache
+from middleware.request_context import set_request_tenant
 from utils.tenant_utils import get_session_church_id_from_user
 
 logger = logging.getLogger(__name__)
@@ -51,21 +54,57 @@ async def _get_cached_user(token_hash: str):
 
 
 async def _cache_user(token_hash: str, user_data: dict):
-    """Cache user data in Redis."""
+    """Cache user data in Redis (never past the token's expiry)."""
+    ttl = int(min(JWT_CACHE_TTL, principal_cache.ttl_for(user_data)))
+    if ttl <= 0:
+        return
     redis = await _get_redis()
     if redis:
         try:
             # Don't cache sensitive fields
             cache_data = {k: v for k, v in user_data.items() if k not in ["db_user"]}
-            await redis.set(
-                f"faithflow:jwt:{token_hash}",
-                json.dumps(cache_data, default=str),
-                ex=JWT_CACHE_TTL
-            )
+            # Index token hashes by subject so a user's tokens can be evicted together
+            subject_key = f"faithflow:jwt:sub:{user_data.get('sub') or user_data.get('id')}"
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.set(
+                    f"faithflow:jwt:{token_hash}",
+                    json.dumps(cache_data, default=str),
+                    ex=ttl
+                )
+                pipe.sadd(subject_key, token_hash)
+                pipe.expire(subject_key, JWT_CACHE_TTL)
+                await pipe.execute()
         except Exception as e:
             logger.debug(f"JWT cache set error: {e}")
 
 
+async def invalidate_cached_principals(subject: str) -> None:
+    """Drop cached principals of a user or API key (this process and Redis).
+
+    Other instances drop their in-process entries when they receive the
+    USER_SESSION invalidation message.
+    """
+    principal_cache.evict_subject(subject)
+    redis = await _get_redis()
+    if redis:
+        try:
+            subject_key = f"faithflow:jwt:sub:{subject}"
+            hashes = await redis.smembers(subject_key)
+            await redis.delete(subject_key, *[f"faithflow:jwt:{h}" for h in hashes])
+        except Exception as e:
+            logger.debug(f"JWT cache invalidation error: {e}")
+
+
+def _set_tenant(user: dict) -> None:
+    """Record the session tenant on the request context (logs, tracing)."""
+    set_request_tenant(user.get("session_church_id") or user.get("church_id"), user.get("id"))
+
+
+def _is_expired(principal: dict) -> bool:
+    exp = principal.get("exp")
+    return exp is not None and float(exp) <= time.time()
+
+
 async def get_db() -> AsyncIOMotorDatabase:
     """Get database instance (lazy-loaded)"""
     global _db_instance
@@ -126,15 +165,24 @@ async def get_current_user(
 ) -> dict:
     """Get current authenticated user from JWT token (supports both users and API keys).
 
-    Uses Redis caching to avoid database lookups on every request.
-    Cache TTL: 5 minutes (balance between performance and security).
+    Verified principals are cached in process (utils/principal_cache.py)
+    and in Redis, for at most 5 minutes and never past the token's expiry.
+    Both are evicted by invalidate_cached_principals / the USER_SESSION
+    invalidation message.
     """
     token = credentials.credentials
 
-    # Check cache first
+    # Check caches first: in-process, then Redis
     token_h = _token_hash(token)
-    cached_user = await _get_cached_user(token_h)
+    cached_user = principal_cache.get(token_h)
     if cached_user:
+        _set_tenant(cached_user)
+        return cached_user
+
+    cached_user = await _get_cached_user(token_h)
+    if cached_user and not _is_expired(cached_user):
+        principal_cache.put(token_h, cached_user, cached_user)
+        _set_tenant(cached_user)
         return cached_user
 
     # Cache miss - decode and validate token
@@ -190,6 +238,8 @@ async def get_current_user(
 
         # Cache the result
         await _cache_user(token_h, result)
+        principal_cache.put(token_h, result, payload)
+        _set_tenant(result)
         return result
 
     # Handle regular user authentication
@@ -217,6 +267,8 @@ async def get_current_user(
 
     # Cache the result
     await _cache_user(token_h, merged_user)
+    principal_cache.put(token_h, merged_user, payload)
+    _set_tenant(merged_user)
 
     return merged_user
 
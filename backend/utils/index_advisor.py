@@ -0,0 +1,428 @@
+"""
+MongoDB Index Advisor
+
+IndexManager.INDEXES (utils/performance.py) declares every index the app
+needs. The advisor compares that registry with what a database actually
+has, and with how the app actually queries it:
+
+- drift: declared indexes that are missing, or present with different
+  options (unique / partial / TTL), and live indexes nobody declared
+- unused: live indexes with no accesses in ``$indexStats`` (counters reset
+  when the mongod restarts, so check ``since``)
+- redundant: live indexes whose keys are a prefix of another index's
+- uncovered: query shapes recorded by utils.query_profiler that no live
+  index can serve (an explained COLLSCAN, or no index leading with a
+  filtered field), with an Equality-Sort-Range suggestion
+
+Indexes are matched by keys and options, never by name, so an index built
+by an older script under another name counts as present.
+
+Missing indexes are built one at a time, pausing between builds on
+non-empty collections, under a distributed lock so a fleet restarting
+together builds each index once. At startup, collections larger than
+INDEX_BUILD_STARTUP_MAX_DOCS are left for the CLI:
+
+    python scripts/index_advisor.py check               # drift only
+    python scripts/index_advisor.py report --hours 24   # + unused/redundant/uncovered
+    python scripts/index_advisor.py apply [--collections a,b] [--pause 5]
+"""
+
+import asyncio
+import logging
+import os
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import IndexModel
+
+from utils.performance import IndexManager
+from utils.serialization import json_loads
+
+logger = logging.getLogger(__name__)
+
+# Pause between builds on non-empty collections, so one build at a time
+# competes with traffic
+INDEX_BUILD_PAUSE = float(os.getenv("INDEX_BUILD_PAUSE", "1"))
+# Startup builds skip collections larger than this (build them with the CLI)
+INDEX_BUILD_STARTUP_MAX_DOCS = int(os.getenv("INDEX_BUILD_STARTUP_MAX_DOCS", "200000"))
+INDEX_BUILD_LOCK_TTL = 3600
+
+# Options that change what an index does (name, v, background... don't)
+_OPTION_KEYS = ("unique", "sparse", "partialFilterExpression", "expireAfterSeconds", "collation")
+
+# Operators that still pin a field to exact values (the E in ESR)
+_EQUALITY_OPERATORS = {"$eq", "$in", "$elemMatch"}
+
+IndexKey = Tuple[Tuple[str, Any], ...]
+
+
+# ==================== Index specs ====================
+
+def _direction(value: Any) -> Any:
+    return int(value) if isinstance(value, float) else value
+
+
+def index_key(spec: Mapping[str, Any]) -> IndexKey:
+    """Comparable key pattern of a declared or live index (text indexes by their fields)."""
+    items = list(spec["key"].items())
+    if any(d == "text" or f == "_fts" for f, d in items):
+        fields = sorted(spec.get("weights") or [f for f, d in items if d == "text"])
+        prefix = tuple((f, _direction(d)) for f, d in items if d != "text" and f not in ("_fts", "_ftsx"))
+        return prefix + (("$text", tuple(fields)),)
+    return tuple((f, _direction(d)) for f, d in items)
+
+
+def index_options(spec: Mapping[str, Any]) -> Dict[str, Any]:
+    # ``is`` so that expireAfterSeconds=0 (expire at the field's date) isn't read as False
+    return {k: spec[k] for k in _OPTION_KEYS if spec.get(k) is not None and spec.get(k) is not False}
+
+
+def describe_key(key: IndexKey) -> List[List[Any]]:
+    return [[field, list(d) if isinstance(d, tuple) else d] for field, d in key]
+
+
+def _constraint(spec: Mapping[str, Any]) -> bool:
+    """Indexes that do something besides speed up reads (never 'unused')."""
+    return bool(spec.get("unique") or "expireAfterSeconds" in spec or spec.get("name") == "_id_")
+
+
+def diff_indexes(declared: Sequence[IndexModel], live: Sequence[Mapping[str, Any]]) -> Dict[str, Any]:
+    """
+    Compare one collection's declared indexes with its live ``listIndexes``.
+
+    Returns missing (IndexModels to build), conflicts (same keys, different
+    options), undeclared live index names and the number present.
+    """
+    live_by_key = {index_key(spec): spec for spec in live}
+    declared_keys = set()
+    missing, conflicts, present = [], [], 0
+
+    for model in declared:
+        doc = model.document
+        key = index_key(doc)
+        declared_keys.add(key)
+        spec = live_by_key.get(key)
+        if spec is None:
+            missing.append(model)
+        elif index_options(spec) != index_options(doc):
+            conflicts.append({
+                "index": spec["name"],
+                "key": describe_key(key),
+                "declared": index_options(doc),
+                "live": index_options(spec),
+            })
+        else:
+            present += 1
+
+    undeclared = [spec["name"] for key, spec in live_by_key.items() if key not in declared_keys and spec["name"] != "_id_"]
+    return {"missing": missing, "conflicts": conflicts, "undeclared": undeclared, "present": present}
+
+
+def redundant_indexes(live: Sequence[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+    """Plain indexes whose keys are a leading prefix of another index's keys."""
+    keyed = [(index_key(spec), spec) for spec in live]
+    redundant = []
+    for key, spec in keyed:
+        if _constraint(spec) or index_options(spec):
+            continue
+        for other_key, other in keyed:
+            if other is not spec and len(other_key) > len(key) and other_key[:len(key)] == key \
+                    and "partialFilterExpression" not in other and "sparse" not in other:
+                redundant.append({"index": spec["name"], "covered_by": other["name"]})
+                break
+    return redundant
+
+
+# ==================== Query shapes ====================
+
+def _predicates(query: Any, equality: Dict[str, None], ranges: Dict[str, None]) -> None:
+    """Collect the fields a (shape-only) filter constrains, by equality or range."""
+    if not isinstance(query, dict):
+        return
+    for field, value in query.items():
+        if field == "$and":
+            for clause in value if isinstance(value, list) else []:
+                _predicates(clause, equality, ranges)
+        elif field == "$text":
+            equality["$text"] = None
+        elif field.startswith("$"):
+            continue  # $or/$nor/$expr: not analysed
+        elif isinstance(value, dict) and any(k.startswith("$") for k in value):
+            target = equality if set(value) <= _EQUALITY_OPERATORS else ranges
+            target[field] = None
+        else:
+            equality[field] = None
+
+
+def query_predicates(command: str, shape: Mapping[str, Any]) -> Optional[Tuple[List[str], List[Tuple[str, int]], List[str]]]:
+    """
+    (equality fields, sort, range fields) of a profiler command shape, or
+    None when it isn't a filtered read the advisor can judge.
+    """
+    if command == "aggregate":
+        pipeline = shape.get("pipeline") or []
+        first = pipeline[0] if pipeline else None
+        if not isinstance(first, dict) or "$match" not in first:
+            return None
+        query = first["$match"]
+        second = pipeline[1] if len(pipeline) > 1 else None
+        sort = second.get("$sort") if isinstance(second, dict) else None
+    elif command in ("update", "delete"):
+        query, sort = shape.get("q"), None
+    elif command == "find":
+        if "hint" in shape:
+            return None
+        query, sort = shape.get("filter"), shape.get("sort")
+    elif command in ("count", "distinct", "findAndModify"):
+        query, sort = shape.get("query"), shape.get("sort")
+    else:
+        return None
+
+    equality: Dict[str, None] = {}
+    ranges: Dict[str, None] = {}
+    _predicates(query or {}, equality, ranges)
+    sort_fields = [(f, int(d)) for f, d in (sort or {}).items() if isinstance(d, (int, float))]
+    if not equality and not ranges and not sort_fields:
+        return None
+    return list(equality), sort_fields, [f for f in ranges if f not in equality]
+
+
+def can_use(key: IndexKey, equality: Sequence[str], sort: Sequence[Tuple[str, int]], ranges: Sequence[str]) -> bool:
+    """Whether an index bounds the scan for these predicates (or provides the sort)."""
+    if not key:
+        return False
+    lead = key[0][0]
+    if lead in equality or lead in ranges:
+        return True
+    if sort and not equality and not ranges:
+        fields = [f for f, _ in key[:len(sort)]]
+        return fields == [f for f, _ in sort]
+    return False
+
+
+def suggest_index(equality: Sequence[str], sort: Sequence[Tuple[str, int]], ranges: Sequence[str]) -> List[List[Any]]:
+    """Equality-Sort-Range key order, tenant (church_id) first."""
+    eq = sorted(f for f in equality if f != "$text")
+    if "church_id" in eq:
+        eq.remove("church_id")
+        eq.insert(0, "church_id")
+    keys = [[f, 1] for f in eq]
+    keys += [[f, d] for f, d in sort if f not in eq]
+    keys += [[f, 1] for f in ranges if f not in eq and f not in dict(sort)]
+    return keys
+
+
+# ==================== Advisor ====================
+
+class IndexAdvisor:
+    """Drift report, usage report and rolling builds for one database."""
+
+    def __init__(self, db: AsyncIOMotorDatabase, registry: Optional[Dict[str, List[IndexModel]]] = None):
+        self.db = db
+        self.registry = registry if registry is not None else IndexManager.INDEXES
+
+    async def live_indexes(self, collection: str) -> List[Dict[str, Any]]:
+        """``listIndexes`` (empty for a collection that doesn't exist yet)."""
+        return await self.db[collection].list_indexes().to_list(None)
+
+    def _collections(self, collections: Optional[Iterable[str]]) -> List[str]:
+        if collections is None:
+            return list(self.registry)
+        unknown = [c for c in collections if c not in self.registry]
+        if unknown:
+            raise ValueError(f"No indexes declared for: {', '.join(unknown)}")
+        return list(collections)
+
+    async def _drop_deprecated(self, collection: str, live: List[Dict[str, Any]]) -> List[str]:
+        """Drop IndexManager.DEPRECATED_INDEXES, unless the live index is one still declared."""
+        declared = [(index_key(m.document), index_options(m.document)) for m in self.registry.get(collection, [])]
+        dropped = []
+        for spec in live:
+            if spec["name"] not in IndexManager.DEPRECATED_INDEXES.get(collection, ()):
+                continue
+            if (index_key(spec), index_options(spec)) in declared:
+                continue
+            await self.db[collection].drop_index(spec["name"])
+            logger.info(f"Dropped deprecated index {spec['name']} from {collection}")
+            dropped.append(spec["name"])
+        return dropped
+
+    async def check(self, collections: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Drift per collection (only collections that drifted)."""
+        drift = {}
+        for name in self._collections(collections):
+            diff = diff_indexes(self.registry[name], await self.live_indexes(name))
+            if diff["missing"] or diff["conflicts"] or diff["undeclared"]:
+                drift[name] = {
+                    **diff,
+                    "missing": [{"key": describe_key(index_key(m.document)), **index_options(m.document)} for m in diff["missing"]],
+                }
+        return drift
+
+    async def apply(
+        self,
+        collections: Optional[Iterable[str]] = None,
+        pause: float = INDEX_BUILD_PAUSE,
+        max_docs: Optional[int] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Build missing indexes one at a time.
+
+        Collections with more than ``max_docs`` documents are reported as
+        deferred instead of built. Conflicting indexes are reported, never
+        dropped. Returns per-collection results; empty when another
+        instance holds the build lock.
+        """
+        from scheduler import DistributedLock, get_lock_redis
+
+        names = self._collections(collections)
+        lock = DistributedLock(await get_lock_redis(), "index_build", ttl_seconds=INDEX_BUILD_LOCK_TTL)
+        if not await lock.acquire():
+            logger.info("Index build already running on another instance, skipping")
+            return {}
+
+        results: Dict[str, Dict[str, Any]] = {}
+        built = 0
+        try:
+            for name in names:
+                collection = self.db[name]
+                try:
+                    live = await self.live_indexes(name)
+                    if await self._drop_deprecated(name, live):
+                        live = await self.live_indexes(name)
+                    diff = diff_indexes(self.registry[name], live)
+                except Exception as e:
+                    results[name] = {"status": "error", "error": str(e)}
+                    logger.warning(f"Failed to read indexes for {name}: {e}")
+                    continue
+
+                result = {"status": "success", "indexes_created": 0, "index_names": [], "present": diff["present"]}
+                if diff["conflicts"]:
+                    result["conflicts"] = diff["conflicts"]
+                    for conflict in diff["conflicts"]:
+                        logger.warning(
+                            f"Index {conflict['index']} on {name} differs from its declaration "
+                            f"(live {conflict['live']}, declared {conflict['declared']}); rebuild it by hand"
+                        )
+                results[name] = result
+                if not diff["missing"]:
+                    continue
+
+                docs = await collection.estimated_document_count()
+                if max_docs is not None and docs > max_docs:
+                    result["status"] = "deferred"
+                    result["deferred"] = len(diff["missing"])
+                    logger.warning(
+                        f"{len(diff['missing'])} missing indexes on {name} ({docs} docs) deferred: "
+                        f"run python scripts/index_advisor.py apply --collections {name}"
+                    )
+                    continue
+
+                for model in diff["missing"]:
+                    if built and docs and pause:
+                        await asyncio.sleep(pause)
+                    try:
+                        result["index_names"] += await collection.create_indexes([model])
+                        result["indexes_created"] += 1
+                        built += 1
+                    except Exception as e:
+                        result["status"] = "error"
+                        result.setdefault("errors", []).append({"key": describe_key(index_key(model.document)), "error": str(e)})
+                        logger.warning(f"Failed to build index {model.document['name']} on {name}: {e}")
+        finally:
+            await lock.release()
+
+        if built:
+            logger.info(f"Built {built} missing indexes")
+        return results
+
+    async def unused_indexes(self, collections: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """Read-only indexes with no accesses since the mongod started counting."""
+        unused = []
+        for name in self._collections(collections):
+            try:
+                live = {spec["name"]: spec for spec in await self.live_indexes(name)}
+                stats = await self.db[name].aggregate([{"$indexStats": {}}]).to_list(None)
+            except Exception as e:
+                logger.debug(f"$indexStats unavailable for {name}: {e}")
+                continue
+            for stat in stats:
+                spec = live.get(stat["name"])
+                accesses = stat.get("accesses") or {}
+                if spec is None or _constraint(spec) or int(accesses.get("ops", 0)):
+                    continue
+                unused.append({"collection": name, "index": stat["name"], "since": accesses.get("since")})
+        return unused
+
+    async def uncovered_shapes(
+        self,
+        entries: Mapping[str, Tuple[Any, Mapping[str, int]]],
+        meta: Mapping[str, Mapping[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """
+        Profiler fingerprints no live index can serve.
+
+        An explained plan decides when there is one; otherwise the shape's
+        predicates are checked against the live index keys.
+        """
+        live_keys: Dict[str, List[IndexKey]] = {}
+        uncovered = []
+        for fp, info in meta.items():
+            collection = info.get("collection")
+            if not collection or fp not in entries:
+                continue
+            try:
+                predicates = query_predicates(info.get("command", ""), json_loads(info.get("shape") or "{}"))
+            except Exception:
+                continue
+            if predicates is None:
+                continue
+            equality, sort, ranges = predicates
+
+            plan = info.get("plan") or {}
+            if plan.get("collscan") is False:
+                continue
+            if collection not in live_keys:
+                live_keys[collection] = [index_key(spec) for spec in await self.live_indexes(collection)]
+            if plan.get("collscan") is not True and any(can_use(k, equality, sort, ranges) for k in live_keys[collection]):
+                continue
+
+            histogram, handlers = entries[fp]
+            declared = any(
+                can_use(index_key(m.document), equality, sort, ranges)
+                for m in self.registry.get(collection, [])
+            )
+            uncovered.append({
+                "fingerprint": fp,
+                "collection": collection,
+                "command": info.get("command"),
+                "shape": info.get("shape"),
+                "count": histogram.count,
+                "total_ms": round(histogram.total_us / 1000, 1),
+                "reason": "collscan" if plan.get("collscan") else "no usable index",
+                "suggested_index": suggest_index(equality, sort, ranges),
+                "declared_index_would_serve": declared,
+                "handlers": [h for h, _ in sorted(handlers.items(), key=lambda kv: -kv[1])[:5]],
+            })
+        uncovered.sort(key=lambda u: -u["total_ms"])
+        return uncovered
+
+    async def report(
+        self,
+        entries: Optional[Mapping[str, Tuple[Any, Mapping[str, int]]]] = None,
+        meta: Optional[Mapping[str, Mapping[str, Any]]] = None,
+        collections: Optional[Iterable[str]] = None,
+    ) -> Dict[str, Any]:
+        """Drift, unused and redundant indexes, and (given profiler data) uncovered shapes."""
+        names = self._collections(collections)
+        drift = await self.check(names)
+        redundant = []
+        for name in names:
+            redundant += [{"collection": name, **r} for r in redundant_indexes(await self.live_indexes(name))]
+        return {
+            "drift": drift,
+            "missing_count": sum(len(d["missing"]) for d in drift.values()),
+            "unused": await self.unused_indexes(names),
+            "redundant": redundant,
+            "uncovered": await self.uncovered_shapes(entries or {}, meta or {}),
+        }
@@ -8,7 +8,6 @@ World-class performance optimizations for FaithFlow:
 4. Response Compression Utilities
 """
 
-import asyncio
 import hashlib
 import json
 import time
@@ -20,6 +19,8 @@ from collections import OrderedDict
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from pymongo import ASCENDING, DESCENDING, IndexModel
 
+from utils.query_profiler import LatencyHistogram
+
 logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
@@ -33,6 +34,10 @@ class IndexManager:
     """
     Manages MongoDB indexes for optimal query performance.
     Automatically creates indexes at application startup.
+
+    INDEXES is the single declaration of the app's indexes (the scripts in
+    scripts/create_*_indexes.py build subsets of it). utils.index_advisor
+    diffs it against each database and builds what is missing.
     """
 
     # Define all indexes for each collection
@@ -58,6 +63,26 @@ class IndexManager:
             IndexModel([("church_id", ASCENDING), ("member_id", ASCENDING), ("created_at", DESCENDING)]),
             # Text search index
             IndexModel([("first_name", "text"), ("last_name", "text"), ("email", "text")]),
+            # Member search fields (services/member_search_index.py)
+            IndexModel([("church_id", ASCENDING), ("search_tokens", ASCENDING)]),
+            IndexModel([("church_id", ASCENDING), ("search_grams", ASCENDING)]),
+            IndexModel([("church_id", ASCENDING), ("phone_e164", ASCENDING)]),
+            IndexModel([("id", ASCENDING)]),
+            IndexModel([("email", ASCENDING)]),
+            IndexModel([("phone_whatsapp", ASCENDING)]),
+            IndexModel([("church_id", ASCENDING), ("is_deleted", ASCENDING), ("is_active", ASCENDING)]),
+            IndexModel([("church_id", ASCENDING), ("member_status", ASCENDING)]),
+            IndexModel([("church_id", ASCENDING), ("demographic_category", ASCENDING)]),
+        ],
+
+        "churches": [
+            IndexModel([("id", ASCENDING)], unique=True),
+        ],
+
+        "users": [
+            IndexModel([("email", ASCENDING)], unique=True),
+            IndexModel([("church_id", ASCENDING)]),
+            IndexModel([("id", ASCENDING)]),
         ],
 
         # Events collection
@@ -67,6 +92,20 @@ class IndexManager:
             IndexModel([("church_id", ASCENDING), ("event_category_id", ASCENDING)]),
             IndexModel([("church_id", ASCENDING), ("is_active", ASCENDING), ("start_date", DESCENDING)]),
             IndexModel([("church_id", ASCENDING), ("deleted", ASCENDING)]),
+            IndexModel([("church_id", ASCENDING), ("event_type", ASCENDING)]),
+            IndexModel([("id", ASCENDING)]),
+            # A member's RSVPs (multikey over the embedded RSVP list)
+            IndexModel([("church_id", ASCENDING), ("rsvp_list.member_id", ASCENDING)]),
+        ],
+
+        "member_statuses": [
+            IndexModel([("church_id", ASCENDING), ("name", ASCENDING)], unique=True),
+            IndexModel([("church_id", ASCENDING), ("order", ASCENDING)]),
+        ],
+
+        "demographic_presets": [
+            IndexModel([("church_id", ASCENDING), ("name", ASCENDING)], unique=True),
+            IndexModel([("church_id", ASCENDING), ("order", ASCENDING)]),
         ],
 
         # Groups collection
@@ -75,6 +114,20 @@ class IndexManager:
             IndexModel([("church_id", ASCENDING), ("category_id", ASCENDING)]),
             IndexModel([("church_id", ASCENDING), ("leader_id", ASCENDING)]),
             IndexModel([("church_id", ASCENDING), ("deleted", ASCENDING)]),
+            IndexModel([("church_id", ASCENDING), ("category", ASCENDING)]),
+            IndexModel([("church_id", ASCENDING), ("is_open_for_join", ASCENDING)]),
+            IndexModel([("id", ASCENDING)]),
+        ],
+
+        "group_memberships": [
+            IndexModel([("church_id", ASCENDING), ("member_id", ASCENDING)]),
+            IndexModel([("church_id", ASCENDING), ("group_id", ASCENDING), ("member_id", ASCENDING), ("status", ASCENDING)]),
+            IndexModel([("church_id", ASCENDING), ("group_id", ASCENDING), ("status", ASCENDING)]),
+        ],
+
+        "group_join_requests": [
+            IndexModel([("church_id", ASCENDING), ("member_id", ASCENDING)]),
+            IndexModel([("church_id", ASCENDING), ("group_id", ASCENDING), ("member_id", ASCENDING), ("status", ASCENDING)]),
         ],
 
         # Group members (join table)
@@ -88,6 +141,7 @@ class IndexManager:
         "donations": [
             IndexModel([("church_id", ASCENDING), ("date", DESCENDING)]),
             IndexModel([("church_id", ASCENDING), ("member_id", ASCENDING)]),
+            IndexModel([("member_id", ASCENDING)]),
             IndexModel([("church_id", ASCENDING), ("fund_id", ASCENDING)]),
             IndexModel([("church_id", ASCENDING), ("payment_method", ASCENDING)]),
         ],
@@ -105,6 +159,25 @@ class IndexManager:
             IndexModel([("church_id", ASCENDING), ("is_available", ASCENDING)]),
         ],
 
+        # Only booked/reserved slots are stored; open slots are computed
+        "counseling_time_slots": [
+            IndexModel([("id", ASCENDING)], unique=True),
+            IndexModel(
+                [("church_id", ASCENDING), ("counselor_id", ASCENDING),
+                 ("date", ASCENDING), ("start_time", ASCENDING)],
+                unique=True,
+            ),
+            IndexModel([("church_id", ASCENDING), ("date", ASCENDING), ("status", ASCENDING)]),
+        ],
+
+        "counseling_recurring_rules": [
+            IndexModel([("church_id", ASCENDING), ("counselor_id", ASCENDING), ("is_active", ASCENDING)]),
+        ],
+
+        "counseling_overrides": [
+            IndexModel([("church_id", ASCENDING), ("date", ASCENDING), ("counselor_id", ASCENDING)]),
+        ],
+
         "counselors": [
             IndexModel([("church_id", ASCENDING), ("is_active", ASCENDING)]),
             IndexModel([("id", ASCENDING)], unique=True),
@@ -123,6 +196,28 @@ class IndexManager:
             IndexModel([("church_id", ASCENDING), ("published_at", DESCENDING)]),
             IndexModel([("church_id", ASCENDING), ("category", ASCENDING)]),
             IndexModel([("church_id", ASCENDING), ("deleted", ASCENDING)]),
+            IndexModel([("church_id", ASCENDING), ("slug", ASCENDING)], unique=True),
+            IndexModel([("church_id", ASCENDING), ("publish_date", DESCENDING)]),
+            IndexModel([("church_id", ASCENDING), ("scheduled_publish_date", ASCENDING)]),
+            IndexModel([("church_id", ASCENDING), ("schedule_status", ASCENDING)]),
+            IndexModel([("church_id", ASCENDING), ("created_at", DESCENDING)]),
+            IndexModel([("id", ASCENDING)]),
+        ],
+
+        "article_categories": [
+            IndexModel([("church_id", ASCENDING), ("slug", ASCENDING)], unique=True),
+            IndexModel([("church_id", ASCENDING), ("name", ASCENDING)]),
+        ],
+
+        "article_tags": [
+            IndexModel([("church_id", ASCENDING), ("slug", ASCENDING)], unique=True),
+            IndexModel([("church_id", ASCENDING), ("name", ASCENDING)]),
+        ],
+
+        "article_comments": [
+            IndexModel([("church_id", ASCENDING), ("article_id", ASCENDING)]),
+            IndexModel([("church_id", ASCENDING), ("status", ASCENDING)]),
+            IndexModel([("church_id", ASCENDING), ("created_at", DESCENDING)]),
         ],
 
         # Prayer Requests
@@ -130,6 +225,15 @@ class IndexManager:
             IndexModel([("church_id", ASCENDING), ("is_active", ASCENDING)]),
             IndexModel([("church_id", ASCENDING), ("member_id", ASCENDING)]),
             IndexModel([("church_id", ASCENDING), ("created_at", DESCENDING)]),
+            IndexModel([("church_id", ASCENDING), ("status", ASCENDING), ("created_at", DESCENDING)]),
+            IndexModel([("church_id", ASCENDING), ("category", ASCENDING)]),
+            IndexModel([("church_id", ASCENDING), ("assigned_to_user_id", ASCENDING)]),
+        ],
+
+        # Prayer intelligence
+        "prayer_analyses": [
+            IndexModel([("church_id", ASCENDING), ("prayer_request_id", ASCENDING)]),
+            IndexModel([("prayer_request_id", ASCENDING)], unique=True),
         ],
 
         # Devotions
@@ -211,6 +315,23 @@ class IndexManager:
             IndexModel([("church_id", ASCENDING), ("user_id", ASCENDING), ("content_type", ASCENDING), ("content_id", ASCENDING)], unique=True),
         ],
 
+        "user_explore_progress": [
+            IndexModel([("church_id", ASCENDING), ("user_id", ASCENDING)], unique=True),
+            IndexModel([("church_id", ASCENDING), ("streak.current_streak", DESCENDING)]),
+        ],
+
+        "user_spiritual_profiles": [
+            IndexModel([("church_id", ASCENDING), ("user_id", ASCENDING)], unique=True),
+            IndexModel([("church_id", ASCENDING), ("onboarding_completed", ASCENDING)]),
+            IndexModel([("church_id", ASCENDING), ("life_situation", ASCENDING), ("deleted", ASCENDING)]),
+        ],
+
+        "user_journey_enrollments": [
+            IndexModel([("church_id", ASCENDING), ("user_id", ASCENDING), ("deleted", ASCENDING)]),
+            IndexModel([("church_id", ASCENDING), ("user_id", ASCENDING), ("status", ASCENDING)]),
+            IndexModel([("church_id", ASCENDING), ("journey_slug", ASCENDING), ("status", ASCENDING)]),
+        ],
+
         # Explore Analytics
         "explore_analytics": [
             IndexModel([("church_id", ASCENDING), ("date", DESCENDING)]),
@@ -229,11 +350,62 @@ class IndexManager:
             IndexModel([("church_id", ASCENDING)], unique=True),
         ],
 
+        "church_explore_settings": [
+            IndexModel([("church_id", ASCENDING)], unique=True),
+        ],
+
+        # Daily Explore content (global and church-scoped)
+        "content_schedule": [
+            IndexModel([("church_id", ASCENDING), ("content_type", ASCENDING), ("date", ASCENDING)]),
+            IndexModel([("church_id", ASCENDING), ("is_takeover", ASCENDING)]),
+        ],
+
+        "daily_devotions": [
+            IndexModel([("scope", ASCENDING), ("status", ASCENDING), ("published_at", ASCENDING)]),
+            IndexModel([("scope", ASCENDING), ("church_id", ASCENDING)]),
+            IndexModel([("id", ASCENDING)]),
+        ],
+
+        "verses_of_the_day": [
+            IndexModel([("scope", ASCENDING), ("status", ASCENDING), ("published_at", ASCENDING)]),
+            IndexModel([("id", ASCENDING)]),
+        ],
+
+        "bible_figures_of_the_day": [
+            IndexModel([("scope", ASCENDING), ("status", ASCENDING), ("published_at", ASCENDING)]),
+        ],
+
+        "bible_figures": [
+            # Generation pipeline upserts by id
+            IndexModel([("id", ASCENDING)], unique=True),
+        ],
+
+        "daily_quizzes": [
+            IndexModel([("scope", ASCENDING), ("status", ASCENDING), ("published_at", ASCENDING)]),
+            IndexModel([("id", ASCENDING)]),
+        ],
+
+        "bible_studies": [
+            IndexModel([("scope", ASCENDING), ("status", ASCENDING)]),
+            IndexModel([("id", ASCENDING)]),
+        ],
+
+        "topical_categories": [
+            IndexModel([("scope", ASCENDING), ("order", ASCENDING)]),
+        ],
+
+        # News context for Explore generation (expires after 30 days)
+        "news_contexts": [
+            IndexModel([("date", DESCENDING)]),
+            IndexModel([("created_at", ASCENDING)], expireAfterSeconds=30 * 24 * 3600),
+        ],
+
         # AI Generation Queue
         "ai_generation_queue": [
             IndexModel([("church_id", ASCENDING), ("user_id", ASCENDING), ("created_at", DESCENDING)]),
             IndexModel([("church_id", ASCENDING), ("status", ASCENDING), ("created_at", DESCENDING)]),
             IndexModel([("status", ASCENDING), ("created_at", ASCENDING)]),
+            IndexModel([("created_at", ASCENDING)], expireAfterSeconds=30 * 24 * 3600),
         ],
 
         # Prompt Configurations
@@ -263,9 +435,171 @@ class IndexManager:
 
         # Audit Logs
         "audit_logs": [
+            # Unique id makes replaying spilled audit entries idempotent
+            IndexModel([("id", ASCENDING)], unique=True),
+            IndexModel([("church_id", ASCENDING), ("timestamp", DESCENDING)]),
             IndexModel([("church_id", ASCENDING), ("created_at", DESCENDING)]),
             IndexModel([("church_id", ASCENDING), ("user_id", ASCENDING)]),
             IndexModel([("church_id", ASCENDING), ("action", ASCENDING)]),
+            IndexModel([("church_id", ASCENDING), ("module", ASCENDING)]),
+        ],
+
+        # Accounting
+        "chart_of_accounts": [
+            IndexModel([("church_id", ASCENDING), ("code", ASCENDING)], unique=True),
+            IndexModel([("church_id", ASCENDING), ("is_active", ASCENDING)]),
+            IndexModel([("church_id", ASCENDING), ("account_type", ASCENDING)]),
+        ],
+
+        "responsibility_centers": [
+            IndexModel([("church_id", ASCENDING), ("code", ASCENDING)], unique=True),
+            IndexModel([("church_id", ASCENDING), ("is_active", ASCENDING)]),
+        ],
+
+        "journals": [
+            IndexModel([("church_id", ASCENDING), ("date", DESCENDING)]),
+            IndexModel([("church_id", ASCENDING), ("journal_type", ASCENDING)]),
+            IndexModel([("church_id", ASCENDING), ("journal_number", ASCENDING)], unique=True),
+            IndexModel([("id", ASCENDING)]),
+            # Reports: approved journals in a date range (general ledger, trial balance)
+            IndexModel([("church_id", ASCENDING), ("status", ASCENDING), ("date", ASCENDING)]),
+            # Account ledger/balance and "is this account used" (multikey over lines)
+            IndexModel([("church_id", ASCENDING), ("lines.account_id", ASCENDING), ("status", ASCENDING), ("date", ASCENDING)]),
+        ],
+
+        "fiscal_periods": [
+            IndexModel([("church_id", ASCENDING), ("month", ASCENDING), ("year", ASCENDING)], unique=True),
+            IndexModel([("church_id", ASCENDING), ("status", ASCENDING)]),
+        ],
+
+        "budgets": [
+            IndexModel([("church_id", ASCENDING), ("fiscal_year", ASCENDING)]),
+            IndexModel([("church_id", ASCENDING), ("status", ASCENDING)]),
+        ],
+
+        "fixed_assets": [
+            IndexModel([("church_id", ASCENDING), ("asset_code", ASCENDING)], unique=True),
+            IndexModel([("church_id", ASCENDING), ("is_active", ASCENDING)]),
+        ],
+
+        "asset_depreciation_logs": [
+            IndexModel([("church_id", ASCENDING), ("asset_id", ASCENDING)]),
+            IndexModel([("church_id", ASCENDING), ("period_month", ASCENDING), ("period_year", ASCENDING)]),
+        ],
+
+        "bank_accounts": [
+            IndexModel([("church_id", ASCENDING), ("account_number", ASCENDING)], unique=True),
+        ],
+
+        "bank_transactions": [
+            IndexModel([("church_id", ASCENDING), ("bank_account_id", ASCENDING)]),
+            IndexModel([("church_id", ASCENDING), ("is_reconciled", ASCENDING)]),
+            IndexModel([("church_id", ASCENDING), ("transaction_date", DESCENDING)]),
+        ],
+
+        "bank_import_logs": [
+            IndexModel([("church_id", ASCENDING), ("bank_account_id", ASCENDING)]),
+        ],
+
+        "beginning_balances": [
+            IndexModel([("church_id", ASCENDING), ("status", ASCENDING)]),
+        ],
+
+        "year_end_closings": [
+            IndexModel([("church_id", ASCENDING), ("fiscal_year", ASCENDING)], unique=True),
+        ],
+
+        "file_uploads": [
+            IndexModel([("church_id", ASCENDING), ("reference_type", ASCENDING), ("reference_id", ASCENDING)]),
+        ],
+
+        "report_templates": [
+            IndexModel([("church_id", ASCENDING), ("created_by", ASCENDING)]),
+        ],
+
+        # Notifications
+        "broadcast_campaigns": [
+            IndexModel([("church_id", ASCENDING), ("status", ASCENDING)]),
+            IndexModel([("church_id", ASCENDING), ("created_at", DESCENDING)]),
+            # Scheduler: scheduled campaigns ready to send
+            IndexModel([("status", ASCENDING), ("scheduled_at", ASCENDING)]),
+            IndexModel([("id", ASCENDING)], unique=True),
+        ],
+
+        "push_notifications": [
+            IndexModel([("member_id", ASCENDING), ("church_id", ASCENDING), ("sent_at", DESCENDING)]),
+            IndexModel([("member_id", ASCENDING), ("church_id", ASCENDING), ("is_read", ASCENDING)]),
+            IndexModel([("campaign_id", ASCENDING), ("delivery_status", ASCENDING)]),
+            IndexModel([("campaign_id", ASCENDING), ("is_opened", ASCENDING)]),
+            IndexModel([("id", ASCENDING)], unique=True),
+        ],
+
+        "device_tokens": [
+            IndexModel([("fcm_token", ASCENDING), ("church_id", ASCENDING)]),
+            IndexModel([("member_id", ASCENDING), ("church_id", ASCENDING), ("is_active", ASCENDING)]),
+            IndexModel([("id", ASCENDING)], unique=True),
+        ],
+
+        "notification_templates": [
+            IndexModel([("church_id", ASCENDING), ("is_active", ASCENDING)]),
+            IndexModel([("church_id", ASCENDING), ("name", ASCENDING)]),
+            IndexModel([("id", ASCENDING)], unique=True),
+        ],
+
+        # Prayer follow-ups (dispatcher looks up by id; sweep scans unsent)
+        "prayer_followups": [
+            IndexModel([("id", ASCENDING)]),
+            IndexModel([("follow_up_sent", ASCENDING), ("follow_up_due_at", ASCENDING)]),
+            IndexModel([("church_id", ASCENDING), ("user_id", ASCENDING), ("deleted", ASCENDING)]),
+            IndexModel([("prayer_request_id", ASCENDING)]),
+        ],
+
+        # Scheduled job runs (expire after jobs.scheduled.RUNS_RETENTION_DAYS)
+        "scheduler_runs": [
+            IndexModel([("job_id", ASCENDING), ("started_at", DESCENDING)]),
+            IndexModel([("started_at", ASCENDING)], expireAfterSeconds=14 * 24 * 3600),
+        ],
+
+        # Community chat read state (one document per member per channel)
+        "community_read_watermarks": [
+            IndexModel(
+                [("member_id", ASCENDING), ("community_id", ASCENDING),
+                 ("channel_type", ASCENDING), ("subgroup_id", ASCENDING), ("church_id", ASCENDING)],
+                unique=True,
+            ),
+            # Read counts / readers of a message
+            IndexModel(
+                [("church_id", ASCENDING), ("community_id", ASCENDING), ("channel_type", ASCENDING),
+                 ("subgroup_id", ASCENDING), ("last_read_seq", DESCENDING)]
+            ),
+        ],
+
+        "community_channel_sequences": [
+            IndexModel(
+                [("church_id", ASCENDING), ("community_id", ASCENDING),
+                 ("channel_type", ASCENDING), ("subgroup_id", ASCENDING)],
+                unique=True,
+            ),
+        ],
+
+        "community_messages": [
+            # Search (search_terms is a multikey inverted index)
+            IndexModel(
+                [("church_id", ASCENDING), ("community_id", ASCENDING),
+                 ("search_terms", ASCENDING), ("created_at", DESCENDING)]
+            ),
+            # Channel history, paged by created_at
+            IndexModel(
+                [("church_id", ASCENDING), ("community_id", ASCENDING),
+                 ("channel_type", ASCENDING), ("created_at", DESCENDING)]
+            ),
+            IndexModel([("church_id", ASCENDING), ("starred_by", ASCENDING), ("created_at", DESCENDING)]),
+            IndexModel([("id", ASCENDING)]),
+        ],
+        "member_care_requests": [
+            IndexModel([("church_id", ASCENDING), ("search_tokens", ASCENDING)]),
+            IndexModel([("church_id", ASCENDING), ("search_grams", ASCENDING)]),
+            IndexModel([("church_id", ASCENDING), ("phone_e164", ASCENDING)]),
         ],
     }
 
@@ -283,54 +617,24 @@ class IndexManager:
     }
 
     @classmethod
-    async def ensure_indexes(cls, db: AsyncIOMotorDatabase) -> Dict[str, Any]:
+    async def ensure_indexes(cls, db: AsyncIOMotorDatabase, max_docs: Optional[int] = None) -> Dict[str, Any]:
         """
-        Create all indexes for optimal performance.
+        Build declared indexes that are missing, one at a time.
         Also removes deprecated indexes that conflict with new ones.
 
+        Args:
+            max_docs: Leave collections larger than this for
+                ``python scripts/index_advisor.py apply`` (None builds everything)
+
         Returns:
             Dict with creation results per collection
         """
-        results = {}
-        start_time = time.time()
+        from utils.index_advisor import IndexAdvisor
 
+        start_time = time.time()
         logger.info("Starting MongoDB index initialization...")
 
-        # First, drop any deprecated indexes
-        for collection_name, deprecated in cls.DEPRECATED_INDEXES.items():
-            try:
-                collection = db[collection_name]
-                existing_indexes = await collection.index_information()
-
-                for index_name in deprecated:
-                    if index_name in existing_indexes:
-                        await collection.drop_index(index_name)
-                        logger.info(f"Dropped deprecated index {index_name} from {collection_name}")
-            except Exception as e:
-                logger.warning(f"Error dropping deprecated indexes from {collection_name}: {e}")
-
-        # Now create indexes
-        for collection_name, indexes in cls.INDEXES.items():
-            try:
-                collection = db[collection_name]
-
-                # Create indexes (MongoDB ignores duplicates)
-                created = await collection.create_indexes(indexes)
-
-                results[collection_name] = {
-                    "status": "success",
-                    "indexes_created": len(created),
-                    "index_names": created
-                }
-
-                logger.debug(f"Created {len(created)} indexes for {collection_name}")
-
-            except Exception as e:
-                results[collection_name] = {
-                    "status": "error",
-                    "error": str(e)
-                }
-                logger.warning(f"Failed to create indexes for {collection_name}: {e}")
+        results = await IndexAdvisor(db, cls.INDEXES).apply(max_docs=max_docs)
 
         elapsed = time.time() - start_time
         logger.info(f"Index initialization completed in {elapsed:.2f}s")
@@ -362,8 +666,13 @@ class IndexManager:
 
 class LRUCache(Generic[T]):
     """
-    Thread-safe LRU cache with TTL support.
+    In-process LRU cache with TTL support.
     Suitable for caching database results, computed values, etc.
+
+    Lock-free: every operation runs to completion on the event loop without
+    awaiting, so no asyncio.Lock is needed. For data that other instances
+    can change, use services.redis.tiered_cache (L1 + Redis, invalidated
+    via pub/sub) instead.
     """
 
     def __init__(self, max_size: int = 1000, default_ttl: int = 300):
@@ -379,65 +688,56 @@ class LRUCache(Generic[T]):
         self._default_ttl = default_ttl
         self._hits = 0
         self._misses = 0
-        self._lock = asyncio.Lock()
 
     async def get(self, key: str) -> Optional[T]:
         """Get item from cache."""
-        async with self._lock:
-            if key not in self._cache:
-                self._misses += 1
-                return None
-
-            item = self._cache[key]
+        item = self._cache.get(key)
+        if item is None:
+            self._misses += 1
+            return None
 
-            # Check TTL
-            if item["expires_at"] < time.time():
-                del self._cache[key]
-                self._misses += 1
-                return None
+        # Check TTL
+        if item["expires_at"] < time.time():
+            self._cache.pop(key, None)
+            self._misses += 1
+            return None
 
-            # Move to end (most recently used)
-            self._cache.move_to_end(key)
-            self._hits += 1
+        # Move to end (most recently used)
+        self._cache.move_to_end(key)
+        self._hits += 1
 
-            return item["value"]
+        return item["value"]
 
     async def set(self, key: str, value: T, ttl: Optional[int] = None) -> None:
         """Set item in cache."""
-        async with self._lock:
-            ttl = ttl or self._default_ttl
-            expires_at = time.time() + ttl
+        ttl = ttl or self._default_ttl
+        now = time.time()
 
-            # Remove oldest if at capacity
-            while len(self._cache) >= self._max_size:
-                self._cache.popitem(last=False)
+        self._cache[key] = {
+            "value": value,
+            "expires_at": now + ttl,
+            "created_at": now
+        }
+        self._cache.move_to_end(key)
 
-            self._cache[key] = {
-                "value": value,
-                "expires_at": expires_at,
-                "created_at": time.time()
-            }
+        # Remove oldest if over capacity
+        while len(self._cache) > self._max_size:
+            self._cache.popitem(last=False)
 
     async def delete(self, key: str) -> bool:
         """Delete item from cache."""
-        async with self._lock:
-            if key in self._cache:
-                del self._cache[key]
-                return True
-            return False
+        return self._cache.pop(key, None) is not None
 
     async def clear(self) -> None:
         """Clear all items from cache."""
-        async with self._lock:
-            self._cache.clear()
+        self._cache.clear()
 
     async def clear_pattern(self, pattern: str) -> int:
         """Clear items matching pattern (prefix match)."""
-        async with self._lock:
-            keys_to_delete = [k for k in self._cache.keys() if k.startswith(pattern)]
-            for key in keys_to_delete:
-                del self._cache[key]
-            return len(keys_to_delete)
+        keys_to_delete = [k for k in self._cache if k.startswith(pattern)]
+        for key in keys_to_delete:
+            del self._cache[key]
+        return len(keys_to_delete)
 
     def stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
@@ -788,31 +1088,38 @@ class ResponseOptimizer:
 # ============================================================================
 
 class PerformanceMonitor:
-    """Simple performance monitoring utilities."""
+    """
+    Timings recorded by ``timed_query``.
 
-    _query_times: List[float] = []
-    _max_stored = 1000
+    Kept in a fixed-size log-linear histogram, so recording is O(1) and
+    percentiles don't sort anything. Every MongoDB command is also profiled
+    automatically by utils.query_profiler.
+    """
+
+    _histogram = LatencyHistogram()
+    _min_us: Optional[int] = None
 
     @classmethod
     def record_query_time(cls, duration: float):
         """Record a query execution time."""
-        cls._query_times.append(duration)
-        if len(cls._query_times) > cls._max_stored:
-            cls._query_times.pop(0)
+        micros = int(duration * 1_000_000)
+        cls._histogram.record(micros)
+        if cls._min_us is None or micros < cls._min_us:
+            cls._min_us = micros
 
     @classmethod
     def get_stats(cls) -> Dict[str, Any]:
         """Get performance statistics."""
-        if not cls._query_times:
+        hist = cls._histogram
+        if not hist.count:
             return {"message": "No queries recorded"}
 
-        times = cls._query_times
         return {
-            "query_count": len(times),
-            "avg_ms": sum(times) / len(times) * 1000,
-            "max_ms": max(times) * 1000,
-            "min_ms": min(times) * 1000,
-            "p95_ms": sorted(times)[int(len(times) * 0.95)] * 1000 if len(times) > 20 else None,
+            "query_count": hist.count,
+            "avg_ms": hist.total_us / hist.count / 1000,
+            "max_ms": hist.max_us / 1000,
+            "min_ms": (cls._min_us or 0) / 1000,
+            "p95_ms": hist.percentile(0.95) if hist.count > 20 else None,
         }
 
 
@@ -845,9 +1152,11 @@ async def initialize_performance_optimizations(db: AsyncIOMotorDatabase) -> Dict
         "optimizations": {}
     }
 
-    # 1. Create indexes
+    # 1. Create missing indexes (large collections are left for the index advisor CLI)
+    from utils.index_advisor import INDEX_BUILD_STARTUP_MAX_DOCS
+
     logger.info("Initializing database indexes...")
-    index_results = await IndexManager.ensure_indexes(db)
+    index_results = await IndexManager.ensure_indexes(db, max_docs=INDEX_BUILD_STARTUP_MAX_DOCS)
     results["optimizations"]["indexes"] = {
         "status": "completed",
         "collections_processed": len(index_results),
@@ -0,0 +1,115 @@
+"""
+In-process verified-principal cache for get_current_user.
+
+Every authenticated request used to hash the bearer token and GET
+``faithflow:jwt:<hash>`` from Redis before any handler ran. This cache
+keeps the verified principal in process memory, keyed by the same token
+hash, so repeat requests with the same token skip the network entirely.
+
+- Entries live for at most PRINCIPAL_CACHE_TTL seconds and never past the
+  token's own ``exp``.
+- The cache is bounded (LRU) at PRINCIPAL_CACHE_MAX entries.
+- Entries are indexed by subject (user or API key id) so a
+  USER_SESSION invalidation message evicts all of a user's tokens at once.
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Set
+
+PRINCIPAL_CACHE_TTL = 300  # seconds (same as the Redis JWT cache)
+PRINCIPAL_CACHE_MAX = 10000
+
+
+@dataclass
+class _Entry:
+    principal: Dict[str, Any]
+    subject: str
+    expires_at: float
+
+
+class PrincipalCache:
+    """Bounded LRU of verified principals keyed by token hash."""
+
+    def __init__(self, max_size: int = PRINCIPAL_CACHE_MAX, ttl: int = PRINCIPAL_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._by_subject: Dict[str, Set[str]] = {}
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0, "invalidations": 0}
+
+    def ttl_for(self, payload: Dict[str, Any]) -> float:
+        """Seconds a principal may be cached: capped by the token's remaining lifetime."""
+        exp = payload.get("exp")
+        if exp is None:
+            return float(self.ttl)
+        return max(0.0, min(float(self.ttl), float(exp) - time.time()))
+
+    def get(self, token_hash: str) -> Optional[Dict[str, Any]]:
+        """Cached principal for a token hash (a shallow copy), or None."""
+        entry = self._entries.get(token_hash)
+        if entry is None:
+            self._stats["misses"] += 1
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove(token_hash)
+            self._stats["expired"] += 1
+            self._stats["misses"] += 1
+            return None
+        self._entries.move_to_end(token_hash)
+        self._stats["hits"] += 1
+        return dict(entry.principal)
+
+    def put(self, token_hash: str, principal: Dict[str, Any], payload: Dict[str, Any]) -> None:
+        """Cache a verified principal for the lifetime allowed by ``payload``."""
+        ttl = self.ttl_for(payload)
+        subject = str(payload.get("sub") or principal.get("id") or "")
+        if ttl <= 0 or not subject:
+            return
+
+        if token_hash in self._entries:
+            self._remove(token_hash)
+        self._entries[token_hash] = _Entry(dict(principal), subject, time.monotonic() + ttl)
+        self._by_subject.setdefault(subject, set()).add(token_hash)
+
+        while len(self._entries) > self.max_size:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self._stats["evictions"] += 1
+
+    def evict_subject(self, subject: str) -> int:
+        """Drop every cached token of a user or API key. Returns entries removed."""
+        hashes = self._by_subject.pop(subject, set())
+        for token_hash in hashes:
+            self._entries.pop(token_hash, None)
+        if hashes:
+            self._stats["invalidations"] += len(hashes)
+        return len(hashes)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._by_subject.clear()
+
+    def _remove(self, token_hash: str) -> None:
+        entry = self._entries.pop(token_hash, None)
+        if entry is None:
+            return
+        hashes = self._by_subject.get(entry.subject)
+        if hashes is not None:
+            hashes.discard(token_hash)
+            if not hashes:
+                del self._by_subject[entry.subject]
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self._stats["hits"] + self._stats["misses"]
+        hit_rate = self._stats["hits"] / lookups * 100 if lookups else 0
+        return {
+            **self._stats,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hit_rate": f"{hit_rate:.1f}%",
+        }
+
+
+principal_cache = PrincipalCache()
@@ -0,0 +1,686 @@
+"""
+MongoDB Query Profiler
+
+A pymongo CommandListener attached to the Motor client sees every command
+the app sends, so nothing has to be decorated (``timed_query`` only
+covered the few functions someone remembered to wrap). For each command:
+
+- the command is reduced to a *fingerprint*: command, collection and the
+  shape of its filter/pipeline/sort with every value replaced by ``?``
+  (``find members {"church_id":?,"is_deleted":{"$ne":?}} sort {"full_name":1}``)
+- its latency goes into an HDR-style log-linear histogram for that
+  fingerprint (8 sub-buckets per power of two, ~12% precision, 1µs-1h)
+- the route handler that issued it (RequestContext) is counted against it
+- new and slow fingerprints are explained (``queryPlanner`` verbosity, rate
+  limited) so collection scans show up with the handlers causing them
+
+Recording is lock-free: listener callbacks run on Motor's executor
+threads and each thread writes only to its own shard; readers merge the
+shards. Every ROLLUP_INTERVAL each instance adds its deltas to hourly
+Redis hashes, so the admin endpoint (routes/query_profile.py) and the
+Prometheus text export show the whole cluster.
+
+Disable with QUERY_PROFILER_ENABLED=false; tune with
+QUERY_PROFILER_SLOW_MS (default 200).
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from pymongo import monitoring
+
+from config.redis import get_redis
+from services.redis.utils import redis_key
+from utils.serialization import json_dumps_str, json_loads
+
+logger = logging.getLogger(__name__)
+
+
+PROFILER_ENABLED = os.getenv("QUERY_PROFILER_ENABLED", "true").lower() == "true"
+SLOW_QUERY_MS = float(os.getenv("QUERY_PROFILER_SLOW_MS", "200"))
+
+# Commands worth profiling (handshakes, auth, index builds etc. are ignored)
+PROFILED_COMMANDS = {
+    "find", "aggregate", "count", "distinct", "update", "delete",
+    "findAndModify", "insert", "getMore",
+}
+EXPLAINABLE_COMMANDS = {"find", "aggregate", "count", "distinct", "update", "delete", "findAndModify"}
+
+# Keys that carry the query shape, per command
+_SHAPE_KEYS = {
+    "find": ("filter", "sort", "projection", "hint"),
+    "count": ("query", "hint"),
+    "distinct": ("key", "query"),
+    "findAndModify": ("query", "sort"),
+}
+
+# Session/transport fields stripped before re-issuing a command as explain
+_TRANSPORT_FIELDS = {"lsid", "txnNumber", "autocommit", "startTransaction", "readConcern", "writeConcern", "cursor"}
+
+MAX_FINGERPRINTS = 2000
+OVERFLOW_FINGERPRINT = "overflow"
+BACKGROUND_HANDLER = "(background)"
+
+# Explain each fingerprint at most this often, and at most one explain per EXPLAIN_MIN_GAP
+EXPLAIN_TTL = 3600
+EXPLAIN_MIN_GAP = 1.0
+
+SLOW_SAMPLES_LOCAL = 100
+SLOW_SAMPLES_CLUSTER = 500
+
+ROLLUP_INTERVAL = 30  # seconds
+ROLLUP_RETENTION = 48 * 3600
+
+# Bucket bounds (seconds) for the Prometheus export
+PROMETHEUS_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+# ==================== Histogram ====================
+
+SUB_BUCKETS = 8
+NUM_BUCKETS = 240  # covers 0 .. ~2^32 µs (~71 minutes)
+
+
+def bucket_index(micros: int) -> int:
+    """Log-linear bucket of a latency in microseconds."""
+    if micros < SUB_BUCKETS:
+        return max(micros, 0)
+    shift = micros.bit_length() - 4
+    return min(SUB_BUCKETS + shift * SUB_BUCKETS + ((micros >> shift) - SUB_BUCKETS), NUM_BUCKETS - 1)
+
+
+def bucket_upper(index: int) -> int:
+    """Largest latency (µs) that falls in a bucket."""
+    if index < SUB_BUCKETS:
+        return index
+    shift, offset = divmod(index - SUB_BUCKETS, SUB_BUCKETS)
+    return ((offset + SUB_BUCKETS + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """Fixed-size log-linear latency histogram (one writer per instance)."""
+
+    __slots__ = ("counts", "count", "total_us", "max_us")
+
+    def __init__(self):
+        self.counts = [0] * NUM_BUCKETS
+        self.count = 0
+        self.total_us = 0
+        self.max_us = 0
+
+    def record(self, micros: int) -> None:
+        self.counts[bucket_index(micros)] += 1
+        self.count += 1
+        self.total_us += micros
+        if micros > self.max_us:
+            self.max_us = micros
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        counts = self.counts
+        for i, n in enumerate(other.counts):
+            if n:
+                counts[i] += n
+        self.count += other.count
+        self.total_us += other.total_us
+        self.max_us = max(self.max_us, other.max_us)
+
+    def percentile(self, q: float) -> float:
+        """Latency (ms) at quantile q (0-1), to bucket precision."""
+        if not self.count:
+            return 0.0
+        rank = max(1, int(round(q * self.count)))
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(bucket_upper(i), self.max_us) / 1000
+        return self.max_us / 1000
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_us / 1000, 1),
+            "mean_ms": round(self.total_us / self.count / 1000, 2) if self.count else 0.0,
+            "p50_ms": round(self.percentile(0.50), 2),
+            "p95_ms": round(self.percentile(0.95), 2),
+            "p99_ms": round(self.percentile(0.99), 2),
+            "max_ms": round(self.max_us / 1000, 2),
+        }
+
+
+# ==================== Fingerprints ====================
+
+def query_shape(value: Any, depth: int = 0) -> Any:
+    """A filter/pipeline with every literal replaced by ``?``."""
+    if depth > 8:
+        return "?"
+    if isinstance(value, dict):
+        return {k: query_shape(v, depth + 1) for k, v in sorted(value.items())}
+    if isinstance(value, (list, tuple)):
+        # Lists of operators ($and/$or/pipelines) keep their structure; value lists collapse
+        shapes = [query_shape(v, depth + 1) for v in value if isinstance(v, dict)]
+        return shapes if shapes else ["?"]
+    return "?"
+
+
+def _pipeline_shape(pipeline: Iterable[Dict[str, Any]]) -> List[Any]:
+    shape = []
+    for stage in pipeline or []:
+        name = next(iter(stage), "?")
+        if name in ("$match", "$sort"):
+            shape.append({name: query_shape(stage[name]) if name == "$match" else stage[name]})
+        elif name == "$lookup":
+            shape.append({name: stage[name].get("from", "?")})
+        else:
+            shape.append(name)
+    return shape
+
+
+def command_shape(command_name: str, command: Dict[str, Any]) -> Dict[str, Any]:
+    """The parts of a command that decide its plan, with values removed."""
+    if command_name == "aggregate":
+        return {"pipeline": _pipeline_shape(command.get("pipeline"))}
+    if command_name in ("update", "delete"):
+        statements = command.get("updates" if command_name == "update" else "deletes") or [{}]
+        first = statements[0]
+        shape = {"q": query_shape(first.get("q", {}))}
+        if command_name == "update" and first.get("upsert"):
+            shape["upsert"] = True
+        if command_name == "delete" or first.get("multi"):
+            shape["multi"] = bool(first.get("multi", first.get("limit") == 0))
+        return shape
+    shape = {}
+    for key in _SHAPE_KEYS.get(command_name, ()):
+        if key in command:
+            value = command[key]
+            shape[key] = value if key in ("sort", "hint", "key") else query_shape(value)
+    return shape
+
+
+def fingerprint(command_name: str, collection: str, shape: Dict[str, Any]) -> str:
+    """Short stable id of a command shape."""
+    raw = f"{command_name}|{collection}|{json_dumps_str(shape)}"
+    return hashlib.blake2b(raw.encode(), digest_size=6).hexdigest()
+
+
+def plan_summary(explain: Dict[str, Any]) -> Dict[str, Any]:
+    """Stages and indexes used by an explain's winning plan."""
+    planner = explain.get("queryPlanner") or {}
+    if not planner and "stages" in explain:
+        # Aggregation explain: the $cursor stage holds the query planner output
+        for stage in explain["stages"]:
+            if "$cursor" in stage:
+                planner = stage["$cursor"].get("queryPlanner", {})
+                break
+
+    stages, indexes = [], []
+
+    def walk(node: Any) -> None:
+        if isinstance(node, dict):
+            if "stage" in node:
+                stages.append(node["stage"])
+            if "indexName" in node:
+                indexes.append(node["indexName"])
+            for value in node.values():
+                walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                walk(value)
+
+    walk(planner.get("winningPlan", {}))
+    return {
+        "collscan": "COLLSCAN" in stages,
+        "stages": list(dict.fromkeys(stages)),
+        "indexes": list(dict.fromkeys(indexes)),
+    }
+
+
+# ==================== Recording ====================
+
+# fingerprint -> (latency histogram, {handler: commands})
+Entries = Dict[str, Tuple[LatencyHistogram, Dict[str, int]]]
+
+
+class _FingerprintStats:
+    __slots__ = ("histogram", "handlers")
+
+    def __init__(self):
+        self.histogram = LatencyHistogram()
+        self.handlers: Dict[str, int] = {}
+
+
+class _Shard:
+    """Stats written by one thread."""
+
+    def __init__(self):
+        self.stats: Dict[str, _FingerprintStats] = {}
+
+
+class QueryProfiler(monitoring.CommandListener):
+    """Per-fingerprint latency histograms, handler attribution and plan sampling."""
+
+    def __init__(self, slow_ms: float = SLOW_QUERY_MS, enabled: bool = PROFILER_ENABLED):
+        self.enabled = enabled
+        self.slow_us = int(slow_ms * 1000)
+        self._local = threading.local()
+        self._shards: List[_Shard] = []
+        self._shards_lock = threading.Lock()  # only taken when a thread first records
+        self._meta: Dict[str, Dict[str, Any]] = {}
+        self._pending: Dict[Tuple[Any, int], Tuple[str, str, Optional[Dict[str, Any]], Optional[int]]] = {}
+        self._cursors: Dict[int, Tuple[str, str]] = {}
+        self._plans: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._slow: deque = deque(maxlen=SLOW_SAMPLES_LOCAL)
+        self._slow_unpushed: deque = deque(maxlen=SLOW_SAMPLES_LOCAL)
+        self._pushed: Dict[str, Tuple[List[int], int, int, Dict[str, int]]] = {}
+        self._last_explain = 0.0
+        self._explaining = False
+        self._client = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._rollup_lock = asyncio.Lock()  # the periodic task and the admin endpoint both roll up
+        self._stats = {"explains": 0, "explain_errors": 0, "rollups": 0, "rollup_errors": 0}
+
+    # ---------- listener callbacks (Motor executor threads) ----------
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        name = event.command_name
+        if name not in PROFILED_COMMANDS:
+            return
+        try:
+            command = event.command
+            if name == "getMore":
+                cursor_id = command.get("getMore")
+                origin = self._cursors.get(cursor_id)
+                if origin is None:
+                    return
+                self._pending[(event.connection_id, event.request_id)] = (origin[0], origin[1], None, cursor_id)
+                return
+
+            collection = command.get(name)
+            if not isinstance(collection, str):
+                return
+            fp = self._fingerprint(name, collection, event.database_name, command)
+            explain = command if name in EXPLAINABLE_COMMANDS else None
+            self._pending[(event.connection_id, event.request_id)] = (fp, self._handler(), explain, None)
+        except Exception as e:
+            logger.debug(f"Query profiler skipped {name}: {e}")
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        pending = self._pending.pop((event.connection_id, event.request_id), None)
+        if pending is None:
+            return
+        fp, handler, command, cursor_id = pending
+        self._record(fp, handler, event.duration_micros)
+
+        # Attribute getMores of a cursor to the find/aggregate that opened it
+        if event.command_name in ("find", "aggregate"):
+            opened = (event.reply.get("cursor") or {}).get("id")
+            if opened:
+                if len(self._cursors) >= 10_000:
+                    self._cursors.clear()  # abandoned cursors; start over
+                self._cursors[opened] = (fp, handler)
+        elif cursor_id is not None and not (event.reply.get("cursor") or {}).get("id"):
+            self._cursors.pop(cursor_id, None)
+
+        if command is not None:
+            self._maybe_explain(fp, event.database_name, command, event.duration_micros, handler)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        pending = self._pending.pop((event.connection_id, event.request_id), None)
+        if pending is not None:
+            self._record(pending[0], pending[1], event.duration_micros)
+            if pending[3] is not None:
+                self._cursors.pop(pending[3], None)
+
+    # ---------- helpers ----------
+
+    @staticmethod
+    def _handler() -> str:
+        from middleware.request_context import get_request_context
+
+        ctx = get_request_context()
+        return ctx.handler if ctx is not None else BACKGROUND_HANDLER
+
+    def _fingerprint(self, name: str, collection: str, database: str, command: Dict[str, Any]) -> str:
+        shape = command_shape(name, command)
+        fp = fingerprint(name, collection, shape)
+        if fp not in self._meta:
+            if len(self._meta) >= MAX_FINGERPRINTS:
+                return OVERFLOW_FINGERPRINT
+            self._meta[fp] = {
+                "fingerprint": fp,
+                "command": name,
+                "collection": collection,
+                "database": database,
+                "shape": json_dumps_str(shape),
+            }
+        return fp
+
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = _Shard()
+            with self._shards_lock:
+                self._shards.append(shard)
+        return shard
+
+    def _record(self, fp: str, handler: str, micros: int) -> None:
+        stats = self._shard().stats.get(fp)
+        if stats is None:
+            stats = self._shard().stats[fp] = _FingerprintStats()
+        stats.histogram.record(micros)
+        stats.handlers[handler] = stats.handlers.get(handler, 0) + 1
+
+    def _maybe_explain(self, fp: str, database: str, command: Dict[str, Any], micros: int, handler: str) -> None:
+        slow = micros >= self.slow_us
+        plan = self._plans.get(fp)
+        fresh = plan is not None and time.monotonic() - plan[0] < EXPLAIN_TTL
+
+        if slow:
+            sample = {
+                "fingerprint": fp,
+                "handler": handler,
+                "duration_ms": round(micros / 1000, 1),
+                "at": time.time(),
+                **{k: v for k, v in self._meta.get(fp, {}).items() if k in ("command", "collection", "shape")},
+                "plan": plan[1] if plan else None,
+            }
+            self._slow.appendleft(sample)
+            self._slow_unpushed.appendleft(sample)
+
+        # Explain new fingerprints once, and slow ones again when the plan is stale
+        if fresh or fp == OVERFLOW_FINGERPRINT or self._loop is None or self._client is None:
+            return
+        now = time.monotonic()
+        if self._explaining or now - self._last_explain < EXPLAIN_MIN_GAP:
+            return
+        self._explaining = True
+        self._last_explain = now
+        asyncio.run_coroutine_threadsafe(self._explain(fp, database, command), self._loop)
+
+    async def _explain(self, fp: str, database: str, command: Dict[str, Any]) -> None:
+        try:
+            cmd = {k: v for k, v in command.items() if not k.startswith("$") and k not in _TRANSPORT_FIELDS}
+            for key in ("updates", "deletes"):
+                if key in cmd:
+                    cmd[key] = cmd[key][:1]  # explain takes a single statement
+            if "pipeline" in cmd:
+                cmd["cursor"] = {}
+            result = await self._client[database].command({"explain": cmd, "verbosity": "queryPlanner"})
+            summary = plan_summary(result)
+            self._plans[fp] = (time.monotonic(), summary)
+            self._meta.get(fp, {})["plan"] = summary
+            self._stats["explains"] += 1
+            if summary["collscan"]:
+                meta = self._meta.get(fp, {})
+                logger.warning(f"Collection scan: {meta.get('command')} {meta.get('collection')} {meta.get('shape')}")
+        except Exception as e:
+            # Don't retry this fingerprint until the TTL passes
+            self._plans[fp] = (time.monotonic(), {"collscan": None, "error": str(e)[:200]})
+            self._stats["explain_errors"] += 1
+        finally:
+            self._explaining = False
+
+    # ---------- reading ----------
+
+    def snapshot(self) -> Dict[str, _FingerprintStats]:
+        """All shards merged into one stats entry per fingerprint."""
+        merged: Dict[str, _FingerprintStats] = {}
+        with self._shards_lock:
+            shards = list(self._shards)
+        for shard in shards:
+            for fp, stats in list(shard.stats.items()):
+                target = merged.get(fp)
+                if target is None:
+                    target = merged[fp] = _FingerprintStats()
+                target.histogram.merge(stats.histogram)
+                for handler, n in list(stats.handlers.items()):
+                    target.handlers[handler] = target.handlers.get(handler, 0) + n
+        return merged
+
+    def local_entries(self) -> Tuple[Entries, Dict[str, Dict[str, Any]], List[Dict[str, Any]]]:
+        """This instance's (histograms per fingerprint, metadata, slow samples)."""
+        entries = {fp: (stats.histogram, stats.handlers) for fp, stats in self.snapshot().items()}
+        return entries, dict(self._meta), list(self._slow)
+
+    def get_stats(self) -> Dict[str, Any]:
+        merged = self.snapshot()
+        total = LatencyHistogram()
+        for stats in merged.values():
+            total.merge(stats.histogram)
+        collscans = sum(1 for meta in self._meta.values() if (meta.get("plan") or {}).get("collscan"))
+        return {
+            **self._stats,
+            "enabled": self.enabled,
+            "fingerprints": len(self._meta),
+            "collscan_fingerprints": collscans,
+            "slow_samples": len(self._slow),
+            **{k: v for k, v in total.summary().items() if k != "count"},
+        }
+
+    # ---------- cluster rollup ----------
+
+    @staticmethod
+    def _hour(ts: Optional[float] = None) -> str:
+        return time.strftime("%Y%m%d%H", time.gmtime(ts if ts is not None else time.time()))
+
+    async def rollup(self) -> int:
+        """Add this instance's deltas since the last rollup to the Redis hourly hashes."""
+        async with self._rollup_lock:
+            return await self._rollup()
+
+    async def _rollup(self) -> int:
+        merged = self.snapshot()
+        hour = self._hour()
+        hist_key = redis_key("queryprof", "hist", hour)
+        handlers_key = redis_key("queryprof", "handlers", hour)
+        meta_key = redis_key("queryprof", "meta")
+        slow_key = redis_key("queryprof", "slow")
+
+        redis = await get_redis()
+        pushed = 0
+        next_pushed = {}
+        async with redis.pipeline(transaction=False) as pipe:
+            for fp, stats in merged.items():
+                hist = stats.histogram
+                prev_counts, prev_count, prev_total, prev_handlers = self._pushed.get(fp, ([0] * NUM_BUCKETS, 0, 0, {}))
+                if hist.count == prev_count:
+                    next_pushed[fp] = self._pushed[fp]
+                    continue
+                for i, n in enumerate(hist.counts):
+                    if n != prev_counts[i]:
+                        pipe.hincrby(hist_key, f"{fp}:{i}", n - prev_counts[i])
+                pipe.hincrby(hist_key, f"{fp}:n", hist.count - prev_count)
+                pipe.hincrby(hist_key, f"{fp}:us", hist.total_us - prev_total)
+                for handler, n in stats.handlers.items():
+                    if n != prev_handlers.get(handler, 0):
+                        pipe.hincrby(handlers_key, f"{fp}|{handler}", n - prev_handlers.get(handler, 0))
+                if fp in self._meta:
+                    pipe.hset(meta_key, fp, json_dumps_str(self._meta[fp]))
+                next_pushed[fp] = (list(hist.counts), hist.count, hist.total_us, dict(stats.handlers))
+                pushed += 1
+
+            samples = [self._slow_unpushed.pop() for _ in range(len(self._slow_unpushed))]
+            for sample in samples:
+                pipe.lpush(slow_key, json_dumps_str(sample))
+            if samples:
+                pipe.ltrim(slow_key, 0, SLOW_SAMPLES_CLUSTER - 1)
+
+            pipe.expire(hist_key, ROLLUP_RETENTION)
+            pipe.expire(handlers_key, ROLLUP_RETENTION)
+            pipe.expire(meta_key, ROLLUP_RETENTION)
+            await pipe.execute()
+
+        self._pushed = next_pushed
+        self._stats["rollups"] += 1
+        return pushed
+
+    async def cluster_entries(self, hours: int = 1) -> Tuple[Entries, Dict[str, Dict[str, Any]], List[Dict[str, Any]]]:
+        """(histograms per fingerprint, metadata, slow samples) across all instances, last ``hours`` hours."""
+        redis = await get_redis()
+        now = time.time()
+        hour_keys = [self._hour(now - h * 3600) for h in range(hours)]
+
+        async with redis.pipeline(transaction=False) as pipe:
+            for hour in hour_keys:
+                pipe.hgetall(redis_key("queryprof", "hist", hour))
+                pipe.hgetall(redis_key("queryprof", "handlers", hour))
+            pipe.hgetall(redis_key("queryprof", "meta"))
+            pipe.lrange(redis_key("queryprof", "slow"), 0, SLOW_SAMPLES_CLUSTER - 1)
+            results = await pipe.execute()
+
+        merged: Entries = {}
+
+        def entry(fp: str) -> Tuple[LatencyHistogram, Dict[str, int]]:
+            if fp not in merged:
+                merged[fp] = (LatencyHistogram(), {})
+            return merged[fp]
+
+        for i in range(len(hour_keys)):
+            for field, value in (results[2 * i] or {}).items():
+                fp, _, part = field.rpartition(":")
+                hist = entry(fp)[0]
+                if part == "n":
+                    hist.count += int(value)
+                elif part == "us":
+                    hist.total_us += int(value)
+                else:
+                    index = int(part)
+                    hist.counts[index] += int(value)
+                    hist.max_us = max(hist.max_us, bucket_upper(index))
+            for field, value in (results[2 * i + 1] or {}).items():
+                fp, _, handler = field.partition("|")
+                handlers = entry(fp)[1]
+                handlers[handler] = handlers.get(handler, 0) + int(value)
+
+        meta = {fp: json_loads(raw) for fp, raw in (results[-2] or {}).items()}
+        cutoff = now - hours * 3600
+        slow = [s for s in (json_loads(raw) for raw in results[-1] or []) if s.get("at", 0) >= cutoff]
+        return merged, meta, slow
+
+    # ---------- lifecycle ----------
+
+    def bind(self, client, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """Attach the Motor client used for explains (and the loop to run them on)."""
+        self._client = client
+        self._loop = loop or asyncio.get_running_loop()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(ROLLUP_INTERVAL)
+            try:
+                await self.rollup()
+            except Exception as e:
+                self._stats["rollup_errors"] += 1
+                logger.debug(f"Query profiler rollup failed: {e}")
+
+    def start(self, client, rollup: bool = True) -> None:
+        """Start plan sampling and the Redis rollup (call once the event loop is running)."""
+        if not self.enabled:
+            return
+        self.bind(client)
+        if rollup and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run())
+        logger.info("Query profiler started")
+
+    async def stop(self) -> None:
+        """Stop the rollup task, pushing what was recorded since the last one."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            try:
+                await self.rollup()
+            except Exception as e:
+                logger.debug(f"Final query profiler rollup failed: {e}")
+        self._loop = None
+
+
+def build_report(
+    entries: Entries,
+    meta: Dict[str, Dict[str, Any]],
+    slow: List[Dict[str, Any]],
+    sort: str = "total",
+    limit: int = 50,
+    collscan_only: bool = False,
+) -> Dict[str, Any]:
+    """Rank fingerprints and attach metadata, plans and top handlers."""
+    rows = []
+    for fp, (hist, handlers) in entries.items():
+        if not hist.count:
+            continue
+        info = meta.get(fp, {"fingerprint": fp})
+        plan = info.get("plan")
+        if collscan_only and not (plan or {}).get("collscan"):
+            continue
+        top = sorted(handlers.items(), key=lambda item: item[1], reverse=True)[:5]
+        rows.append({
+            **{k: v for k, v in info.items() if k != "plan"},
+            "fingerprint": fp,
+            **hist.summary(),
+            "collscan": (plan or {}).get("collscan"),
+            "plan": plan,
+            "handlers": [{"handler": h, "count": n} for h, n in top],
+        })
+
+    sort_key = {"total": "total_ms", "p95": "p95_ms", "p99": "p99_ms", "count": "count", "max": "max_ms"}.get(sort, "total_ms")
+    rows.sort(key=lambda row: row[sort_key], reverse=True)
+
+    collscan_handlers: Dict[str, int] = {}
+    for row in rows:
+        if row["collscan"]:
+            for h in row["handlers"]:
+                collscan_handlers[h["handler"]] = collscan_handlers.get(h["handler"], 0) + h["count"]
+
+    return {
+        "fingerprints": rows[:limit],
+        "total_fingerprints": len(rows),
+        "collscan_handlers": [
+            {"handler": h, "count": n}
+            for h, n in sorted(collscan_handlers.items(), key=lambda item: item[1], reverse=True)
+        ],
+        "slow_queries": slow[:limit],
+    }
+
+
+def prometheus_text(entries: Entries, meta: Dict[str, Dict[str, Any]]) -> str:
+    """Prometheus exposition format: one histogram (and collscan gauge) per fingerprint."""
+    lines = [
+        "# HELP faithflow_mongo_command_duration_seconds MongoDB command latency by query fingerprint",
+        "# TYPE faithflow_mongo_command_duration_seconds histogram",
+    ]
+    collscan_lines = [
+        "# HELP faithflow_mongo_command_collscan Whether the fingerprint's winning plan is a collection scan",
+        "# TYPE faithflow_mongo_command_collscan gauge",
+    ]
+    for fp, (hist, _) in sorted(entries.items()):
+        if not hist.count:
+            continue
+        info = meta.get(fp, {})
+        labels = f'collection="{info.get("collection", "")}",command="{info.get("command", "")}",fingerprint="{fp}"'
+        cumulative, index = 0, 0
+        for bound in PROMETHEUS_BUCKETS:
+            while index < NUM_BUCKETS and bucket_upper(index) < bound * 1_000_000:
+                cumulative += hist.counts[index]
+                index += 1
+            lines.append(f'faithflow_mongo_command_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'faithflow_mongo_command_duration_seconds_bucket{{{labels},le="+Inf"}} {hist.count}')
+        lines.append(f"faithflow_mongo_command_duration_seconds_sum{{{labels}}} {hist.total_us / 1_000_000:.6f}")
+        lines.append(f"faithflow_mongo_command_duration_seconds_count{{{labels}}} {hist.count}")
+        collscan = (info.get("plan") or {}).get("collscan")
+        if collscan is not None:
+            collscan_lines.append(f"faithflow_mongo_command_collscan{{{labels}}} {int(collscan)}")
+    return "\n".join(lines + collscan_lines) + "\n"
+
+
+# Global instance (registered on the Motor client in server.py / jobs/worker.py)
+query_profiler = QueryProfiler()
@@ -128,7 +128,7 @@ def log_security_event(
         event["user_agent"] = request.headers.get("user-agent", "unknown")[:200]
         event["method"] = request.method
         event["path"] = str(request.url.path)
-        event["request_id"] = request.headers.get("x-request-id", "")
+        event["request_id"] = getattr(request.state, "request_id", None) or request.headers.get("x-request-id", "")
 
     # Add user context
     if user_id:
@@ -25,10 +25,12 @@ Usage:
 """
 
 import base64
+import logging
+import re
 from datetime import datetime, date
 from decimal import Decimal
 from enum import Enum
-from typing import Any, Dict, Union
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Type, Union
 from dataclasses import asdict, is_dataclass
 
 # BSON types from pymongo
@@ -46,6 +48,10 @@ from bson.max_key import MaxKey
 # Pydantic
 from pydantic import BaseModel
 
+# FastAPI streaming
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
 # Try to import msgspec (primary) with orjson fallback
 try:
     import msgspec
@@ -59,6 +65,8 @@ try:
 except ImportError:
     ORJSON_AVAILABLE = False
 
+logger = logging.getLogger(__name__)
+
 
 def _encode_hook(obj: Any) -> Any:
     """
@@ -254,6 +262,152 @@ class MSGSpecResponse(Response):
         return json_dumps(content)
 
 
+# =============================================================================
+# STREAMING RESPONSES
+# =============================================================================
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Bytes accumulated before a chunk is handed to the server
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_EMPTY = object()
+
+# Top-level field a msgspec ValidationError points at ("... - at `$.field`")
+_ERROR_FIELD = re.compile(r"at `\$\.(\w+)")
+
+
+def wants_ndjson(request: Request) -> bool:
+    """Whether the client asked for newline-delimited JSON (Accept header)."""
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def _item_encoder(schema: Optional[Type] = None) -> Callable[[Any, bytearray], None]:
+    """Append one encoded item to a buffer, converting it to ``schema`` first."""
+    if not MSGSPEC_AVAILABLE:
+        def append(item: Any, buffer: bytearray) -> None:
+            buffer += json_dumps(item)
+        return append
+
+    if schema is None:
+        def append(item: Any, buffer: bytearray) -> None:
+            _encoder.encode_into(item, buffer, -1)
+        return append
+
+    def append(item: Any, buffer: bytearray) -> None:
+        try:
+            converted = msgspec.convert(item, schema)
+        except msgspec.ValidationError as e:
+            converted = _convert_leniently(item, schema, e)
+        _encoder.encode_into(converted, buffer, -1)
+    return append
+
+
+def _convert_leniently(item: Any, schema: Type, error: Exception) -> Any:
+    """
+    Convert a document that failed ``schema``, field by field.
+
+    The response headers are already sent by the time a bad document is
+    reached, so raising would cut the body off. Each invalid field that has
+    a default falls back to it; a document that still doesn't fit is sent
+    as stored. Either way the error is logged.
+    """
+    optional = {f.name for f in msgspec.structs.fields(schema) if not f.required}
+    doc = dict(item) if isinstance(item, dict) else {}
+    while True:
+        match = _ERROR_FIELD.search(str(error))
+        field = match.group(1) if match else None
+        if field not in optional or field not in doc:
+            break
+        logger.warning(f"Streaming {schema.__name__} {doc.get('id')} with default {field}: {error}")
+        del doc[field]
+        try:
+            return msgspec.convert(doc, schema)
+        except msgspec.ValidationError as e:
+            error = e
+    logger.warning(f"Streaming {schema.__name__} {doc.get('id')} as stored: {error}")
+    return item
+
+
+async def _iter_chunks(
+    first: Any,
+    rest: AsyncIterator[Any],
+    append: Callable[[Any, bytearray], None],
+    prefix: bytes,
+    separator: bytes,
+    suffix: bytes,
+) -> AsyncIterator[bytes]:
+    buffer = bytearray(prefix)
+    if first is not _EMPTY:
+        append(first, buffer)
+        async for item in rest:
+            buffer += separator
+            append(item, buffer)
+            if len(buffer) >= STREAM_CHUNK_SIZE:
+                yield bytes(buffer)
+                buffer.clear()
+    buffer += suffix
+    yield bytes(buffer)
+
+
+async def stream_json(
+    request: Request,
+    items: AsyncIterator[Any],
+    *,
+    schema: Optional[Type] = None,
+    envelope: Optional[Dict[str, Any]] = None,
+    key: str = "data",
+) -> StreamingResponse:
+    """
+    Stream a Motor cursor (or any async iterator of documents) as JSON.
+
+    Large list endpoints opt in by returning this instead of a list: items
+    are encoded one at a time with the msgspec encoder and flushed in
+    ~STREAM_CHUNK_SIZE chunks, so the response is never held in memory and
+    FastAPI's response_model validation / jsonable_encoder pass is skipped
+    (a returned Response is sent as-is).
+
+    - Default: a JSON array, or ``{key: [...], **envelope}`` when an
+      envelope is given, so existing clients see the same document
+    - ``Accept: application/x-ndjson``: one item per line (envelope omitted)
+    - ``schema``: a msgspec Struct each document is converted to first,
+      giving a typed, defaulted shape without Pydantic. A document that
+      doesn't fit is logged and sent with the bad fields defaulted (or as
+      stored) rather than breaking the already-started response
+
+    The first item is fetched before the response starts, so query errors
+    still surface as normal error responses.
+
+    Usage:
+        cursor = db.journals.find(query, {"_id": 0}).sort("date", 1)
+        return await stream_json(request, cursor, envelope={"total": total})
+    """
+    items = items.__aiter__()
+    try:
+        first = await items.__anext__()
+    except StopAsyncIteration:
+        first = _EMPTY
+
+    append = _item_encoder(schema)
+    if wants_ndjson(request):
+        return StreamingResponse(
+            _iter_chunks(first, items, append, b"", b"\n", b"\n" if first is not _EMPTY else b""),
+            media_type=NDJSON_MEDIA_TYPE,
+        )
+
+    if envelope is None:
+        prefix, suffix = b"[", b"]"
+    else:
+        # {"data":[ ... ],"total":...} - the envelope's own braces are reused
+        tail = json_dumps(envelope)
+        prefix = b"{" + json_dumps(key) + b":["
+        suffix = b"]," + tail[1:] if len(tail) > 2 else b"]}"
+    return StreamingResponse(
+        _iter_chunks(first, items, append, prefix, b",", suffix),
+        media_type="application/json",
+    )
+
+
 # =============================================================================
 # REDIS SERIALIZATION HELPERS
 # =============================================================================
@@ -388,6 +542,9 @@ __all__ = [
     'json_loads',
     # FastAPI
     'MSGSpecResponse',
+    'stream_json',
+    'wants_ndjson',
+    'NDJSON_MEDIA_TYPE',
     # Redis helpers
     'redis_encode',
     'redis_decode',
@@ -0,0 +1,314 @@
+"""
+Text Analysis for Search and Matching
+
+Lightweight English + Indonesian analyzer used to build search terms.
+MongoDB's text indexes have no Indonesian analyzer, so terms are
+computed here and stored/queried as plain arrays.
+
+- normalize(): lowercase, strip accents
+- tokenize(): word tokens with their character offsets
+- stem_en(): light English suffix stripping (prayers/praying -> pray)
+- stem_id(): Indonesian particle, possessive, suffix and prefix removal
+  (mendoakan/berdoa/doanya -> doa)
+- term_variants(): the token plus both stems; a query word matches a
+  document word when their variants intersect, so text of either
+  language is handled without language detection
+- KeywordMatcher: keyword/phrase lists compiled once into a token index,
+  matched on whole words in a single pass over a text; text words are
+  stemmed, keywords only lose English inflections
+"""
+
+import re
+import unicodedata
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Set, Tuple
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+STOPWORDS_EN = frozenset("""
+a an and are as at be but by for from has have he her his i if in into is it its me my
+not of on or our she so that the their them they this to was we were what when which
+who will with you your
+""".split())
+
+STOPWORDS_ID = frozenset("""
+ada adalah agar akan aku anda apa atau bagi bahwa dalam dan dari dengan di dia ia ini
+itu juga kami kamu kalian karena ke kita mereka pada saja saya sebagai sudah telah
+tetapi untuk yang
+""".split())
+
+STOPWORDS = STOPWORDS_EN | STOPWORDS_ID
+
+MIN_ROOT = 3
+
+
+def normalize(text: str) -> str:
+    """Lowercase and strip accents ("Café" -> "cafe")"""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def tokenize(text: str) -> Iterator[Tuple[str, int, int]]:
+    """
+    Yield (normalized token, start, end) for each word in the original text
+
+    Offsets refer to the original (un-normalized) text, for highlighting.
+    """
+    for match in _WORD.finditer(text or ""):
+        yield normalize(match.group()), match.start(), match.end()
+
+
+@lru_cache(maxsize=50_000)
+def stem_en(word: str) -> str:
+    """Light English stemmer (plural, -ing, -ed, -ly, trailing e)"""
+    if len(word) <= MIN_ROOT or not word.isalpha():
+        return word
+
+    if word.endswith("ies") and len(word) > 4:
+        word = word[:-3] + "y"
+    elif word.endswith(("sses", "shes", "ches", "xes", "zes")):
+        word = word[:-2]
+    elif word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        word = word[:-1]
+
+    for suffix in ("edly", "ingly", "ing", "ed", "ly"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_ROOT:
+            word = word[: -len(suffix)]
+            # Undouble consonants (running -> run, stopped -> stop)
+            if len(word) > MIN_ROOT and word[-1] == word[-2] and word[-1] not in "lsz":
+                word = word[:-1]
+            break
+
+    if word.endswith("e") and len(word) > 4:
+        word = word[:-1]
+    return word
+
+
+# Prefix -> replacement for the root's first letter (nasal assimilation)
+_ID_PREFIXES = (
+    ("meny", "s"), ("peny", "s"),
+    ("meng", ""), ("peng", ""),
+    ("mem", "p"), ("pem", "p"),
+    ("men", "t"), ("pen", "t"),
+    ("mem", ""), ("pem", ""),
+    ("men", ""), ("pen", ""),
+    ("per", ""), ("ber", ""), ("ter", ""),
+    ("me", ""), ("pe", ""), ("be", ""),
+    ("di", ""), ("ke", ""), ("se", ""),
+)
+_ID_SECOND_PREFIXES = (("per", ""), ("ber", ""), ("ke", ""))
+_ID_PARTICLES = ("lah", "kah", "tah", "pun")
+# -ku/-mu are left alone: too many roots end in them (ilmu, bertemu, waktu)
+_ID_POSSESSIVES = ("nya",)
+_ID_SUFFIXES = ("kan", "an", "i")
+_VOWELS = "aeiou"
+
+
+def _strip_suffix(word: str, suffixes: Tuple[str, ...]) -> str:
+    for suffix in suffixes:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_ROOT:
+            return word[: -len(suffix)]
+    return word
+
+
+@lru_cache(maxsize=50_000)
+def stem_id(word: str) -> str:
+    """Indonesian stemmer: particles, possessives, derivational suffixes, prefixes"""
+    if len(word) <= MIN_ROOT + 1 or not word.isalpha():
+        return word
+
+    word = _strip_suffix(word, _ID_PARTICLES)
+    word = _strip_suffix(word, _ID_POSSESSIVES)
+    word = _strip_suffix(word, _ID_SUFFIXES)
+
+    # A prefix, then optionally per-/ber-/ke- (memper-, diber-, diper-)
+    allowed = _ID_PREFIXES
+    for _ in range(2):
+        for prefix, replacement in allowed:
+            if not word.startswith(prefix):
+                continue
+            rest = word[len(prefix):]
+            if replacement and (not rest or rest[0] not in _VOWELS):
+                continue  # Assimilated forms only before a vowel (menulis -> tulis)
+            candidate = replacement + rest
+            if len(candidate) >= MIN_ROOT:
+                word = candidate
+                break
+        else:
+            break
+        allowed = _ID_SECOND_PREFIXES
+    return word
+
+
+@lru_cache(maxsize=50_000)
+def term_variants(token: str) -> Tuple[str, ...]:
+    """The token and its English and Indonesian stems (deduplicated)"""
+    variants = [token]
+    for stem in (stem_en(token), stem_id(token)):
+        if stem not in variants:
+            variants.append(stem)
+    return tuple(variants)
+
+
+def index_terms(text: str) -> List[str]:
+    """Distinct terms to store for a document (tokens and their stems, no stopwords)"""
+    terms: Set[str] = set()
+    for token, _, _ in tokenize(text):
+        if len(token) < 2 or token in STOPWORDS:
+            continue
+        terms.update(term_variants(token))
+    return sorted(terms)
+
+
+def query_words(query: str) -> List[str]:
+    """
+    Normalized query words, stopwords dropped
+
+    index_terms never stores stopwords, so a query made only of stopwords
+    keeps just its last word, which search matches as a prefix of longer
+    terms (typing "the" finds "theology").
+    """
+    words = [token for token, _, _ in tokenize(query) if len(token) >= 2]
+    content = [w for w in words if w not in STOPWORDS]
+    return list(dict.fromkeys(content)) if content else words[-1:]
+
+
+# ==================== Keyword matching ====================
+
+# English derivational endings the search stemmer keeps (sickness, thankful)
+_MATCH_SUFFIXES = ("fulness", "fully", "ness", "ful")
+_APOSTROPHES = str.maketrans("", "", "'\u2019")
+
+
+def _match_root(token: str) -> str:
+    """The token without an English -ness/-ful ending (or the token itself)"""
+    for suffix in _MATCH_SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= MIN_ROOT:
+            return token[: -len(suffix)]
+    return token
+
+
+@lru_cache(maxsize=50_000)
+def match_forms(token: str) -> FrozenSet[str]:
+    """
+    Forms a text token can match a keyword on
+
+    Its variants and those of its root without -ness/-ful, plus the token
+    without Indonesian particles/-nya, so "meninggalnya" still matches the
+    keyword "meninggal".
+    """
+    forms = set(term_variants(token))
+    forms.update(term_variants(_match_root(token)))
+    if len(token) > MIN_ROOT + 1 and token.isalpha():
+        forms.add(_strip_suffix(_strip_suffix(token, _ID_PARTICLES), _ID_POSSESSIVES))
+    return frozenset(forms)
+
+
+@lru_cache(maxsize=50_000)
+def keyword_forms(token: str) -> FrozenSet[str]:
+    """
+    Forms a keyword token is indexed under: as written, plus English stems
+
+    Indonesian stems are left out on purpose. Affixes there change the
+    meaning, and the roots are everyday words ("meninggal" -> tinggal
+    "live", "keputusan" -> putus "break up", "bermasalah" -> masa "time").
+    A root keyword still matches derived text words through the text's
+    stems ("mendoakan" -> doa).
+    """
+    root = _match_root(token)
+    return frozenset({token, stem_en(token), root, stem_en(root)})
+
+
+def match_tokens(text: str) -> List[str]:
+    """Normalized tokens for matching ("can't" -> "cant", "kehendak-Mu" -> kehendak, mu)"""
+    text = (text or "").translate(_APOSTROPHES)
+    return _WORD.findall(text.lower() if text.isascii() else normalize(text))
+
+
+@dataclass(frozen=True)
+class _Phrase:
+    label: str
+    keyword: str
+    tail: Tuple[FrozenSet[str], ...]  # forms of the 2nd..nth token
+
+
+class KeywordMatcher:
+    """
+    Compiled keyword lists for whole-word, stem-aware matching
+
+    Built once from (label, keyword) pairs. Keywords may be phrases
+    ("rumah sakit", "cant sleep"); a keyword token matches a text token
+    when the keyword's forms (keyword_forms) meet the text token's
+    (match_forms), so "berdoa"/"mendoakan" match "doa" and "worrying"
+    matches "worry", but "miss" doesn't match "mission" and "tinggal"
+    doesn't match "meninggal".
+
+    A text is tokenized once and each token is looked up in a
+    token -> candidate phrases table (memoized per distinct token), so the
+    cost grows with the text, not with the number of keywords.
+    """
+
+    CACHE_MAX = 50_000
+
+    def __init__(self, entries: Iterable[Tuple[str, str]]):
+        self._index: Dict[str, List[_Phrase]] = defaultdict(list)
+        self._candidates: Dict[str, Tuple[_Phrase, ...]] = {}
+        self.size = 0
+        for label, keyword in entries:
+            tokens = match_tokens(keyword)
+            if not tokens:
+                continue
+            phrase = _Phrase(
+                label=label,
+                keyword=keyword,
+                tail=tuple(keyword_forms(t) for t in tokens[1:]),
+            )
+            for form in keyword_forms(tokens[0]):
+                self._index[form].append(phrase)
+            self.size += 1
+
+    def _phrases_starting_with(self, token: str) -> Tuple[_Phrase, ...]:
+        phrases = self._candidates.get(token)
+        if phrases is None:
+            found: Dict[int, _Phrase] = {}
+            for form in match_forms(token):
+                for phrase in self._index.get(form, ()):
+                    found[id(phrase)] = phrase
+            phrases = tuple(found.values())
+            if len(self._candidates) >= self.CACHE_MAX:
+                self._candidates.clear()
+            self._candidates[token] = phrases
+        return phrases
+
+    def scan(self, text: str) -> Iterator[Tuple[str, str, str]]:
+        """Yield (label, keyword, matched text) for every keyword occurrence"""
+        tokens = match_tokens(text)
+        count = len(tokens)
+        for i, token in enumerate(tokens):
+            for phrase in self._phrases_starting_with(token):
+                tail = phrase.tail
+                if not tail:
+                    yield phrase.label, phrase.keyword, token
+                elif i + len(tail) < count and all(
+                    forms & match_forms(tokens[i + 1 + j]) for j, forms in enumerate(tail)
+                ):
+                    yield phrase.label, phrase.keyword, " ".join(tokens[i: i + 1 + len(tail)])
+
+    def find(self, text: str) -> Set[Tuple[str, str]]:
+        """Distinct (label, keyword) pairs occurring in the text"""
+        return {(label, keyword) for label, keyword, _ in self.scan(text)}
+
+    def match(self, text: str) -> Dict[str, int]:
+        """
+        Number of keyword hits per label
+
+        Hits are counted by distinct matched text, so a word repeated, or
+        one word matching several keywords of a label through a shared stem
+        ("kecemasan" -> cemas, kecemasan), counts once.
+        """
+        counts: Dict[str, int] = {}
+        for label, _ in {(label, matched) for label, _, matched in self.scan(text)}:
+            counts[label] = counts.get(label, 0) + 1
+        return counts